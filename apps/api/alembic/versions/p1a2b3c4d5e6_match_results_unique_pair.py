@@ -0,0 +1,51 @@
+"""unique live (project, investor) pair on match_results
+
+Revision ID: p1a2b3c4d5e6
+Revises: fdb047fb791b
+Create Date: 2026-10-16 09:00:00.000000
+
+Backs the INSERT ... ON CONFLICT upsert used by the incremental match refresh.
+Duplicate live rows (possible before this constraint) are soft-deleted first,
+keeping the most recently updated row per pair.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "p1a2b3c4d5e6"
+down_revision = "fdb047fb791b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE match_results SET is_deleted = true
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY project_id, investor_org_id
+                    ORDER BY updated_at DESC, created_at DESC
+                ) AS rn
+                FROM match_results
+                WHERE is_deleted = false
+            ) ranked
+            WHERE ranked.rn > 1
+        )
+        """
+    )
+    op.create_index(
+        "uq_match_results_project_investor",
+        "match_results",
+        ["project_id", "investor_org_id"],
+        unique=True,
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_match_results_project_investor", table_name="match_results")
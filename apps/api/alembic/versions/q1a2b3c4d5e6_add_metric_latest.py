@@ -0,0 +1,70 @@
+"""add metric_latest projection of the newest metric snapshot
+
+Revision ID: q1a2b3c4d5e6
+Revises: p1a2b3c4d5e6
+Create Date: 2026-10-16 12:00:00.000000
+
+One row per (entity_type, entity_id, metric_name), upserted by
+MetricSnapshotService.record_snapshot. Backfilled from the newest snapshot of
+each series.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "q1a2b3c4d5e6"
+down_revision = "p1a2b3c4d5e6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "metric_latest",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            server_default=sa.text("gen_random_uuid()"),
+            nullable=False,
+        ),
+        sa.Column("org_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("entity_type", sa.String(50), nullable=False),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("metric_name", sa.String(100), nullable=False),
+        sa.Column("value", sa.Float, nullable=False),
+        sa.Column("metadata", postgresql.JSONB, nullable=True),
+        sa.Column("snapshot_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "recorded_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "entity_type", "entity_id", "metric_name", name="uq_metric_latest_entity_metric"
+        ),
+    )
+    op.create_index(
+        "ix_metric_latest_rank", "metric_latest", ["entity_type", "metric_name", "value"]
+    )
+    op.execute(
+        """
+        INSERT INTO metric_latest (
+            org_id, entity_type, entity_id, metric_name, value, metadata, snapshot_id, recorded_at
+        )
+        SELECT DISTINCT ON (entity_type, entity_id, metric_name)
+            org_id, entity_type, entity_id, metric_name, value, metadata, id, recorded_at
+        FROM metric_snapshots
+        ORDER BY entity_type, entity_id, metric_name, recorded_at DESC
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_metric_latest_rank", table_name="metric_latest")
+    op.drop_table("metric_latest")
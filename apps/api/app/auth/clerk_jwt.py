@@ -1,16 +1,17 @@
 """Clerk RS256 JWT verification via JWKS.
 
 Fetches Clerk's public keys from the well-known JWKS endpoint, caches them
-in Redis (shared across all worker processes) with an in-process fallback,
-and verifies RS256-signed tokens.
+in Redis (shared across all worker processes) and in-process as parsed key
+objects, and verifies RS256-signed tokens.
 """
 
 import contextlib
 import json
+import time
 
 import httpx
 import structlog
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 
 from app.core.config import settings
 
@@ -18,6 +19,12 @@ logger = structlog.get_logger()
 
 _REDIS_KEY = "clerk:jwks"
 
+# In-process key set: kid -> parsed public key, refreshed every CLERK_JWKS_CACHE_TTL
+_local_keys: dict[str, jwk.Key] = {}
+_local_expires_at: float = 0.0
+_last_forced_refresh: float = 0.0
+_FORCED_REFRESH_INTERVAL = 60.0  # unknown-kid refetches from Clerk, at most this often
+
 
 async def _redis_client():
     """Return a short-lived Redis client, or None if Redis is unavailable."""
@@ -84,6 +91,44 @@ def _get_signing_key(jwks: dict, token: str) -> dict:
     raise JWTError(f"No matching key found for kid={kid}")
 
 
+def _parse_keys(jwks: dict) -> dict[str, jwk.Key]:
+    keys: dict[str, jwk.Key] = {}
+    for key in jwks.get("keys", []):
+        try:
+            keys[key["kid"]] = jwk.construct(key, algorithm=key.get("alg", "RS256"))
+        except Exception as e:
+            logger.warning("clerk_jwks_key_invalid", kid=key.get("kid"), error=str(e))
+    return keys
+
+
+async def _get_local_signing_key(token: str) -> jwk.Key:
+    """Resolve the token's kid against the in-process key set.
+
+    The key set is reloaded (Redis, then Clerk) when it expires. An unknown
+    kid means Clerk rotated its keys, so the shared copy is bypassed and
+    refetched from Clerk — rate-limited so forged kids cannot hammer Clerk.
+    """
+    global _local_keys, _local_expires_at, _last_forced_refresh
+
+    kid = jwt.get_unverified_header(token).get("kid")
+    now = time.monotonic()
+    if now < _local_expires_at and kid in _local_keys:
+        return _local_keys[kid]
+
+    jwks = await _fetch_jwks()
+    known = {k.get("kid") for k in jwks.get("keys", [])}
+    if kid not in known and now - _last_forced_refresh > _FORCED_REFRESH_INTERVAL:
+        _last_forced_refresh = now
+        await clear_jwks_cache()
+        jwks = await _fetch_jwks()
+
+    _local_keys = _parse_keys(jwks)
+    _local_expires_at = now + settings.CLERK_JWKS_CACHE_TTL
+    if kid not in _local_keys:
+        raise JWTError(f"No matching key found for kid={kid}")
+    return _local_keys[kid]
+
+
 async def verify_clerk_token(token: str) -> dict:
     """
     Verify a Clerk-issued RS256 JWT.
@@ -91,8 +136,7 @@ async def verify_clerk_token(token: str) -> dict:
     Returns the decoded payload with claims (sub, email, etc.).
     Raises JWTError on any validation failure.
     """
-    jwks = await _fetch_jwks()
-    signing_key = _get_signing_key(jwks, token)
+    signing_key = await _get_local_signing_key(token)
 
     payload = jwt.decode(
         token,
@@ -112,7 +156,9 @@ async def verify_clerk_token(token: str) -> dict:
 
 
 async def clear_jwks_cache() -> None:
-    """Clear the JWKS cache in Redis (useful for testing and key rotation)."""
+    """Clear the JWKS cache in Redis and in-process (useful for testing and key rotation)."""
+    global _local_keys, _local_expires_at
+    _local_keys, _local_expires_at = {}, 0.0
     redis = await _redis_client()
     if redis:
         try:
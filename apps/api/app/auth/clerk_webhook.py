@@ -11,6 +11,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from svix.webhooks import Webhook, WebhookVerificationError
 
+from app.auth import principal_cache
 from app.core.config import settings
 from app.models.core import Organization, User
 from app.models.enums import OrgType, UserRole
@@ -98,6 +99,7 @@ async def handle_user_created(data: dict, db: AsyncSession) -> None:
 async def handle_user_updated(data: dict, db: AsyncSession) -> None:
     """Handle user.updated: sync email, name, avatar from Clerk."""
     clerk_user_id = data.get("id", "")
+    principal_cache.invalidate_user(clerk_user_id)
     result = await db.execute(select(User).where(User.external_auth_id == clerk_user_id))
     user = result.scalar_one_or_none()
     if not user:
@@ -123,6 +125,7 @@ async def handle_user_updated(data: dict, db: AsyncSession) -> None:
 async def handle_user_deleted(data: dict, db: AsyncSession) -> None:
     """Handle user.deleted: soft-delete the user."""
     clerk_user_id = data.get("id", "")
+    principal_cache.invalidate_user(clerk_user_id)
     result = await db.execute(select(User).where(User.external_auth_id == clerk_user_id))
     user = result.scalar_one_or_none()
     if not user:
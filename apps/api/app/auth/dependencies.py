@@ -1,8 +1,8 @@
 """FastAPI auth dependencies: get_current_user, require_role, require_permission, require_org_access."""
 
+import time
 import uuid
 
-import redis.asyncio as aioredis
 import sentry_sdk
 import structlog
 from fastapi import Depends, HTTPException, Request, status
@@ -11,9 +11,9 @@ from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth import principal_cache
 from app.auth.clerk_jwt import verify_clerk_token
 from app.auth.rbac import check_object_permission, check_permission
-from app.core.config import settings
 from app.core.database import get_db
 from app.models.core import Organization, User
 from app.models.enums import UserRole
@@ -23,6 +23,10 @@ logger = structlog.get_logger()
 
 bearer_scheme = HTTPBearer(auto_error=True)
 
+_ORG_TIER_TTL = 300  # seconds — read by the rate limiter in middleware/security.py
+# org_id -> monotonic time until which this worker trusts the org tier key exists
+_org_tier_fresh_until: dict[uuid.UUID, float] = {}
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
@@ -36,6 +40,12 @@ async def get_current_user(
     Always checks is_active and is_deleted.
     """
     token = credentials.credentials
+    cache_key = principal_cache.token_key(token)
+    cached = principal_cache.get_principal(cache_key)
+    if cached is not None:
+        _tag_sentry(cached)
+        return cached
+
     try:
         payload = await verify_clerk_token(token)
     except (JWTError, Exception) as e:
@@ -76,32 +86,50 @@ async def get_current_user(
         email=user.email,
         external_auth_id=clerk_user_id,
     )
+    principal_cache.put_principal(cache_key, current_user, payload.get("exp"))
+    _tag_sentry(current_user)
+
+    await _ensure_org_tier_cached(db, user.org_id)
+
+    return current_user
+
 
-    # Enrich Sentry scope with identity (PII-free: no email)
-    sentry_sdk.set_user({"id": str(user.id)})
-    sentry_sdk.set_tag("org_id", str(user.org_id))
-    sentry_sdk.set_tag("user_role", user.role.value)
+def _tag_sentry(current_user: CurrentUser) -> None:
+    """Enrich Sentry scope with identity (PII-free: no email)."""
+    sentry_sdk.set_user({"id": str(current_user.user_id)})
+    sentry_sdk.set_tag("org_id", str(current_user.org_id))
+    sentry_sdk.set_tag("user_role", current_user.role.value)
 
-    # Cache org subscription tier in Redis so the rate limiter can apply tier-based
-    # limits without a DB lookup on every request (TTL 300 s, best-effort).
+
+async def _ensure_org_tier_cached(db: AsyncSession, org_id: uuid.UUID) -> None:
+    """Cache the org subscription tier in Redis for the rate limiter.
+
+    The rate limiter applies tier-based limits without a DB lookup on every
+    request. The key is only written when missing: a worker that has seen it
+    recently skips Redis entirely, otherwise one EXISTS decides whether the
+    Organization row needs loading. Best-effort — the rate limiter falls back
+    to foundation limits on a cache miss.
+    """
+    now = time.monotonic()
+    if _org_tier_fresh_until.get(org_id, 0.0) > now:
+        return
+    key = f"org:tier:{org_id}"
     try:
-        org = (
-            await db.execute(select(Organization).where(Organization.id == user.org_id))
-        ).scalar_one_or_none()
-        if org:
-            r = aioredis.from_url(
-                settings.REDIS_URL,
-                decode_responses=True,
-                socket_connect_timeout=0.5,
-                socket_timeout=0.5,
-            )
-            await r.setex(f"org:tier:{user.org_id}", 300, org.subscription_tier.value)
-            await r.aclose()
+        from app.services.response_cache import get_redis
+
+        r = await get_redis()
+        if not await r.exists(key):
+            org = (
+                await db.execute(select(Organization).where(Organization.id == org_id))
+            ).scalar_one_or_none()
+            if org is None:
+                return
+            await r.set(key, org.subscription_tier.value, ex=_ORG_TIER_TTL, nx=True)
+        # Re-check well before the key can expire
+        _org_tier_fresh_until[org_id] = now + _ORG_TIER_TTL / 2
     except Exception:
         pass  # Non-blocking: rate limiter falls back to foundation limits on cache miss
 
-    return current_user
-
 
 def require_role(allowed_roles: list[UserRole]):
     """
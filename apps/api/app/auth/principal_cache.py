@@ -0,0 +1,72 @@
+"""In-process cache of verified principals: token hash -> CurrentUser.
+
+A warm worker resolves a repeat bearer token without JWT verification or
+any DB/Redis round trip. Entries live for AUTH_PRINCIPAL_CACHE_TTL seconds
+(never past the token's own ``exp``) and are dropped when the Clerk
+``user.updated`` / ``user.deleted`` webhooks fire for the user. Other worker
+processes pick the change up when their entry expires.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+
+from app.core.config import settings
+from app.schemas.auth import CurrentUser
+
+_entries: OrderedDict[str, tuple[float, CurrentUser]] = OrderedDict()
+_by_clerk_id: dict[str, set[str]] = {}
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_principal(key: str) -> CurrentUser | None:
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    expires_at, user = entry
+    if time.time() >= expires_at:
+        _discard(key)
+        return None
+    _entries.move_to_end(key)
+    return user
+
+
+def put_principal(key: str, user: CurrentUser, token_exp: float | None = None) -> None:
+    ttl = settings.AUTH_PRINCIPAL_CACHE_TTL
+    if ttl <= 0:
+        return
+    expires_at = time.time() + ttl
+    if token_exp is not None:
+        expires_at = min(expires_at, float(token_exp))
+    _entries[key] = (expires_at, user)
+    _entries.move_to_end(key)
+    _by_clerk_id.setdefault(user.external_auth_id, set()).add(key)
+    while len(_entries) > settings.AUTH_PRINCIPAL_CACHE_SIZE:
+        _discard(next(iter(_entries)))
+
+
+def invalidate_user(clerk_user_id: str) -> int:
+    """Drop every cached principal for a Clerk user; returns entries removed."""
+    keys = _by_clerk_id.pop(clerk_user_id, set())
+    for key in keys:
+        _entries.pop(key, None)
+    return len(keys)
+
+
+def clear() -> None:
+    _entries.clear()
+    _by_clerk_id.clear()
+
+
+def _discard(key: str) -> None:
+    entry = _entries.pop(key, None)
+    if entry is None:
+        return
+    keys = _by_clerk_id.get(entry[1].external_auth_id)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            _by_clerk_id.pop(entry[1].external_auth_id, None)
@@ -85,6 +85,41 @@ class Settings(BaseSettings):
             self.DATABASE_URL_SYNC = sync
         return self
 
+    # Audit log writer (middleware/audit.py) — batched multi-row inserts
+    AUDIT_QUEUE_MAX_SIZE: int = 10_000  # rows beyond this are dropped and counted
+    AUDIT_FLUSH_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_MS: int = 250
+
+    # SSE notifications broker (modules/notifications/sse.py)
+    SSE_QUEUE_SIZE: int = 100  # per-connection; slower consumers are evicted
+    SSE_HEARTBEAT_SECONDS: float = 30.0
+    SSE_BACKLOG_SIZE: int = 200  # per-user Redis stream for Last-Event-ID resume
+    SSE_BACKLOG_TTL_SECONDS: int = 3600
+
+    # Webhook dispatcher (modules/webhooks/dispatcher.py)
+    WEBHOOK_DISPATCHER_ENABLED: bool = True  # False → legacy one-Celery-task-per-delivery
+    WEBHOOK_DISPATCH_BATCH_SIZE: int = 200
+    WEBHOOK_DISPATCH_CONCURRENCY: int = 100  # in-flight requests per dispatcher process
+    WEBHOOK_PER_SUBSCRIBER_CONCURRENCY: int = 4
+    WEBHOOK_DISPATCH_POLL_SECONDS: float = 1.0
+    WEBHOOK_DELIVERY_TIMEOUT_SECONDS: float = 10.0
+
+    # Ralph AI tool execution (modules/ralph_ai/agent.py)
+    RALPH_TOOL_CONCURRENCY: int = 4  # concurrent tool calls per agent turn, each on its own session
+
+    # PDF text extraction (services/pdf_extraction.py)
+    PDF_EXTRACT_WORKERS: int = 4  # worker processes per Celery worker; <= 1 extracts serially
+    PDF_PARALLEL_MIN_PAGES: int = 40  # smaller PDFs are not worth the process hop
+    PDF_PAGES_PER_RANGE: int = 20
+    PDF_SLOW_PAGE_MS: float = 2_000.0  # pages slower than this are logged individually
+    PDF_RANGE_TIMEOUT_SECONDS: float = 120.0  # a silent range worker is killed; its range runs serially
+
+    # Database backups (tasks/backup.py)
+    BACKUP_COMPRESSION: str = "gzip"  # "zstd" needs the zstandard package, else falls back
+    BACKUP_ZSTD_LEVEL: int = 3
+    BACKUP_ZSTD_THREADS: int = -1  # -1 = one per CPU, 0 = single-threaded
+    BACKUP_MULTIPART_PART_MB: int = 64  # also the upload buffer size (S3 minimum is 5)
+
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
@@ -98,6 +133,10 @@ class Settings(BaseSettings):
     CLERK_ISSUER_URL: str = ""  # e.g. "https://your-app.clerk.accounts.dev"
     # 5 min TTL balances security (revoked JWTs invalid within 5 min) vs performance (fewer fetches)
     CLERK_JWKS_CACHE_TTL: int = 300  # seconds to cache JWKS public keys
+    # Verified token -> CurrentUser, per worker. Webhook invalidation is local to the
+    # receiving worker, so this TTL bounds how long other workers see a stale role.
+    AUTH_PRINCIPAL_CACHE_TTL: int = 30  # seconds; 0 disables
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10_000
 
     # S3 / MinIO
     AWS_ACCESS_KEY_ID: str = "minioadmin"
@@ -135,6 +174,8 @@ class Settings(BaseSettings):
     BNEF_API_KEY: str = ""  # Bloomberg NEF — subscription required
     MSCI_ESG_API_KEY: str = ""  # MSCI ESG Research — subscription required
     PREQIN_API_KEY: str = ""  # Preqin Pro — subscription required
+    # Rows per multi-row INSERT ... ON CONFLICT when ingesting external data points
+    MARKET_DATA_UPSERT_BATCH_SIZE: int = 1000
 
     # Google (Maps, Places, Custom Search)
     GOOGLE_API_KEY: str = ""
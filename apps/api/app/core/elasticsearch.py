@@ -73,6 +73,12 @@ _MAPPINGS: dict[str, dict] = {
     },
 }
 
+
+def index_definition(index_name: str) -> dict:
+    """Mappings body for one of the public index names (used for versioned rebuilds)."""
+    return _MAPPINGS[index_name]
+
+
 # ── Singleton client ──────────────────────────────────────────────────────────
 
 _client: AsyncElasticsearch | None = None
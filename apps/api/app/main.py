@@ -26,6 +26,7 @@ from app.middleware.security import (
     SecurityHeadersMiddleware,
 )
 from app.middleware.tenant import TenantMiddleware
+from app.services.gateway_client import close_gateway_client, gateway_client
 
 # Configure structlog before any logger is used.
 configure_logging("api")
@@ -56,8 +57,6 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
             logger.warning("feature_flag_seed_failed", error=str(exc))
 
     # ── Startup dependency validation ─────────────────────────────────────────
-    import httpx
-
     checks: dict[str, str] = {}
 
     # Database check
@@ -84,18 +83,12 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
     except Exception as exc:
         checks["redis"] = f"FAILED: {exc}"
 
-    # AI Gateway check (non-blocking)
+    # AI Gateway check (non-blocking; also warms the shared connection pool)
     try:
-        ai_gw_url = (
-            settings.AI_GATEWAY_URL
-            if hasattr(settings, "AI_GATEWAY_URL")
-            else "http://localhost:8001"
+        resp = await gateway_client().get("/health", timeout=5.0, breaker=False)
+        checks["ai_gateway"] = (
+            "ok" if resp.status_code == 200 else f"WARNING: HTTP {resp.status_code}"
         )
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(f"{ai_gw_url}/health")
-            checks["ai_gateway"] = (
-                "ok" if resp.status_code == 200 else f"WARNING: HTTP {resp.status_code}"
-            )
     except Exception as exc:
         checks["ai_gateway"] = f"WARNING: {exc}"
 
@@ -121,7 +114,14 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
 
     yield
     logger.info("Shutting down SCR API")
+    from app.middleware.audit import audit_writer
+
+    await audit_writer.stop()
+    from app.modules.notifications.sse import sse_manager
+
+    await sse_manager.close()
     await close_es_client()
+    await close_gateway_client()
 
 
 _is_prod = settings.APP_ENV == "production"
@@ -292,10 +292,20 @@ async def health_check() -> dict:
 
 @app.get("/health/ai")
 async def health_ai() -> dict:
-    """Circuit-breaker status for the AI Gateway."""
+    """Circuit-breaker status and pooled client latency/reuse stats for the AI Gateway."""
     from app.core.circuit_breaker import ai_gateway_cb
 
-    return await ai_gateway_cb.get_status()
+    status = await ai_gateway_cb.get_status()
+    status["client"] = gateway_client().stats()
+    return status
+
+
+@app.get("/health/audit")
+async def health_audit() -> dict:
+    """Audit log writer queue depth, drop counters and flush latency."""
+    from app.middleware.audit import audit_writer
+
+    return audit_writer.stats()
 
 
 # ── /v1 versioned router ──────────────────────────────────────────────────────
@@ -1,18 +1,23 @@
 """Audit logging middleware.
 
-Captures all mutating HTTP operations (POST/PUT/PATCH/DELETE) and writes to
-audit_logs asynchronously via fire-and-forget tasks. Uses its own DB session
-to decouple from the request lifecycle.
+Captures all mutating HTTP operations (POST/PUT/PATCH/DELETE) and queues an
+audit_logs row for each. A single background writer drains the queue with
+multi-row inserts, so bulk operations cost one pooled connection per flush
+rather than one per row, decoupled from the request lifecycle.
 """
 
 import asyncio
 import contextlib
+import time
 import uuid
+from typing import Any
 
 import structlog
+from sqlalchemy import insert
 from starlette.requests import Request
 from starlette.types import ASGIApp, Receive, Scope, Send
 
+from app.core.config import settings
 from app.core.database import async_session_factory
 from app.models.core import AuditLog
 
@@ -31,12 +36,146 @@ AUDIT_EXEMPT_PATHS = frozenset(
 )
 
 
+class AuditLogWriter:
+    """Bounded queue of audit rows drained by one background task.
+
+    Rows are flushed as a single multi-row INSERT when ``batch_size`` rows are
+    waiting or ``flush_interval_ms`` has passed since the first one arrived.
+    When the queue is full new rows are dropped and counted — requests are
+    never blocked on audit logging. ``stop()`` waits for the in-flight flush and
+    writes the batch being collected plus everything still queued.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval_ms: int = 250,
+    ) -> None:
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self._queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._task: asyncio.Task | None = None
+        # Rows taken off the queue but not yet handed to a flush, and the running
+        # flush — both live here so stop() can finish them after cancelling _run
+        self._batch: list[dict[str, Any]] = []
+        self._inflight: asyncio.Task | None = None
+        # Metrics
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+        self.max_depth = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._flush_ms_total = 0.0
+
+    def enqueue(self, row: dict[str, Any]) -> bool:
+        """Queue one audit row without blocking; returns False if it was dropped."""
+        if self._task is None or self._task.done():
+            self.start()
+        assert self._queue is not None
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("audit_log_queue_full", dropped=self.dropped, max_queue=self.max_queue)
+            return False
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    def start(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name="audit-log-writer")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop the writer loop, then flush its pending batch and whatever is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._inflight is not None:
+            # The loop's flush is shielded from the cancel above; let it finish
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(asyncio.shield(self._inflight), timeout)
+            self._inflight = None
+        rows, self._batch = self._batch, []
+        if self._queue is not None:
+            while not self._queue.empty():
+                rows.append(self._queue.get_nowait())
+        for i in range(0, len(rows), self.batch_size):
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._flush(rows[i : i + self.batch_size]), timeout)
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        while True:
+            self._batch.append(await self._queue.get())
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except TimeoutError:
+                    break
+            rows, self._batch = self._batch, []
+            self._inflight = asyncio.create_task(self._flush(rows))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    async def _flush(self, rows: list[dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            async with async_session_factory() as session:
+                await session.execute(insert(AuditLog), rows)
+                await session.commit()
+            self.written += len(rows)
+        except Exception:
+            self.failed += len(rows)
+            logger.exception("audit_log_write_failed", rows=len(rows))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.flushes += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._flush_ms_total += elapsed_ms
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "avg_batch_size": round(self.written / self.flushes, 1) if self.flushes else 0.0,
+            "last_flush_ms": round(self.last_flush_ms, 1),
+            "avg_flush_ms": round(self._flush_ms_total / self.flushes, 1) if self.flushes else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 1),
+        }
+
+
+audit_writer = AuditLogWriter(
+    max_queue=settings.AUDIT_QUEUE_MAX_SIZE,
+    batch_size=settings.AUDIT_FLUSH_BATCH_SIZE,
+    flush_interval_ms=settings.AUDIT_FLUSH_INTERVAL_MS,
+)
+
+
 class AuditMiddleware:
     """Pure ASGI middleware that logs mutating operations to audit_logs."""
 
-    def __init__(self, app: ASGIApp) -> None:
+    def __init__(self, app: ASGIApp, writer: AuditLogWriter | None = None) -> None:
         self.app = app
-        self._background_tasks: set[asyncio.Task] = set()
+        self.writer = writer or audit_writer
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] != "http":
@@ -68,47 +207,42 @@ class AuditMiddleware:
 
         # Only audit successful mutations (2xx)
         if 200 <= response_status < 300:
-            _task = asyncio.create_task(self._write_audit_log(scope, request, method, path))
-            self._background_tasks.add(_task)
-            _task.add_done_callback(self._background_tasks.discard)
+            row = _build_audit_row(scope, request, method, path)
+            if row is not None:
+                self.writer.enqueue(row)
 
-    async def _write_audit_log(self, scope: dict, request: Request, method: str, path: str) -> None:
-        """Write audit log in a separate DB session (fire-and-forget)."""
-        try:
-            state = scope.get("state", {})
-            org_id = state.get("org_id")
-            user_id = state.get("user_id")
 
-            if not org_id or not user_id:
-                return  # Skip unauthenticated requests
+def _build_audit_row(
+    scope: Scope, request: Request, method: str, path: str
+) -> dict[str, Any] | None:
+    """Audit row values for a successful mutation, or None if unauthenticated."""
+    state = scope.get("state", {})
+    org_id = state.get("org_id")
+    user_id = state.get("user_id")
 
-            action = _method_to_action(method)
-            entity_type, entity_id = _parse_entity_from_path(path)
+    if not org_id or not user_id:
+        return None  # Skip unauthenticated requests
 
-            # Client IP (handle proxies)
-            ip_address = request.headers.get("x-forwarded-for")
-            if ip_address:
-                ip_address = ip_address.split(",")[0].strip()
-            elif request.client:
-                ip_address = request.client.host
+    action = _method_to_action(method)
+    entity_type, entity_id = _parse_entity_from_path(path)
 
-            user_agent = request.headers.get("user-agent", "")[:500]
+    # Client IP (handle proxies)
+    ip_address = request.headers.get("x-forwarded-for")
+    if ip_address:
+        ip_address = ip_address.split(",")[0].strip()
+    elif request.client:
+        ip_address = request.client.host
 
-            async with async_session_factory() as session:
-                audit_entry = AuditLog(
-                    org_id=org_id,
-                    user_id=user_id,
-                    action=f"{action}:{entity_type}",
-                    entity_type=entity_type,
-                    entity_id=entity_id,
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                )
-                session.add(audit_entry)
-                await session.commit()
-
-        except Exception:
-            logger.exception("audit_log_write_failed", path=path)
+    return {
+        "id": uuid.uuid4(),
+        "org_id": org_id,
+        "user_id": user_id,
+        "action": f"{action}:{entity_type}",
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "ip_address": ip_address,
+        "user_agent": request.headers.get("user-agent", "")[:500],
+    }
 
 
 def _method_to_action(method: str) -> str:
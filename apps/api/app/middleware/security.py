@@ -6,8 +6,9 @@ so they are compatible with streaming responses (SSE, chunked).
 
 import base64
 import json
+import math
 import time
-from typing import ClassVar
+from typing import Any, ClassVar
 
 import redis.asyncio as aioredis
 import structlog
@@ -112,7 +113,7 @@ class RequestBodySizeLimitMiddleware:
         await self.app(scope, receive, send)
 
 
-# ── 3. Redis Sliding-Window Rate Limiter ──────────────────────────────────────
+# ── 3. Redis GCRA Rate Limiter ────────────────────────────────────────────────
 
 
 # (path_prefix, requests_allowed, window_seconds)
@@ -152,9 +153,67 @@ _SKIP_PATHS: frozenset[str] = frozenset(
     ["/health", "/docs", "/redoc", "/openapi.json", "/favicon.ico"]
 )
 
+# GCRA (generic cell rate algorithm): each key stores one "theoretical arrival
+# time" (TAT), so memory is O(1) per key regardless of traffic. A request is
+# allowed when the new TAT stays within one window of now; ``limit`` requests
+# may burst, then they are spaced window/limit apart. The IP check, org tier
+# lookup and org check run atomically in one round trip; neither TAT advances
+# unless both checks pass.
+#
+# KEYS: ip_key, org_key, org_tier_key
+# ARGV: ip_limit, ip_window_ms, org_window_ms, has_org, is_ai, default_tier,
+#       then (tier, general_limit, ai_limit) triples
+# Returns: ip_allowed, ip_remaining, ip_retry_ms, org_allowed, org_remaining,
+#          org_retry_ms, org_limit
+_GCRA_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local function gcra(key, limit, window)
+  local interval = window / limit
+  local tat = tonumber(redis.call('GET', key)) or now
+  if tat < now then tat = now end
+  local new_tat = tat + interval
+  local allow_at = new_tat - window
+  if allow_at > now then
+    return 0, 0, math.ceil(allow_at - now), nil
+  end
+  return 1, math.floor((now - allow_at) / interval), 0, new_tat
+end
+
+local ip_ok, ip_rem, ip_retry, ip_tat = gcra(KEYS[1], tonumber(ARGV[1]), tonumber(ARGV[2]))
+local org_ok, org_rem, org_retry, org_tat, org_limit = 1, 0, 0, nil, 0
+
+if ip_ok == 1 and ARGV[4] == '1' then
+  local limits = {}
+  for i = 7, #ARGV, 3 do
+    limits[ARGV[i]] = {tonumber(ARGV[i + 1]), tonumber(ARGV[i + 2])}
+  end
+  local tier = redis.call('GET', KEYS[3])
+  local tier_limits = limits[tier] or limits[ARGV[6]]
+  org_limit = ARGV[5] == '1' and tier_limits[2] or tier_limits[1]
+  org_ok, org_rem, org_retry, org_tat = gcra(KEYS[2], org_limit, tonumber(ARGV[3]))
+end
+
+if ip_ok == 1 and org_ok == 1 then
+  redis.call('SET', KEYS[1], string.format('%.3f', ip_tat), 'PX', math.ceil(ip_tat - now))
+  if org_tat then
+    redis.call('SET', KEYS[2], string.format('%.3f', org_tat), 'PX', math.ceil(org_tat - now))
+  end
+end
+
+return {ip_ok, ip_rem, ip_retry, org_ok, org_rem, org_retry, org_limit}
+"""
+
+_TIER_ARGS: list[str | int] = [
+    v for tier, (general, ai) in _TIER_LIMITS.items() for v in (tier, general, ai)
+]
+
+_LOCAL_BLOCK_MAX_KEYS = 10_000
+
 
 class RateLimitMiddleware:
-    """IP-based + org-based sliding-window rate limiter backed by Redis.
+    """IP-based + org-based GCRA rate limiter backed by Redis.
 
     Two layers of protection:
     1. IP-level limits — brute-force / unauthenticated request protection.
@@ -162,6 +221,11 @@ class RateLimitMiddleware:
        The org_id is extracted by peeking at the JWT payload (no verification —
        rate limiting is best-effort; actual auth happens in the route handler).
 
+    Both checks (plus the org tier lookup) run as one Lua script — a single
+    Redis round trip. Clients Redis has rejected are remembered in-process
+    until their retry time, so a client hammering past its limit is turned
+    away without touching Redis.
+
     Fails *open* if Redis is unavailable — requests are never blocked due to
     a Redis outage.  Rate-limit headers are added to all passing responses.
     """
@@ -171,6 +235,9 @@ class RateLimitMiddleware:
         self.enabled = enabled
         self._redis_url = redis_url
         self._redis: aioredis.Redis | None = None
+        self._script: Any | None = None
+        # rate-limit key -> (monotonic time until which it is rejected locally, reason, limit)
+        self._blocked: dict[str, tuple[float, str, int]] = {}
 
     def _client(self) -> aioredis.Redis:
         if self._redis is None:
@@ -182,6 +249,11 @@ class RateLimitMiddleware:
             )
         return self._redis
 
+    def _gcra(self) -> Any:
+        if self._script is None:
+            self._script = self._client().register_script(_GCRA_LUA)
+        return self._script
+
     @staticmethod
     def _extract_org_id(headers: dict[bytes, bytes]) -> str | None:
         """Peek at the JWT payload to extract org_id for rate limiting.
@@ -202,37 +274,45 @@ class RateLimitMiddleware:
         except Exception:
             return None
 
-    @staticmethod
-    async def _get_org_tier(redis: aioredis.Redis, org_id: str) -> str:
-        """Read org subscription tier from Redis cache.
-
-        Returns the tier string (e.g. "foundation") or _DEFAULT_TIER if the key
-        is absent or Redis is unavailable.  The cache is populated by the auth
-        dependency after each successful JWT verification (TTL 300 s).
-        """
-        try:
-            tier = await redis.get(f"org:tier:{org_id}")
-            return tier if tier and tier in _TIER_LIMITS else _DEFAULT_TIER
-        except Exception:
-            return _DEFAULT_TIER
-
-    @staticmethod
-    async def _sliding_window(
-        redis: aioredis.Redis,
-        key: str,
-        limit: int,
-        window: int,
-    ) -> tuple[bool, int]:
-        """Execute sliding-window counter. Returns (allowed, remaining)."""
-        now = time.time()
-        pipe = redis.pipeline()
-        pipe.zadd(key, {str(now): now})
-        pipe.zremrangebyscore(key, 0, now - window)
-        pipe.zcard(key)
-        pipe.expire(key, window + 1)
-        results = await pipe.execute()
-        count: int = results[2]
-        return count <= limit, max(0, limit - count)
+    def _locally_blocked(self, key: str) -> tuple[float, str, int] | None:
+        entry = self._blocked.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._blocked[key]
+            return None
+        return entry
+
+    def _block_locally(self, key: str, retry_ms: int, reason: str, limit: int) -> None:
+        now = time.monotonic()
+        if len(self._blocked) >= _LOCAL_BLOCK_MAX_KEYS:
+            self._blocked = {k: v for k, v in self._blocked.items() if v[0] > now}
+        if len(self._blocked) < _LOCAL_BLOCK_MAX_KEYS:
+            self._blocked[key] = (now + retry_ms / 1000, reason, limit)
+
+    async def _check(
+        self,
+        ip_key: str,
+        ip_limit: int,
+        ip_window: int,
+        org_id: str | None,
+        org_key: str,
+        is_ai_path: bool,
+    ) -> list[int]:
+        """Run the GCRA script; returns the seven-integer result described above."""
+        result = await self._gcra()(
+            keys=[ip_key, org_key, f"org:tier:{org_id}" if org_id else org_key],
+            args=[
+                ip_limit,
+                ip_window * 1000,
+                60_000,
+                1 if org_id else 0,
+                1 if is_ai_path else 0,
+                _DEFAULT_TIER,
+                *_TIER_ARGS,
+            ],
+        )
+        return [int(v) for v in result]
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] != "http" or not self.enabled:
@@ -255,66 +335,78 @@ class RateLimitMiddleware:
 
         # Strip /v1 prefix for consistent rule matching
         effective_path = path[3:] if path.startswith("/v1") else path
+        segment = (
+            effective_path.split("/")[1]
+            if "/" in effective_path[1:]
+            else effective_path.lstrip("/")
+        )
 
-        # ── IP-level check ─────────────────────────────────────────────────────
         ip_limit, ip_window = _DEFAULT_RATE
         for prefix, r_lim, r_win in _RATE_RULES:
             if effective_path.startswith(prefix):
                 ip_limit, ip_window = r_lim, r_win
                 break
 
-        ip_allowed = True
+        org_id = self._extract_org_id(raw_headers)
+        is_ai_path = any(effective_path.startswith(p) for p in _AI_PATHS)
+        ip_key = f"rl:ip:{ip}:{segment}"
+        org_key = f"rl:org:{org_id}:{segment}"
+        org_window = 60
+
+        # ── Local pre-check: clients Redis already rejected ────────────────────
+        for key in (ip_key, org_key) if org_id else (ip_key,):
+            blocked = self._locally_blocked(key)
+            if blocked is not None:
+                until, reason, limit = blocked
+                return await self._send_429(
+                    send,
+                    limit,
+                    ip_window if key == ip_key else org_window,
+                    reason=reason,
+                    retry_after=math.ceil(until - time.monotonic()),
+                )
+
+        # ── IP + org check in one round trip ───────────────────────────────────
         ip_remaining = ip_limit
+        org_limit = _TIER_LIMITS[_DEFAULT_TIER][0]  # safe default until Redis answers
+        org_remaining = org_limit
         try:
-            redis = self._client()
-            segment = (
-                effective_path.split("/")[1]
-                if "/" in effective_path[1:]
-                else effective_path.lstrip("/")
-            )
-            ip_allowed, ip_remaining = await self._sliding_window(
-                redis, f"rl:ip:{ip}:{segment}", ip_limit, ip_window
-            )
+            (
+                ip_allowed,
+                ip_remaining,
+                ip_retry_ms,
+                org_allowed,
+                org_remaining,
+                org_retry_ms,
+                script_org_limit,
+            ) = await self._check(ip_key, ip_limit, ip_window, org_id, org_key, is_ai_path)
         except Exception as exc:
-            logger.warning("rate_limit.ip_redis_error", error=str(exc))
-
-        if not ip_allowed:
-            return await self._send_429(
-                send,
-                ip_limit,
-                ip_window,
-                reason="ip_limit_exceeded",
-            )
-
-        # ── Org-level check (authenticated requests only) ──────────────────────
-        org_id = self._extract_org_id(raw_headers)
-        org_limit, org_window = _TIER_LIMITS[_DEFAULT_TIER][0], 60  # safe defaults
-        org_remaining = org_limit
-        if org_id:
-            try:
-                redis = self._client()
-                tier = await self._get_org_tier(redis, org_id)
-                general_limit, ai_limit = _TIER_LIMITS[tier]
-                is_ai_path = any(effective_path.startswith(p) for p in _AI_PATHS)
-                org_limit = ai_limit if is_ai_path else general_limit
-                org_window = 60
-                org_remaining = org_limit
-                org_allowed, org_remaining = await self._sliding_window(
-                    redis, f"rl:org:{org_id}:{segment}", org_limit, org_window
+            logger.warning("rate_limit.redis_error", error=str(exc))
+        else:
+            if script_org_limit:
+                org_limit = script_org_limit
+            if not ip_allowed:
+                self._block_locally(ip_key, ip_retry_ms, "ip_limit_exceeded", ip_limit)
+                return await self._send_429(
+                    send,
+                    ip_limit,
+                    ip_window,
+                    reason="ip_limit_exceeded",
+                    retry_after=math.ceil(ip_retry_ms / 1000),
+                )
+            if not org_allowed:
+                self._block_locally(org_key, org_retry_ms, "org_limit_exceeded", org_limit)
+                return await self._send_429(
+                    send,
+                    org_limit,
+                    org_window,
+                    reason="org_limit_exceeded",
+                    retry_after=math.ceil(org_retry_ms / 1000),
+                    extra_headers=[
+                        (b"x-ratelimit-org-limit", str(org_limit).encode()),
+                        (b"x-ratelimit-org-remaining", b"0"),
+                    ],
                 )
-                if not org_allowed:
-                    return await self._send_429(
-                        send,
-                        org_limit,
-                        org_window,
-                        reason="org_limit_exceeded",
-                        extra_headers=[
-                            (b"x-ratelimit-org-limit", str(org_limit).encode()),
-                            (b"x-ratelimit-org-remaining", b"0"),
-                        ],
-                    )
-            except Exception as exc:
-                logger.warning("rate_limit.org_redis_error", error=str(exc))
 
         # ── Pass-through — annotate response headers ────────────────────────────
         async def _send_with_rl_headers(message: dict) -> None:
@@ -337,6 +429,7 @@ class RateLimitMiddleware:
         window: int,
         reason: str = "rate_limit_exceeded",
         extra_headers: list[tuple[bytes, bytes]] | None = None,
+        retry_after: int | None = None,
     ) -> None:
         body = json.dumps(
             {"detail": "Too many requests. Please slow down.", "reason": reason}
@@ -344,7 +437,7 @@ class RateLimitMiddleware:
         headers: list[tuple[bytes, bytes]] = [
             (b"content-type", b"application/json"),
             (b"content-length", str(len(body)).encode()),
-            (b"retry-after", str(window).encode()),
+            (b"retry-after", str(max(1, retry_after) if retry_after is not None else window).encode()),
             (b"x-ratelimit-limit", str(limit).encode()),
             (b"x-ratelimit-remaining", b"0"),
             (b"x-ratelimit-window", str(window).encode()),
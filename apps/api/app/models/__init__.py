@@ -221,7 +221,7 @@ from app.models.matching import MatchMessage, MatchResult
 from app.models.meeting_prep import MeetingBriefing
 
 # Metrics & Benchmarks
-from app.models.metrics import BenchmarkAggregate, MetricSnapshot
+from app.models.metrics import BenchmarkAggregate, MetricLatest, MetricSnapshot
 
 # Covenant & KPI Monitoring
 from app.models.monitoring import Covenant, KPIActual, KPITarget
@@ -385,6 +385,7 @@ __all__ = [
     # Meeting Prep
     "MeetingBriefing",
     # Metrics & Benchmarks
+    "MetricLatest",
     "MetricSnapshot",
     "ModelMixin",
     "MonitoringAlert",
@@ -3,7 +3,7 @@
 import uuid
 from typing import Any
 
-from sqlalchemy import ForeignKey, Index, Integer, Text
+from sqlalchemy import ForeignKey, Index, Integer, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -20,6 +20,13 @@ class MatchResult(BaseModel):
         Index("ix_match_results_status", "status"),
         Index("ix_match_results_investor_status", "investor_org_id", "status"),
         Index("ix_match_results_ally_status", "ally_org_id", "status"),
+        Index(
+            "uq_match_results_project_investor",
+            "project_id",
+            "investor_org_id",
+            unique=True,
+            postgresql_where=text("is_deleted = false"),
+        ),
     )
 
     investor_org_id: Mapped[uuid.UUID] = mapped_column(
@@ -45,6 +45,37 @@ class MetricSnapshot(Base, ModelMixin):
     )
 
 
+class MetricLatest(Base, ModelMixin):
+    """Current value per (entity, metric) — a projection of the newest
+    MetricSnapshot, maintained by MetricSnapshotService.record_snapshot.
+    Serves 'latest value' lookups and percentile ranks without scanning history."""
+
+    __tablename__ = "metric_latest"
+    __table_args__ = (
+        UniqueConstraint(
+            "entity_type", "entity_id", "metric_name", name="uq_metric_latest_entity_metric"
+        ),
+        Index("ix_metric_latest_rank", "entity_type", "metric_name", "value"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=func.gen_random_uuid(),
+    )
+    org_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    entity_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    metric_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    value: Mapped[float] = mapped_column(Float, nullable=False)
+    metadata_: Mapped[dict[str, Any] | None] = mapped_column("metadata", JSONB, default={})
+    snapshot_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    recorded_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
 class BenchmarkAggregate(Base, ModelMixin):
     """Pre-computed benchmark statistics. Refreshed nightly.
     Enables: 'Your solar project in Spain is in the top quartile for IRR.'"""
@@ -525,13 +525,10 @@ async def get_system_health(db: AsyncSession) -> SystemHealthResponse:
 
     # AI Gateway (try HTTP ping)
     try:
-        import httpx
-
-        from app.core.config import settings
+        from app.services.gateway_client import gateway_client
 
         t0 = time.monotonic()
-        async with httpx.AsyncClient(timeout=2.0) as client:
-            resp = await client.get(f"{settings.AI_GATEWAY_URL}/health")
+        resp = await gateway_client().get("/health", timeout=2.0, breaker=False)
         latency = (time.monotonic() - t0) * 1000
         status = "ok" if resp.status_code == 200 else "degraded"
         services.append(
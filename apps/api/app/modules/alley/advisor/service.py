@@ -5,12 +5,10 @@ from __future__ import annotations
 import uuid
 from datetime import UTC, datetime
 
-import httpx
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.middleware.tenant import tenant_filter
 from app.models.projects import Project, SignalScore
 from app.modules.alley.advisor.schemas import (
@@ -20,6 +18,7 @@ from app.modules.alley.advisor.schemas import (
     MilestonePlanResponse,
     RegulatoryGuidanceResponse,
 )
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -70,17 +69,16 @@ def _project_context(project: Project, score: SignalScore | None) -> str:
 
 async def _call_ai(prompt: str, task_type: str, max_tokens: int = 1500) -> str:
     try:
-        async with httpx.AsyncClient(timeout=90.0) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                json={
-                    "prompt": prompt,
-                    "task_type": task_type,
-                    "max_tokens": max_tokens,
-                    "temperature": 0.4,
-                },
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-            )
+        resp = await gateway_client().post(
+            "/v1/completions",
+            json={
+                "prompt": prompt,
+                "task_type": task_type,
+                "max_tokens": max_tokens,
+                "temperature": 0.4,
+            },
+            timeout=90.0,
+        )
         resp.raise_for_status()
         return resp.json().get("content", "")
     except Exception as exc:
@@ -5,12 +5,10 @@ from __future__ import annotations
 import uuid
 from datetime import UTC, datetime
 
-import httpx
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.middleware.tenant import tenant_filter
 from app.models.projects import Project, SignalScore
 from app.modules.alley.score_performance.schemas import (
@@ -22,6 +20,7 @@ from app.modules.alley.score_performance.schemas import (
     ScoreJourneyPoint,
     ScoreJourneyResponse,
 )
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -158,17 +157,15 @@ async def get_score_insights(
 
     insights: list[ScoreInsightItem] = []
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                json={
-                    "prompt": prompt,
-                    "task_type": "alley_score_insights",
-                    "max_tokens": 800,
-                    "temperature": 0.3,
-                },
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-            )
+        resp = await gateway_client().post(
+            "/v1/completions",
+            json={
+                "prompt": prompt,
+                "task_type": "alley_score_insights",
+                "max_tokens": 800,
+                "temperature": 0.3,
+            },
+        )
         resp.raise_for_status()
         import json
         import re
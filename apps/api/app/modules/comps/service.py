@@ -10,15 +10,14 @@ import uuid
 from datetime import date
 from typing import Any
 
-import httpx
 import structlog
 from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.models.comps import ComparableTransaction
 from app.models.projects import Project
 from app.modules.comps.schemas import CompCreate, CompUpdate
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -264,34 +263,33 @@ async def find_similar_comps(
 
     ranked_comps: list[dict[str, Any]] = []
     try:
-        async with httpx.AsyncClient(timeout=_AI_TIMEOUT) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                json={
-                    "messages": [{"role": "user", "content": prompt}],
-                    "task_type": "rank_comparable_transactions",
-                    "max_tokens": 2000,
-                    "temperature": 0.2,
-                    "org_id": str(org_id),
-                    "user_id": "system",
-                },
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            content = data.get("content", "")
+        resp = await gateway_client().post(
+            "/v1/completions",
+            json={
+                "messages": [{"role": "user", "content": prompt}],
+                "task_type": "rank_comparable_transactions",
+                "max_tokens": 2000,
+                "temperature": 0.2,
+                "org_id": str(org_id),
+                "user_id": "system",
+            },
+            timeout=_AI_TIMEOUT,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        content = data.get("content", "")
 
-            # Parse ranked_comps from AI response
-            try:
-                parsed = json.loads(content)
+        # Parse ranked_comps from AI response
+        try:
+            parsed = json.loads(content)
+            ranked_comps = parsed.get("ranked_comps", [])
+        except json.JSONDecodeError:
+            import re
+
+            match = re.search(r"\{[\s\S]*\}", content)
+            if match:
+                parsed = json.loads(match.group())
                 ranked_comps = parsed.get("ranked_comps", [])
-            except json.JSONDecodeError:
-                import re
-
-                match = re.search(r"\{[\s\S]*\}", content)
-                if match:
-                    parsed = json.loads(match.group())
-                    ranked_comps = parsed.get("ranked_comps", [])
 
     except Exception as exc:
         logger.warning(
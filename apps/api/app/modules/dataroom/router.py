@@ -47,6 +47,7 @@ from app.modules.dataroom.schemas import (
 )
 from app.schemas.auth import CurrentUser
 from app.services.ai_budget import enforce_ai_budget as _enforce_ai_budget
+from app.services.gateway_client import gateway_client
 
 
 class BulkAnalyzeRequest(BaseModel):
@@ -632,8 +633,6 @@ async def bulk_analyze(
     _budget: None = Depends(_enforce_ai_budget),
 ):
     """Run batched AI analysis on multiple documents using the Task Batcher."""
-    import httpx
-
     from app.core.config import settings
 
     document_ids: list[str] = body.document_ids
@@ -670,18 +669,17 @@ async def bulk_analyze(
         }
 
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions/batch",
-                json={
-                    "task_type": task_type,
-                    "contexts": contexts,
-                    "org_id": str(current_user.org_id),
-                },
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await gateway_client().post(
+            "/v1/completions/batch",
+            json={
+                "task_type": task_type,
+                "contexts": contexts,
+                "org_id": str(current_user.org_id),
+            },
+            timeout=120.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
     except Exception as exc:
         raise HTTPException(status_code=502, detail=f"Batch analysis failed: {exc}") from exc
 
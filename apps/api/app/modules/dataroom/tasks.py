@@ -1,9 +1,14 @@
 """Celery tasks for async document processing, AI extraction, and cleanup."""
 
+import functools
 import hashlib
+import io
+import tempfile
 import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
-from typing import Any, cast
+from typing import IO, Any, cast
 
 import structlog
 from sqlalchemy import select
@@ -13,6 +18,47 @@ from app.core.config import settings
 
 logger = structlog.get_logger()
 
+# Objects up to this size stay in memory while processing; larger ones spill to disk
+SPOOL_MAX_MEMORY_BYTES = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+# Plain-text formats are read into the extracted text up to this many bytes
+MAX_TEXT_READ_BYTES = 50 * 1024 * 1024
+
+
+@functools.cache
+def _s3_client():
+    """Process-wide S3 client, built on first use in each worker (boto3 clients are thread-safe)."""
+    import boto3
+    from botocore.config import Config as BotoConfig
+
+    return boto3.client(
+        "s3",
+        endpoint_url=settings.AWS_S3_ENDPOINT_URL or None,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_S3_REGION,
+        config=BotoConfig(signature_version="s3v4", max_pool_connections=20),
+    )
+
+
+@contextmanager
+def _download(doc) -> Iterator[tuple[IO[bytes], str]]:
+    """Stream the S3 object once into a spooled temp file, hashing it on the way.
+
+    Yields ``(file, sha256_hex)`` with the file rewound; it is removed on exit.
+    """
+    response = _s3_client().get_object(Bucket=doc.s3_bucket, Key=doc.s3_key)
+    sha256 = hashlib.sha256()
+    size = 0
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_BYTES) as fh:
+        for chunk in response["Body"].iter_chunks(chunk_size=DOWNLOAD_CHUNK_BYTES):
+            sha256.update(chunk)
+            fh.write(chunk)
+            size += len(chunk)
+        fh.seek(0)
+        logger.debug("document_downloaded", document_id=str(doc.id), bytes=size)
+        yield cast(IO[bytes], fh), sha256.hexdigest()
+
 
 # ── Document Processing Pipeline ────────────────────────────────────────────
 
@@ -30,17 +76,17 @@ def process_document(self, document_id: str) -> dict:
       4. Extract KPIs, key clauses, deadlines
       5. Generate summary
       6. Update document status to READY
-    """
-    from sqlalchemy import create_engine
-    from sqlalchemy.orm import Session as SyncSession
 
+    The S3 object is read exactly once: streamed to a spooled temp file while
+    its SHA-256 is computed, then extracted from that file.
+    """
+    from app.core.celery_db import get_celery_db_session
     from app.models.dataroom import Document, DocumentExtraction
     from app.models.enums import DocumentStatus, ExtractionType
 
-    engine = create_engine(settings.DATABASE_URL_SYNC)
     doc_uuid = uuid.UUID(document_id)
 
-    with SyncSession(engine) as session:
+    with get_celery_db_session() as session:
         doc = session.get(Document, doc_uuid)
         if not doc:
             logger.error("process_document_not_found", document_id=document_id)
@@ -55,11 +101,13 @@ def process_document(self, document_id: str) -> dict:
             return {"status": "skipped", "detail": f"Document in {doc.status.value} state"}
 
         try:
-            # Step 1: Validate checksum
-            _validate_checksum(doc)
-
-            # Step 2: Extract text
-            text_content = _extract_text(doc)
+            # Steps 1–2: single streamed download → validate checksum → extract text
+            with _download(doc) as (fh, actual_hash):
+                _validate_checksum(doc, actual_hash)
+                if doc.file_type == "pdf":
+                    text_content, page_offsets = _extract_pdf_pages(fh)
+                else:
+                    text_content, page_offsets = _extract_text(doc, fh), []
 
             # Step 3: Classify document (skip if pre-classified by bulk upload)
             if doc.classification is not None:
@@ -103,7 +151,7 @@ def process_document(self, document_id: str) -> dict:
             )
 
             # Step 6: Index in vector store for RAG search
-            _index_in_vector_store(doc, text_content, classification)
+            _index_in_vector_store(doc, text_content, classification, pages=page_offsets)
 
             # Step 7: Mark as ready
             doc.status = DocumentStatus.READY
@@ -119,8 +167,8 @@ def process_document(self, document_id: str) -> dict:
 
         except Exception as exc:
             session.rollback()
-            # Reopen session to update status
-            with SyncSession(engine) as err_session:
+            # Separate session to record the failure
+            with get_celery_db_session() as err_session:
                 err_doc = err_session.get(Document, doc_uuid)
                 if err_doc:
                     err_doc.status = DocumentStatus.ERROR
@@ -128,7 +176,6 @@ def process_document(self, document_id: str) -> dict:
                         **(err_doc.metadata_ or {}),
                         "processing_error": str(exc),
                     }
-                    err_session.commit()
 
             logger.error(
                 "document_processing_failed",
@@ -138,101 +185,76 @@ def process_document(self, document_id: str) -> dict:
             raise self.retry(exc=exc) from exc
 
 
-def _validate_checksum(doc) -> None:
-    """Verify file integrity by checking S3 object against stored checksum."""
-    import boto3
-    from botocore.config import Config as BotoConfig
-
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=settings.AWS_S3_ENDPOINT_URL or None,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_S3_REGION,
-        config=BotoConfig(signature_version="s3v4"),
-    )
-
-    response = s3.get_object(Bucket=doc.s3_bucket, Key=doc.s3_key)
-    sha256 = hashlib.sha256()
-    for chunk in response["Body"].iter_chunks(chunk_size=65536):
-        sha256.update(chunk)
-    actual_hash = sha256.hexdigest()
+def _validate_checksum(doc, actual_hash: str) -> None:
+    """Verify file integrity: the streamed object's hash must match the stored checksum."""
     if actual_hash != doc.checksum_sha256:
         raise ValueError(f"Checksum mismatch: expected {doc.checksum_sha256}, got {actual_hash}")
 
 
-def _extract_text(doc) -> str:
-    """Extract text content from document based on file type."""
-    import boto3
-    from botocore.config import Config as BotoConfig
-
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=settings.AWS_S3_ENDPOINT_URL or None,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_S3_REGION,
-        config=BotoConfig(signature_version="s3v4"),
-    )
-
-    _max_extract_bytes = 50 * 1024 * 1024  # 50 MB cap to avoid OOM
-    response = s3.get_object(Bucket=doc.s3_bucket, Key=doc.s3_key)
-    body = response["Body"].read(_max_extract_bytes)
-    if len(body) >= _max_extract_bytes:
-        logger.warning(
-            "document_truncated_for_extraction",
-            document_id=str(doc.id),
-            limit_mb=50,
-        )
-
+def _extract_text(doc, fh: IO[bytes]) -> str:
+    """Extract text content from the downloaded file based on file type."""
     if doc.file_type == "pdf":
-        return _extract_pdf_text(body)
+        return _extract_pdf_text(fh)
     elif doc.file_type == "csv":
+        body = fh.read(MAX_TEXT_READ_BYTES)
+        if fh.read(1):
+            logger.warning(
+                "document_truncated_for_extraction",
+                document_id=str(doc.id),
+                limit_mb=MAX_TEXT_READ_BYTES // (1024 * 1024),
+            )
         return body.decode("utf-8", errors="replace")
     elif doc.file_type in ("jpg", "png"):
         # OCR placeholder — would queue to an OCR service
         logger.info("ocr_placeholder", document_id=str(doc.id), file_type=doc.file_type)
         return f"[Image file: {doc.name} — OCR processing not yet available]"
     elif doc.file_type == "docx":
-        return _extract_docx_text(body)
+        return _extract_docx_text(fh)
     elif doc.file_type == "xlsx":
-        return _extract_xlsx_text(body)
+        return _extract_xlsx_text(fh)
     elif doc.file_type == "pptx":
-        return _extract_pptx_text(body)
+        return _extract_pptx_text(fh)
     else:
         return ""
 
 
-def _extract_pdf_text(pdf_bytes: bytes) -> str:
-    """Extract text from PDF using PyPDF2."""
-    try:
-        import io
+def _extract_pdf_text(fh: IO[bytes] | bytes) -> str:
+    """Extract text from a PDF (pages joined by newlines)."""
+    return _extract_pdf_pages(fh)[0]
 
-        from PyPDF2 import PdfReader
 
-        reader = PdfReader(io.BytesIO(pdf_bytes))
-        text_parts = []
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                text_parts.append(text)
-        return "\n".join(text_parts)
+def _extract_pdf_pages(fh: IO[bytes] | bytes) -> tuple[str, list[dict[str, int]]]:
+    """Extract text from a PDF page by page (page ranges in parallel for large files).
+
+    Returns the text and, for each non-empty page, ``{"page": n, "offset": i}``
+    where ``i`` is the character offset at which that page starts in the text.
+    """
+    from app.services.pdf_extraction import iter_pdf_pages
+
+    text_parts: list[str] = []
+    pages: list[dict[str, int]] = []
+    offset = 0
+    try:
+        for page in iter_pdf_pages(_as_file(fh)):
+            if page.text:
+                pages.append({"page": page.page, "offset": offset})
+                text_parts.append(page.text)
+                offset += len(page.text) + 1  # "\n" separator
+        return "\n".join(text_parts), pages
     except ImportError:
-        logger.warning("pypdf2_not_installed")
-        return "[PDF text extraction unavailable — PyPDF2 not installed]"
+        logger.warning("pypdf_not_installed")
+        return "[PDF text extraction unavailable — pypdf not installed]", []
     except Exception as e:
         logger.warning("pdf_extraction_failed", error=str(e))
-        return f"[PDF extraction failed: {e}]"
+        return f"[PDF extraction failed: {e}]", []
 
 
-def _extract_docx_text(docx_bytes: bytes) -> str:
+def _extract_docx_text(fh: IO[bytes] | bytes) -> str:
     """Extract text from DOCX using python-docx."""
     try:
-        import io
-
         from docx import Document as DocxDocument
 
-        doc = DocxDocument(io.BytesIO(docx_bytes))
+        doc = DocxDocument(_as_file(fh))
         parts = [p.text for p in doc.paragraphs if p.text.strip()]
         for table in doc.tables:
             for row in table.rows:
@@ -245,35 +267,34 @@ def _extract_docx_text(docx_bytes: bytes) -> str:
         return f"[DOCX extraction failed: {e}]"
 
 
-def _extract_xlsx_text(xlsx_bytes: bytes) -> str:
-    """Extract text from XLSX using openpyxl."""
+def _extract_xlsx_text(fh: IO[bytes] | bytes) -> str:
+    """Extract text from XLSX using openpyxl (read-only mode streams rows)."""
     try:
-        import io
-
         import openpyxl
 
-        wb = openpyxl.load_workbook(io.BytesIO(xlsx_bytes), data_only=True)
+        wb = openpyxl.load_workbook(_as_file(fh), data_only=True, read_only=True)
         parts = []
-        for sheet in wb.worksheets:
-            parts.append(f"Sheet: {sheet.title}")
-            for row in sheet.iter_rows(values_only=True):
-                row_vals = [str(v) for v in row if v is not None and str(v).strip()]
-                if row_vals:
-                    parts.append("\t".join(row_vals))
+        try:
+            for sheet in wb.worksheets:
+                parts.append(f"Sheet: {sheet.title}")
+                for row in sheet.iter_rows(values_only=True):
+                    row_vals = [str(v) for v in row if v is not None and str(v).strip()]
+                    if row_vals:
+                        parts.append("\t".join(row_vals))
+        finally:
+            wb.close()
         return "\n".join(parts)
     except Exception as e:
         logger.warning("xlsx_extraction_failed", error=str(e))
         return f"[XLSX extraction failed: {e}]"
 
 
-def _extract_pptx_text(pptx_bytes: bytes) -> str:
+def _extract_pptx_text(fh: IO[bytes] | bytes) -> str:
     """Extract text from PPTX using python-pptx."""
     try:
-        import io
-
         from pptx import Presentation
 
-        prs = Presentation(io.BytesIO(pptx_bytes))
+        prs = Presentation(_as_file(fh))
         parts = []
         for slide_num, slide in enumerate(prs.slides, 1):
             parts.append(f"Slide {slide_num}:")
@@ -289,6 +310,10 @@ def _extract_pptx_text(pptx_bytes: bytes) -> str:
         return f"[PPTX extraction failed: {e}]"
 
 
+def _as_file(data: IO[bytes] | bytes) -> IO[bytes]:
+    return io.BytesIO(data) if isinstance(data, bytes | bytearray) else data
+
+
 def _classify_document(doc, text_content: str) -> str:
     """Classify document type via AI Gateway batch endpoint, falling back to rule-based."""
     import httpx
@@ -457,9 +482,8 @@ def _extract_structured_data(session, doc, text_content: str, classification: st
 def process_bulk_upload(document_ids: list[str]) -> dict:
     """Batch-classify documents in one AI call, then queue individual processing tasks."""
     import httpx
-    from sqlalchemy import create_engine
-    from sqlalchemy.orm import Session as SyncSession
 
+    from app.core.celery_db import get_celery_db_session
     from app.models.dataroom import Document
     from app.models.enums import DocumentClassification
 
@@ -467,11 +491,10 @@ def process_bulk_upload(document_ids: list[str]) -> dict:
         return {"queued": 0, "tasks": [], "pre_classified": 0}
 
     pre_classified = 0
-    engine = create_engine(settings.DATABASE_URL_SYNC)
 
     # Batch pre-classify by filename so process_document can skip the per-doc AI call
     try:
-        with SyncSession(engine) as session:
+        with get_celery_db_session() as session:
             docs = [session.get(Document, uuid.UUID(doc_id)) for doc_id in document_ids]
             docs = [d for d in docs if d]
             if docs:
@@ -516,28 +539,15 @@ def cleanup_orphaned_uploads() -> dict:
     These are records where the client requested a pre-signed URL but never
     confirmed the upload. Marks them as deleted and removes S3 objects.
     """
-    import boto3
-    from botocore.config import Config as BotoConfig
-    from sqlalchemy import create_engine
-    from sqlalchemy.orm import Session as SyncSession
-
+    from app.core.celery_db import get_celery_db_session
     from app.models.dataroom import Document
     from app.models.enums import DocumentStatus
 
-    engine = create_engine(settings.DATABASE_URL_SYNC)
     cutoff = datetime.now(UTC) - timedelta(hours=24)
-
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=settings.AWS_S3_ENDPOINT_URL or None,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_S3_REGION,
-        config=BotoConfig(signature_version="s3v4"),
-    )
+    s3 = _s3_client()
 
     cleaned = 0
-    with SyncSession(engine) as session:
+    with get_celery_db_session() as session:
         stmt = select(Document).where(
             Document.status == DocumentStatus.UPLOADING,
             Document.is_deleted.is_(False),
@@ -572,20 +582,17 @@ def trigger_extraction(self, document_id: str, extraction_types: list[str] | Non
     In production, this would call the AI Gateway for each extraction type.
     For now, re-runs the rule-based pipeline.
     """
-    from sqlalchemy import create_engine
-    from sqlalchemy.orm import Session as SyncSession
-
+    from app.core.celery_db import get_celery_db_session
     from app.models.dataroom import Document, DocumentExtraction
     from app.models.enums import DocumentStatus, ExtractionType
 
-    engine = create_engine(settings.DATABASE_URL_SYNC)
     doc_uuid = uuid.UUID(document_id)
 
     types_to_run = (
         [ExtractionType(t) for t in extraction_types] if extraction_types else list(ExtractionType)
     )
 
-    with SyncSession(engine) as session:
+    with get_celery_db_session() as session:
         doc = session.get(Document, doc_uuid)
         if not doc:
             return {"status": "error", "detail": "Document not found"}
@@ -594,7 +601,8 @@ def trigger_extraction(self, document_id: str, extraction_types: list[str] | Non
             return {"status": "error", "detail": f"Document in {doc.status.value} state"}
 
         try:
-            text_content = _extract_text(doc)
+            with _download(doc) as (fh, _):
+                text_content = _extract_text(doc, fh)
 
             for ext_type in types_to_run:
                 if ext_type == ExtractionType.CLASSIFICATION:
@@ -693,9 +701,14 @@ def trigger_extraction(self, document_id: str, extraction_types: list[str] | Non
 # ── Vector Store Indexing ────────────────────────────────────────────────────
 
 
-def _index_in_vector_store(doc, text_content: str, classification: str) -> None:
+def _index_in_vector_store(
+    doc, text_content: str, classification: str, pages: list[dict[str, int]] | None = None
+) -> None:
     """Send document text to AI Gateway for vector indexing (RAG support).
 
+    ``pages`` (PDF page start offsets) lets the gateway tag each chunk with the
+    page(s) it came from.
+
     This call is non-blocking — a failure here does NOT fail document processing.
     Documents without extracted text are silently skipped.
     """
@@ -710,9 +723,10 @@ def _index_in_vector_store(doc, text_content: str, classification: str) -> None:
         )
         return
 
-    payload = {
+    max_chars = 50_000  # Truncate to avoid gateway limits
+    payload: dict[str, Any] = {
         "document_id": str(doc.id),
-        "text": text_content[:50_000],  # Truncate to avoid gateway limits
+        "text": text_content[:max_chars],
         "org_id": str(doc.org_id),
         "index_type": "document_chunks",
         "metadata": {
@@ -723,6 +737,8 @@ def _index_in_vector_store(doc, text_content: str, classification: str) -> None:
             "s3_key": doc.s3_key,
         },
     }
+    if pages:
+        payload["pages"] = [p for p in pages if p["offset"] < max_chars]
 
     try:
         with httpx.Client(timeout=30) as client:
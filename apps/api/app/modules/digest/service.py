@@ -6,13 +6,12 @@ import uuid
 from datetime import date, datetime
 from typing import Any
 
-import httpx
 import structlog
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.models.ai import AITaskLog
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -101,18 +100,16 @@ async def generate_digest_summary(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                json={
-                    "task_type": "generate_digest_summary",
-                    "prompt": json.dumps(prompt_data),
-                    "org_id": "system",
-                },
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-            )
-            if resp.status_code == 200:
-                return resp.json().get("content", _fallback_summary(activity_data))
+        resp = await gateway_client().post(
+            "/v1/completions",
+            json={
+                "task_type": "generate_digest_summary",
+                "prompt": json.dumps(prompt_data),
+                "org_id": "system",
+            },
+        )
+        if resp.status_code == 200:
+            return resp.json().get("content", _fallback_summary(activity_data))
     except Exception as e:
         logger.warning("digest_summary_generation_failed", error=str(e))
 
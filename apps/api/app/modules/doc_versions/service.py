@@ -6,13 +6,12 @@ import uuid
 from difflib import SequenceMatcher, unified_diff
 from typing import Any
 
-import httpx
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.models.doc_versions import DocumentVersion
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -57,14 +56,13 @@ async def ai_summarize_changes(
         "doc_type": doc_classification or "unknown",
     }
     try:
-        async with httpx.AsyncClient(timeout=_AI_TIMEOUT) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                json={"task_type": "summarize_doc_changes", "context": context},
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await gateway_client().post(
+            "/v1/completions",
+            json={"task_type": "summarize_doc_changes", "context": context},
+            timeout=_AI_TIMEOUT,
+        )
+        resp.raise_for_status()
+        data = resp.json()
         return data.get("validated_data") or {}
     except Exception as exc:
         logger.warning("doc_version.ai_summary_failed", error=str(exc))
@@ -8,7 +8,6 @@ import uuid
 from collections import defaultdict
 from typing import Any
 
-import httpx
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -23,6 +22,7 @@ from app.modules.esg.schemas import (
     SFDRDistribution,
     TopSDG,
 )
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -307,37 +307,32 @@ async def generate_esg_narrative(metrics: dict) -> str:
     prompt = _build_narrative_prompt(metrics)
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                json={
-                    "messages": [{"role": "user", "content": prompt}],
-                    "task_type": "generate_esg_narrative",
-                    "temperature": 0.5,
-                    "max_tokens": 1024,
-                    "org_id": str(metrics.get("org_id", "system")),
-                    "user_id": "system",
-                },
-                headers={
-                    "Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data.get("content", "")
-
-            # Try validated_data first, then parse raw content
-            validated = data.get("validated_data")
-            if validated and isinstance(validated, dict) and validated.get("narrative"):
-                return str(validated["narrative"])
-
-            # Fallback: parse JSON from content
-            try:
-                parsed = json.loads(content)
-                return str(parsed.get("narrative", content))
-            except (json.JSONDecodeError, AttributeError):
-                return content
+        response = await gateway_client().post(
+            "/v1/completions",
+            json={
+                "messages": [{"role": "user", "content": prompt}],
+                "task_type": "generate_esg_narrative",
+                "temperature": 0.5,
+                "max_tokens": 1024,
+                "org_id": str(metrics.get("org_id", "system")),
+                "user_id": "system",
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        content = data.get("content", "")
+
+        # Try validated_data first, then parse raw content
+        validated = data.get("validated_data")
+        if validated and isinstance(validated, dict) and validated.get("narrative"):
+            return str(validated["narrative"])
+
+        # Fallback: parse JSON from content
+        try:
+            parsed = json.loads(content)
+            return str(parsed.get("narrative", content))
+        except (json.JSONDecodeError, AttributeError):
+            return content
 
     except Exception as exc:
         logger.warning("esg_narrative_ai_call_failed", error=str(exc))
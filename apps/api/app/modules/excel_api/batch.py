@@ -0,0 +1,343 @@
+"""Set-based evaluation for ``POST /excel/batch``.
+
+A workbook recalculation sends every ``=SCR.*`` cell in one request. Cells are
+de-duplicated, grouped by function, and each group is resolved with one
+query per table (latest rows via window functions / ``DISTINCT ON``) rather
+than one request — and one API-key check — per cell. Results come back in
+request order; a cell that cannot be evaluated carries an ``error`` instead
+of failing the batch.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from typing import Any, Literal
+
+from fastapi import HTTPException
+from pydantic import BaseModel, Field
+from sqlalchemy import func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.excel_api import cells
+
+MAX_BATCH_CELLS = 5_000
+
+CellFunction = Literal["signal_score", "valuation", "benchmark", "fx", "kpi", "portfolio", "comp"]
+
+# Arguments each function needs (mirrors the GET endpoints' path params)
+_REQUIRED: dict[str, tuple[str, ...]] = {
+    "signal_score": ("project_id",),
+    "valuation": ("project_id", "metric"),
+    "benchmark": ("asset_class", "metric"),
+    "fx": ("base", "quote"),
+    "kpi": ("project_id", "metric"),
+    "portfolio": ("portfolio_id", "metric"),
+    "comp": ("asset_class", "metric"),
+}
+
+
+class CellRef(BaseModel):
+    """One ``=SCR.*`` formula; ``metric`` doubles as the KPI name for ``kpi``."""
+
+    fn: CellFunction
+    project_id: uuid.UUID | None = None
+    portfolio_id: uuid.UUID | None = None
+    metric: str | None = None
+    dimension: str | None = None
+    period: str | None = None
+    asset_class: str | None = None
+    geography: str | None = None
+    percentile: str = "p50"
+    base: str | None = None
+    quote: str | None = None
+
+
+class BatchRequest(BaseModel):
+    cells: list[CellRef] = Field(..., min_length=1, max_length=MAX_BATCH_CELLS)
+
+
+def _error(detail: Any) -> dict[str, Any]:
+    return {"value": None, "label": "", "as_of": None, "error": str(detail)}
+
+
+def _evaluate(build: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+    try:
+        return build()
+    except HTTPException as exc:
+        return _error(exc.detail)
+
+
+class BatchEvaluator:
+    """Resolves a batch of cells for one org with one query per table."""
+
+    def __init__(self, db: AsyncSession, org_id: uuid.UUID) -> None:
+        self.db = db
+        self.org_id = org_id
+        self._projects: dict[uuid.UUID, Any] = {}
+        self._looked_up: set[uuid.UUID | None] = set()
+        self._resolvers: dict[str, Callable[[list[CellRef]], Awaitable[list[dict[str, Any]]]]] = {
+            "signal_score": self._signal_scores,
+            "valuation": self._valuations,
+            "benchmark": self._benchmarks,
+            "fx": self._fx_rates,
+            "kpi": self._kpis,
+            "portfolio": self._portfolios,
+            "comp": self._comps,
+        }
+
+    async def evaluate(self, refs: list[CellRef]) -> tuple[list[dict[str, Any]], dict[str, float]]:
+        """Return (results in request order, per-group timings in ms)."""
+        unique: dict[str, CellRef] = {}
+        keys: list[str] = []
+        for ref in refs:
+            key = ref.model_dump_json()
+            unique.setdefault(key, ref)
+            keys.append(key)
+
+        values: dict[str, dict[str, Any]] = {}
+        groups: dict[str, list[tuple[str, CellRef]]] = defaultdict(list)
+        for key, ref in unique.items():
+            missing = [arg for arg in _REQUIRED[ref.fn] if getattr(ref, arg) is None]
+            if missing:
+                values[key] = _error(f"Missing argument(s) for {ref.fn}: {', '.join(missing)}")
+            else:
+                groups[ref.fn].append((key, ref))
+
+        timings: dict[str, float] = {}
+        for fn, members in groups.items():
+            started = time.perf_counter()
+            results = await self._resolvers[fn]([ref for _, ref in members])
+            for (key, _), result in zip(members, results, strict=True):
+                values[key] = result
+            timings[fn] = round((time.perf_counter() - started) * 1000, 1)
+
+        return [values[key] for key in keys], timings
+
+    # ── Shared lookups ────────────────────────────────────────────────────────
+
+    async def _owned_projects(self, refs: list[CellRef]) -> dict[uuid.UUID, Any]:
+        """The org's projects among ``refs`` (loaded once per batch, then cached)."""
+        from app.models.projects import Project
+
+        wanted = {r.project_id for r in refs} - self._looked_up
+        if wanted:
+            self._looked_up |= wanted
+            rows = await self.db.execute(
+                select(Project).where(
+                    Project.id.in_(wanted),
+                    Project.org_id == self.org_id,
+                    Project.is_deleted.is_(False),
+                )
+            )
+            self._projects.update({p.id: p for p in rows.scalars().all()})
+        return self._projects
+
+    # ── Resolvers (one per cell function) ─────────────────────────────────────
+
+    async def _signal_scores(self, refs: list[CellRef]) -> list[dict[str, Any]]:
+        from app.models.projects import SignalScore
+
+        projects = await self._owned_projects(refs)
+        ids = {r.project_id for r in refs if r.project_id in projects}
+        scores: dict[uuid.UUID, Any] = {}
+        if ids:
+            ranked = (
+                select(
+                    SignalScore.id,
+                    func.row_number()
+                    .over(
+                        partition_by=SignalScore.project_id,
+                        order_by=(SignalScore.version.desc(), SignalScore.created_at.desc()),
+                    )
+                    .label("rn"),
+                )
+                .where(SignalScore.project_id.in_(ids))
+                .subquery()
+            )
+            rows = await self.db.execute(
+                select(SignalScore).join(ranked, ranked.c.id == SignalScore.id).where(ranked.c.rn == 1)
+            )
+            scores = {s.project_id: s for s in rows.scalars().all()}
+
+        return [
+            _error("Not found")
+            if r.project_id not in projects
+            else _evaluate(lambda r=r: cells.signal_score_cell(scores.get(r.project_id), r.dimension))
+            for r in refs
+        ]
+
+    async def _valuations(self, refs: list[CellRef]) -> list[dict[str, Any]]:
+        from app.models.financial import Valuation
+
+        projects = await self._owned_projects(refs)
+        ids = {r.project_id for r in refs if r.project_id in projects}
+        latest: dict[uuid.UUID, Any] = {}
+        if ids:
+            rows = await self.db.execute(
+                select(Valuation)
+                .where(
+                    Valuation.project_id.in_(ids),
+                    Valuation.org_id == self.org_id,
+                    Valuation.is_deleted.is_(False),
+                )
+                .distinct(Valuation.project_id)
+                .order_by(Valuation.project_id, Valuation.version.desc(), Valuation.created_at.desc())
+            )
+            latest = {v.project_id: v for v in rows.scalars().all()}
+
+        return [
+            _error("Project not found")
+            if r.project_id not in projects
+            else _evaluate(
+                lambda r=r: cells.valuation_cell(
+                    latest.get(r.project_id), projects[r.project_id], r.metric or ""
+                )
+            )
+            for r in refs
+        ]
+
+    async def _kpis(self, refs: list[CellRef]) -> list[dict[str, Any]]:
+        from app.models.monitoring import KPIActual
+
+        projects = await self._owned_projects(refs)
+        pairs = {(r.project_id, r.metric) for r in refs if r.project_id in projects}
+        by_pair: dict[tuple[uuid.UUID, str], list[Any]] = defaultdict(list)
+        if pairs:
+            rows = await self.db.execute(
+                select(KPIActual)
+                .where(
+                    tuple_(KPIActual.project_id, KPIActual.kpi_name).in_(pairs),
+                    KPIActual.org_id == self.org_id,
+                    KPIActual.is_deleted.is_(False),
+                )
+                .order_by(KPIActual.period.desc(), KPIActual.updated_at.desc())
+            )
+            for row in rows.scalars().all():
+                by_pair[(row.project_id, row.kpi_name)].append(row)
+
+        def latest(r: CellRef) -> Any:
+            candidates = by_pair.get((r.project_id, r.metric), [])
+            return next((k for k in candidates if not r.period or k.period == r.period), None)
+
+        return [
+            _error("Project not found")
+            if r.project_id not in projects
+            else _evaluate(lambda r=r: cells.kpi_cell(latest(r), r.metric or "", r.period))
+            for r in refs
+        ]
+
+    async def _fx_rates(self, refs: list[CellRef]) -> list[dict[str, Any]]:
+        from app.models.fx import FXRate
+
+        pairs = {((r.base or "").upper(), (r.quote or "").upper()) for r in refs}
+        rows = await self.db.execute(
+            select(FXRate)
+            .where(tuple_(FXRate.base_currency, FXRate.quote_currency).in_(pairs))
+            .distinct(FXRate.base_currency, FXRate.quote_currency)
+            .order_by(FXRate.base_currency, FXRate.quote_currency, FXRate.rate_date.desc())
+        )
+        latest = {(fx.base_currency, fx.quote_currency): fx for fx in rows.scalars().all()}
+        return [
+            _evaluate(
+                lambda r=r: cells.fx_cell(
+                    latest.get(((r.base or "").upper(), (r.quote or "").upper())),
+                    r.base or "",
+                    r.quote or "",
+                )
+            )
+            for r in refs
+        ]
+
+    async def _portfolios(self, refs: list[CellRef]) -> list[dict[str, Any]]:
+        from app.models.investors import Portfolio, PortfolioMetrics
+
+        ids = {r.portfolio_id for r in refs}
+        owned = set(
+            (
+                await self.db.execute(
+                    select(Portfolio.id).where(
+                        Portfolio.id.in_(ids),
+                        Portfolio.org_id == self.org_id,
+                        Portfolio.is_deleted.is_(False),
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        latest: dict[uuid.UUID, Any] = {}
+        if owned:
+            rows = await self.db.execute(
+                select(PortfolioMetrics)
+                .where(PortfolioMetrics.portfolio_id.in_(owned))
+                .distinct(PortfolioMetrics.portfolio_id)
+                .order_by(
+                    PortfolioMetrics.portfolio_id,
+                    PortfolioMetrics.as_of_date.desc(),
+                    PortfolioMetrics.created_at.desc(),
+                )
+            )
+            latest = {pm.portfolio_id: pm for pm in rows.scalars().all()}
+
+        return [
+            _error("Portfolio not found")
+            if r.portfolio_id not in owned
+            else _evaluate(lambda r=r: cells.portfolio_cell(latest.get(r.portfolio_id), r.metric or ""))
+            for r in refs
+        ]
+
+    async def _benchmarks(self, refs: list[CellRef]) -> list[dict[str, Any]]:
+        from app.models.metrics import BenchmarkAggregate
+
+        keys = {(r.asset_class, r.metric) for r in refs}
+        rows = await self.db.execute(
+            select(BenchmarkAggregate)
+            .where(tuple_(BenchmarkAggregate.asset_class, BenchmarkAggregate.metric_name).in_(keys))
+            .order_by(BenchmarkAggregate.computed_at.desc())
+        )
+        by_key: dict[tuple[str, str], list[Any]] = defaultdict(list)
+        for row in rows.scalars().all():
+            by_key[(row.asset_class, row.metric_name)].append(row)
+
+        def latest(r: CellRef) -> Any:
+            candidates = by_key.get((r.asset_class or "", r.metric or ""), [])
+            return next((b for b in candidates if not r.geography or b.geography == r.geography), None)
+
+        return [
+            _evaluate(
+                lambda r=r: cells.benchmark_cell(
+                    latest(r), r.asset_class or "", r.metric or "", r.percentile
+                )
+            )
+            for r in refs
+        ]
+
+    async def _comps(self, refs: list[CellRef]) -> list[dict[str, Any]]:
+        from app.models.comps import ComparableTransaction
+
+        rows = await self.db.execute(
+            select(ComparableTransaction).where(
+                ComparableTransaction.asset_type.in_({r.asset_class for r in refs}),
+                ComparableTransaction.is_deleted.is_(False),
+                or_(
+                    ComparableTransaction.org_id.is_(None),
+                    ComparableTransaction.org_id == self.org_id,
+                ),
+            )
+        )
+        comps = rows.scalars().all()
+
+        def matching(r: CellRef) -> list[Any]:
+            return [
+                c
+                for c in comps
+                if c.asset_type == r.asset_class and (not r.geography or c.geography == r.geography)
+            ]
+
+        return [
+            _evaluate(lambda r=r: cells.comp_cell(matching(r), r.asset_class or "", r.metric or ""))
+            for r in refs
+        ]
@@ -0,0 +1,230 @@
+"""Cell value builders shared by the per-cell GET endpoints and ``POST /excel/batch``.
+
+Each builder turns already-loaded rows into the flat
+``{"value": X, "label": "...", "as_of": "..."}`` shape, raising the same
+``HTTPException`` the GET endpoint returns for missing data or bad arguments
+(the batch endpoint reports those inline per cell).
+"""
+
+from __future__ import annotations
+
+import statistics
+from datetime import date
+from typing import Any
+
+from fastapi import HTTPException
+
+DIMENSION_MAP: dict[str, str] = {
+    "project_viability": "project_viability_score",
+    "financial_planning": "financial_planning_score",
+    "team_strength": "team_strength_score",
+    "risk_assessment": "risk_assessment_score",
+    "esg": "esg_score",
+    "market_opportunity": "market_opportunity_score",
+}
+
+VALUATION_DIRECT: set[str] = {
+    "enterprise_value",
+    "equity_value",
+}
+
+VALUATION_ASSUMPTIONS: set[str] = {
+    "irr",
+    "moic",
+    "npv",
+}
+
+PERCENTILE_FIELDS: dict[str, str] = {
+    "p10": "p10",
+    "p25": "p25",
+    "p50": "median",
+    "p75": "p75",
+    "p90": "p90",
+}
+
+PORTFOLIO_METRIC_MAP: dict[str, str] = {
+    "nav": "total_value",
+    "irr": "irr_net",  # prefer net IRR; fall back to gross if absent
+    "irr_gross": "irr_gross",
+    "moic": "moic",
+    "tvpi": "tvpi",
+    "dpi": "dpi",
+}
+
+COMP_FIELD_MAP: dict[str, str] = {
+    "irr": "equity_irr",
+    "project_irr": "project_irr",
+    "moic": "ebitda_multiple",  # closest available field
+    "ev_per_mw": "ev_per_mw",
+    "deal_size": "deal_size_eur",
+    "equity_value": "equity_value_eur",
+}
+
+
+def signal_score_cell(score: Any, dimension: str | None) -> dict[str, Any]:
+    if not score:
+        raise HTTPException(status_code=404, detail="No signal score found for this project")
+
+    as_of = score.calculated_at.isoformat() if score.calculated_at else None
+
+    if dimension:
+        field = DIMENSION_MAP.get(dimension.lower())
+        if not field:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown dimension '{dimension}'. Valid: {', '.join(DIMENSION_MAP)}",
+            )
+        value = getattr(score, field, None)
+        return {"value": value, "label": f"Signal Score – {dimension}", "as_of": as_of}
+
+    return {"value": score.overall_score, "label": "Signal Score", "as_of": as_of}
+
+
+def valuation_cell(valuation: Any, project: Any, metric: str) -> dict[str, Any]:
+    if not valuation:
+        raise HTTPException(status_code=404, detail="No valuation found for this project")
+
+    as_of = valuation.valued_at.isoformat() if isinstance(valuation.valued_at, date) else None
+    label = f"Valuation – {metric}"
+
+    if metric in VALUATION_DIRECT:
+        raw = getattr(valuation, metric)
+        value = float(raw) if raw is not None else None
+        return {"value": value, "label": label, "as_of": as_of}
+
+    if metric in VALUATION_ASSUMPTIONS:
+        assumptions = valuation.assumptions or {}
+        raw = assumptions.get(metric)
+        value = float(raw) if raw is not None else None
+        if value is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Metric '{metric}' not present in valuation assumptions",
+            )
+        return {"value": value, "label": label, "as_of": as_of}
+
+    if metric == "ev_per_mw":
+        if project.capacity_mw and float(project.capacity_mw) > 0:
+            value = float(valuation.enterprise_value) / float(project.capacity_mw)
+        else:
+            raise HTTPException(
+                status_code=422,
+                detail="Project capacity_mw is not set — cannot compute EV/MW",
+            )
+        return {"value": value, "label": label, "as_of": as_of}
+
+    raise HTTPException(
+        status_code=422,
+        detail=(
+            f"Unknown metric '{metric}'. "
+            "Valid: enterprise_value, equity_value, irr, moic, npv, ev_per_mw"
+        ),
+    )
+
+
+def percentile_field(percentile: str) -> str:
+    pct_field = PERCENTILE_FIELDS.get(percentile.lower())
+    if not pct_field:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown percentile '{percentile}'. Valid: p10, p25, p50, p75, p90",
+        )
+    return pct_field
+
+
+def benchmark_cell(row: Any, asset_class: str, metric: str, percentile: str) -> dict[str, Any]:
+    pct_field = percentile_field(percentile)
+    if not row:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No benchmark data for asset_class='{asset_class}' metric='{metric}'",
+        )
+
+    value = getattr(row, pct_field, None)
+    label = f"Benchmark {asset_class} {metric} {percentile}"
+    as_of = row.computed_at.isoformat() if row.computed_at else None
+
+    return {"value": value, "label": label, "as_of": as_of}
+
+
+def fx_cell(row: Any, base: str, quote: str) -> dict[str, Any]:
+    if not row:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No FX rate found for {base.upper()}/{quote.upper()}",
+        )
+
+    return {
+        "value": row.rate,
+        "label": f"{base.upper()}/{quote.upper()}",
+        "as_of": row.rate_date.isoformat() if row.rate_date else None,
+    }
+
+
+def kpi_cell(row: Any, kpi_name: str, period: str | None) -> dict[str, Any]:
+    if not row:
+        detail = f"No KPI '{kpi_name}' found for project" + (
+            f" in period '{period}'" if period else ""
+        )
+        raise HTTPException(status_code=404, detail=detail)
+
+    return {
+        "value": row.value,
+        "label": f"{kpi_name} ({row.period})",
+        "as_of": row.updated_at.isoformat() if row.updated_at else None,
+    }
+
+
+def portfolio_field(metric: str) -> str:
+    field = PORTFOLIO_METRIC_MAP.get(metric.lower())
+    if not field:
+        raise HTTPException(
+            status_code=422,
+            detail=(f"Unknown metric '{metric}'. " "Valid: nav, irr, irr_gross, moic, tvpi, dpi"),
+        )
+    return field
+
+
+def portfolio_cell(pm: Any, metric: str) -> dict[str, Any]:
+    field = portfolio_field(metric)
+    if not pm:
+        raise HTTPException(status_code=404, detail="No portfolio metrics found")
+
+    raw = getattr(pm, field, None)
+    # For IRR net, fall back to gross if net is not populated
+    if raw is None and metric.lower() == "irr":
+        raw = pm.irr_gross
+
+    value = float(raw) if raw is not None else None
+    as_of = pm.as_of_date.isoformat() if isinstance(pm.as_of_date, date) else None
+
+    return {"value": value, "label": f"Portfolio {metric.upper()}", "as_of": as_of}
+
+
+def comp_field(metric: str) -> str:
+    field = COMP_FIELD_MAP.get(metric.lower())
+    if not field:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                f"Unknown metric '{metric}'. "
+                "Valid: irr, project_irr, moic, ev_per_mw, deal_size, equity_value"
+            ),
+        )
+    return field
+
+
+def comp_cell(rows: list[Any], asset_class: str, metric: str) -> dict[str, Any]:
+    field = comp_field(metric)
+    values = [float(getattr(r, field)) for r in rows if getattr(r, field) is not None]
+
+    if not values:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No comp data for asset_class='{asset_class}' metric='{metric}'",
+        )
+
+    median_val = statistics.median(values)
+    label = f"Comp {asset_class} {metric}"
+
+    return {"value": median_val, "label": label, "as_of": None}
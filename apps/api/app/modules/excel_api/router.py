@@ -5,21 +5,42 @@ All endpoints are authenticated via the ``X-SCR-API-Key`` header (see
 dependency.  Responses are intentionally flat:
 ``{"value": X, "label": "...", "as_of": "..."}``
 so that Excel custom functions can consume them with minimal parsing.
+
+``POST /excel/batch`` evaluates a whole workbook's cells in one round trip.
 """
 
 from __future__ import annotations
 
-import statistics
+import hashlib
+import json
+import time
 import uuid
-from datetime import date
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+import structlog
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.modules.excel_api.auth import verify_api_key
+from app.modules.excel_api.batch import BatchEvaluator, BatchRequest
+from app.modules.excel_api.cells import (
+    benchmark_cell,
+    comp_cell,
+    comp_field,
+    fx_cell,
+    kpi_cell,
+    percentile_field,
+    portfolio_cell,
+    portfolio_field,
+    signal_score_cell,
+    valuation_cell,
+)
+
+logger = structlog.get_logger()
 
 router = APIRouter(prefix="/excel", tags=["Excel API"])
 
@@ -39,15 +60,6 @@ def _not_found(label: str = "") -> dict[str, Any]:
 
 # ── Signal Score ──────────────────────────────────────────────────────────────
 
-_DIMENSION_MAP: dict[str, str] = {
-    "project_viability": "project_viability_score",
-    "financial_planning": "financial_planning_score",
-    "team_strength": "team_strength_score",
-    "risk_assessment": "risk_assessment_score",
-    "esg": "esg_score",
-    "market_opportunity": "market_opportunity_score",
-}
-
 
 @router.get("/signal-score/{project_id}")
 async def excel_signal_score(
@@ -83,38 +95,11 @@ async def excel_signal_score(
         .limit(1)
     )
     score_result = await db.execute(score_stmt)
-    score = score_result.scalar_one_or_none()
-    if not score:
-        raise HTTPException(status_code=404, detail="No signal score found for this project")
-
-    as_of = score.calculated_at.isoformat() if score.calculated_at else None
-
-    if dimension:
-        field = _DIMENSION_MAP.get(dimension.lower())
-        if not field:
-            raise HTTPException(
-                status_code=422,
-                detail=f"Unknown dimension '{dimension}'. Valid: {', '.join(_DIMENSION_MAP)}",
-            )
-        value = getattr(score, field, None)
-        return {"value": value, "label": f"Signal Score – {dimension}", "as_of": as_of}
-
-    return {"value": score.overall_score, "label": "Signal Score", "as_of": as_of}
+    return signal_score_cell(score_result.scalar_one_or_none(), dimension)
 
 
 # ── Valuation ─────────────────────────────────────────────────────────────────
 
-_VALUATION_DIRECT: set[str] = {
-    "enterprise_value",
-    "equity_value",
-}
-
-_VALUATION_ASSUMPTIONS: set[str] = {
-    "irr",
-    "moic",
-    "npv",
-}
-
 
 @router.get("/valuation/{project_id}/{metric}")
 async def excel_valuation(
@@ -154,58 +139,11 @@ async def excel_valuation(
         .limit(1)
     )
     val_result = await db.execute(val_stmt)
-    valuation = val_result.scalar_one_or_none()
-    if not valuation:
-        raise HTTPException(status_code=404, detail="No valuation found for this project")
-
-    as_of = valuation.valued_at.isoformat() if isinstance(valuation.valued_at, date) else None
-    label = f"Valuation – {metric}"
-
-    if metric in _VALUATION_DIRECT:
-        raw = getattr(valuation, metric)
-        value = float(raw) if raw is not None else None
-        return {"value": value, "label": label, "as_of": as_of}
-
-    if metric in _VALUATION_ASSUMPTIONS:
-        assumptions = valuation.assumptions or {}
-        raw = assumptions.get(metric)
-        value = float(raw) if raw is not None else None
-        if value is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Metric '{metric}' not present in valuation assumptions",
-            )
-        return {"value": value, "label": label, "as_of": as_of}
-
-    if metric == "ev_per_mw":
-        if project.capacity_mw and float(project.capacity_mw) > 0:
-            value = float(valuation.enterprise_value) / float(project.capacity_mw)
-        else:
-            raise HTTPException(
-                status_code=422,
-                detail="Project capacity_mw is not set — cannot compute EV/MW",
-            )
-        return {"value": value, "label": label, "as_of": as_of}
-
-    raise HTTPException(
-        status_code=422,
-        detail=(
-            f"Unknown metric '{metric}'. "
-            "Valid: enterprise_value, equity_value, irr, moic, npv, ev_per_mw"
-        ),
-    )
+    return valuation_cell(val_result.scalar_one_or_none(), project, metric)
 
 
 # ── Benchmark ─────────────────────────────────────────────────────────────────
 
-_PERCENTILE_FIELDS: dict[str, str] = {
-    "p10": "p10",
-    "p25": "p25",
-    "p50": "median",
-    "p75": "p75",
-    "p90": "p90",
-}
-
 
 @router.get("/benchmark/{asset_class}/{metric}")
 async def excel_benchmark(
@@ -222,12 +160,7 @@ async def excel_benchmark(
     """
     from app.models.metrics import BenchmarkAggregate
 
-    pct_field = _PERCENTILE_FIELDS.get(percentile.lower())
-    if not pct_field:
-        raise HTTPException(
-            status_code=422,
-            detail=f"Unknown percentile '{percentile}'. Valid: p10, p25, p50, p75, p90",
-        )
+    percentile_field(percentile)
 
     stmt = select(BenchmarkAggregate).where(
         BenchmarkAggregate.asset_class == asset_class,
@@ -239,18 +172,7 @@ async def excel_benchmark(
     # Return the most-recently computed row
     stmt = stmt.order_by(BenchmarkAggregate.computed_at.desc()).limit(1)
     result = await db.execute(stmt)
-    row = result.scalar_one_or_none()
-    if not row:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No benchmark data for asset_class='{asset_class}' metric='{metric}'",
-        )
-
-    value = getattr(row, pct_field, None)
-    label = f"Benchmark {asset_class} {metric} {percentile}"
-    as_of = row.computed_at.isoformat() if row.computed_at else None
-
-    return {"value": value, "label": label, "as_of": as_of}
+    return benchmark_cell(result.scalar_one_or_none(), asset_class, metric, percentile)
 
 
 # ── FX Rate ───────────────────────────────────────────────────────────────────
@@ -276,18 +198,7 @@ async def excel_fx(
         .limit(1)
     )
     result = await db.execute(stmt)
-    row = result.scalar_one_or_none()
-    if not row:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No FX rate found for {base.upper()}/{quote.upper()}",
-        )
-
-    return {
-        "value": row.rate,
-        "label": f"{base.upper()}/{quote.upper()}",
-        "as_of": row.rate_date.isoformat() if row.rate_date else None,
-    }
+    return fx_cell(result.scalar_one_or_none(), base, quote)
 
 
 # ── Project KPI ───────────────────────────────────────────────────────────────
@@ -330,31 +241,11 @@ async def excel_kpi(
     # Return the most recent entry
     stmt = stmt.order_by(KPIActual.period.desc(), KPIActual.updated_at.desc()).limit(1)
     result = await db.execute(stmt)
-    row = result.scalar_one_or_none()
-    if not row:
-        detail = f"No KPI '{kpi_name}' found for project" + (
-            f" in period '{period}'" if period else ""
-        )
-        raise HTTPException(status_code=404, detail=detail)
-
-    return {
-        "value": row.value,
-        "label": f"{kpi_name} ({row.period})",
-        "as_of": row.updated_at.isoformat() if row.updated_at else None,
-    }
+    return kpi_cell(result.scalar_one_or_none(), kpi_name, period)
 
 
 # ── Portfolio Metrics ─────────────────────────────────────────────────────────
 
-_PORTFOLIO_METRIC_MAP: dict[str, str] = {
-    "nav": "total_value",
-    "irr": "irr_net",  # prefer net IRR; fall back to gross if absent
-    "irr_gross": "irr_gross",
-    "moic": "moic",
-    "tvpi": "tvpi",
-    "dpi": "dpi",
-}
-
 
 @router.get("/portfolio/{portfolio_id}/{metric}")
 async def excel_portfolio(
@@ -380,12 +271,7 @@ async def excel_portfolio(
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
 
-    field = _PORTFOLIO_METRIC_MAP.get(metric.lower())
-    if not field:
-        raise HTTPException(
-            status_code=422,
-            detail=(f"Unknown metric '{metric}'. " "Valid: nav, irr, irr_gross, moic, tvpi, dpi"),
-        )
+    portfolio_field(metric)
 
     metrics_stmt = (
         select(PortfolioMetrics)
@@ -394,32 +280,11 @@ async def excel_portfolio(
         .limit(1)
     )
     metrics_result = await db.execute(metrics_stmt)
-    pm = metrics_result.scalar_one_or_none()
-    if not pm:
-        raise HTTPException(status_code=404, detail="No portfolio metrics found")
-
-    raw = getattr(pm, field, None)
-    # For IRR net, fall back to gross if net is not populated
-    if raw is None and metric.lower() == "irr":
-        raw = pm.irr_gross
-
-    value = float(raw) if raw is not None else None
-    as_of = pm.as_of_date.isoformat() if isinstance(pm.as_of_date, date) else None
-
-    return {"value": value, "label": f"Portfolio {metric.upper()}", "as_of": as_of}
+    return portfolio_cell(metrics_result.scalar_one_or_none(), metric)
 
 
 # ── Comparable Transactions ───────────────────────────────────────────────────
 
-_COMP_FIELD_MAP: dict[str, str] = {
-    "irr": "equity_irr",
-    "project_irr": "project_irr",
-    "moic": "ebitda_multiple",  # closest available field
-    "ev_per_mw": "ev_per_mw",
-    "deal_size": "deal_size_eur",
-    "equity_value": "equity_value_eur",
-}
-
 
 @router.get("/comp/{asset_class}/{metric}")
 async def excel_comp(
@@ -436,15 +301,7 @@ async def excel_comp(
     """
     from app.models.comps import ComparableTransaction
 
-    field = _COMP_FIELD_MAP.get(metric.lower())
-    if not field:
-        raise HTTPException(
-            status_code=422,
-            detail=(
-                f"Unknown metric '{metric}'. "
-                "Valid: irr, project_irr, moic, ev_per_mw, deal_size, equity_value"
-            ),
-        )
+    comp_field(metric)
 
     from sqlalchemy import or_
 
@@ -460,17 +317,62 @@ async def excel_comp(
         stmt = stmt.where(ComparableTransaction.geography == geography)
 
     result = await db.execute(stmt)
-    rows = result.scalars().all()
+    return comp_cell(list(result.scalars().all()), asset_class, metric)
 
-    values = [float(getattr(r, field)) for r in rows if getattr(r, field) is not None]
 
-    if not values:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No comp data for asset_class='{asset_class}' metric='{metric}'",
-        )
+# ── Batch evaluation ──────────────────────────────────────────────────────────
 
-    median_val = statistics.median(values)
-    label = f"Comp {asset_class} {metric}"
 
-    return {"value": median_val, "label": label, "as_of": None}
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+@router.post("/batch")
+async def excel_batch(
+    body: BatchRequest,
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+    org_id: uuid.UUID = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Evaluate many cells in one request; results are returned in request order.
+
+    Each cell is ``{"fn": ..., <args>}`` with the same arguments as the matching
+    GET endpoint (``kpi`` takes the KPI name as ``metric``). Cells that cannot
+    be evaluated carry an ``error`` instead of failing the batch.
+
+    The response carries an ``ETag`` over the results; send it back as
+    ``If-None-Match`` and an unchanged workbook gets an empty ``304``. Timings
+    are reported in the body and the ``Server-Timing`` header.
+    """
+    started = time.perf_counter()
+    results, group_ms = await BatchEvaluator(db, org_id).evaluate(body.cells)
+    results = jsonable_encoder(results)
+
+    digest = hashlib.sha256(
+        json.dumps([str(org_id), results], sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+    etag = f'"{digest[:32]}"'
+    timings = {**group_ms, "total": round((time.perf_counter() - started) * 1000, 1)}
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Server-Timing": ", ".join(f"{name};dur={ms}" for name, ms in timings.items()),
+    }
+
+    not_modified = _etag_matches(if_none_match, etag)
+    logger.info(
+        "excel_batch_evaluated",
+        org_id=str(org_id),
+        cells=len(body.cells),
+        groups=len(group_ms),
+        not_modified=not_modified,
+        timings_ms=timings,
+    )
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(
+        {"results": results, "count": len(results), "timings_ms": timings}, headers=headers
+    )
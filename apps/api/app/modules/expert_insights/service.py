@@ -6,17 +6,16 @@ import contextlib
 import json
 import uuid
 
-import httpx
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.models.expert_notes import ExpertNote
 from app.modules.expert_insights.schemas import (
     CreateExpertNoteRequest,
     UpdateExpertNoteRequest,
 )
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -156,20 +155,15 @@ Provide a JSON response with:
 Respond ONLY with valid JSON (no markdown, no extra text)."""
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{settings.AI_GATEWAY_URL}/v1/completions",
-                    json={
-                        "messages": [{"role": "user", "content": prompt}],
-                        "task_type": "expert_note_enrichment",
-                        "max_tokens": 800,
-                        "temperature": 0.3,
-                    },
-                    headers={
-                        "Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}",
-                        "Content-Type": "application/json",
-                    },
-                )
+            response = await gateway_client().post(
+                "/v1/completions",
+                json={
+                    "messages": [{"role": "user", "content": prompt}],
+                    "task_type": "expert_note_enrichment",
+                    "max_tokens": 800,
+                    "temperature": 0.3,
+                },
+            )
 
             if response.status_code == 200:
                 data = response.json()
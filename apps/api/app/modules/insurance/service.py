@@ -5,12 +5,10 @@ from __future__ import annotations
 import uuid
 from datetime import UTC, datetime
 
-import httpx
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.models.advisory import InsurancePolicy, InsuranceQuote
 from app.models.enums import InsurancePolicyStatus, InsurancePremiumFrequency, InsuranceSide
 from app.models.projects import Project, SignalScore
@@ -21,6 +19,7 @@ from app.modules.insurance.schemas import (
     PolicyCreate,
     QuoteCreate,
 )
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -271,19 +270,18 @@ Risk Reduction Score: {risk_reduction_score}/100
 Write 2-3 concise sentences describing the insurance programme for this project. Be specific about coverage types and their role in protecting investor returns. Use professional investment banking style. Output plain prose only."""
 
     try:
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                json={
-                    "prompt": prompt,
-                    "task_type": "analysis",
-                    "max_tokens": 200,
-                    "temperature": 0.3,
-                },
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-            )
-            resp.raise_for_status()
-            return resp.json().get("content", "").strip()
+        resp = await gateway_client().post(
+            "/v1/completions",
+            json={
+                "prompt": prompt,
+                "task_type": "analysis",
+                "max_tokens": 200,
+                "temperature": 0.3,
+            },
+            timeout=_TIMEOUT,
+        )
+        resp.raise_for_status()
+        return resp.json().get("content", "").strip()
     except Exception as exc:
         logger.warning("insurance_narrative_failed", error=str(exc))
         return (
@@ -6,15 +6,14 @@ import uuid
 from decimal import Decimal
 from typing import Any
 
-import httpx
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.models.advisory import InvestorPersona
 from app.models.projects import Project, SignalScore
 from app.modules.investor_personas.schemas import PersonaCreate, PersonaMatchResponse
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -197,17 +196,15 @@ async def generate_persona(
 
     extracted: dict[str, Any] = {}
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                json={
-                    "prompt": prompt,
-                    "task_type": "persona_extraction",
-                    "max_tokens": 1000,
-                    "temperature": 0.7,
-                },
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-            )
+        resp = await gateway_client().post(
+            "/v1/completions",
+            json={
+                "prompt": prompt,
+                "task_type": "persona_extraction",
+                "max_tokens": 1000,
+                "temperature": 0.7,
+            },
+        )
         resp.raise_for_status()
         data = resp.json()
         content = data.get("content", "")
@@ -17,7 +17,6 @@ from datetime import date, datetime
 from typing import Any
 
 import boto3
-import httpx
 import numpy_financial as npf
 import structlog
 from botocore.config import Config as BotoConfig
@@ -27,6 +26,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models.lp_report import LPReport
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -183,19 +183,18 @@ Write four narrative sections for the LP report. Respond ONLY with valid JSON:
 }}"""
 
     try:
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                json={
-                    "prompt": prompt,
-                    "task_type": "generate_lp_report_narrative",
-                    "max_tokens": 2000,
-                    "temperature": 0.5,
-                },
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await gateway_client().post(
+            "/v1/completions",
+            json={
+                "prompt": prompt,
+                "task_type": "generate_lp_report_narrative",
+                "max_tokens": 2000,
+                "temperature": 0.5,
+            },
+            timeout=_TIMEOUT,
+        )
+        resp.raise_for_status()
+        data = resp.json()
 
         # Try validated_data first (structured), fall back to parsing content
         validated = data.get("validated_data")
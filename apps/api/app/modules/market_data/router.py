@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_permission
@@ -13,6 +13,7 @@ from app.modules.market_data.schemas import (
     ExternalDataPointResponse,
     MarketDataSummaryResponse,
     RefreshResponse,
+    SeriesBucketsResponse,
 )
 from app.schemas.auth import CurrentUser
 
@@ -45,6 +46,30 @@ async def get_series_history(
     return [ExternalDataPointResponse.model_validate(p) for p in points]
 
 
+@router.get("/series/{source}/{series_id}/buckets", response_model=SeriesBucketsResponse)
+async def get_series_buckets(
+    source: str,
+    series_id: str,
+    days: int = Query(365, ge=1, le=36500),
+    interval: str = Query("auto", pattern="^(auto|day|week|month)$"),
+    current_user: CurrentUser = Depends(require_permission("view", "portfolio")),
+    db: AsyncSession = Depends(get_readonly_db),
+) -> SeriesBucketsResponse:
+    """Return a series downsampled into day/week/month buckets (last/avg/min/max).
+
+    ``interval=auto`` picks daily up to a year, weekly up to five years, monthly beyond.
+    """
+    resolved = service.auto_interval(days) if interval == "auto" else interval
+    buckets = await service.get_series_buckets(
+        db, source=source, series_id=series_id, days=days, interval=resolved
+    )
+    if not buckets:
+        raise HTTPException(status_code=404, detail=f"No data found for {source}/{series_id}")
+    return SeriesBucketsResponse(
+        source=source, series_id=series_id, interval=resolved, buckets=buckets
+    )
+
+
 @router.get("/summary", response_model=MarketDataSummaryResponse)
 async def get_summary(
     current_user: CurrentUser = Depends(require_permission("view", "portfolio")),
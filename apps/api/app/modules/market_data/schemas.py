@@ -34,6 +34,24 @@ class MarketDataSummary(BaseModel):
     change_pct: float | None  # % change vs previous observation; None if only 1 data point
 
 
+class SeriesBucket(BaseModel):
+    """Aggregates for one day/week/month bucket of a series."""
+
+    bucket_start: date
+    last: float
+    avg: float
+    min: float
+    max: float
+    count: int
+
+
+class SeriesBucketsResponse(BaseModel):
+    source: str
+    series_id: str
+    interval: str  # day | week | month
+    buckets: list[SeriesBucket]
+
+
 class SeriesGroupResponse(BaseModel):
     """All series available from a given source."""
 
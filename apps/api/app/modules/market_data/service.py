@@ -3,19 +3,21 @@
 from __future__ import annotations
 
 import random
+import time
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import Any
 
 import httpx
 import structlog
-from sqlalchemy import select, text
+from sqlalchemy import Date, DateTime, cast, func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models.external_data import ExternalDataPoint
-from app.modules.market_data.schemas import MarketDataSummary
+from app.modules.market_data.schemas import MarketDataSummary, SeriesBucket
 
 logger = structlog.get_logger()
 
@@ -89,6 +91,28 @@ def _mock_series(series_id: str, days: int = 90) -> list[dict[str, Any]]:
 # ── Upsert helper ─────────────────────────────────────────────────────────────
 
 
+def _normalise_observations(observations: list[dict[str, Any]]) -> dict[date, Decimal]:
+    """Parse dates/values, drop unusable rows and de-duplicate by date (last wins).
+
+    De-duplication is required for multi-row upserts: Postgres rejects an
+    ON CONFLICT DO UPDATE statement that touches the same row twice.
+    """
+    points: dict[date, Decimal] = {}
+    for obs in observations:
+        raw_value = obs["value"]
+        if raw_value is None:
+            continue
+        try:
+            numeric_value = float(raw_value)
+        except (TypeError, ValueError):
+            continue
+        obs_date = (
+            obs["date"] if isinstance(obs["date"], date) else date.fromisoformat(str(obs["date"]))
+        )
+        points[obs_date] = Decimal(str(round(numeric_value, 6)))
+    return points
+
+
 async def _upsert_points(
     db: AsyncSession,
     source: str,
@@ -96,44 +120,56 @@ async def _upsert_points(
     series_name: str,
     unit: str,
     observations: list[dict[str, Any]],
+    batch_size: int | None = None,
 ) -> int:
-    """Upsert observations for one series. Returns number of rows inserted/updated."""
+    """Upsert observations for one series. Returns number of rows inserted/updated.
+
+    Observations are staged in batches of ``batch_size`` rows (default
+    ``settings.MARKET_DATA_UPSERT_BATCH_SIZE``) and written with one multi-row
+    INSERT ... ON CONFLICT per batch, then committed once.
+    """
     if not observations:
         return 0
 
-    inserted = 0
-    for obs in observations:
-        obs_date = (
-            obs["date"] if isinstance(obs["date"], date) else date.fromisoformat(str(obs["date"]))
-        )
-        raw_value = obs["value"]
-        if raw_value is None:
-            continue
-        try:
-            numeric_value = float(raw_value)
-        except (TypeError, ValueError):
-            continue
-
-        stmt = (
-            pg_insert(ExternalDataPoint)
-            .values(
-                source=source,
-                series_id=series_id,
-                series_name=series_name,
-                data_date=obs_date,
-                value=Decimal(str(round(numeric_value, 6))),
-                unit=unit,
-            )
-            .on_conflict_do_update(
-                constraint="uq_external_data_point",
-                set_={"value": Decimal(str(round(numeric_value, 6))), "fetched_at": text("now()")},
-            )
+    started = time.perf_counter()
+    points = _normalise_observations(observations)
+    rows = [
+        {
+            "source": source,
+            "series_id": series_id,
+            "series_name": series_name,
+            "data_date": obs_date,
+            "value": value,
+            "unit": unit,
+        }
+        for obs_date, value in points.items()
+    ]
+    size = max(1, batch_size or settings.MARKET_DATA_UPSERT_BATCH_SIZE)
+
+    batches = 0
+    for offset in range(0, len(rows), size):
+        stmt = pg_insert(ExternalDataPoint).values(rows[offset : offset + size])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_external_data_point",
+            set_={"value": stmt.excluded.value, "fetched_at": text("now()")},
         )
         await db.execute(stmt)
-        inserted += 1
+        batches += 1
 
     await db.commit()
-    return inserted
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "market_data.upsert.timing",
+        source=source,
+        series_id=series_id,
+        rows=len(rows),
+        skipped=len(observations) - len(rows),
+        batches=batches,
+        elapsed_ms=round(elapsed * 1000, 1),
+        rows_per_sec=round(len(rows) / elapsed) if elapsed > 0 else None,
+    )
+    return len(rows)
 
 
 # ── FRED ingestion ────────────────────────────────────────────────────────────
@@ -326,32 +362,53 @@ async def list_series(db: AsyncSession) -> list[dict[str, Any]]:
     return [{"source": src, "series": series} for src, series in sorted(grouped.items())]
 
 
-async def get_summary(db: AsyncSession) -> list[MarketDataSummary]:
-    """Return latest value + change_pct for key FRED indicators."""
-    key_series = [
-        ("fred", "DGS10"),
-        ("fred", "FEDFUNDS"),
-        ("fred", "UNRATE"),
-        ("fred", "CPIAUCSL"),
-        ("fred", "SP500"),
-        ("fred", "MORTGAGE30US"),
-    ]
+# Key FRED indicators shown on the dashboard summary, in display order
+SUMMARY_SERIES: list[tuple[str, str]] = [
+    ("fred", "DGS10"),
+    ("fred", "FEDFUNDS"),
+    ("fred", "UNRATE"),
+    ("fred", "CPIAUCSL"),
+    ("fred", "SP500"),
+    ("fred", "MORTGAGE30US"),
+]
 
-    summaries: list[MarketDataSummary] = []
 
-    for source, sid in key_series:
-        # Fetch last 2 data points to compute change
-        result = await db.execute(
-            select(ExternalDataPoint)
-            .where(
-                ExternalDataPoint.source == source,
-                ExternalDataPoint.series_id == sid,
+async def get_summary(db: AsyncSession) -> list[MarketDataSummary]:
+    """Return latest value + change_pct for key FRED indicators.
+
+    One window-function query ranks observations per series and keeps the
+    latest two, instead of one query per series.
+    """
+    ranked = (
+        select(
+            ExternalDataPoint.source,
+            ExternalDataPoint.series_id,
+            ExternalDataPoint.series_name,
+            ExternalDataPoint.data_date,
+            ExternalDataPoint.value,
+            ExternalDataPoint.unit,
+            func.row_number()
+            .over(
+                partition_by=(ExternalDataPoint.source, ExternalDataPoint.series_id),
+                order_by=ExternalDataPoint.data_date.desc(),
             )
-            .order_by(ExternalDataPoint.data_date.desc())
-            .limit(2)
+            .label("rn"),
         )
-        rows = list(result.scalars().all())
+        .where(tuple_(ExternalDataPoint.source, ExternalDataPoint.series_id).in_(SUMMARY_SERIES))
+        .subquery()
+    )
+    result = await db.execute(
+        select(ranked).where(ranked.c.rn <= 2).order_by(ranked.c.source, ranked.c.series_id, "rn")
+    )
+
+    latest_two: dict[tuple[str, str], list[Any]] = {}
+    for row in result.all():
+        latest_two.setdefault((row.source, row.series_id), []).append(row)
 
+    summaries: list[MarketDataSummary] = []
+
+    for source, sid in SUMMARY_SERIES:
+        rows = latest_two.get((source, sid))
         if not rows:
             continue
 
@@ -379,6 +436,73 @@ async def get_summary(db: AsyncSession) -> list[MarketDataSummary]:
     return summaries
 
 
+# ── Downsampled series ────────────────────────────────────────────────────────
+
+BUCKET_INTERVALS = ("day", "week", "month")
+
+
+def auto_interval(days: int) -> str:
+    """Pick a bucket width that keeps the payload at roughly a year of points or fewer."""
+    if days <= 366:
+        return "day"
+    if days <= 5 * 366:
+        return "week"
+    return "month"
+
+
+async def get_series_buckets(
+    db: AsyncSession,
+    source: str,
+    series_id: str,
+    days: int = 365,
+    interval: str = "auto",
+) -> list[SeriesBucket]:
+    """Return one series downsampled into day/week/month buckets (last N days).
+
+    Bucketing and the last/avg/min/max aggregates run in SQL, so the payload
+    size depends on the bucket count rather than the number of raw rows.
+    """
+    if interval == "auto":
+        interval = auto_interval(days)
+    if interval not in BUCKET_INTERVALS:
+        raise ValueError(f"Unsupported interval: {interval}")
+
+    cutoff = date.today() - timedelta(days=days)
+    bucket = cast(
+        func.date_trunc(interval, cast(ExternalDataPoint.data_date, DateTime)), Date
+    ).label("bucket_start")
+    result = await db.execute(
+        select(
+            bucket,
+            array_agg(
+                aggregate_order_by(ExternalDataPoint.value, ExternalDataPoint.data_date.desc())
+            )[1].label("last"),
+            func.avg(ExternalDataPoint.value).label("avg"),
+            func.min(ExternalDataPoint.value).label("min"),
+            func.max(ExternalDataPoint.value).label("max"),
+            func.count().label("count"),
+        )
+        .where(
+            ExternalDataPoint.source == source,
+            ExternalDataPoint.series_id == series_id,
+            ExternalDataPoint.data_date >= cutoff,
+        )
+        .group_by(bucket)
+        .order_by(bucket.asc())
+    )
+    return [
+        SeriesBucket(
+            bucket_start=row.bucket_start,
+            last=float(row.last),
+            avg=float(row.avg),
+            min=float(row.min),
+            max=float(row.max),
+            count=row.count,
+        )
+        for row in result.all()
+    ]
+
+
 # ── IRENA ─────────────────────────────────────────────────────────────────────
 
 IRENA_SERIES: list[dict[str, str]] = [
@@ -6,6 +6,8 @@ stored in MatchResult.score_breakdown for full auditability.
 
 from __future__ import annotations
 
+import heapq
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import Any
@@ -59,6 +61,35 @@ def _country_region(country: str) -> str | None:
     return None
 
 
+def adjacent_sectors(sectors: list[str]) -> set[str]:
+    """Project types that score on the sector dimension for these mandate sectors."""
+    result = set(sectors)
+    for s in sectors:
+        result |= _ADJACENT_SECTORS.get(s, set())
+    return result
+
+
+def region_countries(geographies: list[str]) -> set[str]:
+    """Countries that score on the geography dimension for these mandate geographies."""
+    regions = {_country_region(g) for g in geographies} - {None}
+    result = set(geographies)
+    for countries in _REGIONS.values():
+        result |= {c for c in countries if _country_region(c) in regions}
+    return result
+
+
+# Each scoring dimension depends on a single project attribute, which lets the
+# batch scorer memoise dimension results per (mandate, attribute value).
+_DIMENSION_KEYS: tuple[tuple[str, Callable[[Project, SignalScore | None], Any]], ...] = (
+    ("sector", lambda p, ss: p.project_type),
+    ("geography", lambda p, ss: p.geography_country),
+    ("ticket_size", lambda p, ss: p.total_investment_required),
+    ("stage", lambda p, ss: p.stage),
+    ("risk_return", lambda p, ss: None if ss is None else ss.overall_score),
+    ("esg", lambda p, ss: p.project_type),
+)
+
+
 @dataclass
 class AlignmentScore:
     overall: int
@@ -96,33 +127,36 @@ class MatchingAlgorithm:
         project: Project,
         signal_score: SignalScore | None = None,
     ) -> AlignmentScore:
-        sector_pts, sector_detail = self._score_sector(mandate, project)
-        geo_pts, geo_detail = self._score_geography(mandate, project)
-        ticket_pts, ticket_detail = self._score_ticket_size(mandate, project)
-        stage_pts, stage_detail = self._score_stage(mandate, project)
-        rr_pts, rr_detail = self._score_risk_return(mandate, project, signal_score)
-        esg_pts, esg_detail = self._score_esg(mandate, project)
-
-        overall = sector_pts + geo_pts + ticket_pts + stage_pts + rr_pts + esg_pts
+        parts = {
+            name: self._score_dimension(name, mandate, project, signal_score)
+            for name, _ in _DIMENSION_KEYS
+        }
+        return self._assemble(parts)
 
+    @staticmethod
+    def _assemble(parts: dict[str, tuple[int, dict]]) -> AlignmentScore:
         return AlignmentScore(
-            overall=overall,
-            sector=sector_pts,
-            geography=geo_pts,
-            ticket_size=ticket_pts,
-            stage=stage_pts,
-            risk_return=rr_pts,
-            esg=esg_pts,
-            breakdown={
-                "sector": sector_detail,
-                "geography": geo_detail,
-                "ticket_size": ticket_detail,
-                "stage": stage_detail,
-                "risk_return": rr_detail,
-                "esg": esg_detail,
-            },
+            overall=sum(pts for pts, _ in parts.values()),
+            sector=parts["sector"][0],
+            geography=parts["geography"][0],
+            ticket_size=parts["ticket_size"][0],
+            stage=parts["stage"][0],
+            risk_return=parts["risk_return"][0],
+            esg=parts["esg"][0],
+            breakdown={name: detail for name, (_, detail) in parts.items()},
         )
 
+    def _score_dimension(
+        self,
+        name: str,
+        mandate: InvestorMandate,
+        project: Project,
+        signal_score: SignalScore | None,
+    ) -> tuple[int, dict]:
+        if name == "risk_return":
+            return self._score_risk_return(mandate, project, signal_score)
+        return getattr(self, f"_score_{name}")(mandate, project)
+
     # ── Dimension scorers ──────────────────────────────────────────────────
 
     def _score_sector(self, mandate: InvestorMandate, project: Project) -> tuple[int, dict]:
@@ -265,3 +299,53 @@ class MatchingAlgorithm:
         ]
         results.sort(key=lambda x: x[2].overall, reverse=True)
         return results
+
+    def score_matrix(
+        self,
+        mandates: list[InvestorMandate],
+        candidates: list[tuple[Project, SignalScore | None]],
+        *,
+        min_score: int | None = None,
+        top_k: int | None = None,
+    ) -> list[tuple[Project, SignalScore | None, AlignmentScore, InvestorMandate]]:
+        """Score all mandates against all candidates and keep the best mandate per project.
+
+        Dimension results are memoised per (mandate, attribute value), so a
+        portfolio of N projects sharing a handful of types, stages and countries
+        costs far fewer scorer calls than N x M ``calculate_alignment`` runs.
+        Only each project's winning mandate is materialised as an AlignmentScore.
+        Returns rows sorted by overall desc; with ``top_k`` a bounded heap
+        replaces the full sort. Ties keep candidate order, as with ``sorted``.
+        """
+        if not mandates:
+            return []
+
+        caches: list[dict[tuple[str, Any], tuple[int, dict]]] = [{} for _ in mandates]
+        rows: list[tuple[Project, SignalScore | None, AlignmentScore, InvestorMandate]] = []
+
+        for project, ss in candidates:
+            keys = [(name, key_fn(project, ss)) for name, key_fn in _DIMENSION_KEYS]
+            best_idx = -1
+            best_total = -1
+            for idx, mandate in enumerate(mandates):
+                cache = caches[idx]
+                total = 0
+                for name, value in keys:
+                    hit = cache.get((name, value))
+                    if hit is None:
+                        hit = self._score_dimension(name, mandate, project, ss)
+                        cache[(name, value)] = hit
+                    total += hit[0]
+                if total > best_total:
+                    best_idx, best_total = idx, total
+
+            if min_score is not None and best_total < min_score:
+                continue
+            cache = caches[best_idx]
+            alignment = self._assemble({name: cache[(name, value)] for name, value in keys})
+            rows.append((project, ss, alignment, mandates[best_idx]))
+
+        if top_k is not None:
+            return heapq.nlargest(top_k, rows, key=lambda x: x[2].overall)
+        rows.sort(key=lambda x: x[2].overall, reverse=True)
+        return rows
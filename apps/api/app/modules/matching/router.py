@@ -37,6 +37,7 @@ async def get_investor_recommendations(
     geography: str | None = Query(None),
     min_alignment: int | None = Query(None, ge=0, le=100),
     sort_by: str = Query("alignment", pattern="^(alignment|signal_score|recency)$"),
+    prefilter: bool = Query(True, description="False scores every published project"),
     current_user: CurrentUser = Depends(require_permission("view", "match")),
     db: AsyncSession = Depends(get_db),
 ):
@@ -48,6 +49,7 @@ async def get_investor_recommendations(
         geography=geography,
         min_alignment=min_alignment,
         sort_by=sort_by,
+        prefilter=prefilter,
     )
 
 
@@ -2,18 +2,26 @@
 
 from __future__ import annotations
 
+import logging
 import uuid
+from collections.abc import Iterable
+from decimal import Decimal
 
 import structlog
-from sqlalchemy import or_, select
+from sqlalchemy import ColumnElement, Select, and_, func, or_, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.core import Organization
-from app.models.enums import MatchInitiator, MatchStatus, RiskTolerance
+from app.models.enums import MatchInitiator, MatchStatus, ProjectType, RiskTolerance
 from app.models.investors import InvestorMandate
 from app.models.matching import MatchMessage, MatchResult
 from app.models.projects import Project, SignalScore
-from app.modules.matching.algorithm import AlignmentScore, MatchingAlgorithm
+from app.modules.matching.algorithm import (
+    AlignmentScore,
+    MatchingAlgorithm,
+    adjacent_sectors,
+    region_countries,
+)
 from app.modules.matching.schemas import (
     AlignmentBreakdownResponse,
     AllyRecommendationsResponse,
@@ -45,6 +53,56 @@ async def _latest_signal_score(db: AsyncSession, project_id: uuid.UUID) -> Signa
     return result.scalar_one_or_none()
 
 
+def latest_signal_scores_stmt(project_ids: list[uuid.UUID]) -> Select[tuple[SignalScore]]:
+    """Select the latest SignalScore per project with a row_number() window."""
+    ranked = (
+        select(
+            SignalScore.id,
+            func.row_number()
+            .over(partition_by=SignalScore.project_id, order_by=SignalScore.version.desc())
+            .label("rn"),
+        )
+        .where(SignalScore.project_id.in_(project_ids))
+        .subquery()
+    )
+    return select(SignalScore).join(ranked, ranked.c.id == SignalScore.id).where(ranked.c.rn == 1)
+
+
+async def _latest_signal_scores(
+    db: AsyncSession, project_ids: Iterable[uuid.UUID]
+) -> dict[uuid.UUID, SignalScore]:
+    """Latest SignalScore per project in one window-function query."""
+    ids = list(project_ids)
+    if not ids:
+        return {}
+    result = await db.execute(latest_signal_scores_stmt(ids))
+    return {ss.project_id: ss for ss in result.scalars().all()}
+
+
+def _mandate_candidate_filter(mandates: list[InvestorMandate]) -> ColumnElement[bool]:
+    """SQL predicate keeping projects that score on sector, geography and ticket size
+    for at least one mandate.
+
+    Mirrors the scoring bands of MatchingAlgorithm: exact or adjacent sector,
+    exact country or same region, and the ±50% ticket tolerance band. An empty
+    sector or geography list leaves that dimension unconstrained.
+    """
+    clauses: list[ColumnElement[bool]] = []
+    for mandate in mandates:
+        conds: list[ColumnElement[bool]] = []
+        if mandate.sectors:
+            valid = {t.value for t in ProjectType}
+            types = [ProjectType(t) for t in adjacent_sectors(mandate.sectors) if t in valid]
+            conds.append(Project.project_type.in_(types))
+        if mandate.geographies:
+            conds.append(Project.geography_country.in_(region_countries(mandate.geographies)))
+        lo, hi = mandate.ticket_size_min, mandate.ticket_size_max
+        band = (hi - lo) * Decimal("0.50")
+        conds.append(Project.total_investment_required.between(lo - band, hi + band))
+        clauses.append(and_(*conds) if conds else true())
+    return or_(*clauses)
+
+
 async def _get_match_or_raise(
     db: AsyncSession, match_id: uuid.UUID, org_id: uuid.UUID
 ) -> MatchResult:
@@ -108,7 +166,20 @@ async def get_investor_recommendations(
     min_alignment: int | None = None,
     sort_by: str = "alignment",  # alignment|signal_score|recency
     limit: int = 50,
+    prefilter: bool = True,
 ) -> InvestorRecommendationsResponse:
+    """Published projects scored against the investor's active mandates.
+
+    With ``prefilter`` (the default) only projects that could score on every
+    hard dimension of at least one mandate are loaded and scored — see
+    ``_mandate_candidate_filter``. Projects outside every mandate's sectors
+    (including adjacent ones), geographies (including same-region countries)
+    or ±50% ticket band are therefore not recommended, even though unfiltered
+    scoring would have listed them with a low alignment. Projects the investor
+    already has a match with are always kept, and with debug logging enabled
+    the number excluded is logged as ``investor_recommendations_prefiltered``.
+    ``prefilter=False`` scores every published project.
+    """
     # Load all active mandates for this investor
     mandate_stmt = select(InvestorMandate).where(
         InvestorMandate.org_id == investor_org_id,
@@ -121,7 +192,16 @@ async def get_investor_recommendations(
     if not mandates:
         return InvestorRecommendationsResponse(items=[], total=0)
 
-    # Load all published projects
+    # Load existing matches for investor (to get status)
+    existing_stmt = select(MatchResult).where(
+        MatchResult.investor_org_id == investor_org_id,
+        MatchResult.is_deleted.is_(False),
+    )
+    existing_result = await db.execute(existing_stmt)
+    existing_by_project: dict[uuid.UUID, MatchResult] = {
+        m.project_id: m for m in existing_result.scalars().all()
+    }
+
     proj_stmt = select(Project).where(
         Project.is_published.is_(True),
         Project.is_deleted.is_(False),
@@ -131,38 +211,40 @@ async def get_investor_recommendations(
     if geography:
         proj_stmt = proj_stmt.where(Project.geography_country.ilike(f"%{geography}%"))
 
+    if prefilter:
+        # Pre-filter in SQL to projects that fit some mandate, plus existing matches
+        candidates = _mandate_candidate_filter(mandates)
+        if existing_by_project:
+            candidates = or_(candidates, Project.id.in_(list(existing_by_project)))
+        unfiltered, proj_stmt = proj_stmt, proj_stmt.where(candidates)
+
     proj_result = await db.execute(proj_stmt)
     projects = list(proj_result.scalars().all())
 
-    # Load existing matches for investor (to get status)
-    existing_stmt = select(MatchResult).where(
-        MatchResult.investor_org_id == investor_org_id,
-        MatchResult.is_deleted.is_(False),
+    if prefilter and logger.is_enabled_for(logging.DEBUG):
+        # Costs an extra COUNT, so only when debugging the prefilter
+        published = (
+            await db.execute(select(func.count()).select_from(unfiltered.subquery()))
+        ).scalar_one()
+        logger.debug(
+            "investor_recommendations_prefiltered",
+            investor_org_id=str(investor_org_id),
+            mandates=len(mandates),
+            published=published,
+            candidates=len(projects),
+            excluded=published - len(projects),
+        )
+
+    # Score every candidate against all mandates in one batch, keeping the best mandate
+    signal_scores = await _latest_signal_scores(db, (p.id for p in projects))
+    scored = _algo.score_matrix(
+        mandates,
+        [(p, signal_scores.get(p.id)) for p in projects],
+        min_score=min_alignment,
+        top_k=limit if sort_by == "alignment" else None,
     )
-    existing_result = await db.execute(existing_stmt)
-    existing_by_project: dict[uuid.UUID, MatchResult] = {
-        m.project_id: m for m in existing_result.scalars().all()
-    }
 
-    # Score each project against best matching mandate
-    scored: list[tuple[Project, SignalScore | None, AlignmentScore, InvestorMandate]] = []
-    for proj in projects:
-        ss = await _latest_signal_score(db, proj.id)
-        best_score: AlignmentScore | None = None
-        best_mandate: InvestorMandate | None = None
-        for mandate in mandates:
-            score = _algo.calculate_alignment(mandate, proj, ss)
-            if best_score is None or score.overall > best_score.overall:
-                best_score = score
-                best_mandate = mandate
-        if best_score is not None and best_mandate is not None:
-            scored.append((proj, ss, best_score, best_mandate))
-
-    # Filter by min alignment
-    if min_alignment is not None:
-        scored = [(p, ss, s, m) for p, ss, s, m in scored if s.overall >= min_alignment]
-
-    # Sort
+    # Sort (alignment order already comes from score_matrix)
     if sort_by == "signal_score":
         scored.sort(key=lambda x: (x[1].overall_score if x[1] else 0), reverse=True)
     elif sort_by == "recency":
@@ -172,8 +254,6 @@ async def get_investor_recommendations(
             else x[0].created_at,
             reverse=True,
         )
-    else:  # alignment (default)
-        scored.sort(key=lambda x: x[2].overall, reverse=True)
 
     scored = scored[:limit]
 
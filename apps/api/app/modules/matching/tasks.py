@@ -1,7 +1,13 @@
-"""Celery tasks for Matching: batch daily refresh of all match scores."""
+"""Celery tasks for Matching: incremental daily refresh of match scores."""
+
+from __future__ import annotations
 
 import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any
 
+import redis
 import structlog
 
 from app.core.celery_app import celery_app
@@ -9,53 +15,106 @@ from app.core.config import settings
 
 logger = structlog.get_logger()
 
+_WATERMARK_KEY = "matching:batch:watermark"
+_MIN_MATCH_SCORE = 20  # only create/update for meaningful scores
+_UPSERT_BATCH_SIZE = 1_000
+
+
+def _redis() -> redis.Redis:
+    return redis.from_url(
+        settings.REDIS_URL, socket_connect_timeout=5, socket_timeout=5, decode_responses=True
+    )
+
+
+def _read_watermark() -> datetime | None:
+    """Start time of the last successful run, or None to force a full refresh."""
+    try:
+        raw = _redis().get(_WATERMARK_KEY)
+    except Exception as exc:
+        logger.warning("batch_match_watermark_read_failed", error=str(exc))
+        return None
+    return datetime.fromisoformat(raw) if raw else None
+
+
+def _write_watermark(value: datetime) -> None:
+    try:
+        _redis().set(_WATERMARK_KEY, value.isoformat())
+    except Exception as exc:
+        logger.warning("batch_match_watermark_write_failed", error=str(exc))
+
+
+def _upsert_matches(session: Any, rows: list[dict[str, Any]]) -> int:
+    """Bulk INSERT ... ON CONFLICT upsert of match rows; returns rows written.
+
+    Existing matches get their score, breakdown and mandate refreshed but keep
+    their status — the refresh never downgrades a match. Rows whose score and
+    mandate are unchanged are left untouched.
+    """
+    from sqlalchemy import func, text
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    from app.models.matching import MatchResult
+
+    written = 0
+    for start in range(0, len(rows), _UPSERT_BATCH_SIZE):
+        stmt = pg_insert(MatchResult).values(rows[start : start + _UPSERT_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["project_id", "investor_org_id"],
+            index_where=text("is_deleted = false"),  # matches the partial unique index
+            set_={
+                "overall_score": stmt.excluded.overall_score,
+                "score_breakdown": stmt.excluded.score_breakdown,
+                "mandate_id": stmt.excluded.mandate_id,
+                "updated_at": func.now(),
+            },
+            where=(
+                (MatchResult.overall_score != stmt.excluded.overall_score)
+                | MatchResult.mandate_id.is_distinct_from(stmt.excluded.mandate_id)
+            ),
+        )
+        written += session.execute(stmt).rowcount or 0
+    return written
+
 
 @celery_app.task(
     bind=True, max_retries=2, default_retry_delay=60, soft_time_limit=120, time_limit=180
 )
-def batch_calculate_matches(self) -> dict:
+def batch_calculate_matches(self, full: bool = False) -> dict:
     """
-    Daily batch task: refresh MatchResult scores for all active pairings.
+    Daily batch task: refresh MatchResult scores for changed pairings.
 
     Steps:
-      1. Load all published projects
-      2. Load all active InvestorMandates
-      3. For each (project, mandate) pair:
-         a. Score with MatchingAlgorithm
-         b. Upsert MatchResult (create if new, update score_breakdown if score changed)
-      4. Only create SUGGESTED records — never downgrade existing status
+      1. Read the watermark (start time of the last successful run); without
+         one, or with ``full=True``, every pair is rescored
+      2. Find projects updated or re-scored (new SignalScore) since the
+         watermark, and investor orgs whose mandates changed since it
+      3. Rescore only affected pairs: changed projects x all investors, plus
+         all projects x investors with changed mandates. Each (project,
+         investor) pair keeps its best-scoring mandate
+      4. Bulk upsert results with INSERT ... ON CONFLICT — only SUGGESTED
+         records are created and existing status is never downgraded
+      5. Advance the watermark to this run's start time
     """
-    from sqlalchemy import create_engine, select
-    from sqlalchemy.orm import Session as SyncSession
+    from sqlalchemy import func, select
 
+    from app.core.celery_db import get_celery_db_session
     from app.models.enums import MatchInitiator, MatchStatus
     from app.models.investors import InvestorMandate
-    from app.models.matching import MatchResult
     from app.models.projects import Project, SignalScore
     from app.modules.matching.algorithm import MatchingAlgorithm
+    from app.modules.matching.service import latest_signal_scores_stmt
 
-    engine = create_engine(settings.DATABASE_URL_SYNC)
     algo = MatchingAlgorithm()
+    watermark = None if full else _read_watermark()
+    mode = "full" if watermark is None else "incremental"
 
-    created = 0
-    updated = 0
+    rescored = 0
     errors = 0
 
     try:
-        with SyncSession(engine) as session:
-            # Load all published projects
-            projects = (
-                session.execute(
-                    select(Project).where(
-                        Project.is_published.is_(True),
-                        Project.is_deleted.is_(False),
-                    )
-                )
-                .scalars()
-                .all()
-            )
+        with get_celery_db_session() as session:
+            run_started: datetime = session.execute(select(func.now())).scalar_one()
 
-            # Load all active mandates
             mandates = (
                 session.execute(
                     select(InvestorMandate).where(
@@ -66,91 +125,123 @@ def batch_calculate_matches(self) -> dict:
                 .scalars()
                 .all()
             )
+            mandates_by_org: dict[uuid.UUID, list[InvestorMandate]] = defaultdict(list)
+            for mandate in mandates:
+                mandates_by_org[mandate.org_id].append(mandate)
+
+            published = select(Project).where(
+                Project.is_published.is_(True),
+                Project.is_deleted.is_(False),
+            )
+
+            if watermark is None:
+                changed_orgs = set(mandates_by_org)
+                changed_project_ids: set[uuid.UUID] = set()
+            else:
+                # Includes deactivated/deleted mandates: the org's best match may move
+                changed_orgs = set(
+                    session.execute(
+                        select(InvestorMandate.org_id)
+                        .where(InvestorMandate.updated_at > watermark)
+                        .distinct()
+                    ).scalars()
+                )
+                changed_project_ids = set(
+                    session.execute(select(Project.id).where(Project.updated_at > watermark))
+                    .scalars()
+                    .all()
+                ) | set(
+                    session.execute(
+                        select(SignalScore.project_id)
+                        .where(SignalScore.created_at > watermark)
+                        .distinct()
+                    )
+                    .scalars()
+                    .all()
+                )
+
+            if changed_orgs & set(mandates_by_org):
+                projects = session.execute(published).scalars().all()
+            elif changed_project_ids:
+                projects = (
+                    session.execute(published.where(Project.id.in_(changed_project_ids)))
+                    .scalars()
+                    .all()
+                )
+            else:
+                projects = []
+            changed_projects = [p for p in projects if p.id in changed_project_ids]
+
+            total_published = session.execute(
+                select(func.count()).select_from(published.subquery())
+            ).scalar_one()
+            scanned = total_published * len(mandates)
 
             logger.info(
                 "batch_match_start",
-                project_count=len(projects),
+                mode=mode,
+                project_count=total_published,
                 mandate_count=len(mandates),
+                changed_projects=len(changed_project_ids),
+                changed_orgs=len(changed_orgs),
             )
 
-            # Load latest signal scores for all projects
             signal_scores: dict[uuid.UUID, SignalScore] = {}
-            for proj in projects:
-                ss = session.execute(
-                    select(SignalScore)
-                    .where(SignalScore.project_id == proj.id)
-                    .order_by(SignalScore.version.desc())
-                    .limit(1)
-                ).scalar_one_or_none()
-                if ss:
-                    signal_scores[proj.id] = ss
-
-            # Build existing match lookup
-            existing = (
-                session.execute(select(MatchResult).where(MatchResult.is_deleted.is_(False)))
-                .scalars()
-                .all()
-            )
-            existing_map: dict[tuple[uuid.UUID, uuid.UUID], MatchResult] = {
-                (m.project_id, m.investor_org_id): m for m in existing
-            }
+            if projects:
+                signal_scores = {
+                    ss.project_id: ss
+                    for ss in session.execute(latest_signal_scores_stmt([p.id for p in projects]))
+                    .scalars()
+                    .all()
+                }
+
+            rows: list[dict[str, Any]] = []
+            for org_id, org_mandates in mandates_by_org.items():
+                targets = projects if org_id in changed_orgs else changed_projects
+                # Skip same-org pairs (ally investing in own project)
+                candidates = [(p, signal_scores.get(p.id)) for p in targets if p.org_id != org_id]
+                if not candidates:
+                    continue
+                rescored += len(candidates) * len(org_mandates)
+                try:
+                    scored = algo.score_matrix(
+                        org_mandates, candidates, min_score=_MIN_MATCH_SCORE
+                    )
+                except Exception as org_exc:
+                    errors += 1
+                    logger.warning(
+                        "batch_match_org_error", investor_org_id=str(org_id), error=str(org_exc)
+                    )
+                    continue
+                rows.extend(
+                    {
+                        "investor_org_id": org_id,
+                        "ally_org_id": project.org_id,
+                        "project_id": project.id,
+                        "mandate_id": mandate.id,
+                        "overall_score": alignment.overall,
+                        "score_breakdown": alignment.to_dict(),
+                        "status": MatchStatus.SUGGESTED,
+                        "initiated_by": MatchInitiator.SYSTEM,
+                    }
+                    for project, _, alignment, mandate in scored
+                )
 
-            for mandate in mandates:
-                for project in projects:
-                    # Skip if same org (ally investing in own project)
-                    if mandate.org_id == project.org_id:
-                        continue
-
-                    try:
-                        ss = signal_scores.get(project.id)
-                        alignment = algo.calculate_alignment(mandate, project, ss)
-
-                        # Only create/update for meaningful scores (≥20)
-                        if alignment.overall < 20:
-                            continue
-
-                        key = (project.id, mandate.org_id)
-                        existing_match = existing_map.get(key)
-
-                        if existing_match:
-                            # Update score breakdown but never downgrade status
-                            existing_match.overall_score = alignment.overall
-                            existing_match.score_breakdown = alignment.to_dict()
-                            existing_match.mandate_id = mandate.id
-                            updated += 1
-                        else:
-                            # Create new SUGGESTED match
-                            new_match = MatchResult(
-                                investor_org_id=mandate.org_id,
-                                ally_org_id=project.org_id,
-                                project_id=project.id,
-                                mandate_id=mandate.id,
-                                overall_score=alignment.overall,
-                                score_breakdown=alignment.to_dict(),
-                                status=MatchStatus.SUGGESTED,
-                                initiated_by=MatchInitiator.SYSTEM,
-                            )
-                            session.add(new_match)
-                            created += 1
-
-                    except Exception as pair_exc:
-                        errors += 1
-                        logger.warning(
-                            "batch_match_pair_error",
-                            project_id=str(project.id),
-                            mandate_id=str(mandate.id),
-                            error=str(pair_exc),
-                        )
-
-            session.commit()
-
-        logger.info(
-            "batch_match_complete",
-            created=created,
-            updated=updated,
-            errors=errors,
-        )
-        return {"status": "success", "created": created, "updated": updated, "errors": errors}
+            updated = _upsert_matches(session, rows)
+
+        _write_watermark(run_started)
+
+        stats = {
+            "status": "success",
+            "mode": mode,
+            "scanned": scanned,
+            "rescored": rescored,
+            "skipped": max(0, scanned - rescored),
+            "updated": updated,
+            "errors": errors,
+        }
+        logger.info("batch_match_complete", **stats)
+        return stats
 
     except Exception as exc:
         logger.error("batch_match_failed", error=str(exc))
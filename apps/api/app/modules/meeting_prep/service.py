@@ -6,13 +6,12 @@ import uuid
 from datetime import date
 from typing import Any
 
-import httpx
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.models.meeting_prep import MeetingBriefing
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -156,14 +155,13 @@ async def _ai_generate_briefing(
             }
         else:
             payload = {"task_type": "generate_meeting_briefing", "context": context}
-        async with httpx.AsyncClient(timeout=_AI_TIMEOUT) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                json=payload,
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await gateway_client().post(
+            "/v1/completions",
+            json=payload,
+            timeout=_AI_TIMEOUT,
+        )
+        resp.raise_for_status()
+        data = resp.json()
         if _template_id and db is not None:
             try:
                 from app.services.prompt_registry import PromptRegistry
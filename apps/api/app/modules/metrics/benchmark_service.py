@@ -1,15 +1,17 @@
 """BenchmarkService — computes and queries peer benchmark statistics."""
 
 import csv
+import datetime as _dt
+import time
 import uuid
 from typing import Any
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.metrics import BenchmarkAggregate, MetricSnapshot
+from app.models.metrics import BenchmarkAggregate, MetricLatest
 from app.models.projects import Project
 
 logger = structlog.get_logger()
@@ -24,6 +26,17 @@ BENCHMARK_METRICS = [
     "enterprise_value",
 ]
 
+_STAT_FIELDS = ("mean", "median", "p25", "p75", "p10", "p90", "std_dev", "min_val", "max_val")
+_UPSERT_BATCH_SIZE = 1_000
+
+
+def _enum_value(v: Any) -> str | None:
+    return v.value if hasattr(v, "value") else (str(v) if v else None)
+
+
+def _float(v: Any) -> float | None:
+    return float(v) if v is not None else None
+
 
 class BenchmarkService:
     def __init__(self, db: AsyncSession):
@@ -31,93 +44,108 @@ class BenchmarkService:
 
     # ── Benchmark computation ─────────────────────────────────────────────────
 
-    async def compute_benchmarks(self) -> dict[str, Any]:
-        """Nightly task. Aggregates all metric snapshots into benchmark stats."""
-        try:
-            import statistics
-        except ImportError:
-            return {"error": "statistics module unavailable"}
-
-        # Get all projects
-        projects_result = await self.db.execute(
-            select(
-                Project.id, Project.project_type, Project.geography_country, Project.stage
-            ).where(Project.is_deleted.is_(False))
-        )
-        projects = projects_result.all()
-
-        rows_written = 0
-        import datetime as _dt
+    async def compute_benchmarks(self, dry_run: bool = False) -> dict[str, Any]:
+        """Nightly task. Aggregates all metric snapshots into benchmark stats.
 
+        Set-based: one query aggregates each project's latest value (the
+        ``metric_latest`` projection) per peer group (asset class, geography,
+        stage) with ``percentile_cont`` (linear interpolation), and
+        one bulk upsert writes every group. ``dry_run`` computes and times
+        everything but writes nothing.
+        """
+        started = time.perf_counter()
         period = _dt.date.today().strftime("%Y-%m")
 
-        for metric_name in BENCHMARK_METRICS:
-            # Collect latest value per project
-            project_values: dict[tuple[str, Any, str], list[float]] = {}
-            for proj_id, proj_type, geography, stage in projects:
-                latest_result = await self.db.execute(
-                    select(MetricSnapshot.value)
-                    .where(
-                        MetricSnapshot.entity_type == "project",
-                        MetricSnapshot.entity_id == proj_id,
-                        MetricSnapshot.metric_name == metric_name,
-                    )
-                    .order_by(MetricSnapshot.recorded_at.desc())
-                    .limit(1)
-                )
-                val = latest_result.scalar_one_or_none()
-                if val is None:
-                    continue
-                key = (
-                    proj_type.value if hasattr(proj_type, "value") else str(proj_type or "other"),
-                    geography,
-                    stage.value if hasattr(stage, "value") else str(stage or ""),
-                )
-                if key not in project_values:
-                    project_values[key] = []
-                project_values[key].append(val)
-
-            # Compute stats per group
-            for (asset_class, geography, stage), values in project_values.items():
-                if not values:
-                    continue
-                stats = self._compute_stats(values, statistics)
-                await self._upsert_benchmark(
-                    asset_class=asset_class,
-                    geography=geography,
-                    stage=stage,
-                    vintage_year=None,
-                    metric_name=metric_name,
-                    period=period,
-                    stats={**stats, "count": len(values)},
-                )
-                rows_written += 1
-
-        await self.db.commit()
-        return {"rows_written": rows_written, "period": period}
-
-    def _compute_stats(self, values: list[float], statistics_module) -> dict[str, float | None]:
-        if not values:
-            return {}
-        sorted_vals = sorted(values)
-        n = len(sorted_vals)
+        latest = (
+            select(MetricLatest.entity_id, MetricLatest.metric_name, MetricLatest.value)
+            .where(
+                MetricLatest.entity_type == "project",
+                MetricLatest.metric_name.in_(BENCHMARK_METRICS),
+            )
+            .subquery()
+        )
+        value = latest.c.value
 
-        def _percentile(p: float) -> float:
-            idx = (p / 100) * (n - 1)
-            lo, hi = int(idx), min(int(idx) + 1, n - 1)
-            return sorted_vals[lo] + (idx - lo) * (sorted_vals[hi] - sorted_vals[lo])
+        def pct(p: float) -> Any:
+            return func.percentile_cont(p).within_group(value)
 
-        return {
-            "mean": statistics_module.mean(values),
-            "median": statistics_module.median(values),
-            "p25": _percentile(25),
-            "p75": _percentile(75),
-            "p10": _percentile(10),
-            "p90": _percentile(90),
-            "std_dev": statistics_module.stdev(values) if n > 1 else None,
-            "min_val": min(values),
-            "max_val": max(values),
+        stmt = (
+            select(
+                Project.project_type,
+                Project.geography_country,
+                Project.stage,
+                latest.c.metric_name,
+                func.count().label("count"),
+                func.avg(value).label("mean"),
+                pct(0.5).label("median"),
+                pct(0.25).label("p25"),
+                pct(0.75).label("p75"),
+                pct(0.10).label("p10"),
+                pct(0.90).label("p90"),
+                func.stddev_samp(value).label("std_dev"),
+                func.min(value).label("min_val"),
+                func.max(value).label("max_val"),
+            )
+            .join(Project, Project.id == latest.c.entity_id)
+            .where(Project.is_deleted.is_(False))
+            .group_by(
+                Project.project_type,
+                Project.geography_country,
+                Project.stage,
+                latest.c.metric_name,
+            )
+        )
+        groups = (await self.db.execute(stmt)).all()
+        aggregate_ms = (time.perf_counter() - started) * 1000
+
+        rows = [
+            {
+                "asset_class": _enum_value(g.project_type) or "other",
+                "geography": g.geography_country,
+                "stage": _enum_value(g.stage),
+                "vintage_year": None,
+                "metric_name": g.metric_name,
+                "period": period,
+                "count": g.count,
+                **{f: _float(getattr(g, f)) for f in _STAT_FIELDS},
+            }
+            for g in groups
+        ]
+
+        upsert_started = time.perf_counter()
+        if rows and not dry_run:
+            await self._bulk_upsert_benchmarks(rows)
+            await self.db.commit()
+        upsert_ms = (time.perf_counter() - upsert_started) * 1000
+
+        report = {
+            "rows_written": 0 if dry_run else len(rows),
+            "period": period,
+            "dry_run": dry_run,
+            "groups": len(rows),
+            "projects_valued": sum(r["count"] for r in rows),
+            "timings_ms": {
+                "aggregate": round(aggregate_ms, 1),
+                "upsert": round(upsert_ms, 1),
+                "total": round((time.perf_counter() - started) * 1000, 1),
+            },
         }
+        logger.info("benchmarks_computed", **report)
+        return report
+
+    async def _bulk_upsert_benchmarks(self, rows: list[dict[str, Any]]) -> None:
+        """Upsert many benchmark rows in one INSERT ... ON CONFLICT statement."""
+        for start in range(0, len(rows), _UPSERT_BATCH_SIZE):
+            stmt = pg_insert(BenchmarkAggregate).values(rows[start : start + _UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_benchmark_aggregate",
+                set_={
+                    "count": stmt.excluded.count,
+                    **{f: getattr(stmt.excluded, f) for f in _STAT_FIELDS},
+                    "computed_at": func.now(),
+                },
+            )
+            await self.db.execute(stmt)
 
     async def _upsert_benchmark(
         self,
@@ -126,12 +126,13 @@ async def list_benchmarks(
 
 @router.post("/benchmark/compute")
 async def compute_benchmarks(
+    dry_run: bool = Query(False, description="Compute and time the run without writing"),
     current_user: CurrentUser = Depends(require_permission("edit", "report")),
     db: AsyncSession = Depends(get_db),
 ):
-    """Admin trigger: recompute all benchmark aggregates."""
+    """Admin trigger: recompute all benchmark aggregates (returns a timing report)."""
     svc = BenchmarkService(db)
-    result = await svc.compute_benchmarks()
+    result = await svc.compute_benchmarks(dry_run=dry_run)
     return {"status": "complete", **result}
 
 
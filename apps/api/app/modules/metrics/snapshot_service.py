@@ -1,4 +1,11 @@
-"""MetricSnapshotService — records and queries point-in-time metric values."""
+"""MetricSnapshotService — records and queries point-in-time metric values.
+
+Every write also upserts the ``metric_latest`` projection (one row per entity
+and metric), which answers "current value" and percentile-rank queries without
+scanning the snapshot history. Writes that would not change the series — same
+value and metadata as the latest snapshot — are dropped, so dashboards that
+record on every view no longer grow the table.
+"""
 
 import uuid
 from datetime import datetime
@@ -6,9 +13,11 @@ from typing import Any
 
 import structlog
 from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.models.metrics import MetricSnapshot
+from app.models.metrics import MetricLatest, MetricSnapshot
 
 logger = structlog.get_logger()
 
@@ -27,20 +36,23 @@ class MetricSnapshotService:
         metadata: dict[str, Any] | None = None,
         trigger_event: str | None = None,
         trigger_entity_id: uuid.UUID | None = None,
-    ) -> MetricSnapshot:
-        """Record a point-in-time metric value."""
-        # Get previous value for delta
-        prev_result = await self.db.execute(
-            select(MetricSnapshot.value)
-            .where(
-                MetricSnapshot.entity_type == entity_type,
-                MetricSnapshot.entity_id == entity_id,
-                MetricSnapshot.metric_name == metric_name,
+    ) -> MetricSnapshot | None:
+        """Record a point-in-time metric value.
+
+        Returns None (and writes nothing) when the value and metadata match the
+        entity's latest snapshot.
+        """
+        metadata = metadata or {}
+        latest = await self._get_latest(entity_type, entity_id, metric_name)
+        previous_value = latest.value if latest else None
+        if latest is not None and latest.value == value and (latest.metadata_ or {}) == metadata:
+            logger.debug(
+                "metric_snapshot_unchanged",
+                entity_type=entity_type,
+                entity_id=str(entity_id),
+                metric_name=metric_name,
             )
-            .order_by(MetricSnapshot.recorded_at.desc())
-            .limit(1)
-        )
-        previous_value = prev_result.scalar_one_or_none()
+            return None
 
         snapshot = MetricSnapshot(
             org_id=org_id,
@@ -49,12 +61,13 @@ class MetricSnapshotService:
             metric_name=metric_name,
             value=value,
             previous_value=previous_value,
-            metadata_=metadata or {},
+            metadata_=metadata,
             trigger_event=trigger_event,
             trigger_entity_id=trigger_entity_id,
         )
         self.db.add(snapshot)
         await self.db.flush()
+        await self._upsert_latest(snapshot)
         logger.info(
             "metric_snapshot_recorded",
             entity_type=entity_type,
@@ -65,6 +78,33 @@ class MetricSnapshotService:
         )
         return snapshot
 
+    async def _upsert_latest(self, snapshot: MetricSnapshot) -> None:
+        """Point the ``metric_latest`` row for this series at ``snapshot``."""
+        stmt = pg_insert(MetricLatest).values(
+            {
+                MetricLatest.org_id: snapshot.org_id,
+                MetricLatest.entity_type: snapshot.entity_type,
+                MetricLatest.entity_id: snapshot.entity_id,
+                MetricLatest.metric_name: snapshot.metric_name,
+                MetricLatest.value: snapshot.value,
+                MetricLatest.metadata_: snapshot.metadata_,
+                MetricLatest.snapshot_id: snapshot.id,
+                # Same transaction timestamp as the snapshot's server default
+                MetricLatest.recorded_at: func.now(),
+            }
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_metric_latest_entity_metric",
+            set_={
+                "org_id": stmt.excluded.org_id,
+                "value": stmt.excluded.value,
+                "metadata": stmt.excluded["metadata"],
+                "snapshot_id": stmt.excluded.snapshot_id,
+                "recorded_at": stmt.excluded.recorded_at,
+            },
+        )
+        await self.db.execute(stmt)
+
     async def get_trend(
         self,
         entity_type: str,
@@ -118,53 +158,48 @@ class MetricSnapshotService:
 
     async def _get_latest(
         self, entity_type: str, entity_id: uuid.UUID, metric_name: str
-    ) -> MetricSnapshot | None:
+    ) -> MetricLatest | None:
         result = await self.db.execute(
-            select(MetricSnapshot)
+            select(MetricLatest)
             .where(
-                MetricSnapshot.entity_type == entity_type,
-                MetricSnapshot.entity_id == entity_id,
-                MetricSnapshot.metric_name == metric_name,
+                MetricLatest.entity_type == entity_type,
+                MetricLatest.entity_id == entity_id,
+                MetricLatest.metric_name == metric_name,
             )
-            .order_by(MetricSnapshot.recorded_at.desc())
-            .limit(1)
+            .execution_options(populate_existing=True)
         )
         return result.scalar_one_or_none()
 
     async def get_percentile_rank(
         self, entity_type: str, entity_id: uuid.UUID, metric_name: str
     ) -> float | None:
-        """Where does this entity rank vs all others of same type for this metric?"""
-        current = await self._get_latest(entity_type, entity_id, metric_name)
-        if not current:
-            return None
+        """Where does this entity rank vs all others of same type for this metric?
 
-        # Count distinct entities with this metric
-        total_result = await self.db.execute(
-            select(func.count(func.distinct(MetricSnapshot.entity_id))).where(
-                MetricSnapshot.metric_name == metric_name,
-                MetricSnapshot.entity_type == entity_type,
+        One query over ``metric_latest`` (served by ``ix_metric_latest_rank``):
+        the share of entities whose latest value is below this entity's.
+        """
+        own = aliased(MetricLatest)
+        current = (
+            select(own.value)
+            .where(
+                own.entity_type == entity_type,
+                own.entity_id == entity_id,
+                own.metric_name == metric_name,
             )
+            .correlate(None)
+            .scalar_subquery()
         )
-        total_count = total_result.scalar() or 0
-        if total_count == 0:
-            return None
-
-        # Subquery: latest value per entity
-        subq = (
+        result = await self.db.execute(
             select(
-                MetricSnapshot.entity_id,
-                func.max(MetricSnapshot.value).label("latest_val"),
+                current.label("current"),
+                func.count().label("total"),
+                func.count().filter(MetricLatest.value < current).label("below"),
+            ).where(
+                MetricLatest.entity_type == entity_type,
+                MetricLatest.metric_name == metric_name,
             )
-            .where(
-                MetricSnapshot.metric_name == metric_name,
-                MetricSnapshot.entity_type == entity_type,
-            )
-            .group_by(MetricSnapshot.entity_id)
-            .subquery()
-        )
-        below_result = await self.db.execute(
-            select(func.count()).select_from(subq).where(subq.c.latest_val < current.value)
         )
-        below_count = below_result.scalar() or 0
-        return round((below_count / total_count) * 100, 1)
+        row = result.one()
+        if row.current is None or not row.total:
+            return None
+        return round((row.below / row.total) * 100, 1)
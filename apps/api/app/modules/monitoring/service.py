@@ -5,7 +5,6 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-import httpx
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,6 +17,7 @@ from app.modules.monitoring.schemas import (
     KPITargetCreate,
     KPIVarianceItem,
 )
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -450,27 +450,23 @@ class MonitoringService:
 
     async def auto_extract_kpis(self, document_id: uuid.UUID, project_id: uuid.UUID) -> dict:
         """AI extracts KPIs from uploaded document."""
-        from app.core.config import settings
-
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.post(
-                    f"{settings.AI_GATEWAY_URL}/v1/completions",
-                    json={
-                        "task_type": "extract_kpis",
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": (
-                                    f"Extract all financial KPIs and their values from document "
-                                    f"{document_id}. Return as JSON list of objects with fields: "
-                                    f"name, value, unit, period."
-                                ),
-                            }
-                        ],
-                    },
-                    headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-                )
+            resp = await gateway_client().post(
+                "/v1/completions",
+                json={
+                    "task_type": "extract_kpis",
+                    "messages": [
+                        {
+                            "role": "user",
+                            "content": (
+                                f"Extract all financial KPIs and their values from document "
+                                f"{document_id}. Return as JSON list of objects with fields: "
+                                f"name, value, unit, period."
+                            ),
+                        }
+                    ],
+                },
+            )
             data = resp.json()
             kpis = data.get("result", {}).get("kpis", [])
             count = 0
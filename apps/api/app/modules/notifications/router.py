@@ -1,12 +1,11 @@
 """Notifications API router: list, read, stream (SSE), preferences."""
 
 import asyncio
-import json
 import math
 import uuid
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -110,23 +109,23 @@ async def get_unread_count(
 )
 async def notification_stream(
     current_user: CurrentUser = Depends(get_current_user),
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
 ):
-    """SSE stream for real-time notifications."""
+    """SSE stream for real-time notifications.
+
+    Reconnecting clients send ``Last-Event-ID`` and receive any events they
+    missed from the short per-user backlog before live events resume.
+    """
 
     async def event_generator():
-        queue = await sse_manager.connect(current_user.user_id)
+        conn = await sse_manager.connect(current_user.user_id, last_event_id)
         try:
-            while True:
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    yield f"data: {json.dumps(event)}\n\n"
-                except TimeoutError:
-                    # Send heartbeat
-                    yield f"data: {json.dumps({'type': 'heartbeat'})}\n\n"
+            async for chunk in conn.events():
+                yield chunk
         except asyncio.CancelledError:
             pass
         finally:
-            sse_manager.disconnect(current_user.user_id, queue)
+            sse_manager.disconnect(conn)
 
     return StreamingResponse(
         event_generator(),
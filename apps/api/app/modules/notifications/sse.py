@@ -1,44 +1,261 @@
-"""SSE (Server-Sent Events) connection manager for real-time notifications."""
+"""SSE (Server-Sent Events) broker for real-time notifications.
+
+``push`` appends the event to a short per-user Redis stream (the resume
+backlog) and publishes it on one cluster-wide pub/sub channel. Every API
+process holds a single subscription to that channel and fans events out to
+its local connections by user_id, so a notification reaches the user's
+stream whichever worker or ECS task it is connected to.
+
+Each connection has a bounded queue; a consumer that falls
+SSE_QUEUE_SIZE events behind is evicted and reconnects with
+``Last-Event-ID``, replaying what it missed from the backlog. One shared
+ticker sends heartbeats to all local connections.
+
+If Redis is unavailable, ``push`` falls back to local-only delivery.
+"""
 
 import asyncio
 import contextlib
+import json
 import uuid
+from collections.abc import AsyncIterator
+from typing import Any
 
 import structlog
 
+from app.core.config import settings
+from app.services.response_cache import get_redis
+
 logger = structlog.get_logger()
 
+SSE_CHANNEL = "sse:events"
+_HEARTBEAT = {"type": "heartbeat"}
+
+
+def _backlog_key(user_id: uuid.UUID) -> str:
+    return f"sse:backlog:{user_id}"
+
+
+def _stream_id(event_id: str) -> tuple[int, int]:
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def format_event(event: dict, event_id: str | None = None) -> str:
+    """Serialise one event in SSE wire format."""
+    prefix = f"id: {event_id}\n" if event_id else ""
+    return f"{prefix}data: {json.dumps(event)}\n\n"
+
+
+class SSEConnection:
+    """One client stream: a bounded queue plus any backlog replayed on resume."""
+
+    def __init__(self, user_id: uuid.UUID, max_queue: int) -> None:
+        self.user_id = user_id
+        self.queue: asyncio.Queue[tuple[str | None, dict] | None] = asyncio.Queue(maxsize=max_queue)
+        self.backlog: list[tuple[str, dict]] = []
+        self.evicted = False
+
+    def offer(self, event_id: str | None, event: dict) -> bool:
+        """Queue an event without blocking; False if the queue is full."""
+        if self.evicted:
+            return True
+        try:
+            self.queue.put_nowait((event_id, event))
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def evict(self) -> None:
+        """Drop queued events and end the stream; the client resumes via Last-Event-ID."""
+        self.evicted = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def events(self) -> AsyncIterator[str]:
+        """Yield replayed backlog events, then live events, in SSE wire format."""
+        replayed_to: tuple[int, int] | None = None
+        for event_id, event in self.backlog:
+            replayed_to = _stream_id(event_id)
+            yield format_event(event, event_id)
+        self.backlog = []
+
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                return
+            event_id, event = item
+            # Live events that were also in the replayed backlog
+            if replayed_to and event_id and _stream_id(event_id) <= replayed_to:
+                continue
+            yield format_event(event, event_id)
+
 
 class SSEManager:
-    """Manages SSE connections per user using asyncio.Queue."""
-
-    def __init__(self) -> None:
-        self._connections: dict[uuid.UUID, list[asyncio.Queue]] = {}
-
-    async def connect(self, user_id: uuid.UUID) -> asyncio.Queue:
-        """Register a new SSE connection for a user."""
-        queue: asyncio.Queue = asyncio.Queue()
-        if user_id not in self._connections:
-            self._connections[user_id] = []
-        self._connections[user_id].append(queue)
-        logger.info("sse_connected", user_id=str(user_id), total=len(self._connections[user_id]))
-        return queue
-
-    def disconnect(self, user_id: uuid.UUID, queue: asyncio.Queue) -> None:
-        """Remove an SSE connection for a user."""
-        if user_id in self._connections:
+    """Per-process registry of SSE connections fed by one Redis subscription."""
+
+    def __init__(
+        self,
+        max_queue: int = 100,
+        heartbeat_seconds: float = 30.0,
+        backlog_size: int = 200,
+        backlog_ttl_seconds: int = 3600,
+    ) -> None:
+        self.max_queue = max_queue
+        self.heartbeat_seconds = heartbeat_seconds
+        self.backlog_size = backlog_size
+        self.backlog_ttl_seconds = backlog_ttl_seconds
+        self._connections: dict[uuid.UUID, list[SSEConnection]] = {}
+        self._listener: asyncio.Task | None = None
+        self._ticker: asyncio.Task | None = None
+        # Metrics
+        self.published = 0
+        self.delivered = 0
+        self.evicted = 0
+        self.local_fallbacks = 0
+
+    async def connect(self, user_id: uuid.UUID, last_event_id: str | None = None) -> SSEConnection:
+        """Register a new SSE connection, replaying the backlog after ``last_event_id``."""
+        self._ensure_background_tasks()
+        conn = SSEConnection(user_id, self.max_queue)
+        # Register before reading the backlog so nothing published in between is lost;
+        # overlap between the two is skipped in SSEConnection.events().
+        self._connections.setdefault(user_id, []).append(conn)
+        if last_event_id:
+            conn.backlog = await self._read_backlog(user_id, last_event_id)
+        logger.info(
+            "sse_connected",
+            user_id=str(user_id),
+            total=len(self._connections[user_id]),
+            replayed=len(conn.backlog),
+        )
+        return conn
+
+    def disconnect(self, conn: SSEConnection) -> None:
+        """Remove an SSE connection."""
+        conns = self._connections.get(conn.user_id)
+        if conns is not None:
             with contextlib.suppress(ValueError):
-                self._connections[user_id].remove(queue)
-            if not self._connections[user_id]:
-                del self._connections[user_id]
-        logger.info("sse_disconnected", user_id=str(user_id))
+                conns.remove(conn)
+            if not conns:
+                del self._connections[conn.user_id]
+        logger.info("sse_disconnected", user_id=str(conn.user_id), evicted=conn.evicted)
 
     async def push(self, user_id: uuid.UUID, event_data: dict) -> None:
-        """Push an event to all SSE connections for a user."""
-        queues = self._connections.get(user_id, [])
-        for queue in queues:
-            await queue.put(event_data)
+        """Publish an event to every SSE connection for a user, cluster-wide."""
+        try:
+            redis = await get_redis()
+            event_id = await redis.xadd(
+                _backlog_key(user_id),
+                {"e": json.dumps(event_data)},
+                maxlen=self.backlog_size,
+                approximate=True,
+            )
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.expire(_backlog_key(user_id), self.backlog_ttl_seconds)
+                pipe.publish(SSE_CHANNEL, json.dumps({"u": str(user_id), "id": event_id, "e": event_data}))
+                await pipe.execute()
+            self.published += 1
+        except Exception as e:
+            logger.warning("sse_publish_failed", user_id=str(user_id), error=str(e))
+            self.local_fallbacks += 1
+            self._dispatch(user_id, None, event_data)
+
+    def _dispatch(self, user_id: uuid.UUID, event_id: str | None, event: dict) -> None:
+        for conn in list(self._connections.get(user_id, [])):
+            if conn.offer(event_id, event):
+                self.delivered += 1
+            else:
+                conn.evict()
+                self.evicted += 1
+                logger.warning("sse_slow_consumer_evicted", user_id=str(user_id), max_queue=self.max_queue)
+
+    async def _read_backlog(self, user_id: uuid.UUID, last_event_id: str) -> list[tuple[str, dict]]:
+        try:
+            _stream_id(last_event_id)
+        except ValueError:
+            return []
+        try:
+            redis = await get_redis()
+            entries = await redis.xrange(_backlog_key(user_id), min=f"({last_event_id}", max="+")
+        except Exception as e:
+            logger.warning("sse_backlog_read_failed", user_id=str(user_id), error=str(e))
+            return []
+        return [(event_id, json.loads(fields["e"])) for event_id, fields in entries]
+
+    # ── Background tasks ──────────────────────────────────────────────────────
+
+    def _ensure_background_tasks(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(), name="sse-listener")
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.create_task(self._heartbeat(), name="sse-heartbeat")
+
+    async def _listen(self) -> None:
+        """Single per-process subscription; reconnects with backoff on errors."""
+        backoff = 1.0
+        while True:
+            try:
+                redis = await get_redis()
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(SSE_CHANNEL)
+                    backoff = 1.0
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        self._handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("sse_listener_error", error=str(e), retry_in=backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _handle_message(self, raw: str) -> None:
+        try:
+            payload = json.loads(raw)
+            user_id = uuid.UUID(payload["u"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("sse_bad_message")
+            return
+        if user_id in self._connections:
+            self._dispatch(user_id, payload.get("id"), payload["e"])
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            for conns in list(self._connections.values()):
+                for conn in conns:
+                    conn.offer(None, _HEARTBEAT)  # a full queue already has data pending
+
+    async def close(self) -> None:
+        """Stop the subscription and heartbeat ticker, ending all local streams."""
+        for task in (self._listener, self._ticker):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._listener = self._ticker = None
+        for conns in list(self._connections.values()):
+            for conn in conns:
+                conn.evict()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "users": len(self._connections),
+            "connections": sum(len(c) for c in self._connections.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "evicted": self.evicted,
+            "local_fallbacks": self.local_fallbacks,
+        }
 
 
 # Module-level singleton
-sse_manager = SSEManager()
+sse_manager = SSEManager(
+    max_queue=settings.SSE_QUEUE_SIZE,
+    heartbeat_seconds=settings.SSE_HEARTBEAT_SECONDS,
+    backlog_size=settings.SSE_BACKLOG_SIZE,
+    backlog_ttl_seconds=settings.SSE_BACKLOG_TTL_SECONDS,
+)
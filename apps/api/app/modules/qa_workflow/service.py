@@ -6,13 +6,11 @@ import uuid
 from datetime import datetime, timedelta
 from typing import ClassVar
 
-import httpx
 import structlog
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.config import settings
 from app.models.qa import QAAnswer, QAQuestion
 from app.modules.qa_workflow.schemas import (
     QAAnswerCreate,
@@ -20,6 +18,7 @@ from app.modules.qa_workflow.schemas import (
     QAQuestionUpdate,
     QAStatsResponse,
 )
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -189,15 +188,13 @@ class QAService:
         )
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.post(
-                    f"{settings.AI_GATEWAY_URL}/v1/completions",
-                    json={
-                        "task_type": "general",
-                        "messages": [{"role": "user", "content": prompt}],
-                    },
-                    headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-                )
+            resp = await gateway_client().post(
+                "/v1/completions",
+                json={
+                    "task_type": "general",
+                    "messages": [{"role": "user", "content": prompt}],
+                },
+            )
             resp.raise_for_status()
             data = resp.json()
             suggestion = data.get("content", "")
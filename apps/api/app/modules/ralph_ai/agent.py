@@ -1,21 +1,26 @@
 """Ralph AI — agentic loop with tool use and streaming support."""
 
+import asyncio
 import json
+import time
 import uuid
 from collections.abc import AsyncGenerator
+from dataclasses import dataclass
 from typing import Any
 
 import httpx
 import structlog
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.circuit_breaker import AIGatewayUnavailableError, ai_gateway_cb
+from app.core.circuit_breaker import AIGatewayUnavailableError
 from app.core.config import settings
+from app.core.database import async_session_factory
 from app.models.ai import AIMessage
 from app.models.enums import AIMessageRole
 from app.modules.ralph_ai import service
 from app.modules.ralph_ai.context_manager import ContextWindowManager, GatewayAIClient
-from app.modules.ralph_ai.tools import RALPH_TOOL_DEFINITIONS, RalphTools
+from app.modules.ralph_ai.tools import RALPH_TOOL_DEFINITIONS, RalphTools, ToolResultMemo
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -60,56 +65,115 @@ MAX_TOOL_ITERATIONS = 10
 RAG_MAX_CHARS = 3000  # ~750 tokens — fits within context budget
 
 
-async def _fetch_rag_context(
-    gateway_url: str,
-    gateway_key: str,
-    query: str,
-    org_id: uuid.UUID,
-) -> str:
+async def _fetch_rag_context(query: str, org_id: uuid.UUID) -> str:
     """Search relevant documents via AI Gateway and return a condensed context string."""
-    if not await ai_gateway_cb.allow_request():
-        logger.debug("ralph_rag_skipped", reason="circuit_breaker_open")
-        return ""
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(
-                f"{gateway_url}/v1/search",
-                json={"query": query, "org_id": str(org_id), "top_k": 5},
-                headers={"Authorization": f"Bearer {gateway_key}"},
-            )
-            if resp.status_code != 200:
-                return ""
-            await ai_gateway_cb.record_success()
-            data = resp.json()
-            chunks: list[dict] = data.get("results", data.get("chunks", []))
-            if not chunks:
-                return ""
-            parts: list[str] = []
-            for chunk in chunks:
-                text = chunk.get("text") or chunk.get("content") or ""
-                source = chunk.get("source") or chunk.get("document_name") or ""
-                if text:
-                    header = f"[{source}]" if source else ""
-                    parts.append(f"{header}\n{text}".strip())
-            combined = "\n\n---\n\n".join(parts)
-            return combined[:RAG_MAX_CHARS]
-    except (httpx.TimeoutException, httpx.ConnectError) as e:
-        await ai_gateway_cb.record_failure()
-        logger.debug("ralph_rag_fetch_failed", error=str(e))
+        resp = await gateway_client().post(
+            "/v1/search",
+            json={"query": query, "org_id": str(org_id), "top_k": 5},
+            timeout=15.0,
+        )
+        if resp.status_code != 200:
+            return ""
+        data = resp.json()
+        chunks: list[dict] = data.get("results", data.get("chunks", []))
+        if not chunks:
+            return ""
+        parts: list[str] = []
+        for chunk in chunks:
+            text = chunk.get("text") or chunk.get("content") or ""
+            source = chunk.get("source") or chunk.get("document_name") or ""
+            if text:
+                header = f"[{source}]" if source else ""
+                parts.append(f"{header}\n{text}".strip())
+        combined = "\n\n---\n\n".join(parts)
+        return combined[:RAG_MAX_CHARS]
+    except AIGatewayUnavailableError:
+        logger.debug("ralph_rag_skipped", reason="circuit_breaker_open")
         return ""
     except Exception as e:
         logger.debug("ralph_rag_fetch_failed", error=str(e))
         return ""
 
+@dataclass
+class ToolTiming:
+    """Tool execution accounting for one assistant message."""
+
+    calls: int = 0
+    memo_hits: int = 0
+    tool_ms: float = 0.0  # summed duration of the calls actually executed
+    wall_ms: float = 0.0  # elapsed time of the tool phases
+    memo_saved_ms: float = 0.0  # original cost of calls served from the memo
+
+    @property
+    def saved_ms(self) -> float:
+        """Memo hits plus the overlap gained by running calls concurrently."""
+        return self.memo_saved_ms + max(0.0, self.tool_ms - self.wall_ms)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "memo_hits": self.memo_hits,
+            "tool_ms": round(self.tool_ms, 1),
+            "wall_ms": round(self.wall_ms, 1),
+            "saved_ms": round(self.saved_ms, 1),
+        }
+
 
 class RalphAgent:
     """Tool-using agentic loop for Ralph AI."""
 
-    def __init__(self) -> None:
-        self._gateway_url = settings.AI_GATEWAY_URL
-        self._gateway_key = settings.AI_GATEWAY_API_KEY
-        _ai_client = GatewayAIClient(self._gateway_url, self._gateway_key)
-        self.context_manager = ContextWindowManager(_ai_client)
+    def __init__(
+        self, session_factory: async_sessionmaker[AsyncSession] | None = None
+    ) -> None:
+        self.context_manager = ContextWindowManager(GatewayAIClient())
+        self.session_factory = session_factory or async_session_factory
+        self.tool_memo = ToolResultMemo()
+
+    async def _run_tool_calls(
+        self,
+        tools: RalphTools,
+        conversation_id: uuid.UUID,
+        tool_calls: list[dict[str, Any]],
+        timing: ToolTiming,
+    ) -> list[dict[str, Any]]:
+        """Run one turn's tool calls concurrently; results come back in call order.
+
+        Memoised results are served without a slot; the rest run at most
+        ``RALPH_TOOL_CONCURRENCY`` at a time within this turn, each on its own
+        pooled session. The agent is a process-wide singleton, so the cap is
+        per turn — one user's slow tools never hold up another conversation.
+        """
+        parsed: list[tuple[str, dict[str, Any]]] = []
+        for tc in tool_calls:
+            fn_name = tc["function"]["name"]
+            try:
+                fn_args = json.loads(tc["function"]["arguments"])
+            except (json.JSONDecodeError, KeyError):
+                fn_args = {}
+            logger.info("ralph_tool_call", tool=fn_name, args=fn_args)
+            parsed.append((fn_name, fn_args))
+        slots = asyncio.Semaphore(settings.RALPH_TOOL_CONCURRENCY)
+
+        async def _run(fn_name: str, fn_args: dict[str, Any]) -> dict[str, Any]:
+            hit = self.tool_memo.get(conversation_id, fn_name, fn_args)
+            if hit is not None:
+                timing.memo_hits += 1
+                timing.memo_saved_ms += hit[1]
+                return hit[0]
+            async with slots:
+                started = time.perf_counter()
+                result = await tools.execute(fn_name, fn_args)
+                cost_ms = (time.perf_counter() - started) * 1000
+            timing.tool_ms += cost_ms
+            self.tool_memo.put(conversation_id, fn_name, fn_args, result, cost_ms)
+            return result
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(_run(name, args) for name, args in parsed))
+        timing.wall_ms += (time.perf_counter() - started) * 1000
+        timing.calls += len(parsed)
+        return list(results)
 
     async def process_message(
         self,
@@ -136,9 +200,7 @@ class RalphAgent:
             if full_history and full_history[-1].role == AIMessageRole.USER
             else full_history
         )
-        rag_context = await _fetch_rag_context(
-            self._gateway_url, self._gateway_key, user_content, org_id
-        )
+        rag_context = await _fetch_rag_context(user_content, org_id)
         messages = await self.context_manager.prepare_context(
             system_prompt=RALPH_SYSTEM_PROMPT,
             tool_definitions=RALPH_TOOL_DEFINITIONS,
@@ -148,7 +210,8 @@ class RalphAgent:
         )
 
         # 3. Agentic loop
-        tools_instance = RalphTools(db=db, org_id=org_id)
+        tools_instance = RalphTools(db=db, org_id=org_id, session_factory=self.session_factory)
+        timing = ToolTiming()
         all_tool_calls: list[dict[str, Any]] = []
         all_tool_results: list[dict[str, Any]] = []
         final_content = ""
@@ -158,8 +221,6 @@ class RalphAgent:
 
         for _iteration in range(MAX_TOOL_ITERATIONS):
             result = await _call_gateway_with_tools(
-                gateway_url=self._gateway_url,
-                gateway_key=self._gateway_key,
                 messages=messages,
                 tools=RALPH_TOOL_DEFINITIONS,
             )
@@ -182,17 +243,12 @@ class RalphAgent:
                 }
                 messages.append(assistant_turn)
 
-                # Execute each tool
-                for tc in tool_calls:
-                    fn_name = tc["function"]["name"]
-                    try:
-                        fn_args = json.loads(tc["function"]["arguments"])
-                    except (json.JSONDecodeError, KeyError):
-                        fn_args = {}
-
-                    logger.info("ralph_tool_call", tool=fn_name, args=fn_args)
-                    tool_result = await tools_instance.execute(fn_name, fn_args)
-                    all_tool_results.append({"tool": fn_name, "result": tool_result})
+                # Execute the turn's tools concurrently
+                tool_results = await self._run_tool_calls(
+                    tools_instance, conversation_id, tool_calls, timing
+                )
+                for tc, tool_result in zip(tool_calls, tool_results, strict=True):
+                    all_tool_results.append({"tool": tc["function"]["name"], "result": tool_result})
 
                     # Append tool result message
                     messages.append(
@@ -209,13 +265,16 @@ class RalphAgent:
                 break
 
         # 4. Save assistant message
+        _log_tool_timing(conversation_id, timing)
         assistant_msg = await service.append_message(
             db,
             conversation_id,
             AIMessageRole.ASSISTANT,
             final_content,
             tool_calls={"calls": all_tool_calls} if all_tool_calls else None,
-            tool_results={"results": all_tool_results} if all_tool_results else None,
+            tool_results={"results": all_tool_results, "timing": timing.as_dict()}
+            if all_tool_results
+            else None,
             model_used=model_used,
             tokens_in=tokens_in,
             tokens_out=tokens_out,
@@ -250,9 +309,7 @@ class RalphAgent:
             if full_history and full_history[-1].role == AIMessageRole.USER
             else full_history
         )
-        rag_context = await _fetch_rag_context(
-            self._gateway_url, self._gateway_key, user_content, org_id
-        )
+        rag_context = await _fetch_rag_context(user_content, org_id)
         messages = await self.context_manager.prepare_context(
             system_prompt=RALPH_SYSTEM_PROMPT,
             tool_definitions=RALPH_TOOL_DEFINITIONS,
@@ -261,7 +318,8 @@ class RalphAgent:
             new_message=user_content,
         )
 
-        tools_instance = RalphTools(db=db, org_id=org_id)
+        tools_instance = RalphTools(db=db, org_id=org_id, session_factory=self.session_factory)
+        timing = ToolTiming()
         all_tool_calls: list[dict[str, Any]] = []
         all_tool_results: list[dict[str, Any]] = []
         model_used = "claude-sonnet-4-20250514"
@@ -271,8 +329,6 @@ class RalphAgent:
         # Phase 1: Tool loop
         for _iteration in range(MAX_TOOL_ITERATIONS):
             result = await _call_gateway_with_tools(
-                gateway_url=self._gateway_url,
-                gateway_key=self._gateway_key,
                 messages=messages,
                 tools=RALPH_TOOL_DEFINITIONS,
             )
@@ -294,14 +350,12 @@ class RalphAgent:
                 messages.append(assistant_turn)
 
                 for tc in tool_calls:
+                    yield {"type": "tool_call", "name": tc["function"]["name"], "status": "running"}
+                tool_results = await self._run_tool_calls(
+                    tools_instance, conversation_id, tool_calls, timing
+                )
+                for tc, tool_result in zip(tool_calls, tool_results, strict=True):
                     fn_name = tc["function"]["name"]
-                    try:
-                        fn_args = json.loads(tc["function"]["arguments"])
-                    except (json.JSONDecodeError, KeyError):
-                        fn_args = {}
-
-                    yield {"type": "tool_call", "name": fn_name, "status": "running"}
-                    tool_result = await tools_instance.execute(fn_name, fn_args)
                     all_tool_results.append({"tool": fn_name, "result": tool_result})
                     yield {
                         "type": "tool_call",
@@ -323,35 +377,23 @@ class RalphAgent:
 
         # Phase 2: Stream final response
         final_content_parts: list[str] = []
-        if not await ai_gateway_cb.allow_request():
-            raise AIGatewayUnavailableError()
         try:
-            async with (
-                httpx.AsyncClient(timeout=120.0) as client,
-                client.stream(
-                    "POST",
-                    f"{self._gateway_url}/v1/completions/stream",
-                    json={
-                        "messages": messages,
-                        "task_type": "chat_with_tools",
-                        "org_id": str(org_id),
-                    },
-                    headers={"Authorization": f"Bearer {self._gateway_key}"},
-                ) as resp,
-            ):
+            async with gateway_client().stream(
+                "/v1/completions/stream",
+                json={
+                    "messages": messages,
+                    "task_type": "chat_with_tools",
+                    "org_id": str(org_id),
+                },
+            ) as resp:
                 if resp.status_code != 200:
                     # Fall back to non-streaming
-                    fallback = await _call_gateway_with_tools(
-                        gateway_url=self._gateway_url,
-                        gateway_key=self._gateway_key,
-                        messages=messages,
-                    )
+                    fallback = await _call_gateway_with_tools(messages=messages)
                     content = fallback.get("content", "")
                     final_content_parts.append(content)
                     tokens_out += fallback.get("usage", {}).get("completion_tokens", 0)
                     yield {"type": "token", "content": content}
                 else:
-                    await ai_gateway_cb.record_success()
                     async for line in resp.aiter_lines():
                         if line.startswith("data: "):
                             raw = line[6:]
@@ -366,7 +408,6 @@ class RalphAgent:
                             except json.JSONDecodeError:
                                 pass
         except (httpx.TimeoutException, httpx.ConnectError) as e:
-            await ai_gateway_cb.record_failure()
             logger.warning("ralph_stream_error", error=str(e))
             raise AIGatewayUnavailableError() from e
         except AIGatewayUnavailableError:
@@ -374,11 +415,7 @@ class RalphAgent:
         except Exception as e:
             logger.warning("ralph_stream_error", error=str(e))
             # Non-streaming fallback
-            fallback = await _call_gateway_with_tools(
-                gateway_url=self._gateway_url,
-                gateway_key=self._gateway_key,
-                messages=messages,
-            )
+            fallback = await _call_gateway_with_tools(messages=messages)
             content = fallback.get("content", "")
             final_content_parts.append(content)
             yield {"type": "token", "content": content}
@@ -386,24 +423,35 @@ class RalphAgent:
         final_content = "".join(final_content_parts)
 
         # Phase 3: Save and yield done
+        _log_tool_timing(conversation_id, timing)
         assistant_msg = await service.append_message(
             db,
             conversation_id,
             AIMessageRole.ASSISTANT,
             final_content,
             tool_calls={"calls": all_tool_calls} if all_tool_calls else None,
-            tool_results={"results": all_tool_results} if all_tool_results else None,
+            tool_results={"results": all_tool_results, "timing": timing.as_dict()}
+            if all_tool_results
+            else None,
             model_used=model_used,
             tokens_in=tokens_in,
             tokens_out=tokens_out,
         )
 
-        yield {"type": "done", "message_id": str(assistant_msg.id)}
+        done: dict[str, Any] = {"type": "done", "message_id": str(assistant_msg.id)}
+        if timing.calls:
+            done["tool_timing"] = timing.as_dict()
+        yield done
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 
+def _log_tool_timing(conversation_id: uuid.UUID, timing: ToolTiming) -> None:
+    if timing.calls:
+        logger.info("ralph_tool_timing", conversation_id=str(conversation_id), **timing.as_dict())
+
+
 def _history_to_dicts(history: list[AIMessage]) -> list[dict[str, Any]]:
     """Convert DB AIMessage objects to plain dicts for the context manager."""
     result: list[dict[str, Any]] = []
@@ -456,14 +504,10 @@ def _build_messages_for_llm(history: list[AIMessage]) -> list[dict[str, Any]]:
 
 
 async def _call_gateway_with_tools(
-    gateway_url: str,
-    gateway_key: str,
     messages: list[dict[str, Any]],
     tools: list[dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
     """Call the AI gateway completions endpoint with optional tools."""
-    if not await ai_gateway_cb.allow_request():
-        raise AIGatewayUnavailableError()
 
     payload: dict[str, Any] = {
         "messages": messages,
@@ -474,17 +518,12 @@ async def _call_gateway_with_tools(
         payload["tool_choice"] = "auto"
 
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            resp = await client.post(
-                f"{gateway_url}/v1/completions",
-                json=payload,
-                headers={"Authorization": f"Bearer {gateway_key}"},
-            )
-            resp.raise_for_status()
-            await ai_gateway_cb.record_success()
-            return resp.json()
+        resp = await gateway_client().post("/v1/completions", json=payload)
+        resp.raise_for_status()
+        return resp.json()
+    except AIGatewayUnavailableError:
+        raise
     except (httpx.TimeoutException, httpx.ConnectError) as e:
-        await ai_gateway_cb.record_failure()
         logger.error("gateway_call_failed", error=str(e))
         raise AIGatewayUnavailableError() from e
     except Exception as e:
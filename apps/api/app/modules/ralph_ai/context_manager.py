@@ -24,7 +24,8 @@ from typing import Any
 import httpx
 import structlog
 
-from app.core.circuit_breaker import AIGatewayUnavailableError, ai_gateway_cb
+from app.core.circuit_breaker import AIGatewayUnavailableError
+from app.services.gateway_client import GatewayClient, gateway_client
 
 logger = structlog.get_logger()
 
@@ -40,9 +41,8 @@ class _CompletionResult:
 class GatewayAIClient:
     """Thin adapter that calls the AI gateway for Haiku summarisation requests."""
 
-    def __init__(self, gateway_url: str, gateway_key: str) -> None:
-        self._url = gateway_url
-        self._key = gateway_key
+    def __init__(self, client: GatewayClient | None = None) -> None:
+        self._client = client or gateway_client()
 
     async def complete(
         self,
@@ -51,9 +51,6 @@ class GatewayAIClient:
         max_tokens: int = 200,
         temperature: float = 0.1,
     ) -> _CompletionResult:
-        if not await ai_gateway_cb.allow_request():
-            raise AIGatewayUnavailableError()
-
         payload = {
             "messages": messages,
             "model": model,
@@ -62,18 +59,11 @@ class GatewayAIClient:
             "task_type": "summarize_document",
         }
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.post(
-                    f"{self._url}/v1/completions",
-                    json=payload,
-                    headers={"Authorization": f"Bearer {self._key}"},
-                )
-                resp.raise_for_status()
-                await ai_gateway_cb.record_success()
-                data = resp.json()
-                return _CompletionResult(content=data.get("content", ""))
+            resp = await self._client.post("/v1/completions", json=payload)
+            resp.raise_for_status()
+            data = resp.json()
+            return _CompletionResult(content=data.get("content", ""))
         except (httpx.TimeoutException, httpx.ConnectError) as exc:
-            await ai_gateway_cb.record_failure()
             logger.warning("context_manager_summarize_failed", error=str(exc))
             raise AIGatewayUnavailableError() from exc
         except AIGatewayUnavailableError:
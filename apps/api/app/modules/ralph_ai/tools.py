@@ -1,39 +1,151 @@
 """Ralph AI — tool implementations that call existing SCR service layers."""
 
+import asyncio
+import json
+import time
 import uuid
+from collections import OrderedDict
 from typing import Any
 
-import httpx
 import structlog
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.circuit_breaker import ai_gateway_cb
-from app.core.config import settings
+from app.core.circuit_breaker import AIGatewayUnavailableError
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
 
+# Read-only tools whose results are reused within a conversation, with TTL (seconds)
+TOOL_MEMO_TTL_SECONDS: dict[str, float] = {
+    "get_project_details": 300.0,
+    "get_signal_score": 120.0,
+    "get_risk_assessment": 120.0,
+    "get_portfolio_metrics": 120.0,
+    "search_documents": 60.0,
+}
+
+# Tools that never use ``self.db`` directly: gateway-only calls, and composites
+# that fan out through ``_isolated`` themselves
+_SESSIONLESS_TOOLS = frozenset(
+    {
+        "search_documents",
+        "generate_report_section",
+        "deep_dive_project",
+        "portfolio_health_check",
+        "deal_readiness_check",
+    }
+)
+
+
+class ToolResultMemo:
+    """Per-conversation (tool, args) → result memo for read-only tools.
+
+    Lives on the process-wide ``RalphAgent`` so repeated lookups across tool
+    iterations and turns of one conversation are served from memory. Errors
+    are never stored; least recently used conversations are dropped first.
+    """
+
+    def __init__(
+        self,
+        ttls: dict[str, float] | None = None,
+        max_conversations: int = 1_000,
+    ) -> None:
+        self.ttls = TOOL_MEMO_TTL_SECONDS if ttls is None else ttls
+        self.max_conversations = max_conversations
+        self._entries: OrderedDict[uuid.UUID, dict[tuple[str, str], tuple[float, dict, float]]] = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def _key(tool_name: str, tool_input: dict[str, Any]) -> tuple[str, str]:
+        return tool_name, json.dumps(tool_input, sort_keys=True, default=str)
+
+    def get(
+        self, conversation_id: uuid.UUID, tool_name: str, tool_input: dict[str, Any]
+    ) -> tuple[dict[str, Any], float] | None:
+        """Return (result, original cost in ms) or None on a miss."""
+        entries = self._entries.get(conversation_id)
+        if not entries or tool_name not in self.ttls:
+            return None
+        self._entries.move_to_end(conversation_id)
+        key = self._key(tool_name, tool_input)
+        hit = entries.get(key)
+        if hit is None:
+            return None
+        expires_at, result, cost_ms = hit
+        if expires_at < time.monotonic():
+            del entries[key]
+            return None
+        return result, cost_ms
+
+    def put(
+        self,
+        conversation_id: uuid.UUID,
+        tool_name: str,
+        tool_input: dict[str, Any],
+        result: dict[str, Any],
+        cost_ms: float,
+    ) -> None:
+        ttl = self.ttls.get(tool_name)
+        if ttl is None or "error" in result:
+            return
+        entries = self._entries.setdefault(conversation_id, {})
+        self._entries.move_to_end(conversation_id)
+        entries[self._key(tool_name, tool_input)] = (time.monotonic() + ttl, result, cost_ms)
+        while len(self._entries) > self.max_conversations:
+            self._entries.popitem(last=False)
+
+
 class RalphTools:
-    """Executes Ralph's 19 tools by delegating to existing SCR service layers."""
+    """Executes Ralph's 19 tools by delegating to existing SCR service layers.
+
+    With a ``session_factory`` every call runs on its own pooled session, so
+    tool calls (and the sub-queries of composite tools) can run concurrently;
+    an ``AsyncSession`` must never be shared between concurrent tasks.
+    Without one, calls share ``db`` and are serialised.
+    """
 
-    def __init__(self, db: AsyncSession, org_id: uuid.UUID) -> None:
+    def __init__(
+        self,
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
         self.db = db
         self.org_id = org_id
-        self._gateway_url = settings.AI_GATEWAY_URL
-        self._gateway_key = settings.AI_GATEWAY_API_KEY
+        self._session_factory = session_factory
+        self._db_lock = asyncio.Lock()
 
     async def execute(self, tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any]:
         """Dispatch a tool call by name and return the result."""
-        handler = getattr(self, f"_tool_{tool_name}", None)
-        if handler is None:
+        if getattr(self, f"_tool_{tool_name}", None) is None:
             return {"error": f"Unknown tool: {tool_name}"}
         try:
-            return await handler(**tool_input)
+            return await self._isolated(tool_name, **tool_input)
         except Exception as e:
             logger.warning("ralph_tool_error", tool=tool_name, error=str(e))
             return {"error": str(e)}
 
+    async def _isolated(self, tool_name: str, **tool_input: Any) -> dict[str, Any]:
+        """Run one tool without sharing a session with any concurrently running tool."""
+        handler = getattr(self, f"_tool_{tool_name}")
+        if tool_name in _SESSIONLESS_TOOLS:
+            return await handler(**tool_input)
+        if self._session_factory is None:
+            async with self._db_lock:
+                return await handler(**tool_input)
+        async with self._session_factory() as session:
+            tools = RalphTools(session, self.org_id)
+            try:
+                result = await getattr(tools, f"_tool_{tool_name}")(**tool_input)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        return result
+
     # ── Project tools ─────────────────────────────────────────────────────────
 
     async def _tool_get_project_details(self, project_id: str) -> dict[str, Any]:
@@ -172,29 +284,20 @@ class RalphTools:
         self, query: str, project_id: str | None = None
     ) -> dict[str, Any]:
         """Search documents via AI gateway RAG endpoint."""
-        if not await ai_gateway_cb.allow_request():
-            return {"results": [], "error": "AI service temporarily unavailable"}
+        payload: dict[str, Any] = {
+            "query": query,
+            "org_id": str(self.org_id),
+            "limit": 5,
+        }
+        if project_id:
+            payload["entity_id"] = project_id
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                payload: dict[str, Any] = {
-                    "query": query,
-                    "org_id": str(self.org_id),
-                    "limit": 5,
-                }
-                if project_id:
-                    payload["entity_id"] = project_id
-                resp = await client.post(
-                    f"{self._gateway_url}/v1/search",
-                    json=payload,
-                    headers={"Authorization": f"Bearer {self._gateway_key}"},
-                )
-                if resp.status_code == 200:
-                    await ai_gateway_cb.record_success()
-                    return resp.json()
-                return {"results": [], "error": f"Search unavailable (status {resp.status_code})"}
-        except (httpx.TimeoutException, httpx.ConnectError) as e:
-            await ai_gateway_cb.record_failure()
-            return {"results": [], "error": str(e)}
+            resp = await gateway_client().post("/v1/search", json=payload, timeout=30.0)
+            if resp.status_code == 200:
+                return resp.json()
+            return {"results": [], "error": f"Search unavailable (status {resp.status_code})"}
+        except AIGatewayUnavailableError:
+            return {"results": [], "error": "AI service temporarily unavailable"}
         except Exception as e:
             return {"results": [], "error": str(e)}
 
@@ -202,27 +305,21 @@ class RalphTools:
         self, topic: str, context: str, section_type: str = "analysis"
     ) -> dict[str, Any]:
         """Generate a report section via AI gateway."""
-        if not await ai_gateway_cb.allow_request():
-            return {"content": "", "error": "AI service temporarily unavailable"}
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                resp = await client.post(
-                    f"{self._gateway_url}/v1/completions",
-                    json={
-                        "task_type": "generate_section",
-                        "prompt": f"Write a {section_type} section about: {topic}\n\nContext:\n{context}",
-                        "org_id": str(self.org_id),
-                    },
-                    headers={"Authorization": f"Bearer {self._gateway_key}"},
-                )
-                if resp.status_code == 200:
-                    await ai_gateway_cb.record_success()
-                    data = resp.json()
-                    return {"content": data.get("content", ""), "model": data.get("model_used")}
-                return {"content": "", "error": f"Generation failed (status {resp.status_code})"}
-        except (httpx.TimeoutException, httpx.ConnectError) as e:
-            await ai_gateway_cb.record_failure()
-            return {"content": "", "error": str(e)}
+            resp = await gateway_client().post(
+                "/v1/completions",
+                json={
+                    "task_type": "generate_section",
+                    "prompt": f"Write a {section_type} section about: {topic}\n\nContext:\n{context}",
+                    "org_id": str(self.org_id),
+                },
+            )
+            if resp.status_code == 200:
+                data = resp.json()
+                return {"content": data.get("content", ""), "model": data.get("model_used")}
+            return {"content": "", "error": f"Generation failed (status {resp.status_code})"}
+        except AIGatewayUnavailableError:
+            return {"content": "", "error": "AI service temporarily unavailable"}
         except Exception as e:
             return {"content": "", "error": str(e)}
 
@@ -437,15 +534,17 @@ class RalphTools:
 
     async def _tool_deep_dive_project(self, project_id: str) -> dict[str, Any]:
         """Comprehensive project analysis — chains 6 tools concurrently."""
-        import asyncio
-
         results = await asyncio.gather(
-            self._tool_get_project_details(project_id),
-            self._tool_get_signal_score(project_id),
-            self._tool_get_risk_assessment(project_id, "project"),
-            self._tool_search_documents("business plan overview financials", project_id=project_id),
-            self._tool_run_valuation(project_id),
-            self._tool_find_matching_investors(project_id, limit=3),
+            self._isolated("get_project_details", project_id=project_id),
+            self._isolated("get_signal_score", project_id=project_id),
+            self._isolated("get_risk_assessment", entity_id=project_id, entity_type="project"),
+            self._isolated(
+                "search_documents",
+                query="business plan overview financials",
+                project_id=project_id,
+            ),
+            self._isolated("run_valuation", project_id=project_id),
+            self._isolated("find_matching_investors", project_id=project_id, limit=3),
             return_exceptions=True,
         )
         keys = ["project", "signal_score", "risk", "documents", "valuation", "matching_investors"]
@@ -456,16 +555,20 @@ class RalphTools:
 
     async def _tool_portfolio_health_check(self, portfolio_id: str | None = None) -> dict[str, Any]:
         """Portfolio-wide health check — chains 3 tools concurrently."""
-        import asyncio
-
-        portfolio_result = await self._tool_get_portfolio_metrics(portfolio_id)
+        portfolio_result = await self._isolated("get_portfolio_metrics", portfolio_id=portfolio_id)
         pid = portfolio_result.get("portfolio_id") if "error" not in portfolio_result else None
 
         async def _no_portfolio() -> dict[str, Any]:
             return {"error": "No portfolio found"}
 
-        risk_coro = self._tool_get_risk_assessment(pid, "portfolio") if pid else _no_portfolio()
-        docs_coro = self._tool_search_documents("compliance regulatory reporting portfolio")
+        risk_coro = (
+            self._isolated("get_risk_assessment", entity_id=pid, entity_type="portfolio")
+            if pid
+            else _no_portfolio()
+        )
+        docs_coro = self._isolated(
+            "search_documents", query="compliance regulatory reporting portfolio"
+        )
 
         risk_result, docs_result = await asyncio.gather(
             risk_coro, docs_coro, return_exceptions=True
@@ -483,14 +586,16 @@ class RalphTools:
 
     async def _tool_deal_readiness_check(self, project_id: str) -> dict[str, Any]:
         """Deal readiness assessment — chains 4 tools concurrently."""
-        import asyncio
-
-        signal_coro = self._tool_get_signal_score(project_id)
-        docs_coro = self._tool_search_documents(
-            "term sheet subscription agreement legal document", project_id=project_id
+        signal_coro = self._isolated("get_signal_score", project_id=project_id)
+        docs_coro = self._isolated(
+            "search_documents",
+            query="term sheet subscription agreement legal document",
+            project_id=project_id,
+        )
+        improvement_coro = self._isolated("get_improvement_plan", project_id=project_id)
+        risk_coro = self._isolated(
+            "get_risk_assessment", entity_id=project_id, entity_type="project"
         )
-        improvement_coro = self._tool_get_improvement_plan(project_id)
-        risk_coro = self._tool_get_risk_assessment(project_id, "project")
 
         signal, docs, improvement, risk = await asyncio.gather(
             signal_coro, docs_coro, improvement_coro, risk_coro, return_exceptions=True
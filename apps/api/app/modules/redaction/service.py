@@ -5,14 +5,13 @@ from __future__ import annotations
 import json
 import uuid
 
-import httpx
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.models.redaction import RedactionJob
 from app.modules.redaction.schemas import ENTITY_TYPES, HIGH_SENSITIVITY
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -73,16 +72,14 @@ class RedactionService:
         )
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                resp = await client.post(
-                    f"{settings.AI_GATEWAY_URL}/v1/completions",
-                    json={
-                        "prompt": prompt,
-                        "task_type": "detect_redactable",
-                        "max_tokens": 2000,
-                    },
-                    headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-                )
+            resp = await gateway_client().post(
+                "/v1/completions",
+                json={
+                    "prompt": prompt,
+                    "task_type": "detect_redactable",
+                    "max_tokens": 2000,
+                },
+            )
             resp.raise_for_status()
             if resp.status_code == 200:
                 content = resp.json().get("content", "[]")
@@ -56,6 +56,7 @@ from app.modules.risk.schemas import (
     ScenarioResult,
     TaxonomyResult,
 )
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -1347,8 +1348,6 @@ async def generate_domain_mitigation(
     domain: str,
 ) -> MitigationResponse:
     """Call AI Gateway to generate mitigation strategies for a risk domain."""
-    import httpx
-
     from app.core.config import settings
     from app.modules.risk.service import _get_portfolio_or_raise as _gp
 
@@ -1405,12 +1404,11 @@ async def generate_domain_mitigation(
                 _payload["messages"] = _registry_messages
             else:
                 _payload["prompt"] = prompt
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.post(
-                    f"{settings.AI_GATEWAY_URL}/v1/completions",
-                    json=_payload,
-                    headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-                )
+            resp = await gateway_client().post(
+                "/v1/completions",
+                json=_payload,
+                timeout=30.0,
+            )
             if resp.status_code == 200:
                 content = resp.json().get("content", "")
                 import json as _json
@@ -0,0 +1,436 @@
+"""Streaming ElasticSearch reindexer.
+
+Rows are paged out of Postgres through server-side cursors (``yield_per``)
+and sent as bounded ``_bulk`` chunks, with at most ``BULK_CONCURRENCY``
+requests in flight — memory stays flat regardless of tenant volume.
+
+Two modes:
+
+* ``full`` — builds a fresh versioned index per entity type (e.g.
+  ``scr_projects_1718000000``) and atomically swaps the public alias onto it
+  only once every row is indexed, so search keeps serving the old index
+  throughout. A run with bulk errors drops the new index instead.
+  A pre-alias concrete index of the same name is replaced in the same swap.
+* ``incremental`` — re-sends only rows whose ``updated_at`` is at or after
+  the newest ``updated_at`` already in the index (the watermark), and
+  deletes rows that have since been soft-deleted or unpublished.
+
+Progress and throughput for the current/last run are kept in-process and
+served by ``GET /search/reindex/status``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+import structlog
+from elasticsearch import AsyncElasticsearch
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.elasticsearch import (
+    INDEX_DOCUMENTS,
+    INDEX_MARKETPLACE,
+    INDEX_PROJECTS,
+    index_definition,
+)
+from app.models.dataroom import Document, DocumentExtraction
+from app.models.enums import DocumentStatus, ExtractionType, ListingStatus
+from app.models.marketplace import Listing
+from app.models.projects import Project
+
+logger = structlog.get_logger()
+
+ReindexMode = Literal["full", "incremental"]
+
+DB_PAGE_SIZE = 500  # rows per server-side cursor fetch
+BULK_MAX_DOCS = 500  # documents per _bulk request
+BULK_MAX_BYTES = 5 * 1024 * 1024  # well below ES http.max_content_length
+BULK_CONCURRENCY = 3  # _bulk requests in flight per entity type
+
+
+# ── Progress ──────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class EntityProgress:
+    total: int = 0
+    indexed: int = 0
+    deleted: int = 0
+    errors: int = 0
+
+
+@dataclass
+class ReindexProgress:
+    mode: ReindexMode
+    status: str = "running"  # running | completed | failed
+    started_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    entities: dict[str, EntityProgress] = field(default_factory=dict)
+
+    @property
+    def elapsed_s(self) -> float:
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def processed(self) -> int:
+        return sum(e.indexed + e.deleted for e in self.entities.values())
+
+    @property
+    def docs_per_sec(self) -> float:
+        return round(self.processed / self.elapsed_s, 1) if self.elapsed_s > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        total = sum(e.total for e in self.entities.values())
+        return {
+            "mode": self.mode,
+            "status": self.status,
+            "elapsed_s": round(self.elapsed_s, 2),
+            "processed": self.processed,
+            "total": total,
+            "percent": round(100 * self.processed / total, 1) if total else 100.0,
+            "docs_per_sec": self.docs_per_sec,
+            "entities": {name: vars(e) for name, e in self.entities.items()},
+        }
+
+
+_progress: ReindexProgress | None = None
+
+
+def current_progress() -> ReindexProgress | None:
+    """Progress of the running reindex, or of the last one in this process."""
+    return _progress
+
+
+# ── Entity specs ──────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class _EntitySpec:
+    name: str
+    index: str
+    query: Callable[[], Select]
+    updated_at: Any
+    live: Callable[[], Any]  # SQL filter for rows that belong in the index
+    eligible: Callable[[Any], bool]  # the same test applied to a fetched row
+    to_doc: Callable[[Any], dict]
+
+
+def _iso(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+
+def _project_doc(row: Any) -> dict:
+    p = row.Project
+    return {
+        "id": str(p.id),
+        "org_id": str(p.org_id),
+        "name": p.name,
+        "description": p.description or "",
+        "project_type": p.project_type.value if p.project_type else None,
+        "status": p.status.value if p.status else None,
+        "stage": p.stage.value if p.stage else None,
+        "geography_country": p.geography_country,
+        "total_investment_required": float(p.total_investment_required)
+        if p.total_investment_required
+        else None,
+        "is_published": p.is_published,
+        "updated_at": _iso(p.updated_at),
+    }
+
+
+def _listing_doc(row: Any) -> dict:
+    li = row.Listing
+    return {
+        "id": str(li.id),
+        "org_id": str(li.org_id),
+        "project_id": str(li.project_id) if li.project_id else None,
+        "headline": li.title,  # model field `title` → ES field `headline`
+        "description": li.description or "",
+        "listing_type": li.listing_type.value if li.listing_type else None,
+        "sector": li.details.get("sector") if li.details else None,
+        "status": li.status.value if li.status else None,
+        "visibility": li.visibility.value if li.visibility else None,
+        "updated_at": _iso(li.updated_at),
+    }
+
+
+def _document_doc(row: Any) -> dict:
+    d = row.Document
+    return {
+        "id": str(d.id),
+        "org_id": str(d.org_id),
+        "project_id": str(d.project_id) if d.project_id else None,
+        "filename": d.name,  # model field `name` → ES field `filename`
+        "extracted_text": row.summary or "",
+        "document_type": d.classification.value if d.classification else None,
+        "status": d.status.value if d.status else None,
+        "updated_at": _iso(d.updated_at),
+    }
+
+
+def _documents_query() -> Select:
+    # SUMMARY extraction text only — avoids loading every extraction per document
+    summary = (
+        select(
+            func.coalesce(
+                DocumentExtraction.result["text"].astext,
+                DocumentExtraction.result["summary"].astext,
+            )
+        )
+        .where(
+            DocumentExtraction.document_id == Document.id,
+            DocumentExtraction.extraction_type == ExtractionType.SUMMARY,
+        )
+        .limit(1)
+        .correlate(Document)
+        .scalar_subquery()
+    )
+    return select(Document, summary.label("summary"))
+
+
+ENTITIES: tuple[_EntitySpec, ...] = (
+    _EntitySpec(
+        name="projects",
+        index=INDEX_PROJECTS,
+        query=lambda: select(Project),
+        updated_at=Project.updated_at,
+        live=lambda: Project.is_deleted.is_(False),
+        eligible=lambda row: not row.Project.is_deleted,
+        to_doc=_project_doc,
+    ),
+    _EntitySpec(
+        name="listings",
+        index=INDEX_MARKETPLACE,
+        query=lambda: select(Listing),
+        updated_at=Listing.updated_at,
+        live=lambda: Listing.is_deleted.is_(False) & (Listing.status == ListingStatus.ACTIVE),
+        eligible=lambda row: not row.Listing.is_deleted and row.Listing.status == ListingStatus.ACTIVE,
+        to_doc=_listing_doc,
+    ),
+    _EntitySpec(
+        name="documents",
+        index=INDEX_DOCUMENTS,
+        query=_documents_query,
+        updated_at=Document.updated_at,
+        live=lambda: Document.is_deleted.is_(False) & (Document.status == DocumentStatus.READY),
+        eligible=lambda row: not row.Document.is_deleted and row.Document.status == DocumentStatus.READY,
+        to_doc=_document_doc,
+    ),
+)
+
+
+# ── Bulk sending ──────────────────────────────────────────────────────────────
+
+
+class _BulkSender:
+    """Sends bounded ``_bulk`` chunks with at most ``concurrency`` in flight."""
+
+    def __init__(
+        self,
+        client: AsyncElasticsearch,
+        index: str,
+        progress: EntityProgress,
+        errors: list[str],
+        label: str,
+        concurrency: int = BULK_CONCURRENCY,
+    ) -> None:
+        self.client = client
+        self.index = index
+        self.progress = progress
+        self.errors = errors
+        self.label = label
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tasks: set[asyncio.Task] = set()
+        self._actions: list[dict] = []
+        self._docs = 0
+        self._bytes = 0
+
+    async def index_doc(self, doc: dict) -> None:
+        self._actions += [{"index": {"_index": self.index, "_id": doc["id"]}}, doc]
+        self._docs += 1
+        self._bytes += len(json.dumps(doc, default=str))
+        if self._docs >= BULK_MAX_DOCS or self._bytes >= BULK_MAX_BYTES:
+            await self.flush()
+
+    async def delete_doc(self, doc_id: str) -> None:
+        self._actions.append({"delete": {"_index": self.index, "_id": doc_id}})
+        self._docs += 1
+        if self._docs >= BULK_MAX_DOCS:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._actions:
+            return
+        actions, self._actions, self._docs, self._bytes = self._actions, [], 0, 0
+        await self._slots.acquire()  # backpressure: blocks the DB cursor while chunks are in flight
+        task = asyncio.create_task(self._send(actions))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, actions: list[dict]) -> None:
+        try:
+            resp = await self.client.bulk(body=actions)
+            for item in resp.get("items", []):
+                op, result = next(iter(item.items()))
+                err = result.get("error")
+                if err:
+                    self.progress.errors += 1
+                    self.errors.append(f"{self.label}:{result.get('_id')}: {err}")
+                elif op == "delete":
+                    self.progress.deleted += 1
+                else:
+                    self.progress.indexed += 1
+        except Exception as exc:
+            n = sum(1 for a in actions if "index" in a or "delete" in a)
+            self.progress.errors += n
+            self.errors.append(f"{self.label}: bulk request failed: {exc}")
+        finally:
+            self._slots.release()
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+
+# ── Index lifecycle ───────────────────────────────────────────────────────────
+
+
+async def _watermark(client: AsyncElasticsearch, index: str) -> datetime | None:
+    """Newest ``updated_at`` already indexed, or None for an empty/missing index."""
+    try:
+        resp = await client.search(
+            index=index, size=0, aggs={"watermark": {"max": {"field": "updated_at"}}}
+        )
+    except Exception as exc:
+        logger.warning("reindex.watermark_failed", index=index, error=str(exc))
+        return None
+    value = resp.get("aggregations", {}).get("watermark", {}).get("value")
+    if value is None:
+        return None
+    # updated_at columns are naive UTC timestamps
+    return datetime.fromtimestamp(value / 1000, UTC).replace(tzinfo=None)
+
+
+async def _create_versioned_index(client: AsyncElasticsearch, alias: str) -> str:
+    name = f"{alias}_{int(time.time() * 1000)}"
+    body = index_definition(alias)
+    # No refreshes while bulk loading; restored before the alias swap
+    await client.indices.create(
+        index=name, body={**body, "settings": {"index": {"refresh_interval": "-1"}}}
+    )
+    return name
+
+
+async def _swap_alias(client: AsyncElasticsearch, alias: str, new_index: str) -> list[str]:
+    """Atomically point ``alias`` at ``new_index``; returns the indices it replaced."""
+    await client.indices.put_settings(index=new_index, body={"index": {"refresh_interval": None}})
+    await client.indices.refresh(index=new_index)
+
+    actions: list[dict] = [{"add": {"index": new_index, "alias": alias}}]
+    old: list[str] = []
+    if await client.indices.exists_alias(name=alias):
+        old = list((await client.indices.get_alias(name=alias)).keys())
+        actions += [{"remove": {"index": o, "alias": alias}} for o in old]
+    elif await client.indices.exists(index=alias):
+        # Pre-alias deployments have a concrete index under the public name
+        actions.append({"remove_index": {"index": alias}})
+    await client.indices.update_aliases(body={"actions": actions})
+
+    stale = [o for o in old if o != new_index]
+    if stale:
+        await client.indices.delete(index=",".join(stale), ignore_unavailable=True)
+    return stale
+
+
+# ── Reindex ───────────────────────────────────────────────────────────────────
+
+
+async def _reindex_entity(
+    db: AsyncSession,
+    client: AsyncElasticsearch,
+    spec: _EntitySpec,
+    mode: ReindexMode,
+    progress: EntityProgress,
+    errors: list[str],
+) -> None:
+    stmt = spec.query()
+    if mode == "incremental":
+        watermark = await _watermark(client, spec.index)
+        target = spec.index
+        if watermark is not None:
+            stmt = stmt.where(spec.updated_at >= watermark)
+        else:
+            stmt = stmt.where(spec.live())
+    else:
+        watermark = None
+        stmt = stmt.where(spec.live())
+        target = await _create_versioned_index(client, spec.index)
+
+    # Progress reporting only: rows committed between this COUNT and the stream
+    # make it drift, so completeness is judged on bulk errors alone
+    progress.total = (
+        await db.execute(select(func.count()).select_from(stmt.subquery()))
+    ).scalar_one()
+
+    sender = _BulkSender(client, target, progress, errors, label=spec.name.rstrip("s"))
+    try:
+        try:
+            result = await db.stream(stmt.execution_options(yield_per=DB_PAGE_SIZE))
+            async for rows in result.partitions():
+                for row in rows:
+                    if mode == "full" or spec.eligible(row):
+                        await sender.index_doc(spec.to_doc(row))
+                    else:
+                        await sender.delete_doc(str(row[0].id))
+                logger.info(
+                    "search.reindex_progress",
+                    entity=spec.name,
+                    sent=progress.indexed + progress.deleted,
+                    total=progress.total,
+                )
+        finally:
+            await sender.close()
+        if mode == "full" and progress.errors:
+            # Rejected documents or failed _bulk requests leave the new index incomplete
+            raise RuntimeError(
+                f"incomplete index {target}: {progress.indexed} indexed, {progress.errors} errors"
+            )
+    except Exception:
+        if mode == "full":
+            # Leave the live alias untouched; drop the half-built index
+            await client.indices.delete(index=target, ignore_unavailable=True)
+        raise
+
+    if mode == "full":
+        replaced = await _swap_alias(client, spec.index, target)
+        logger.info("search.reindex_alias_swapped", alias=spec.index, index=target, replaced=replaced)
+    else:
+        logger.info("search.reindex_incremental", entity=spec.name, watermark=watermark)
+
+
+async def run_reindex(
+    db: AsyncSession, client: AsyncElasticsearch, mode: ReindexMode = "full"
+) -> tuple[ReindexProgress, list[str]]:
+    """Reindex every entity type; one failing type does not stop the others."""
+    global _progress
+    progress = ReindexProgress(mode=mode)
+    _progress = progress
+    errors: list[str] = []
+    for spec in ENTITIES:
+        entity_progress = progress.entities.setdefault(spec.name, EntityProgress())
+        try:
+            await _reindex_entity(db, client, spec, mode, entity_progress, errors)
+        except Exception as exc:
+            errors.append(f"{spec.name}: {exc}")
+            logger.warning("search.reindex_entity_failed", entity=spec.name, error=str(exc))
+    progress.finished_at = time.time()
+    progress.status = "failed" if errors and not progress.processed else "completed"
+    return progress, errors
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+from typing import Literal
+
 import structlog
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_permission
 from app.core.database import get_db
 from app.modules.search import service
-from app.modules.search.schemas import ReindexResponse, SearchResponse
+from app.modules.search.reindexer import current_progress
+from app.modules.search.schemas import ReindexResponse, ReindexStatusResponse, SearchResponse
 from app.schemas.auth import CurrentUser
 
 logger = structlog.get_logger()
@@ -30,9 +33,23 @@ async def search(
 
 @router.post("/reindex", response_model=ReindexResponse, status_code=202)
 async def reindex(
+    mode: Literal["full", "incremental"] = Query(
+        "full", description="full: rebuild behind an alias swap; incremental: changed rows only"
+    ),
     current_user: CurrentUser = Depends(require_permission("manage_settings", "settings")),
     db: AsyncSession = Depends(get_db),
 ) -> ReindexResponse:
     """Rebuild the ElasticSearch indices from the database. Admin-only."""
-    logger.info("search.reindex_requested", user_id=str(current_user.user_id))
-    return await service.reindex_all(db)
+    logger.info("search.reindex_requested", user_id=str(current_user.user_id), mode=mode)
+    return await service.reindex_all(db, mode)
+
+
+@router.get("/reindex/status", response_model=ReindexStatusResponse)
+async def reindex_status(
+    current_user: CurrentUser = Depends(require_permission("manage_settings", "settings")),
+) -> ReindexStatusResponse:
+    """Progress and throughput of the running (or last) reindex in this process."""
+    progress = current_progress()
+    if progress is None:
+        raise HTTPException(status_code=404, detail="No reindex has run in this process")
+    return ReindexStatusResponse(**progress.as_dict())
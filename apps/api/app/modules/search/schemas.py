@@ -54,4 +54,26 @@ class ReindexResponse(BaseModel):
     indexed_projects: int
     indexed_listings: int
     indexed_documents: int
+    deleted: int = 0
+    mode: str = "full"
+    elapsed_s: float = 0.0
+    docs_per_sec: float = 0.0
     errors: list[str] = Field(default_factory=list)
+
+
+class EntityReindexProgress(BaseModel):
+    total: int
+    indexed: int
+    deleted: int
+    errors: int
+
+
+class ReindexStatusResponse(BaseModel):
+    mode: str
+    status: str
+    elapsed_s: float
+    processed: int
+    total: int
+    percent: float
+    docs_per_sec: float
+    entities: dict[str, EntityReindexProgress]
@@ -5,9 +5,7 @@ from __future__ import annotations
 import uuid
 
 import structlog
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
 from app.core.elasticsearch import (
     INDEX_DOCUMENTS,
@@ -15,10 +13,7 @@ from app.core.elasticsearch import (
     INDEX_PROJECTS,
     get_es_client,
 )
-from app.models.dataroom import Document
-from app.models.enums import DocumentStatus, ExtractionType, ListingStatus
-from app.models.marketplace import Listing
-from app.models.projects import Project
+from app.modules.search.reindexer import ReindexMode, run_reindex
 from app.modules.search.schemas import (
     DocumentHit,
     ListingHit,
@@ -211,10 +206,14 @@ async def search(
     )
 
 
-async def reindex_all(db: AsyncSession) -> ReindexResponse:
-    """Bulk reindex all projects, listings, and documents into ElasticSearch."""
+async def reindex_all(db: AsyncSession, mode: ReindexMode = "full") -> ReindexResponse:
+    """Reindex projects, listings, and documents into ElasticSearch.
+
+    Streams rows in bounded ``_bulk`` chunks (see reindexer.py). ``full``
+    rebuilds into new indices behind an alias swap; ``incremental`` only
+    re-sends rows changed since the index's ``updated_at`` watermark.
+    """
     client = get_es_client()
-    errors: list[str] = []
     if client is None:
         logger.warning("reindex.skipped", reason="elasticsearch not configured")
         return ReindexResponse(
@@ -223,139 +222,27 @@ async def reindex_all(db: AsyncSession) -> ReindexResponse:
             indexed_documents=0,
             errors=["Elasticsearch not configured"],
         )
-    indexed_projects = 0
-    indexed_listings = 0
-    indexed_documents = 0
-
-    # ── Projects ──────────────────────────────────────────────────────────────
-    try:
-        result = await db.execute(select(Project).where(Project.is_deleted.is_(False)))
-        project_rows = result.scalars().all()
-
-        if project_rows:
-            actions: list[dict] = []
-            for p in project_rows:
-                actions.append({"index": {"_index": INDEX_PROJECTS, "_id": str(p.id)}})
-                actions.append(
-                    {
-                        "id": str(p.id),
-                        "org_id": str(p.org_id),
-                        "name": p.name,
-                        "description": p.description or "",
-                        "project_type": p.project_type.value if p.project_type else None,
-                        "status": p.status.value if p.status else None,
-                        "stage": p.stage.value if p.stage else None,
-                        "geography_country": p.geography_country,
-                        "total_investment_required": float(p.total_investment_required)
-                        if p.total_investment_required
-                        else None,
-                        "is_published": p.is_published,
-                        "updated_at": p.updated_at.isoformat() if p.updated_at else None,
-                    }
-                )
-            resp = await client.bulk(body=actions)
-            if resp.get("errors"):
-                for item in resp.get("items", []):
-                    err = item.get("index", {}).get("error")
-                    if err:
-                        errors.append(f"project:{item['index']['_id']}: {err}")
-            indexed_projects = len(project_rows)
-    except Exception as exc:
-        errors.append(f"projects: {exc}")
-
-    # ── Listings ──────────────────────────────────────────────────────────────
-    try:
-        result = await db.execute(
-            select(Listing).where(
-                Listing.is_deleted.is_(False),
-                Listing.status == ListingStatus.ACTIVE,
-            )
-        )
-        listing_rows = result.scalars().all()
-
-        if listing_rows:
-            actions = []
-            for li in listing_rows:
-                actions.append({"index": {"_index": INDEX_MARKETPLACE, "_id": str(li.id)}})
-                actions.append(
-                    {
-                        "id": str(li.id),
-                        "org_id": str(li.org_id),
-                        "project_id": str(li.project_id) if li.project_id else None,
-                        "headline": li.title,  # model field `title` → ES field `headline`
-                        "description": li.description or "",
-                        "listing_type": li.listing_type.value if li.listing_type else None,
-                        "sector": li.details.get("sector") if li.details else None,
-                        "status": li.status.value if li.status else None,
-                        "visibility": li.visibility.value if li.visibility else None,
-                        "updated_at": li.updated_at.isoformat() if li.updated_at else None,
-                    }
-                )
-            resp = await client.bulk(body=actions)
-            if resp.get("errors"):
-                for item in resp.get("items", []):
-                    err = item.get("index", {}).get("error")
-                    if err:
-                        errors.append(f"listing:{item['index']['_id']}: {err}")
-            indexed_listings = len(listing_rows)
-    except Exception as exc:
-        errors.append(f"listings: {exc}")
-
-    # ── Documents ─────────────────────────────────────────────────────────────
-    try:
-        result = await db.execute(
-            select(Document)
-            .where(
-                Document.is_deleted.is_(False),
-                Document.status == DocumentStatus.READY,
-            )
-            .options(joinedload(Document.extractions))
-        )
-        doc_rows = result.unique().scalars().all()
-
-        if doc_rows:
-            actions = []
-            for d in doc_rows:
-                # Use SUMMARY extraction text when available
-                extracted_text = ""
-                for ext in d.extractions:
-                    if ext.extraction_type == ExtractionType.SUMMARY:
-                        extracted_text = ext.result.get("text") or ext.result.get("summary") or ""
-                        break
-
-                actions.append({"index": {"_index": INDEX_DOCUMENTS, "_id": str(d.id)}})
-                actions.append(
-                    {
-                        "id": str(d.id),
-                        "org_id": str(d.org_id),
-                        "project_id": str(d.project_id) if d.project_id else None,
-                        "filename": d.name,  # model field `name` → ES field `filename`
-                        "extracted_text": extracted_text,
-                        "document_type": d.classification.value if d.classification else None,
-                        "status": d.status.value if d.status else None,
-                        "updated_at": d.updated_at.isoformat() if d.updated_at else None,
-                    }
-                )
-            resp = await client.bulk(body=actions)
-            if resp.get("errors"):
-                for item in resp.get("items", []):
-                    err = item.get("index", {}).get("error")
-                    if err:
-                        errors.append(f"document:{item['index']['_id']}: {err}")
-            indexed_documents = len(doc_rows)
-    except Exception as exc:
-        errors.append(f"documents: {exc}")
 
+    progress, errors = await run_reindex(db, client, mode)
+    entities = progress.entities
     logger.info(
         "search.reindex_complete",
-        projects=indexed_projects,
-        listings=indexed_listings,
-        documents=indexed_documents,
+        mode=mode,
+        projects=entities["projects"].indexed,
+        listings=entities["listings"].indexed,
+        documents=entities["documents"].indexed,
+        deleted=sum(e.deleted for e in entities.values()),
+        docs_per_sec=progress.docs_per_sec,
+        elapsed_s=round(progress.elapsed_s, 2),
         errors=len(errors),
     )
     return ReindexResponse(
-        indexed_projects=indexed_projects,
-        indexed_listings=indexed_listings,
-        indexed_documents=indexed_documents,
+        indexed_projects=entities["projects"].indexed,
+        indexed_listings=entities["listings"].indexed,
+        indexed_documents=entities["documents"].indexed,
+        deleted=sum(e.deleted for e in entities.values()),
+        mode=mode,
+        elapsed_s=round(progress.elapsed_s, 2),
+        docs_per_sec=progress.docs_per_sec,
         errors=errors,
     )
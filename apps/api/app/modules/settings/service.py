@@ -10,6 +10,7 @@ import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.auth import principal_cache
 from app.models.core import Organization, User
 from app.models.enums import UserRole
 from app.modules.settings.schemas import (
@@ -88,6 +89,7 @@ async def update_user_role(
 ) -> User:
     user = await get_user(db, org_id, user_id)
     user.role = role
+    principal_cache.invalidate_user(user.external_auth_id)
     return user
 
 
@@ -99,6 +101,7 @@ async def toggle_user_status(
 ) -> User:
     user = await get_user(db, org_id, user_id)
     user.is_active = is_active
+    principal_cache.invalidate_user(user.external_auth_id)
     return user
 
 
@@ -6,14 +6,13 @@ import json
 import uuid
 from typing import Any
 
-import httpx
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.models.screener import SavedSearch
 from app.modules.smart_screener.schemas import ParsedFilters, ScreenerResult
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -21,18 +20,16 @@ logger = structlog.get_logger()
 async def parse_query(query: str) -> ParsedFilters:
     """Use Haiku via the AI gateway to parse natural language into structured filters."""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                json={
-                    "task_type": "parse_screener_query",
-                    "messages": [{"role": "user", "content": query}],
-                    "context": {"query": query},
-                },
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await gateway_client().post(
+            "/v1/completions",
+            json={
+                "task_type": "parse_screener_query",
+                "messages": [{"role": "user", "content": query}],
+                "context": {"query": query},
+            },
+        )
+        resp.raise_for_status()
+        data = resp.json()
 
         validated = data.get("validated_data") or {}
         if validated:
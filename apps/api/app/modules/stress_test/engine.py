@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
@@ -92,40 +93,155 @@ def apply_stress(
     return max(0.0, value)
 
 
+# Upper bound on (simulations x projects) cells materialised per chunk — 2M float64
+# cells is ~16 MB per shock matrix, which keeps 100k+ simulation runs memory-flat.
+_MAX_CHUNK_CELLS = 2_000_000
+# Rows of the per-project stressed matrix retained for sensitivity medians.
+_SENSITIVITY_SAMPLE = 10_000
+# Independent RNG streams, one per shock factor, so chunking never changes results.
+_SHOCK_STREAMS = ("rate", "energy", "delay", "fx")
+
+
+@dataclass(frozen=True)
+class ProjectArrays:
+    """Columnar encoding of portfolio projects for vectorised simulation."""
+
+    ids: list[str]
+    names: list[str]
+    value: np.ndarray
+    leverage: np.ndarray
+    energy_mask: np.ndarray
+    construction_mask: np.ndarray
+    currency: np.ndarray
+
+    @classmethod
+    def from_projects(cls, projects: list[dict[str, Any]]) -> ProjectArrays:
+        return cls(
+            ids=[str(p.get("id", "")) for p in projects],
+            names=[p.get("name", "Unknown") for p in projects],
+            value=np.array([float(p.get("current_value", 0)) for p in projects], dtype=np.float64),
+            leverage=np.array(
+                [float(p.get("leverage_ratio", 0.5)) for p in projects], dtype=np.float64
+            ),
+            energy_mask=np.array(
+                [str(p.get("project_type", "")).lower() in _ENERGY_TYPES for p in projects],
+                dtype=bool,
+            ),
+            construction_mask=np.array(
+                [str(p.get("stage", "")).lower() in _CONSTRUCTION_STAGES for p in projects],
+                dtype=bool,
+            ),
+            currency=np.array([str(p.get("currency", "EUR")).upper() for p in projects]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def stress_matrix(
+    arrays: ProjectArrays,
+    params: dict[str, Any],
+    rngs: dict[str, np.random.Generator],
+    n: int,
+) -> np.ndarray:
+    """Draw ``n`` scenarios for every project at once.
+
+    Vectorised equivalent of :func:`apply_stress` — returns an ``(n, projects)``
+    matrix of stressed values (always >= 0).
+    """
+    n_projects = len(arrays)
+    factor = np.ones((n, n_projects), dtype=np.float64)
+
+    if "rate_delta_bps" in params:
+        bps = params["rate_delta_bps"]
+        rate_shock = rngs["rate"].normal(bps, abs(bps) * 0.2, size=(n, n_projects))
+        # Higher leverage amplifies rate impact
+        dcf_discount = (rate_shock / 10_000) * (1 + arrays.leverage * 2)
+        factor *= np.maximum(0.0, 1 - dcf_discount)
+
+    energy_cols = np.flatnonzero(arrays.energy_mask)
+    if "energy_delta_pct" in params and energy_cols.size:
+        pct = params["energy_delta_pct"]
+        energy_shock = rngs["energy"].normal(pct, abs(pct) * 0.3, size=(n, energy_cols.size))
+        factor[:, energy_cols] *= np.maximum(0.0, 1 + energy_shock / 100)
+
+    construction_cols = np.flatnonzero(arrays.construction_mask)
+    if "delay_months" in params and construction_cols.size:
+        delay = np.maximum(
+            0.0,
+            rngs["delay"].normal(params["delay_months"], 2, size=(n, construction_cols.size)),
+        )
+        factor[:, construction_cols] *= np.maximum(0.0, 1 - delay * 0.01)
+
+    if "fx_delta_pct" in params:
+        fx_cols = np.flatnonzero(arrays.currency == params.get("target_currency", "USD"))
+        if fx_cols.size:
+            pct = params["fx_delta_pct"]
+            fx_shock = rngs["fx"].normal(pct, abs(pct) * 0.3, size=(n, fx_cols.size))
+            factor[:, fx_cols] *= np.maximum(0.0, 1 + fx_shock / 100)
+
+    return np.maximum(0.0, arrays.value) * factor
+
+
+def _chunk_rows(n_projects: int, simulations: int, chunk_size: int | None) -> int:
+    if chunk_size is None:
+        chunk_size = max(1, _MAX_CHUNK_CELLS // max(1, n_projects))
+    return max(1, min(chunk_size, simulations))
+
+
 def run_monte_carlo(
     projects: list[dict[str, Any]],
     params: dict[str, Any],
     simulations: int = 10_000,
     seed: int | None = None,
+    chunk_size: int | None = None,
 ) -> dict[str, Any]:
     """Run Monte Carlo simulation over a list of portfolio projects.
 
     Projects: list of dicts with keys: id, name, current_value, project_type, stage,
               currency, leverage_ratio.
+
+    Shocks are drawn as ``(simulations, projects)`` matrices in chunks of
+    ``chunk_size`` rows (auto-sized when ``None``). Each shock factor has its own
+    RNG stream derived from ``seed``, so results are identical for any chunk size.
+    Portfolio NAV distribution, histogram and per-project medians all come from
+    the same draw.
     Returns aggregated statistics and histogram data.
     """
-    rng = np.random.default_rng(seed)
-    base_nav = sum(float(p.get("current_value", 0)) for p in projects)
-    results = np.zeros(simulations)
+    arrays = ProjectArrays.from_projects(projects)
+    streams = np.random.SeedSequence(seed).spawn(len(_SHOCK_STREAMS))
+    rngs = {
+        name: np.random.default_rng(stream)
+        for name, stream in zip(_SHOCK_STREAMS, streams, strict=True)
+    }
+
+    base_nav = float(arrays.value.sum())
+    results = np.empty(simulations, dtype=np.float64)
+    sample_rows = min(simulations, _SENSITIVITY_SAMPLE)
+    sample = np.empty((sample_rows, len(arrays)), dtype=np.float64)
 
-    for i in range(simulations):
-        portfolio_nav = sum(apply_stress(p, params, rng) for p in projects)
-        results[i] = portfolio_nav
+    step = _chunk_rows(len(arrays), simulations, chunk_size)
+    for start in range(0, simulations, step):
+        stop = min(start + step, simulations)
+        stressed = stress_matrix(arrays, params, rngs, stop - start)
+        results[start:stop] = stressed.sum(axis=1)
+        if start < sample_rows:
+            keep = min(stop, sample_rows) - start
+            sample[start : start + keep] = stressed[:keep]
 
     counts, edges = np.histogram(results, bins=50)
 
-    # Per-project sensitivity (using median stressed value across simulations)
-    rng2 = np.random.default_rng(seed)
+    # Per-project sensitivity (median stressed value across the sampled simulations)
+    stressed_medians = np.median(sample, axis=0) if len(arrays) else np.empty(0)
     sensitivities: list[dict[str, Any]] = []
-    for proj in projects:
-        stressed_vals = [apply_stress(proj, params, rng2) for _ in range(1000)]
-        stressed_median = float(np.median(stressed_vals))
-        base_val = float(proj.get("current_value", 0))
+    for idx, project_id in enumerate(arrays.ids):
+        base_val = float(arrays.value[idx])
+        stressed_median = float(stressed_medians[idx])
         change_pct = ((stressed_median - base_val) / base_val * 100) if base_val > 0 else 0.0
         sensitivities.append(
             {
-                "project_id": str(proj.get("id", "")),
-                "project_name": proj.get("name", "Unknown"),
+                "project_id": project_id,
+                "project_name": arrays.names[idx],
                 "base_value": base_val,
                 "stressed_value": stressed_median,
                 "change_pct": round(change_pct, 2),
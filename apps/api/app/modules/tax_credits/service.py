@@ -9,12 +9,10 @@ from datetime import date
 from decimal import Decimal
 from typing import Any
 
-import httpx
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.models.enums import ReportStatus, TaxCreditQualification
 from app.models.financial import TaxCredit
 from app.models.investors import Portfolio, PortfolioHolding
@@ -31,6 +29,7 @@ from app.modules.tax_credits.schemas import (
     TaxCreditSummaryResponse,
     TransferDocRequest,
 )
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -189,19 +188,18 @@ Respond ONLY with valid JSON array:
 
     identified: list[IdentifiedCredit] = []
     try:
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                json={
-                    "prompt": prompt,
-                    "task_type": "analysis",
-                    "max_tokens": 1500,
-                    "temperature": 0.2,
-                },
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-            )
-            resp.raise_for_status()
-            content = resp.json().get("content", "")
+        resp = await gateway_client().post(
+            "/v1/completions",
+            json={
+                "prompt": prompt,
+                "task_type": "analysis",
+                "max_tokens": 1500,
+                "temperature": 0.2,
+            },
+            timeout=_TIMEOUT,
+        )
+        resp.raise_for_status()
+        content = resp.json().get("content", "")
 
         match = re.search(r"\[.*\]", content, re.DOTALL)
         raw_list: list[dict[str, Any]] = json.loads(match.group() if match else content)
@@ -9,12 +9,11 @@ import json
 import re
 from typing import Any
 
-import httpx
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.modules.valuation.schemas import AssumptionSuggestion
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -91,14 +90,13 @@ Respond ONLY with valid JSON in this exact structure:
             _payload["prompt"] = prompt
 
         try:
-            async with httpx.AsyncClient(timeout=self._TIMEOUT) as client:
-                resp = await client.post(
-                    f"{settings.AI_GATEWAY_URL}/v1/completions",
-                    json=_payload,
-                    headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-                )
-                resp.raise_for_status()
-                content = resp.json().get("content", "")
+            resp = await gateway_client().post(
+                "/v1/completions",
+                json=_payload,
+                timeout=self._TIMEOUT,
+            )
+            resp.raise_for_status()
+            content = resp.json().get("content", "")
         except Exception as exc:
             logger.warning("suggest_assumptions_ai_failed", error=str(exc))
             return self._fallback_assumptions(project_type, geography)
@@ -189,19 +187,18 @@ Write in professional investment banking style. Be specific about methodology an
 Do NOT use bullet points. Output plain prose only."""
 
         try:
-            async with httpx.AsyncClient(timeout=self._TIMEOUT) as client:
-                resp = await client.post(
-                    f"{settings.AI_GATEWAY_URL}/v1/completions",
-                    json={
-                        "prompt": prompt,
-                        "task_type": "analysis",
-                        "max_tokens": 250,
-                        "temperature": 0.4,
-                    },
-                    headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-                )
-                resp.raise_for_status()
-                return resp.json().get("content", "").strip()
+            resp = await gateway_client().post(
+                "/v1/completions",
+                json={
+                    "prompt": prompt,
+                    "task_type": "analysis",
+                    "max_tokens": 250,
+                    "temperature": 0.4,
+                },
+                timeout=self._TIMEOUT,
+            )
+            resp.raise_for_status()
+            return resp.json().get("content", "").strip()
         except Exception as exc:
             logger.warning("narrative_generation_failed", error=str(exc))
             return (
@@ -286,19 +283,18 @@ Respond ONLY with valid JSON array:
 ]"""
 
         try:
-            async with httpx.AsyncClient(timeout=self._TIMEOUT) as client:
-                resp = await client.post(
-                    f"{settings.AI_GATEWAY_URL}/v1/completions",
-                    json={
-                        "prompt": prompt,
-                        "task_type": "analysis",
-                        "max_tokens": 700,
-                        "temperature": 0.3,
-                    },
-                    headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-                )
-                resp.raise_for_status()
-                content = resp.json().get("content", "")
+            resp = await gateway_client().post(
+                "/v1/completions",
+                json={
+                    "prompt": prompt,
+                    "task_type": "analysis",
+                    "max_tokens": 700,
+                    "temperature": 0.3,
+                },
+                timeout=self._TIMEOUT,
+            )
+            resp.raise_for_status()
+            content = resp.json().get("content", "")
             match = re.search(r"\[.*\]", content, re.DOTALL)
             return json.loads(match.group() if match else content)
         except Exception as exc:
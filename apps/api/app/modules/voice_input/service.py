@@ -7,8 +7,9 @@ from typing import Any
 import httpx
 import structlog
 
-from app.core.circuit_breaker import AIGatewayUnavailableError, ai_gateway_cb
+from app.core.circuit_breaker import AIGatewayUnavailableError
 from app.core.config import settings
+from app.services.gateway_client import gateway_client
 
 logger = structlog.get_logger()
 
@@ -34,25 +35,19 @@ async def transcribe_audio(audio_bytes: bytes, filename: str, content_type: str)
 
 async def extract_project_data(transcript: str) -> dict[str, Any]:
     """Use AI to extract structured project data from a spoken transcript."""
-    if not await ai_gateway_cb.allow_request():
-        raise AIGatewayUnavailableError()
     try:
-        async with httpx.AsyncClient(timeout=60) as client:
-            resp = await client.post(
-                f"{settings.AI_GATEWAY_URL}/v1/completions",
-                headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}"},
-                json={
-                    "task_type": "extract_project_from_voice",
-                    "context": {"transcript": transcript},
-                    "model": "claude-sonnet-4-20250514",
-                },
-            )
-            resp.raise_for_status()
-            await ai_gateway_cb.record_success()
-            return resp.json().get("validated_data", {})
+        resp = await gateway_client().post(
+            "/v1/completions",
+            json={
+                "task_type": "extract_project_from_voice",
+                "context": {"transcript": transcript},
+                "model": "claude-sonnet-4-20250514",
+            },
+        )
     except (httpx.TimeoutException, httpx.ConnectError) as exc:
-        await ai_gateway_cb.record_failure()
         raise AIGatewayUnavailableError() from exc
+    resp.raise_for_status()
+    return resp.json().get("validated_data", {})
 
 
 async def process_audio(audio_bytes: bytes, filename: str, content_type: str) -> dict[str, Any]:
@@ -0,0 +1,454 @@
+"""Watchlist / saved-search percolator.
+
+Instead of running one query per watchlist, every active watchlist and every
+saved search with ``notify_new_matches`` is compiled into an in-memory
+predicate index, and each project or signal score that changed since the last
+run is evaluated against it once. Cost scales with the number of changed
+entities, not the number of subscriptions:
+
+* subscriptions are bucketed by project-type term (``None`` = any type),
+* within a bucket they are sorted by their lower bound — min capacity for
+  project matches, min score for score matches — so one bisect drops every
+  subscription whose threshold the entity does not reach,
+* ``specific_project`` watches are keyed by project id,
+* the few surviving candidates are checked against their remaining
+  predicates (geography, stage, upper bounds, ticket size, org scope).
+
+Watchlist alerts, in-app notifications and saved-search notifications are
+then written with one bulk INSERT each.
+"""
+
+from __future__ import annotations
+
+import bisect
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+# Per subscription per run, like the old per-watchlist query limits
+MAX_ALERTS_PER_SUBSCRIPTION = 20
+
+_NEG_INF = float("-inf")
+
+
+@dataclass(frozen=True)
+class ProjectFacts:
+    """The project columns subscriptions can filter on."""
+
+    id: uuid.UUID
+    org_id: uuid.UUID
+    name: str
+    project_type: str
+    stage: str
+    geography: str
+    capacity_mw: float | None
+    ticket_size: float | None  # total_investment_required
+    signal_score: int | None
+    is_new: bool  # created since the watermark
+
+
+@dataclass(frozen=True)
+class ScoreChange:
+    project: ProjectFacts
+    score: int
+    previous: int | None
+
+
+@dataclass
+class Subscription:
+    """One compiled watchlist or saved search."""
+
+    kind: str  # "watchlist" | "saved_search"
+    id: uuid.UUID
+    user_id: uuid.UUID
+    org_id: uuid.UUID
+    name: str
+    watch_type: str  # new_projects, score_changes, specific_project; "saved_search"
+    other_orgs_only: bool  # watchlists discover other orgs' projects; the screener searches your own
+    project_types: tuple[str, ...] = ()
+    geographies: tuple[str, ...] = ()
+    stages: frozenset[str] = frozenset()
+    min_capacity_mw: float | None = None
+    max_capacity_mw: float | None = None
+    min_ticket_size: float | None = None  # absolute, not millions
+    max_ticket_size: float | None = None
+    min_score: float | None = None
+    max_score: float | None = None
+    project_id: uuid.UUID | None = None
+    alert_channels: tuple[str, ...] = ()
+
+    def matches(self, p: ProjectFacts, score: int | None = None) -> bool:
+        """Full predicate check (the index has already applied the lower bound)."""
+        if self.other_orgs_only == (p.org_id == self.org_id):
+            return False
+        ptype, geo = p.project_type.lower(), p.geography.lower()
+        if self.project_types and not any(t in ptype for t in self.project_types):
+            return False
+        if self.geographies and not any(g in geo for g in self.geographies):
+            return False
+        if self.stages and p.stage.lower() not in self.stages:
+            return False
+        if self.min_capacity_mw is not None and (p.capacity_mw or 0) < self.min_capacity_mw:
+            return False
+        if self.max_capacity_mw is not None and (p.capacity_mw or 0) > self.max_capacity_mw:
+            return False
+        if self.min_ticket_size is not None and (p.ticket_size or 0) < self.min_ticket_size:
+            return False
+        if self.max_ticket_size is not None and (p.ticket_size or 0) > self.max_ticket_size:
+            return False
+        value = p.signal_score if score is None else score
+        # Like the screener, unscored projects pass score filters
+        if value is not None:
+            if self.min_score is not None and value < self.min_score:
+                return False
+            if self.max_score is not None and value > self.max_score:
+                return False
+        return True
+
+
+# ── Compilation ───────────────────────────────────────────────────────────────
+
+
+def _terms(value: Any) -> tuple[str, ...]:
+    values = value if isinstance(value, list | tuple) else [value]
+    return tuple(sorted({str(v).strip().lower() for v in values if v}))
+
+
+def _number(value: Any) -> float | None:
+    try:
+        return float(value) if value is not None and value != "" else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _millions(value: Any) -> float | None:
+    n = _number(value)
+    return n * 1_000_000 if n is not None else None
+
+
+def _filter_fields(criteria: dict[str, Any]) -> dict[str, Any]:
+    """Subscription predicates from watchlist criteria or screener ``ParsedFilters``."""
+    return {
+        "project_types": _terms(
+            [*_terms(criteria.get("project_type")), *_terms(criteria.get("project_types") or [])]
+        ),
+        "geographies": _terms(
+            [*_terms(criteria.get("geography")), *_terms(criteria.get("geographies") or [])]
+        ),
+        "stages": frozenset(_terms(criteria.get("stages") or [])),
+        "min_capacity_mw": _number(criteria.get("min_capacity_mw")),
+        "max_capacity_mw": _number(criteria.get("max_capacity_mw")),
+        "min_ticket_size": _millions(criteria.get("min_ticket_size")),
+        "max_ticket_size": _millions(criteria.get("max_ticket_size")),
+        "min_score": _number(criteria.get("min_signal_score", criteria.get("min_score"))),
+        "max_score": _number(criteria.get("max_signal_score", criteria.get("max_score"))),
+    }
+
+
+def compile_watchlist(wl: Any) -> Subscription | None:
+    """Compile a Watchlist row; ``None`` for watch types the percolator does not serve."""
+    criteria = wl.criteria or {}
+    common = {
+        "kind": "watchlist",
+        "id": wl.id,
+        "user_id": wl.user_id,
+        "org_id": wl.org_id,
+        "name": wl.name,
+        "watch_type": wl.watch_type,
+        "alert_channels": tuple(wl.alert_channels or ()),
+    }
+    if wl.watch_type in ("new_projects", "score_changes"):
+        return Subscription(other_orgs_only=True, **common, **_filter_fields(criteria))
+    if wl.watch_type == "specific_project":
+        try:
+            project_id = uuid.UUID(str(criteria.get("project_id")))
+        except ValueError:
+            return None
+        return Subscription(other_orgs_only=False, project_id=project_id, **common)
+    return None
+
+
+def compile_saved_search(search: Any) -> Subscription:
+    return Subscription(
+        kind="saved_search",
+        id=search.id,
+        user_id=search.user_id,
+        org_id=search.org_id,
+        name=search.name,
+        watch_type="saved_search",
+        other_orgs_only=False,
+        **_filter_fields(search.filters or {}),
+    )
+
+
+# ── Index ─────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class _Band:
+    """Subscriptions sorted by lower bound; ``upto(v)`` = those with bound <= v."""
+
+    bounds: list[float] = field(default_factory=list)
+    subs: list[Subscription] = field(default_factory=list)
+
+    def add(self, bound: float | None, sub: Subscription) -> None:
+        b = _NEG_INF if bound is None else bound
+        i = bisect.bisect_right(self.bounds, b)
+        self.bounds.insert(i, b)
+        self.subs.insert(i, sub)
+
+    def upto(self, value: float | None) -> list[Subscription]:
+        return self.subs[: bisect.bisect_right(self.bounds, _NEG_INF if value is None else value)]
+
+
+class _TypeIndex:
+    """Bands keyed by project-type term; ``None`` holds type-agnostic subscriptions."""
+
+    def __init__(self, bound: str) -> None:
+        self.bound = bound
+        self.bands: dict[str | None, _Band] = defaultdict(_Band)
+
+    def add(self, sub: Subscription) -> None:
+        for term in sub.project_types or (None,):
+            self.bands[term].add(getattr(sub, self.bound), sub)
+
+    def candidates(self, project_type: str, value: float | None) -> list[Subscription]:
+        ptype = project_type.lower()
+        seen: dict[uuid.UUID, Subscription] = {}
+        for term, band in self.bands.items():
+            if term is None or term in ptype:
+                for sub in band.upto(value):
+                    seen.setdefault(sub.id, sub)
+        return list(seen.values())
+
+
+class PercolatorIndex:
+    def __init__(self, subscriptions: list[Subscription]) -> None:
+        self.projects = _TypeIndex("min_capacity_mw")  # new_projects watchlists + saved searches
+        self.scores = _TypeIndex("min_score")  # score_changes watchlists
+        self.by_project: dict[uuid.UUID, list[Subscription]] = defaultdict(list)
+        self.size = len(subscriptions)
+        for sub in subscriptions:
+            if sub.project_id is not None:
+                self.by_project[sub.project_id].append(sub)
+            elif sub.watch_type == "score_changes":
+                self.scores.add(sub)
+            else:
+                self.projects.add(sub)
+
+    def match_project(self, p: ProjectFacts) -> list[Subscription]:
+        """Subscriptions a new or updated project should alert."""
+        hits = list(self.by_project.get(p.id, ()))
+        if p.is_new:
+            hits += [s for s in self.projects.candidates(p.project_type, p.capacity_mw) if s.matches(p)]
+        return hits
+
+    def match_score(self, change: ScoreChange) -> list[Subscription]:
+        """Subscriptions a new signal score should alert."""
+        p = change.project
+        hits = [
+            s
+            for s in self.scores.candidates(p.project_type, change.score)
+            if s.matches(p, change.score)
+        ]
+        return hits + list(self.by_project.get(p.id, ()))
+
+
+# ── Alert rows ────────────────────────────────────────────────────────────────
+
+
+def project_alert(sub: Subscription, p: ProjectFacts) -> dict[str, Any]:
+    if sub.watch_type == "specific_project":
+        alert_type, title = "project_updated", f"'{p.name}' was updated"
+    else:
+        alert_type, title = "new_match", f"New project matches '{sub.name}'"
+    return {
+        "alert_type": alert_type,
+        "title": title[:255],
+        "description": f"{p.name} — {p.project_type}",
+        "entity_type": "project",
+        "entity_id": p.id,
+        "data": {"project_type": p.project_type, "geography": p.geography},
+    }
+
+
+def score_alert(sub: Subscription, change: ScoreChange) -> dict[str, Any]:
+    declined = change.previous is not None and change.score < change.previous
+    description = f"Score: {change.score}"
+    if change.previous is not None:
+        description += f" (was {change.previous})"
+    return {
+        "alert_type": "score_declined" if declined else "score_improved",
+        "title": f"Signal Score update — {change.project.name}"[:255],
+        "description": description,
+        "entity_type": "project",
+        "entity_id": change.project.id,
+        "data": {"score": change.score, "previous": change.previous},
+    }
+
+
+# ── Run ───────────────────────────────────────────────────────────────────────
+
+
+def _recent_scores(session: Any, project_ids: set[uuid.UUID]) -> dict[uuid.UUID, list[int]]:
+    """Latest two overall scores per project (newest first), in one window query."""
+    from sqlalchemy import func, select
+
+    from app.models.projects import SignalScore
+
+    if not project_ids:
+        return {}
+    ranked = (
+        select(
+            SignalScore.project_id,
+            SignalScore.overall_score,
+            func.row_number()
+            .over(partition_by=SignalScore.project_id, order_by=SignalScore.version.desc())
+            .label("rn"),
+        )
+        .where(SignalScore.project_id.in_(project_ids))
+        .subquery()
+    )
+    scores: dict[uuid.UUID, list[int]] = defaultdict(list)
+    for project_id, overall, _ in session.execute(
+        select(ranked).where(ranked.c.rn <= 2).order_by(ranked.c.project_id, ranked.c.rn)
+    ):
+        scores[project_id].append(overall)
+    return scores
+
+
+def percolate(session: Any, since: datetime, include_saved_searches: bool = True) -> dict[str, int]:
+    """Evaluate projects and scores changed after ``since``; bulk-write alerts.
+
+    Returns counts; the caller commits and advances the watermark.
+    """
+    from sqlalchemy import case, insert, or_, select, update
+
+    from app.models.core import Notification
+    from app.models.enums import NotificationType
+    from app.models.projects import Project, SignalScore
+    from app.models.screener import SavedSearch
+    from app.models.watchlists import Watchlist, WatchlistAlert
+
+    watchlists = (
+        session.execute(
+            select(Watchlist).where(Watchlist.is_active.is_(True), Watchlist.is_deleted.is_(False))
+        )
+        .scalars()
+        .all()
+    )
+    subscriptions = [s for s in map(compile_watchlist, watchlists) if s is not None]
+    if include_saved_searches:
+        subscriptions += [
+            compile_saved_search(s)
+            for s in session.execute(
+                select(SavedSearch).where(SavedSearch.notify_new_matches.is_(True))
+            ).scalars()
+        ]
+    index = PercolatorIndex(subscriptions)
+
+    # (project, created since the watermark) — compared in SQL, not Python
+    changed_stmt = select(Project, (Project.created_at > since).label("is_new")).where(
+        Project.is_deleted.is_(False)
+    )
+    changed = session.execute(
+        changed_stmt.where(or_(Project.created_at > since, Project.updated_at > since))
+    ).all()
+    rescored_ids = set(
+        session.execute(
+            select(SignalScore.project_id).where(SignalScore.created_at > since).distinct()
+        ).scalars()
+    )
+    missing = rescored_ids - {p.id for p, _ in changed}
+    if missing:
+        changed += session.execute(changed_stmt.where(Project.id.in_(missing))).all()
+    recent = _recent_scores(session, {p.id for p, _ in changed})
+
+    facts = {
+        p.id: ProjectFacts(
+            id=p.id,
+            org_id=p.org_id,
+            name=p.name,
+            project_type=str(getattr(p.project_type, "value", p.project_type) or ""),
+            stage=str(getattr(p.stage, "value", p.stage) or ""),
+            geography=p.geography_country or "",
+            capacity_mw=float(p.capacity_mw) if p.capacity_mw is not None else None,
+            ticket_size=float(p.total_investment_required)
+            if p.total_investment_required is not None
+            else None,
+            signal_score=recent[p.id][0] if recent.get(p.id) else None,
+            is_new=bool(is_new),
+        )
+        for p, is_new in changed
+    }
+
+    per_sub: dict[uuid.UUID, int] = defaultdict(int)
+    alerts: list[tuple[Subscription, dict[str, Any]]] = []
+
+    def emit(sub: Subscription, row: dict[str, Any]) -> None:
+        if per_sub[sub.id] < MAX_ALERTS_PER_SUBSCRIPTION:
+            per_sub[sub.id] += 1
+            alerts.append((sub, row))
+
+    for p in facts.values():
+        if p.id in rescored_ids and recent.get(p.id):
+            scores = recent[p.id]
+            change = ScoreChange(p, scores[0], scores[1] if len(scores) > 1 else None)
+            for sub in index.match_score(change):
+                emit(sub, score_alert(sub, change))
+        for sub in index.match_project(p):
+            if sub.project_id is not None and p.id in rescored_ids:
+                continue  # already alerted through the score change
+            emit(sub, project_alert(sub, p))
+
+    alert_rows = [
+        {"watchlist_id": sub.id, "user_id": sub.user_id, **row}
+        for sub, row in alerts
+        if sub.kind == "watchlist"
+    ]
+    notification_rows = [
+        {
+            "org_id": sub.org_id,
+            "user_id": sub.user_id,
+            "type": NotificationType.INFO,
+            "title": row["title"]
+            if sub.kind == "watchlist"
+            else f"New match for saved search '{sub.name}'"[:500],
+            "message": row["description"] or "",
+            "link": f"/projects/{row['entity_id']}",
+        }
+        for sub, row in alerts
+        if sub.kind == "saved_search" or "in_app" in sub.alert_channels
+    ]
+    if alert_rows:
+        session.execute(insert(WatchlistAlert), alert_rows)
+        sent: dict[uuid.UUID, int] = defaultdict(int)
+        for row in alert_rows:
+            sent[row["watchlist_id"]] += 1
+        session.execute(
+            update(Watchlist)
+            .where(Watchlist.id.in_(sent))
+            .values(
+                total_alerts_sent=Watchlist.total_alerts_sent
+                + case(sent, value=Watchlist.id, else_=0)
+            )
+        )
+    if notification_rows:
+        session.execute(insert(Notification), notification_rows)
+    if watchlists:
+        session.execute(
+            update(Watchlist)
+            .where(Watchlist.id.in_([wl.id for wl in watchlists]))
+            .values(last_checked_at=datetime.utcnow().isoformat())
+        )
+
+    return {
+        "subscriptions": index.size,
+        "watchlists": len(watchlists),
+        "projects_evaluated": len(facts),
+        "scores_evaluated": len(rescored_ids),
+        "alerts_created": len(alert_rows),
+        "notifications_created": len(notification_rows),
+    }
@@ -1,9 +1,8 @@
-"""Watchlist service — CRUD, alert creation, monitoring engine."""
+"""Watchlist service — CRUD and alert creation (monitoring runs in percolator.py)."""
 
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, timedelta
 from typing import Any
 
 import structlog
@@ -157,75 +156,3 @@ async def delete_alert(db: AsyncSession, alert_id: uuid.UUID, user_id: uuid.UUID
     if alert:
         await db.delete(alert)
         await db.commit()
-
-
-async def get_active_watchlists(db: AsyncSession) -> list[Watchlist]:
-    result = await db.execute(
-        select(Watchlist).where(Watchlist.is_active.is_(True), Watchlist.is_deleted.is_(False))
-    )
-    return list(result.scalars().all())
-
-
-async def check_watchlist(db: AsyncSession, wl: Watchlist) -> int:
-    """Check a single watchlist and create alerts. Returns number of alerts created."""
-    since_str = wl.last_checked_at  # stored as ISO string
-    since = (
-        datetime.fromisoformat(since_str)
-        if isinstance(since_str, str)
-        else (datetime.utcnow() - timedelta(hours=1))
-    )
-    alert_count = 0
-
-    try:
-        if wl.watch_type == "new_projects":
-            from app.models.projects import Project
-
-            criteria = wl.criteria or {}
-            stmt = select(Project).where(
-                Project.org_id != wl.org_id,  # other orgs' projects
-                Project.is_deleted.is_(False),
-                Project.created_at >= since,
-            )
-            if criteria.get("project_type"):
-                stmt = stmt.where(Project.project_type == criteria["project_type"])
-            if criteria.get("min_capacity_mw"):
-                stmt = stmt.where(Project.capacity_mw >= criteria["min_capacity_mw"])
-            result = await db.execute(stmt.limit(10))
-            projects = result.scalars().all()
-            for p in projects:
-                await create_alert(
-                    db,
-                    wl,
-                    "new_match",
-                    title=f"New project matches '{wl.name}'",
-                    description=f"{p.name} — {p.project_type}",
-                    entity_type="project",
-                    entity_id=p.id,
-                )
-                alert_count += 1
-
-        elif wl.watch_type == "score_changes":
-            from app.models.projects import SignalScore
-
-            result = await db.execute(
-                select(SignalScore).where(SignalScore.created_at >= since).limit(20)
-            )
-            for score in result.scalars().all():
-                await create_alert(
-                    db,
-                    wl,
-                    "score_improved",
-                    title="Signal Score update",
-                    description=f"Score: {score.overall_score}",
-                    entity_type="project",
-                    entity_id=score.project_id,
-                )
-                alert_count += 1
-
-    except Exception as exc:
-        logger.error("watchlist.check_failed", watchlist_id=str(wl.id), error=str(exc))
-
-    # Update last_checked_at
-    wl.last_checked_at = datetime.utcnow().isoformat()
-    await db.commit()
-    return alert_count
@@ -0,0 +1,358 @@
+"""Long-lived async webhook dispatcher.
+
+Replaces one Celery task (fresh event loop, DB session, Redis client and
+HTTP client) per delivery with a single process that:
+
+1. claims a batch of due deliveries with ``FOR UPDATE SKIP LOCKED`` and
+   leases them (status ``sending``) so several dispatchers can run side by
+   side; a crashed dispatcher's lease simply expires and the rows are due again,
+2. sends them concurrently over pooled keep-alive clients, one per host
+   (HTTP/2 when the ``h2`` package is installed), capped globally and per
+   subscriber,
+3. writes every status / subscription update back in one transaction;
+   failure counts are applied as deltas so concurrent dispatchers and manual
+   re-enables are never overwritten.
+
+Run with:  python -m app.modules.webhooks.dispatcher
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import signal
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+import structlog
+from sqlalchemy import and_, bindparam, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.models.webhooks import WebhookDelivery, WebhookSubscription
+from app.modules.webhooks.service import AUTO_DISABLE_AFTER, RETRY_DELAYS_SECONDS, WebhookService
+
+logger = structlog.get_logger()
+
+try:
+    import h2  # noqa: F401
+
+    _HTTP2 = True
+except ImportError:  # httpx falls back to HTTP/1.1 keep-alive
+    _HTTP2 = False
+
+# A claimed delivery not written back within this window is due again
+LEASE_SECONDS = 120
+
+_subscriptions = WebhookSubscription.__table__
+
+# Executed once per touched subscription with {"sub_id", "delta"}; relative so a
+# concurrent dispatcher's (or a manual re-enable's) write is never clobbered.
+_AUTO_DISABLE = (
+    update(_subscriptions)
+    .where(
+        _subscriptions.c.id == bindparam("sub_id"),
+        _subscriptions.c.is_active.is_(True),
+        _subscriptions.c.failure_count + bindparam("delta") >= AUTO_DISABLE_AFTER,
+    )
+    .values(
+        is_active=False,
+        disabled_reason=f"Auto-disabled: {AUTO_DISABLE_AFTER} consecutive delivery failures",
+    )
+)
+_APPLY_FAILURE_DELTA = (
+    update(_subscriptions)
+    .where(_subscriptions.c.id == bindparam("sub_id"))
+    .values(failure_count=func.greatest(0, _subscriptions.c.failure_count + bindparam("delta")))
+)
+
+
+@dataclass
+class _Claimed:
+    id: uuid.UUID
+    subscription_id: uuid.UUID
+    event_type: str
+    payload: dict
+    attempts: int
+
+
+@dataclass
+class _Subscriber:
+    id: uuid.UUID
+    url: str
+    secret: str
+    is_active: bool
+
+
+def _due_clause(now: datetime) -> Any:
+    return or_(
+        and_(
+            WebhookDelivery.status == "pending",
+            or_(WebhookDelivery.next_retry_at.is_(None), WebhookDelivery.next_retry_at <= now),
+        ),
+        and_(
+            WebhookDelivery.status.in_(("retrying", "sending")),
+            WebhookDelivery.next_retry_at <= now,
+        ),
+    )
+
+
+def delivery_outcome(
+    attempts: int, status_code: int | None, body: str | None, error: str | None, now: datetime
+) -> dict[str, Any]:
+    """Column values for a delivery after one attempt (same policy as WebhookService.deliver)."""
+    if error is None and status_code is not None and status_code < 300:
+        return {
+            "status": "delivered",
+            "response_status_code": status_code,
+            "response_body": (body or "")[:1000],
+            "delivered_at": now,
+            "next_retry_at": None,
+            "error_message": None,
+        }
+    if attempts <= len(RETRY_DELAYS_SECONDS):
+        status, next_retry_at = "retrying", now + timedelta(seconds=RETRY_DELAYS_SECONDS[attempts - 1])
+    else:
+        status, next_retry_at = "failed", None
+    return {
+        "status": status,
+        "response_status_code": status_code,
+        "response_body": body[:1000] if body is not None else None,
+        "delivered_at": None,
+        "next_retry_at": next_retry_at,
+        "error_message": (error or f"HTTP {status_code}")[:500],
+    }
+
+
+class WebhookDispatcher:
+    """Claims due deliveries in batches and sends them over pooled clients."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        *,
+        batch_size: int = settings.WEBHOOK_DISPATCH_BATCH_SIZE,
+        concurrency: int = settings.WEBHOOK_DISPATCH_CONCURRENCY,
+        per_subscriber: int = settings.WEBHOOK_PER_SUBSCRIBER_CONCURRENCY,
+        poll_seconds: float = settings.WEBHOOK_DISPATCH_POLL_SECONDS,
+        timeout_seconds: float = settings.WEBHOOK_DELIVERY_TIMEOUT_SECONDS,
+    ) -> None:
+        self.session_factory = session_factory or async_session_factory
+        self.batch_size = batch_size
+        self.per_subscriber = per_subscriber
+        self.poll_seconds = poll_seconds
+        self.timeout = httpx.Timeout(timeout_seconds, connect=5.0)
+        self._global = asyncio.Semaphore(concurrency)
+        self._per_subscriber: dict[uuid.UUID, asyncio.Semaphore] = {}
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._stopping = asyncio.Event()
+        # Metrics
+        self.batches = 0
+        self.delivered = 0
+        self.failed = 0
+
+    # ── Claim ─────────────────────────────────────────────────────────────────
+
+    async def _claim(self) -> tuple[list[_Claimed], dict[uuid.UUID, _Subscriber]]:
+        now = datetime.utcnow()
+        due = (
+            select(WebhookDelivery.id)
+            .where(_due_clause(now))
+            .order_by(WebhookDelivery.created_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_factory() as db:
+            rows = (
+                await db.execute(
+                    update(WebhookDelivery)
+                    .where(WebhookDelivery.id.in_(due.scalar_subquery()))
+                    .values(
+                        status="sending",
+                        attempts=WebhookDelivery.attempts + 1,
+                        next_retry_at=now + timedelta(seconds=LEASE_SECONDS),
+                    )
+                    .returning(
+                        WebhookDelivery.id,
+                        WebhookDelivery.subscription_id,
+                        WebhookDelivery.event_type,
+                        WebhookDelivery.payload,
+                        WebhookDelivery.attempts,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            ).all()
+            claimed = [_Claimed(*row) for row in rows]
+            subs: dict[uuid.UUID, _Subscriber] = {}
+            if claimed:
+                sub_rows = (
+                    await db.execute(
+                        select(
+                            WebhookSubscription.id,
+                            WebhookSubscription.url,
+                            WebhookSubscription.secret,
+                            WebhookSubscription.is_active,
+                        ).where(WebhookSubscription.id.in_({c.subscription_id for c in claimed}))
+                    )
+                ).all()
+                subs = {row.id: _Subscriber(*row) for row in sub_rows}
+            await db.commit()
+        return claimed, subs
+
+    # ── Send ──────────────────────────────────────────────────────────────────
+
+    def _client_for(self, url: str) -> httpx.AsyncClient:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(origin)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=_HTTP2,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.per_subscriber * 4,
+                    max_keepalive_connections=self.per_subscriber,
+                    keepalive_expiry=60.0,
+                ),
+            )
+            self._clients[origin] = client
+        return client
+
+    async def _send(self, delivery: _Claimed, sub: _Subscriber) -> tuple[int | None, str | None, str | None]:
+        """POST one delivery; returns (status_code, body, error)."""
+        body = json.dumps(delivery.payload).encode()
+        sem = self._per_subscriber.setdefault(sub.id, asyncio.Semaphore(self.per_subscriber))
+        async with self._global, sem:
+            try:
+                resp = await self._client_for(sub.url).post(
+                    sub.url,
+                    content=body,
+                    headers={
+                        "Content-Type": "application/json",
+                        "X-SCR-Signature": WebhookService._sign_payload(sub.secret, body),
+                        "X-SCR-Event": delivery.event_type,
+                        "X-SCR-Delivery": str(delivery.id),
+                        "Idempotency-Key": str(delivery.id),
+                    },
+                )
+            except Exception as exc:
+                return None, None, str(exc) or type(exc).__name__
+        return resp.status_code, resp.text, None
+
+    # ── Write back ────────────────────────────────────────────────────────────
+
+    async def dispatch_once(self) -> int:
+        """Claim, send and record one batch; returns the number of deliveries claimed."""
+        started = time.perf_counter()
+        claimed, subs = await self._claim()
+        if not claimed:
+            return 0
+
+        sendable = [
+            d for d in claimed if d.subscription_id in subs and subs[d.subscription_id].is_active
+        ]
+        results = await asyncio.gather(*(self._send(d, subs[d.subscription_id]) for d in sendable))
+        send_ms = (time.perf_counter() - started) * 1000
+
+        now = datetime.utcnow()
+        delivery_updates: list[dict[str, Any]] = []
+        deltas: dict[uuid.UUID, int] = {}
+        for d, (status_code, body, error) in zip(sendable, results, strict=True):
+            outcome = delivery_outcome(d.attempts, status_code, body, error, now)
+            delivery_updates.append({"id": d.id, **outcome})
+            if outcome["status"] == "delivered":
+                deltas[d.subscription_id] = deltas.get(d.subscription_id, 0) - 1
+                self.delivered += 1
+            else:
+                deltas[d.subscription_id] = deltas.get(d.subscription_id, 0) + 1
+                self.failed += 1
+        for d in claimed:
+            sub = subs.get(d.subscription_id)
+            if sub is None or not sub.is_active:
+                delivery_updates.append(
+                    {
+                        "id": d.id,
+                        "status": "failed",
+                        "response_status_code": None,
+                        "response_body": None,
+                        "delivered_at": None,
+                        "next_retry_at": None,
+                        "error_message": "Subscription not found" if sub is None else "Subscription disabled",
+                    }
+                )
+                self.failed += 1
+
+        async with self.session_factory() as db:
+            await db.execute(update(WebhookDelivery), delivery_updates)
+            changed = [{"sub_id": i, "delta": n} for i, n in deltas.items() if n]
+            failing = [p for p in changed if p["delta"] > 0]
+            if failing:
+                # Checked against the pre-update count, so it must run first
+                await db.execute(_AUTO_DISABLE, failing)
+            if changed:
+                await db.execute(_APPLY_FAILURE_DELTA, changed)
+            await db.commit()
+
+        self.batches += 1
+        logger.info(
+            "webhook_dispatch_batch",
+            claimed=len(claimed),
+            delivered=sum(1 for u in delivery_updates if u["status"] == "delivered"),
+            subscribers=len(deltas),
+            send_ms=round(send_ms, 1),
+            total_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        return len(claimed)
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    async def run(self) -> None:
+        """Dispatch until stopped; a full batch loops immediately, otherwise poll."""
+        logger.info("webhook_dispatcher_started", http2=_HTTP2, batch_size=self.batch_size)
+        try:
+            while not self._stopping.is_set():
+                try:
+                    claimed = await self.dispatch_once()
+                except Exception:
+                    logger.exception("webhook_dispatch_batch_failed")
+                    claimed = 0
+                if claimed < self.batch_size:
+                    with contextlib.suppress(TimeoutError):
+                        await asyncio.wait_for(self._stopping.wait(), self.poll_seconds)
+        finally:
+            await self.aclose()
+            logger.info(
+                "webhook_dispatcher_stopped",
+                batches=self.batches,
+                delivered=self.delivered,
+                failed=self.failed,
+            )
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        await asyncio.gather(*(c.aclose() for c in clients.values()), return_exceptions=True)
+
+
+async def _main() -> None:
+    dispatcher = WebhookDispatcher()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, dispatcher.stop)
+    await dispatcher.run()
+
+
+if __name__ == "__main__":
+    from app.core.logging import configure_logging
+
+    configure_logging("webhook-dispatcher")
+    asyncio.run(_main())
@@ -21,6 +21,11 @@ from app.modules.webhooks.schemas import CreateSubscriptionRequest, UpdateSubscr
 
 logger = structlog.get_logger()
 
+# Exponential retry: 1m, 5m, 15m, 1h, 4h
+RETRY_DELAYS_SECONDS = [60, 300, 900, 3600, 14400]
+# Auto-disable a subscription after this many consecutive delivery failures
+AUTO_DISABLE_AFTER = 10
+
 
 class WebhookService:
     def __init__(self, db: AsyncSession) -> None:
@@ -148,6 +153,13 @@ class WebhookService:
 
         await self.db.flush()
 
+        from app.core.config import settings
+
+        if settings.WEBHOOK_DISPATCHER_ENABLED:
+            # Pending rows are claimed by the long-lived dispatcher (dispatcher.py)
+            await self.db.commit()
+            return len(deliveries_to_queue)
+
         # Refresh to get server-generated IDs, then queue Celery tasks
         from app.modules.webhooks.tasks import deliver_webhook_task
 
@@ -242,18 +254,15 @@ class WebhookService:
             delivery.error_message = str(exc)[:500]
             sub.failure_count += 1
 
-            # Exponential retry: 1m, 5m, 15m, 1h, 4h
-            retry_delays = [60, 300, 900, 3600, 14400]
-            if delivery.attempts <= len(retry_delays):
+            if delivery.attempts <= len(RETRY_DELAYS_SECONDS):
                 delivery.next_retry_at = datetime.utcnow() + timedelta(
-                    seconds=retry_delays[delivery.attempts - 1]
+                    seconds=RETRY_DELAYS_SECONDS[delivery.attempts - 1]
                 )
                 delivery.status = "retrying"
             else:
                 delivery.status = "failed"
 
-            # Auto-disable after 10 consecutive failures
-            if sub.failure_count >= 10:
+            if sub.failure_count >= AUTO_DISABLE_AFTER:
                 sub.is_active = False
                 sub.disabled_reason = "Auto-disabled: 10 consecutive delivery failures"
 
@@ -32,7 +32,15 @@ def deliver_webhook_task(self, delivery_id: str) -> dict:  # type: ignore[misc]
 
 @shared_task(name="tasks.retry_pending_webhooks", soft_time_limit=120, time_limit=180)
 def retry_pending_webhooks() -> dict:
-    """Beat task: retry deliveries whose next_retry_at has passed."""
+    """Beat task: retry deliveries whose next_retry_at has passed.
+
+    A no-op when the long-lived dispatcher is enabled — it claims due
+    retries itself.
+    """
+    from app.core.config import settings
+
+    if settings.WEBHOOK_DISPATCHER_ENABLED:
+        return {"queued": 0, "skipped": "dispatcher_enabled"}
 
     async def _run() -> int:
         from datetime import datetime
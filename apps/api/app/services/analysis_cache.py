@@ -26,13 +26,13 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-import httpx
 import structlog
 from sqlalchemy import and_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.circuit_breaker import ai_gateway_cb
+from app.core.circuit_breaker import AIGatewayUnavailableError
 from app.models.dataroom import Document, DocumentExtraction
+from app.services.gateway_client import GatewayClient, gateway_client
 
 logger = structlog.get_logger()
 
@@ -40,9 +40,8 @@ logger = structlog.get_logger()
 class AsyncGatewayClient:
     """Async AI Gateway adapter satisfying DocumentAnalysisCache._ai interface."""
 
-    def __init__(self, gateway_url: str, gateway_key: str) -> None:
-        self._url = gateway_url
-        self._key = gateway_key
+    def __init__(self, client: GatewayClient | None = None) -> None:
+        self._client = client or gateway_client()
 
     async def complete(self, task_type: str, context: dict[str, Any]) -> dict[str, Any]:
         """Call gateway and return normalised result dict."""
@@ -53,14 +52,6 @@ class AsyncGatewayClient:
             "model_used": "unavailable",
             "usage": {},
         }
-        if not await ai_gateway_cb.allow_request():
-            logger.warning(
-                "async_gateway_client_blocked",
-                task_type=task_type,
-                reason="circuit_breaker_open",
-            )
-            return _unavailable
-
         doc_text = context.get("document_text", "")
         doc_name = context.get("document_name", "document")
         prompt = (
@@ -70,37 +61,37 @@ class AsyncGatewayClient:
             f"Respond with a JSON object summarising your findings."
         )
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                resp = await client.post(
-                    f"{self._url}/v1/completions",
-                    json={
-                        "prompt": prompt,
-                        "task_type": task_type,
-                        "max_tokens": 800,
-                        "temperature": 0.3,
-                    },
-                    headers={"Authorization": f"Bearer {self._key}"},
-                )
-                resp.raise_for_status()
-                await ai_gateway_cb.record_success()
-                data = resp.json()
-                content = data.get("content", "")
-                # Try to parse JSON out of the response
-                validated: dict[str, Any] | None = None
-                match = re.search(r"\{.*\}", content, re.DOTALL)
-                if match:
-                    with contextlib.suppress(Exception):
-                        validated = json.loads(match.group())
-                return {
-                    "content": content,
-                    "validated_data": validated,
-                    "confidence": 0.75,
-                    "model_used": data.get("model_used", "claude"),
-                    "usage": data.get("usage", {}),
-                }
-        except (httpx.TimeoutException, httpx.ConnectError) as exc:
-            await ai_gateway_cb.record_failure()
-            logger.warning("async_gateway_client_failed", task_type=task_type, error=str(exc))
+            resp = await self._client.post(
+                "/v1/completions",
+                json={
+                    "prompt": prompt,
+                    "task_type": task_type,
+                    "max_tokens": 800,
+                    "temperature": 0.3,
+                },
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            content = data.get("content", "")
+            # Try to parse JSON out of the response
+            validated: dict[str, Any] | None = None
+            match = re.search(r"\{.*\}", content, re.DOTALL)
+            if match:
+                with contextlib.suppress(Exception):
+                    validated = json.loads(match.group())
+            return {
+                "content": content,
+                "validated_data": validated,
+                "confidence": 0.75,
+                "model_used": data.get("model_used", "claude"),
+                "usage": data.get("usage", {}),
+            }
+        except AIGatewayUnavailableError:
+            logger.warning(
+                "async_gateway_client_blocked",
+                task_type=task_type,
+                reason="circuit_breaker_open",
+            )
             return _unavailable
         except Exception as exc:
             logger.warning("async_gateway_client_failed", task_type=task_type, error=str(exc))
@@ -109,13 +100,7 @@ class AsyncGatewayClient:
 
 def make_analysis_cache(db: AsyncSession) -> DocumentAnalysisCache:
     """Factory: builds a ready-to-use cache with the async gateway client."""
-    from app.core.config import settings
-
-    client = AsyncGatewayClient(
-        gateway_url=settings.AI_GATEWAY_URL or "",
-        gateway_key=settings.AI_GATEWAY_API_KEY or "",
-    )
-    return DocumentAnalysisCache(db, client)
+    return DocumentAnalysisCache(db, AsyncGatewayClient())
 
 
 # Maps cross-module analysis_type → AI Gateway task_type
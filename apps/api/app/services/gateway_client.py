@@ -0,0 +1,292 @@
+"""Shared pooled HTTP client for AI Gateway calls.
+
+Every gateway caller in the API used to open its own ``httpx.AsyncClient``
+per call, paying TCP (and TLS) setup each time. ``gateway_client()`` returns
+one app-lifetime client with keep-alive pooling that:
+
+* applies per-task-type timeouts (``GATEWAY_TASK_TIMEOUTS``; callers may
+  still override),
+* goes through the shared ``ai_gateway_cb`` circuit breaker — raises
+  ``AIGatewayUnavailableError`` while it is open and records outcomes,
+* records connect / time-to-first-byte / total latency histograms and
+  connection reuse counts, served on ``GET /health/ai``.
+
+HTTP/2 is negotiated when the ``h2`` package is installed and the gateway
+is reached over https (httpx does not speak cleartext h2c).
+
+The pool is bound to the running event loop; Celery tasks that wrap service
+code in ``asyncio.run`` transparently get a client for their own loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import time
+import weakref
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from typing import Any
+
+import httpx
+import structlog
+
+from app.core.circuit_breaker import AIGatewayUnavailableError, ai_gateway_cb
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+try:
+    import h2  # noqa: F401
+
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+DEFAULT_TIMEOUT = 60.0
+CONNECT_TIMEOUT = 5.0
+
+# Read budget per gateway task type (seconds); anything unlisted uses DEFAULT_TIMEOUT
+GATEWAY_TASK_TIMEOUTS: dict[str, float] = {
+    "parse_screener_query": 10.0,
+    "rag_search": 15.0,
+    "summarize_document": 30.0,
+    "extract_kpis": 30.0,
+    "expert_note_enrichment": 30.0,
+    "general": 30.0,
+    "chat_with_tools": 120.0,
+    "batch": 120.0,
+}
+
+
+# ── Latency histograms ────────────────────────────────────────────────────────
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 30_000, 60_000, 120_000)
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+
+    def percentile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-th percentile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return float(self.BUCKETS_MS[i]) if i < len(self.BUCKETS_MS) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict[str, Any]:
+        labels = [f"le_{b}" for b in self.BUCKETS_MS] + ["le_inf"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 1) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+class _RequestTrace:
+    """httpcore trace hook: captures connect time and time-to-first-byte."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.connect_ms: float | None = None
+        self.ttfb_ms: float | None = None
+        self._connect_started: float | None = None
+
+    async def __call__(self, event: str, info: dict[str, Any]) -> None:
+        now = time.perf_counter()
+        if event == "connection.connect_tcp.started":
+            self._connect_started = now
+        elif event in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            if self._connect_started is not None:
+                self.connect_ms = (now - self._connect_started) * 1000
+        elif event.endswith("receive_response_headers.complete") and self.ttfb_ms is None:
+            self.ttfb_ms = (now - self.started) * 1000
+
+
+# ── Client ────────────────────────────────────────────────────────────────────
+
+
+class GatewayClient:
+    """Pooled AI Gateway client shared by every caller in the process."""
+
+    def __init__(self, base_url: str, api_key: str, max_connections: int = 100) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.latency = {
+            "connect": LatencyHistogram(),
+            "ttfb": LatencyHistogram(),
+            "total": LatencyHistogram(),
+        }
+        self.requests = 0
+        self.new_connections = 0
+        self.errors = 0
+        self.rejected = 0
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=_HTTP2,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections // 2,
+                    keepalive_expiry=60.0,
+                ),
+                timeout=httpx.Timeout(DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT),
+            )
+            self._clients[loop] = client
+        return client
+
+    @staticmethod
+    def timeout_for(task_type: str | None, override: float | None = None) -> httpx.Timeout:
+        seconds = override or GATEWAY_TASK_TIMEOUTS.get(task_type or "", DEFAULT_TIMEOUT)
+        return httpx.Timeout(seconds, connect=min(CONNECT_TIMEOUT, seconds))
+
+    async def _before(self, breaker: bool) -> None:
+        if breaker and not await ai_gateway_cb.allow_request():
+            self.rejected += 1
+            raise AIGatewayUnavailableError()
+
+    async def _after(
+        self, trace: _RequestTrace, status_code: int | None, breaker: bool
+    ) -> None:
+        self.requests += 1
+        if trace.connect_ms is not None:
+            self.new_connections += 1
+            self.latency["connect"].observe(trace.connect_ms)
+        if trace.ttfb_ms is not None:
+            self.latency["ttfb"].observe(trace.ttfb_ms)
+        self.latency["total"].observe((time.perf_counter() - trace.started) * 1000)
+        if status_code is None or status_code >= 500:
+            self.errors += 1
+        if breaker:
+            if status_code is None or status_code >= 500:
+                await ai_gateway_cb.record_failure()
+            else:
+                await ai_gateway_cb.record_success()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: dict[str, Any] | None = None,
+        task_type: str | None = None,
+        timeout: float | None = None,
+        breaker: bool = True,
+    ) -> httpx.Response:
+        """Send one request and read the body.
+
+        Raises ``AIGatewayUnavailableError`` when the circuit is open; transport
+        errors (timeouts, refused connections) are recorded and re-raised.
+        """
+        await self._before(breaker)
+        if task_type is None and json is not None:
+            task_type = json.get("task_type")
+        trace = _RequestTrace()
+        try:
+            resp = await self._client().request(
+                method,
+                path,
+                json=json,
+                timeout=self.timeout_for(task_type, timeout),
+                extensions={"trace": trace},
+            )
+        except httpx.TransportError:
+            await self._after(trace, None, breaker)
+            raise
+        await self._after(trace, resp.status_code, breaker)
+        return resp
+
+    async def post(self, path: str, json: dict[str, Any], **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", path, json=json, **kwargs)
+
+    async def get(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        path: str,
+        json: dict[str, Any],
+        *,
+        timeout: float | None = None,
+        breaker: bool = True,
+    ) -> AsyncIterator[httpx.Response]:
+        """Streamed POST; total latency covers the whole body."""
+        await self._before(breaker)
+        trace = _RequestTrace()
+        status_code: int | None = None
+        try:
+            async with self._client().stream(
+                "POST",
+                path,
+                json=json,
+                timeout=self.timeout_for(json.get("task_type"), timeout),
+                extensions={"trace": trace},
+            ) as resp:
+                status_code = resp.status_code
+                yield resp
+        finally:
+            await self._after(trace, status_code, breaker)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "http2": _HTTP2,
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "connection_reuse_ratio": round(1 - self.new_connections / self.requests, 3)
+            if self.requests
+            else None,
+            "errors": self.errors,
+            "breaker_rejections": self.rejected,
+            "latency_ms": {name: h.snapshot() for name, h in self.latency.items()},
+        }
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            with suppress(RuntimeError):  # its event loop is already closed
+                await client.aclose()
+
+
+_gateway_client: GatewayClient | None = None
+
+
+def gateway_client() -> GatewayClient:
+    global _gateway_client
+    if _gateway_client is None:
+        _gateway_client = GatewayClient(settings.AI_GATEWAY_URL, settings.AI_GATEWAY_API_KEY)
+    return _gateway_client
+
+
+async def close_gateway_client() -> None:
+    """Close pooled connections (called on shutdown)."""
+    if _gateway_client is not None:
+        await _gateway_client.aclose()
@@ -0,0 +1,320 @@
+"""Page-parallel PDF text extraction.
+
+``iter_pdf_pages`` yields one ``PageText`` per page, in page order, with the
+1-based page number and how long that page took to extract. Large PDFs are
+split into page ranges that a process-wide set of worker processes extracts
+concurrently (text extraction is CPU-bound pure Python, so threads alone would
+not help); only a small window of ranges is in flight at a time so memory
+stays bounded however long the document is. Small PDFs are extracted serially
+with the same per-page timing, as is any range whose worker fails.
+
+Workers are plain ``subprocess`` children running this module, not
+``multiprocessing`` ones: Celery's prefork pool processes are daemonic, and
+multiprocessing refuses to start children from a daemonic process.
+
+A worker that has not replied within ``PDF_RANGE_TIMEOUT_SECONDS`` is killed
+and its range extracted serially as well.
+
+Pages slower than ``PDF_SLOW_PAGE_MS`` and a per-document summary (page count,
+total time, slowest page) are logged so pathological files can be found.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class PageText:
+    page: int  # 1-based
+    text: str
+    elapsed_ms: float
+
+
+def _reader_class() -> Any:
+    """``pypdf``'s PdfReader, falling back to the legacy ``PyPDF2`` package."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        from PyPDF2 import PdfReader
+    return PdfReader
+
+
+def _extract_pages(reader: Any, start: int, stop: int) -> list[tuple[int, str, float]]:
+    """(page number, text, ms) for zero-based pages ``[start, stop)``."""
+    rows = []
+    for index in range(start, stop):
+        t0 = time.perf_counter()
+        try:
+            text = reader.pages[index].extract_text() or ""
+        except Exception:
+            text = ""  # one malformed page must not sink the whole document
+        rows.append((index + 1, text, (time.perf_counter() - t0) * 1000))
+    return rows
+
+
+def _extract_range(path: str, start: int, stop: int) -> list[tuple[int, str, float]]:
+    """Worker side: open the PDF at ``path`` and extract one page range."""
+    return _extract_pages(_reader_class()(path), start, stop)
+
+
+# ── Range workers ─────────────────────────────────────────────────────────────
+
+_APP_ROOT = Path(__file__).resolve().parents[2]  # directory containing ``app/``
+
+
+class RangeWorkerError(RuntimeError):
+    """A range worker exited or could not extract the range it was sent."""
+
+
+class _RangeWorker:
+    """One long-lived ``python -m app.services.pdf_extraction`` child.
+
+    Requests are ``[path, start, stop]`` JSON lines on stdin; each reply is one
+    JSON line on stdout (``null`` if extraction failed). The child exits when
+    stdin closes, i.e. when this process goes away. Replies are read on a
+    daemon thread so waiting for one can time out.
+    """
+
+    def __init__(self) -> None:
+        pythonpath = [str(_APP_ROOT), os.environ.get("PYTHONPATH", "")]
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "app.services.pdf_extraction"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, pythonpath))},
+            encoding="utf-8",
+        )
+        self._replies: queue.SimpleQueue[str] = queue.SimpleQueue()
+        threading.Thread(target=self._read_replies, name="pdf-range-reader", daemon=True).start()
+
+    def _read_replies(self) -> None:
+        assert self.proc.stdout is not None
+        with contextlib.suppress(OSError, ValueError):
+            for line in self.proc.stdout:
+                self._replies.put(line)
+        self._replies.put("")  # EOF: the child exited
+
+    def extract(self, path: str, start: int, stop: int) -> list[tuple[int, str, float]]:
+        assert self.proc.stdin is not None
+        try:
+            self.proc.stdin.write(json.dumps([path, start, stop]) + "\n")
+            self.proc.stdin.flush()
+        except OSError as exc:
+            raise RangeWorkerError(str(exc)) from exc
+        timeout = settings.PDF_RANGE_TIMEOUT_SECONDS
+        try:
+            line = self._replies.get(timeout=timeout)
+        except queue.Empty:
+            self.close()
+            raise RangeWorkerError(
+                f"range worker timed out after {timeout:g}s on pages {start + 1}-{stop}"
+            ) from None
+        if not line:
+            raise RangeWorkerError(f"range worker exited with {self.proc.poll()}")
+        rows = json.loads(line)
+        if rows is None:
+            raise RangeWorkerError(f"range worker could not extract pages {start + 1}-{stop}")
+        return [tuple(row) for row in rows]
+
+    def close(self) -> None:
+        with contextlib.suppress(OSError):
+            self.proc.kill()
+        self.proc.wait()
+
+
+class _RangeWorkerPool:
+    """``workers`` threads, each driving one reusable worker process at a time."""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.pid = os.getpid()
+        self._threads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-range")
+        self._idle: queue.SimpleQueue[_RangeWorker] = queue.SimpleQueue()
+        self._closed = False
+
+    def submit(self, path: str, start: int, stop: int) -> Future:
+        return self._threads.submit(self._extract, path, start, stop)
+
+    def _extract(self, path: str, start: int, stop: int) -> list[tuple[int, str, float]]:
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            worker = _RangeWorker()
+        try:
+            rows = worker.extract(path, start, stop)
+        except BaseException:
+            worker.close()  # a worker that failed mid-request cannot be trusted again
+            raise
+        if self._closed:
+            worker.close()
+        else:
+            self._idle.put(worker)
+        return rows
+
+    def shutdown(self) -> None:
+        self._closed = True
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        with contextlib.suppress(queue.Empty):
+            while True:
+                self._idle.get_nowait().close()
+
+
+_pool: _RangeWorkerPool | None = None
+
+
+def _get_pool(workers: int) -> _RangeWorkerPool:
+    """Process-wide pool, created on first use; worker processes start lazily."""
+    global _pool
+    if _pool is not None and _pool.pid != os.getpid():
+        _pool = None  # inherited across fork: its threads and workers belong to the parent
+    if _pool is None or _pool.workers != workers:
+        _shutdown_pool()
+        _pool = _RangeWorkerPool(workers)
+    return _pool
+
+
+def _shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+@contextmanager
+def _as_path(fh: IO[bytes]) -> Iterator[str]:
+    """A filesystem path to the PDF that pool workers can open themselves."""
+    name = getattr(fh, "name", None)
+    if isinstance(name, str):
+        yield name
+        return
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+        fh.seek(0)
+        shutil.copyfileobj(fh, tmp, 1024 * 1024)
+        tmp.flush()
+        yield tmp.name
+
+
+def _ranges_in_pool(
+    reader: Any, path: str, ranges: list[tuple[int, int]], workers: int
+) -> Iterator[list[tuple[int, str, float]]]:
+    """Yield each range's rows in order, keeping ``2 × workers`` ranges in flight.
+
+    A range whose worker fails is extracted serially with the reader already
+    open in this process; if worker processes cannot be started at all, so
+    are the remaining ranges.
+    """
+    pool: _RangeWorkerPool | None = _get_pool(workers)
+    todo = deque(ranges)
+    pending: deque[tuple[tuple[int, int], Future | None]] = deque()
+
+    def fill() -> None:
+        while todo and len(pending) < workers * 2:
+            span = todo.popleft()
+            pending.append((span, pool.submit(path, *span) if pool is not None else None))
+
+    fill()
+    while pending:
+        span, future = pending.popleft()
+        rows = None
+        if future is not None:
+            try:
+                rows = future.result()
+            except RangeWorkerError as exc:
+                logger.warning(
+                    "pdf_range_worker_failed", pages=f"{span[0] + 1}-{span[1]}", error=str(exc)
+                )
+            except OSError as exc:
+                logger.warning("pdf_pool_unavailable", error=str(exc))
+                _shutdown_pool()
+                pool = None
+        yield rows if rows is not None else _extract_pages(reader, *span)
+        fill()
+
+
+def iter_pdf_pages(
+    fh: IO[bytes],
+    *,
+    workers: int | None = None,
+    pages_per_range: int | None = None,
+    parallel_min_pages: int | None = None,
+) -> Iterator[PageText]:
+    """Yield every page's text in page order.
+
+    Raises ``ImportError`` when no PDF library is installed; errors reading the
+    document itself propagate, a single unreadable page yields empty text.
+    """
+    workers = settings.PDF_EXTRACT_WORKERS if workers is None else workers
+    pages_per_range = pages_per_range or settings.PDF_PAGES_PER_RANGE
+    if parallel_min_pages is None:
+        parallel_min_pages = settings.PDF_PARALLEL_MIN_PAGES
+
+    started = time.perf_counter()
+    reader = _reader_class()(fh)
+    total = len(reader.pages)
+    ranges = [(s, min(s + pages_per_range, total)) for s in range(0, total, pages_per_range)]
+    parallel = workers > 1 and total >= parallel_min_pages and len(ranges) > 1
+
+    slowest = PageText(0, "", 0.0)
+    with _as_path(fh) if parallel else nullcontext("") as path:
+        batches = (
+            _ranges_in_pool(reader, path, ranges, workers)
+            if parallel
+            else (_extract_pages(reader, *span) for span in ranges)
+        )
+        for rows in batches:
+            for row in rows:
+                page = PageText(*row)
+                if page.elapsed_ms > slowest.elapsed_ms:
+                    slowest = page
+                if page.elapsed_ms >= settings.PDF_SLOW_PAGE_MS:
+                    logger.warning("pdf_slow_page", page=page.page, ms=round(page.elapsed_ms, 1))
+                yield page
+
+    logger.info(
+        "pdf_text_extracted",
+        pages=total,
+        workers=workers if parallel else 1,
+        total_ms=round((time.perf_counter() - started) * 1000, 1),
+        slowest_page=slowest.page or None,
+        slowest_page_ms=round(slowest.elapsed_ms, 1),
+    )
+
+
+def _serve() -> None:
+    """Range worker loop, run as ``python -m app.services.pdf_extraction``."""
+    replies = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)  # stray prints or log lines must not corrupt the reply stream
+    for line in sys.stdin:
+        try:
+            rows = _extract_range(*json.loads(line))
+        except Exception:
+            rows = None
+        replies.write(json.dumps(rows) + "\n")
+        replies.flush()
+
+
+if __name__ == "__main__":
+    _serve()
@@ -4,9 +4,9 @@ SCR Platform — Master Backup Orchestrator
 Replaces the basic Gap Fix Block 10 backup.py with a full production system.
 
 Tasks:
-  nightly_backup         — Daily 2am: pg_dump → S3 primary + DR, OpenSearch snapshot,
-                           secrets inventory, RDS snapshot verification, S3 replication
-                           status, table count audit, health report
+  nightly_backup         — Daily 2am: pg_dump streamed → S3 primary + DR, OpenSearch
+                           snapshot, secrets inventory, RDS snapshot verification, S3
+                           replication status, table count audit, health report
   weekly_backup_test     — Sunday 5am: restore pg_dump to temp schema, verify table count,
                            check S3 DR replication, report pass/fail
 """
@@ -14,12 +14,15 @@ Tasks:
 from __future__ import annotations
 
 import contextlib
-import gzip
 import hashlib
 import json
 import os
 import subprocess
 import tempfile
+import threading
+import time
+import zlib
+from collections.abc import Iterable, Iterator
 from datetime import UTC, datetime
 from typing import Any
 
@@ -32,9 +35,19 @@ from app.core.config import settings
 
 logger = structlog.get_logger()
 
+_STREAM_CHUNK_BYTES = 4 * 1024 * 1024
+_PG_DUMP_TIMEOUT_S = 900
+_DUMP_SUFFIXES = (".dump", ".dump.gz", ".dump.zst")
+_MB = 1024 * 1024
+
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
 
+def _manifest_key(s3_key: str) -> str:
+    """Sidecar holding the dump's SHA-256 and sizes."""
+    return f"{s3_key}.manifest.json"
+
+
 def _s3_client(region: str | None = None) -> Any:
     return boto3.client(
         "s3",
@@ -81,11 +94,145 @@ def _emit_metric(metric_name: str, value: float, unit: str = "Count") -> None:
         pass  # Never fail a backup because of metric emission
 
 
+# ── Streaming helpers ─────────────────────────────────────────────────────────
+#
+# A dump is never held in memory: pg_dump stdout is read in chunks, compressed
+# as it streams, and uploaded part by part. Reads go the other way, chunk by
+# chunk. Peak memory is about one multipart part (BACKUP_MULTIPART_PART_MB).
+
+
+def _compressor() -> tuple[str, Any]:
+    """Return (key suffix, streaming compressor) for BACKUP_COMPRESSION.
+
+    Both compressors expose ``compress(bytes)`` / ``flush()``; zstd compresses
+    on BACKUP_ZSTD_THREADS threads inside libzstd.
+    """
+    if settings.BACKUP_COMPRESSION == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            logger.warning("backup.zstd_unavailable", fallback="gzip")
+        else:
+            cctx = zstandard.ZstdCompressor(
+                level=settings.BACKUP_ZSTD_LEVEL, threads=settings.BACKUP_ZSTD_THREADS
+            )
+            return ".zst", cctx.compressobj()
+    return ".gz", zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 → gzip container
+
+
+def _iter_dump(chunks: Iterable[bytes], key: str) -> Iterator[bytes]:
+    """Decompress a backup object stream according to its key suffix.
+
+    Older nightly backups were gzip under a plain ``.dump`` key, so those are
+    detected by their magic bytes.
+    """
+    decompressor: Any = None
+    first = True
+    for chunk in chunks:
+        if first:
+            first = False
+            if key.endswith(".zst"):
+                import zstandard
+
+                decompressor = zstandard.ZstdDecompressor().decompressobj()
+            elif key.endswith(".gz") or chunk[:2] == b"\x1f\x8b":
+                decompressor = zlib.decompressobj(31)
+        out = decompressor.decompress(chunk) if decompressor is not None else chunk
+        if out:
+            yield out
+
+
+def _hashing(chunks: Iterable[bytes], digest: Any) -> Iterator[bytes]:
+    for chunk in chunks:
+        digest.update(chunk)
+        yield chunk
+
+
+def _s3_object_chunks(s3: Any, bucket: str, key: str) -> Iterator[bytes]:
+    body = s3.get_object(Bucket=bucket, Key=key)["Body"]
+    try:
+        yield from body.iter_chunks(_STREAM_CHUNK_BYTES)
+    finally:
+        body.close()
+
+
+def _multipart_upload(
+    s3: Any, bucket: str, key: str, chunks: Iterable[bytes], part_size: int, **create_args: Any
+) -> dict:
+    """Upload ``chunks`` as an S3 multipart upload, hashing the stream as it goes.
+
+    The upload is aborted if ``chunks`` raises, so a failed dump never leaves a
+    completed object behind. Returns the SHA-256, byte count and part count.
+    """
+    upload_id = s3.create_multipart_upload(Bucket=bucket, Key=key, **create_args)["UploadId"]
+    digest = hashlib.sha256()
+    parts: list[dict] = []
+    buffer = bytearray()
+    total = 0
+
+    def send(body: bytes) -> None:
+        number = len(parts) + 1
+        resp = s3.upload_part(
+            Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=body
+        )
+        parts.append({"PartNumber": number, "ETag": resp["ETag"]})
+
+    try:
+        for chunk in chunks:
+            digest.update(chunk)
+            total += len(chunk)
+            buffer += chunk
+            while len(buffer) >= part_size:
+                send(bytes(buffer[:part_size]))
+                del buffer[:part_size]
+        if buffer or not parts:
+            send(bytes(buffer))
+        s3.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+        )
+    except BaseException:
+        with contextlib.suppress(Exception):
+            s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise
+    return {"sha256": digest.hexdigest(), "bytes": total, "parts": len(parts)}
+
+
+def _verify_backup(s3: Any, bucket: str, key: str, expected_sha256: str) -> bool:
+    """Stream the object back: recompute its SHA-256 and pipe the dump into
+    ``pg_restore --list`` (which reads the archive TOC from stdin)."""
+    digest = hashlib.sha256()
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            ["pg_restore", "--list"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr,
+        )
+        sink = proc.stdin
+        try:
+            for chunk in _iter_dump(_hashing(_s3_object_chunks(s3, bucket, key), digest), key):
+                if sink is None:
+                    continue  # keep reading so the checksum covers the whole object
+                try:
+                    sink.write(chunk)
+                except BrokenPipeError:
+                    sink = None  # pg_restore has read the TOC and exited
+        finally:
+            with contextlib.suppress(BrokenPipeError):
+                proc.stdin.close()  # type: ignore[union-attr]
+        returncode = proc.wait(timeout=60)
+
+    checksum_ok = digest.hexdigest() == expected_sha256
+    if not checksum_ok:
+        logger.warning("backup.pg_dump.checksum_mismatch", key=key)
+    return checksum_ok and returncode == 0
+
+
 # ── Step 1: PostgreSQL logical backup ─────────────────────────────────────────
 
 
 def _run_pg_backup(timestamp: str, backup_bucket: str) -> dict:
-    """pg_dump → gzip → S3 primary. Returns metadata dict."""
+    """pg_dump → streaming gzip/zstd → S3 multipart upload. Returns metadata dict."""
     db_url = getattr(settings, "DATABASE_URL", "") or getattr(settings, "DATABASE_URL_SYNC", "")
     if not db_url:
         return {"status": "skipped", "reason": "DATABASE_URL not configured"}
@@ -95,7 +242,8 @@ def _run_pg_backup(timestamp: str, backup_bucket: str) -> dict:
     if params["password"]:
         env["PGPASSWORD"] = params["password"]
 
-    s3_key = f"postgresql/{timestamp[:6]}/{timestamp}_scr_platform.dump"
+    suffix, compressor = _compressor()
+    s3_key = f"postgresql/{timestamp[:6]}/{timestamp}_scr_platform.dump{suffix}"
 
     cmd = [
         "pg_dump",
@@ -109,74 +257,133 @@ def _run_pg_backup(timestamp: str, backup_bucket: str) -> dict:
         params["dbname"],
         "--no-password",
         "--format=custom",
-        "--compress=9",
+        # zstd replaces pg_dump's single-threaded zlib rather than recompressing it
+        "--compress=0" if suffix == ".zst" else "--compress=9",
         "--no-owner",
         "--no-acl",
     ]
-    logger.info("backup.pg_dump.start", host=params["host"], db=params["dbname"])
-
-    try:
-        result = subprocess.run(cmd, capture_output=True, env=env, timeout=900)
-        if result.returncode != 0:
-            err = result.stderr.decode("utf-8", errors="replace")[:500]
-            raise RuntimeError(f"pg_dump exited {result.returncode}: {err}")
-
-        dump_bytes = result.stdout
-        compressed = gzip.compress(dump_bytes, compresslevel=6)
-        checksum = hashlib.sha256(compressed).hexdigest()
-        size_mb = round(len(compressed) / 1024 / 1024, 2)
+    logger.info(
+        "backup.pg_dump.start", host=params["host"], db=params["dbname"], compression=suffix[1:]
+    )
 
-        s3 = _s3_client()
-        s3.put_object(
-            Bucket=backup_bucket,
-            Key=s3_key,
-            Body=compressed,
-            ContentType="application/gzip",
-            Metadata={
-                "backup_timestamp": timestamp,
-                "db_host": params["host"],
-                "db_name": params["dbname"],
-                "sha256": checksum,
-                "uncompressed_bytes": str(len(dump_bytes)),
-                "size_mb": str(size_mb),
-            },
-        )
+    s3 = _s3_client()
+    started = time.monotonic()
+    raw_bytes = 0
+    timed_out = threading.Event()
+
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr, env=env)
+
+        def kill() -> None:
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(_PG_DUMP_TIMEOUT_S, kill)
+        timer.start()
+
+        def compressed() -> Iterator[bytes]:
+            nonlocal raw_bytes
+            while chunk := proc.stdout.read(_STREAM_CHUNK_BYTES):  # type: ignore[union-attr]
+                raw_bytes += len(chunk)
+                if out := compressor.compress(chunk):
+                    yield out
+            if tail := compressor.flush():
+                yield tail
+            # Checked before the upload completes, so a failed dump is aborted
+            if proc.wait() != 0:
+                if timed_out.is_set():
+                    raise RuntimeError("pg_dump timed out after 15 minutes")
+                stderr.seek(0)
+                err = stderr.read(500).decode("utf-8", errors="replace")
+                raise RuntimeError(f"pg_dump exited {proc.returncode}: {err}")
 
-        # Verify: download and run pg_restore --list
-        verified = False
         try:
-            obj = s3.get_object(Bucket=backup_bucket, Key=s3_key)
-            verify_bytes = gzip.decompress(obj["Body"].read())
-            with tempfile.NamedTemporaryFile(suffix=".dump", delete=True) as tmp:
-                tmp.write(verify_bytes)
-                tmp.flush()
-                chk = subprocess.run(
-                    ["pg_restore", "--list", tmp.name],
-                    capture_output=True,
-                    timeout=60,
-                )
-                verified = chk.returncode == 0
-        except Exception as ve:
-            logger.warning("backup.pg_dump.verify_failed", error=str(ve))
-
-        logger.info("backup.pg_dump.complete", key=s3_key, size_mb=size_mb, verified=verified)
-        return {
-            "status": "success",
-            "s3_key": s3_key,
-            "size_mb": size_mb,
-            "sha256": checksum,
-            "verified": verified,
-        }
+            upload = _multipart_upload(
+                s3,
+                backup_bucket,
+                s3_key,
+                compressed(),
+                part_size=max(settings.BACKUP_MULTIPART_PART_MB, 5) * _MB,
+                ContentType="application/zstd" if suffix == ".zst" else "application/gzip",
+                Metadata={
+                    "backup_timestamp": timestamp,
+                    "db_host": params["host"],
+                    "db_name": params["dbname"],
+                    "compression": suffix[1:],
+                },
+            )
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+    elapsed = time.monotonic() - started
+    size_mb = round(upload["bytes"] / _MB, 2)
+    uncompressed_mb = round(raw_bytes / _MB, 2)
+    throughput = round(raw_bytes / _MB / elapsed, 2) if elapsed > 0 else 0.0
+    ratio = round(raw_bytes / upload["bytes"], 2) if upload["bytes"] else 0.0
+
+    # The checksum is only known once the stream ends, so it goes in a manifest
+    # next to the dump (object metadata is fixed when the upload starts).
+    manifest = {
+        "timestamp": timestamp,
+        "s3_key": s3_key,
+        "compression": suffix[1:],
+        "sha256": upload["sha256"],
+        "size_bytes": upload["bytes"],
+        "uncompressed_bytes": raw_bytes,
+        "parts": upload["parts"],
+    }
+    s3.put_object(
+        Bucket=backup_bucket,
+        Key=_manifest_key(s3_key),
+        Body=json.dumps(manifest, indent=2).encode(),
+        ContentType="application/json",
+    )
 
-    except subprocess.TimeoutExpired as exc:
-        raise RuntimeError("pg_dump timed out after 15 minutes") from exc
+    verified = False
+    verify_started = time.monotonic()
+    try:
+        verified = _verify_backup(s3, backup_bucket, s3_key, upload["sha256"])
+    except Exception as ve:
+        logger.warning("backup.pg_dump.verify_failed", error=str(ve))
+    verify_seconds = round(time.monotonic() - verify_started, 1)
+
+    _emit_metric("backup_pg_dump_throughput", throughput, "Megabytes/Second")
+    _emit_metric("backup_pg_dump_compression_ratio", ratio, "None")
+    _emit_metric("backup_pg_dump_size", size_mb, "Megabytes")
+
+    logger.info(
+        "backup.pg_dump.complete",
+        key=s3_key,
+        size_mb=size_mb,
+        uncompressed_mb=uncompressed_mb,
+        throughput_mb_s=throughput,
+        compression_ratio=ratio,
+        verified=verified,
+    )
+    return {
+        "status": "success",
+        "s3_key": s3_key,
+        "size_mb": size_mb,
+        "uncompressed_mb": uncompressed_mb,
+        "compression": suffix[1:],
+        "sha256": upload["sha256"],
+        "parts": upload["parts"],
+        "throughput_mb_s": throughput,
+        "compression_ratio": ratio,
+        "duration_seconds": round(elapsed, 1),
+        "verify_seconds": verify_seconds,
+        "verified": verified,
+    }
 
 
 # ── Step 2: DR cross-region copy ───────────────────────────────────────────────
 
 
 def _copy_to_dr(s3_key: str, primary_bucket: str) -> dict:
-    """Copy the backup to the DR region bucket."""
+    """Copy the backup and its checksum manifest to the DR region bucket."""
     dr_region = getattr(settings, "DR_REGION", "eu-central-1")
     dr_bucket = getattr(settings, "DR_BACKUP_BUCKET", f"scr-backups-{dr_region}")
 
@@ -193,6 +400,9 @@ def _copy_to_dr(s3_key: str, primary_bucket: str) -> dict:
             s3_key,
             ExtraArgs={"StorageClass": "STANDARD_IA"},
         )
+        # Without the manifest a DR restore cannot verify the dump's checksum
+        manifest_key = _manifest_key(s3_key)
+        s3_dr.copy({"Bucket": primary_bucket, "Key": manifest_key}, dr_bucket, manifest_key)
         logger.info("backup.dr_copy.complete", dr_bucket=dr_bucket, key=s3_key, size_mb=size_mb)
         return {
             "status": "success",
@@ -595,7 +805,7 @@ def weekly_backup_test(self) -> dict:  # type: ignore[misc]
         all_keys = []
         for page in paginator.paginate(Bucket=backup_bucket, Prefix="postgresql/"):
             for obj in page.get("Contents", []):
-                if obj["Key"].endswith(".dump") or obj["Key"].endswith(".dump.gz"):
+                if obj["Key"].endswith(_DUMP_SUFFIXES):
                     all_keys.append((obj["LastModified"], obj["Key"]))
 
         if not all_keys:
@@ -636,14 +846,13 @@ def weekly_backup_test(self) -> dict:  # type: ignore[misc]
             if params["password"]:
                 env["PGPASSWORD"] = params["password"]
 
-            # Download backup
-            obj = s3.get_object(Bucket=backup_bucket, Key=latest_key)
-            raw_bytes = obj["Body"].read()
-            dump_bytes = gzip.decompress(raw_bytes) if latest_key.endswith(".gz") else raw_bytes
-
+            # Stream the backup to disk, decompressing as it downloads
             with tempfile.NamedTemporaryFile(suffix=".dump", delete=False) as tmp:
-                tmp.write(dump_bytes)
                 tmp_path = tmp.name
+                for chunk in _iter_dump(
+                    _s3_object_chunks(s3, backup_bucket, latest_key), latest_key
+                ):
+                    tmp.write(chunk)
 
             try:
                 # Create temp schema and restore with --schema-only first for quick table count
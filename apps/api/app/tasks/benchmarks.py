@@ -7,8 +7,11 @@ logger = structlog.get_logger()
 
 
 @shared_task(name="tasks.compute_nightly_benchmarks")
-def compute_nightly_benchmarks() -> dict:
-    """Run at 3am daily. Aggregates all snapshots into benchmark stats."""
+def compute_nightly_benchmarks(dry_run: bool = False) -> dict:
+    """Run at 3am daily. Aggregates all snapshots into benchmark stats.
+
+    ``dry_run=True`` only reports timings and group counts.
+    """
     import asyncio
 
     async def _run():
@@ -17,7 +20,7 @@ def compute_nightly_benchmarks() -> dict:
 
         async with async_session_factory() as db:
             svc = BenchmarkService(db)
-            return await svc.compute_benchmarks()
+            return await svc.compute_benchmarks(dry_run=dry_run)
 
     result = asyncio.run(_run())
     logger.info("nightly_benchmarks_computed", **result)
@@ -37,6 +40,7 @@ def record_daily_snapshots() -> dict:
         from app.modules.metrics.snapshot_service import MetricSnapshotService
 
         snapshots_recorded = 0
+        snapshots_unchanged = 0
 
         async with async_session_factory() as db:
             svc = MetricSnapshotService(db)
@@ -51,7 +55,7 @@ def record_daily_snapshots() -> dict:
             )
             for score, org_id in scores_result.all():
                 try:
-                    await svc.record_snapshot(
+                    snapshot = await svc.record_snapshot(
                         org_id=org_id,
                         entity_type="project",
                         entity_id=score.project_id,
@@ -69,13 +73,19 @@ def record_daily_snapshots() -> dict:
                         },
                         trigger_event="daily_snapshot",
                     )
-                    snapshots_recorded += 1
+                    if snapshot is None:
+                        snapshots_unchanged += 1
+                    else:
+                        snapshots_recorded += 1
                 except Exception as exc:
                     logger.warning("daily_snapshot_failed", error=str(exc))
 
             await db.commit()
 
-        return {"snapshots_recorded": snapshots_recorded}
+        return {
+            "snapshots_recorded": snapshots_recorded,
+            "snapshots_unchanged": snapshots_unchanged,
+        }
 
     result = asyncio.run(_run())
     logger.info("daily_snapshots_recorded", **result)
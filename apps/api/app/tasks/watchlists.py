@@ -2,38 +2,67 @@
 
 from __future__ import annotations
 
-import asyncio
+from datetime import datetime, timedelta
 
+import redis
 import structlog
 from celery import shared_task
 
+from app.core.config import settings
+
 logger = structlog.get_logger()
 
+_WATERMARK_KEY = "watchlists:percolator:watermark"
+# First run (or lost watermark): look back this far, as the per-watchlist check did
+_INITIAL_LOOKBACK = timedelta(hours=1)
+
+
+def _redis() -> redis.Redis:
+    return redis.from_url(
+        settings.REDIS_URL, socket_connect_timeout=5, socket_timeout=5, decode_responses=True
+    )
+
+
+def _read_watermark() -> datetime | None:
+    """Start time of the last successful run."""
+    try:
+        raw = _redis().get(_WATERMARK_KEY)
+    except Exception as exc:
+        logger.warning("watchlists.watermark_read_failed", error=str(exc))
+        return None
+    return datetime.fromisoformat(raw) if raw else None
+
+
+def _write_watermark(value: datetime) -> None:
+    try:
+        _redis().set(_WATERMARK_KEY, value.isoformat())
+    except Exception as exc:
+        logger.warning("watchlists.watermark_write_failed", error=str(exc))
+
+
+def percolate_alerts(include_saved_searches: bool = True) -> dict:
+    """Evaluate everything changed since the watermark against all watchlists
+    (and saved searches) in one pass, then advance the watermark."""
+    from sqlalchemy import func, select
+
+    from app.core.celery_db import get_celery_db_session
+    from app.modules.watchlists.percolator import percolate
+
+    with get_celery_db_session() as session:
+        run_started: datetime = session.execute(select(func.now())).scalar_one()
+        since = _read_watermark() or run_started - _INITIAL_LOOKBACK
+        stats = percolate(session, since, include_saved_searches=include_saved_searches)
+
+    _write_watermark(run_started)
+    logger.info("watchlists.checked", since=since.isoformat(), **stats)
+    return {"status": "ok", **stats}
+
 
 @shared_task(name="tasks.check_watchlists", bind=True, max_retries=3, default_retry_delay=120)
 def check_watchlists(self) -> dict:
-    """Check all active watchlists and create alerts for matches."""
-    from app.core.database import async_session_factory
-    from app.modules.watchlists.service import check_watchlist, get_active_watchlists
-
-    async def _run() -> dict:
-        total_alerts = 0
-        async with async_session_factory() as db:
-            watchlists = await get_active_watchlists(db)
-            for wl in watchlists:
-                try:
-                    alerts = await check_watchlist(db, wl)
-                    total_alerts += alerts
-                except Exception as exc:
-                    logger.error("watchlist.check_error", watchlist_id=str(wl.id), error=str(exc))
-        logger.info("watchlists.checked", count=len(watchlists), alerts=total_alerts)
-        return {
-            "status": "ok",
-            "watchlists_checked": len(watchlists),
-            "alerts_created": total_alerts,
-        }
-
+    """Check all active watchlists and saved searches; create alerts for matches."""
     try:
-        return asyncio.run(_run())
+        return percolate_alerts()
     except Exception as exc:
+        logger.error("watchlists.check_failed", error=str(exc))
         raise self.retry(exc=exc) from exc
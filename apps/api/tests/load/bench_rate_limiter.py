@@ -0,0 +1,100 @@
+"""Rate limiter benchmark: legacy sorted-set sliding window vs GCRA Lua script.
+
+Measures, per simulated request (IP check + org check), the number of Redis
+commands executed, Redis memory held per rate-limit key, and client-side
+p50/p99 overhead. Needs a real Redis — point REDIS_URL at a scratch database:
+
+    REDIS_URL=redis://localhost:6379/15 poetry run python tests/load/bench_rate_limiter.py
+
+The script FLUSHES that database before each run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import redis.asyncio as aioredis
+
+from app.middleware.security import _DEFAULT_TIER, _TIER_LIMITS, RateLimitMiddleware
+
+
+async def _legacy_sliding_window(redis: aioredis.Redis, key: str, limit: int, window: int) -> bool:
+    """The pre-GCRA implementation: one sorted-set member per request."""
+    now = time.time()
+    pipe = redis.pipeline()
+    pipe.zadd(key, {str(now): now})
+    pipe.zremrangebyscore(key, 0, now - window)
+    pipe.zcard(key)
+    pipe.expire(key, window + 1)
+    results = await pipe.execute()
+    return results[2] <= limit
+
+
+async def _legacy_request(redis: aioredis.Redis, ip: str, org: str) -> None:
+    if await _legacy_sliding_window(redis, f"rl:ip:{ip}:projects", 300, 60):
+        await redis.get(f"org:tier:{org}")
+        await _legacy_sliding_window(redis, f"rl:org:{org}:projects", _TIER_LIMITS[_DEFAULT_TIER][0], 60)
+
+
+async def _commands_processed(redis: aioredis.Redis) -> int | None:
+    try:
+        return int((await redis.info("stats"))["total_commands_processed"])
+    except Exception:
+        return None  # INFO unsupported (e.g. a Redis emulator)
+
+
+async def _memory_usage(redis: aioredis.Redis, key: str) -> int:
+    try:
+        return await redis.memory_usage(key) or 0
+    except Exception:
+        return 0
+
+
+async def _run(name: str, redis: aioredis.Redis, request, n: int, clients: int) -> None:
+    await redis.flushdb()
+    await redis.set("org:tier:org-0", _DEFAULT_TIER)
+    before = await _commands_processed(redis)
+    latencies: list[float] = []
+
+    for i in range(n):
+        started = time.perf_counter()
+        await request(f"10.0.0.{i % clients}", "org-0")
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    after = await _commands_processed(redis)
+    # INFO itself counts as one command
+    per_request = f"{(after - before - 1) / n:5.2f}" if before is not None and after is not None else "  n/a"
+    keys = [k async for k in redis.scan_iter("rl:*")]
+    memory = sum([await _memory_usage(redis, k) for k in keys])
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<8} commands/req={per_request}  "
+        f"p50={quantiles[49]:.3f}ms  p99={quantiles[98]:.3f}ms  "
+        f"keys={len(keys)}  bytes/key={memory // max(1, len(keys))}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--clients", type=int, default=50, help="distinct client IPs")
+    args = parser.parse_args()
+
+    redis = aioredis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379/15"), decode_responses=True)
+    limiter = RateLimitMiddleware(app=None, redis_url="")  # type: ignore[arg-type]
+    limiter._redis = redis
+
+    async def gcra_request(ip: str, org: str) -> None:
+        await limiter._check(f"rl:ip:{ip}:projects", 300, 60, org, f"rl:org:{org}:projects", False)
+
+    await _run("legacy", redis, lambda ip, org: _legacy_request(redis, ip, org), args.requests, args.clients)
+    await _run("gcra", redis, gcra_request, args.requests, args.clients)
+    await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
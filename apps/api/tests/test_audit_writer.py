@@ -0,0 +1,127 @@
+"""Unit tests for the batched audit-log writer — no database required."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.middleware import audit
+from app.middleware.audit import AuditLogWriter
+
+
+class FakeDB:
+    def __init__(self) -> None:
+        self.batches: list[list[dict]] = []
+        self.fail = False
+
+    def session(self) -> FakeSession:
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, db: FakeDB) -> None:
+        self.db = db
+
+    async def __aenter__(self) -> FakeSession:
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def execute(self, stmt, rows):
+        if self.db.fail:
+            raise ConnectionError("db down")
+        self.db.batches.append(list(rows))
+
+    async def commit(self) -> None:
+        return None
+
+
+@pytest.fixture
+def db(monkeypatch) -> FakeDB:
+    fake = FakeDB()
+    monkeypatch.setattr(audit, "async_session_factory", fake.session)
+    return fake
+
+
+def _row(i: int = 0) -> dict:
+    return {"id": uuid.uuid4(), "org_id": uuid.uuid4(), "user_id": uuid.uuid4(), "action": f"create:{i}"}
+
+
+class TestAuditLogWriter:
+    async def test_flushes_when_batch_is_full(self, db):
+        writer = AuditLogWriter(batch_size=3, flush_interval_ms=10_000)
+        for i in range(3):
+            writer.enqueue(_row(i))
+        await asyncio.sleep(0.05)
+
+        assert [len(b) for b in db.batches] == [3]
+        await writer.stop()
+
+    async def test_flushes_partial_batch_after_interval(self, db):
+        writer = AuditLogWriter(batch_size=100, flush_interval_ms=20)
+        writer.enqueue(_row(1))
+        writer.enqueue(_row(2))
+        await asyncio.sleep(0.1)
+
+        assert [len(b) for b in db.batches] == [2]
+        await writer.stop()
+
+    async def test_drops_and_counts_when_queue_full(self, db):
+        writer = AuditLogWriter(max_queue=2, batch_size=100, flush_interval_ms=10_000)
+        results = [writer.enqueue(_row(i)) for i in range(5)]
+
+        assert results == [True, True, False, False, False]
+        assert writer.stats()["dropped"] == 3
+        assert writer.stats()["queue_depth"] == 2
+        await writer.stop()
+
+    async def test_stop_drains_queue(self, db):
+        writer = AuditLogWriter(batch_size=4, flush_interval_ms=10_000)
+        for i in range(10):
+            writer.enqueue(_row(i))
+        await asyncio.sleep(0.05)  # one batch flushed, the next is being collected
+
+        await writer.stop()
+
+        assert [len(b) for b in db.batches] == [4, 4, 2]
+        stats = writer.stats()
+        assert stats["written"] == 10
+        assert stats["queue_depth"] == 0
+        assert stats["flushes"] == 3
+
+    async def test_stop_waits_for_inflight_flush(self, db, monkeypatch):
+        writer = AuditLogWriter(batch_size=2, flush_interval_ms=10_000)
+        release = asyncio.Event()
+        flush = writer._flush
+
+        async def slow_flush(rows):
+            await release.wait()
+            await flush(rows)
+
+        monkeypatch.setattr(writer, "_flush", slow_flush)
+        for i in range(3):
+            writer.enqueue(_row(i))
+        await asyncio.sleep(0.01)  # first batch of 2 is now flushing
+
+        stopping = asyncio.create_task(writer.stop())
+        await asyncio.sleep(0.01)
+        release.set()
+        await stopping
+
+        assert [len(b) for b in db.batches] == [2, 1]
+        assert writer.stats()["written"] == 3
+
+    async def test_failed_flush_is_counted_not_raised(self, db):
+        db.fail = True
+        writer = AuditLogWriter(batch_size=2, flush_interval_ms=10_000)
+        writer.enqueue(_row(1))
+        writer.enqueue(_row(2))
+        await asyncio.sleep(0.05)
+
+        stats = writer.stats()
+        assert stats["failed"] == 2
+        assert stats["written"] == 0
+        await writer.stop()
@@ -1,16 +1,23 @@
 """Tests for auth dependency functions."""
 
+import time
 import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
 
+from app.auth import dependencies, principal_cache
+from app.auth.clerk_webhook import handle_user_deleted
 from app.auth.dependencies import (
+    get_current_user,
     require_org_access,
     require_permission,
     require_role,
 )
-from app.models.enums import UserRole
+from app.models.enums import SubscriptionTier, UserRole
 from app.schemas.auth import CurrentUser
 from tests.conftest import SAMPLE_CLERK_ID, SAMPLE_ORG_ID, SAMPLE_USER_ID
 
@@ -119,3 +126,87 @@ class TestRequireOrgAccess:
         with pytest.raises(HTTPException) as exc:
             await require_org_access(org_id=other_org, current_user=user)
         assert exc.value.status_code == 403
+
+
+class TestPrincipalCache:
+    """get_current_user serves repeat tokens from the in-process principal cache."""
+
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        principal_cache.clear()
+        dependencies._org_tier_fresh_until.clear()
+        yield
+        principal_cache.clear()
+
+    def _db(self):
+        user = SimpleNamespace(
+            id=SAMPLE_USER_ID, org_id=SAMPLE_ORG_ID, role=UserRole.ADMIN, email="test@example.com"
+        )
+        org = SimpleNamespace(subscription_tier=SubscriptionTier.PROFESSIONAL)
+        user_result, org_result = MagicMock(), MagicMock()
+        user_result.scalar_one_or_none.return_value = user
+        org_result.scalar_one_or_none.return_value = org
+        db = AsyncMock()
+        db.execute.side_effect = lambda stmt: (
+            org_result if "organizations" in str(stmt) else user_result
+        )
+        return db
+
+    async def _resolve(self, db, token="token-a", redis=None):
+        creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        payload = {"sub": SAMPLE_CLERK_ID, "exp": time.time() + 3600}
+        redis = redis or AsyncMock(exists=AsyncMock(return_value=1))
+        with (
+            patch.object(dependencies, "verify_clerk_token", AsyncMock(return_value=payload)) as verify,
+            patch("app.services.response_cache.get_redis", AsyncMock(return_value=redis)),
+        ):
+            user = await get_current_user(credentials=creds, db=db)
+        return user, verify
+
+    @pytest.mark.anyio
+    async def test_repeat_token_skips_verification_and_db(self):
+        db = self._db()
+        first, verify = await self._resolve(db)
+        assert verify.await_count == 1
+        calls = db.execute.await_count
+
+        second, verify = await self._resolve(db)
+        assert second == first
+        verify.assert_not_awaited()
+        assert db.execute.await_count == calls
+
+    @pytest.mark.anyio
+    async def test_org_tier_written_only_when_missing(self):
+        redis = AsyncMock(exists=AsyncMock(return_value=0))
+        db = self._db()
+        await self._resolve(db, redis=redis)
+        redis.set.assert_awaited_once_with(
+            f"org:tier:{SAMPLE_ORG_ID}", "professional", ex=300, nx=True
+        )
+
+        present = AsyncMock(exists=AsyncMock(return_value=1))
+        dependencies._org_tier_fresh_until.clear()
+        await self._resolve(self._db(), token="token-b", redis=present)
+        present.set.assert_not_awaited()
+
+    @pytest.mark.anyio
+    async def test_user_deleted_webhook_invalidates(self):
+        await self._resolve(self._db())
+        key = principal_cache.token_key("token-a")
+        assert principal_cache.get_principal(key) is not None
+
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = None
+        await handle_user_deleted({"id": SAMPLE_CLERK_ID}, AsyncMock(execute=AsyncMock(return_value=result)))
+        assert principal_cache.get_principal(key) is None
+
+    def test_entry_never_outlives_token(self):
+        user = CurrentUser(
+            user_id=SAMPLE_USER_ID,
+            org_id=SAMPLE_ORG_ID,
+            role=UserRole.ADMIN,
+            email="test@example.com",
+            external_auth_id=SAMPLE_CLERK_ID,
+        )
+        principal_cache.put_principal("k", user, token_exp=time.time() - 1)
+        assert principal_cache.get_principal("k") is None
@@ -0,0 +1,104 @@
+"""Unit tests for the streaming backup helpers — no S3, pg_dump or database required."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+
+import pytest
+
+from app.tasks import backup
+
+
+class FakeS3:
+    """Records multipart calls; parts are kept so the object can be reassembled."""
+
+    def __init__(self) -> None:
+        self.parts: list[bytes] = []
+        self.completed: list[dict] | None = None
+        self.aborted = False
+
+    def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, **kwargs):
+        assert kwargs["PartNumber"] == len(self.parts) + 1
+        self.parts.append(kwargs["Body"])
+        return {"ETag": f'"etag-{kwargs["PartNumber"]}"'}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.completed = kwargs["MultipartUpload"]["Parts"]
+
+    def abort_multipart_upload(self, **kwargs):
+        self.aborted = True
+
+
+def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+class TestMultipartUpload:
+    def test_splits_into_fixed_parts_and_hashes_stream(self):
+        data = os.urandom(25_000)
+        s3 = FakeS3()
+        chunks = _chunks(data, 3_000)
+        result = backup._multipart_upload(s3, "bucket", "key", chunks, part_size=10_000)
+
+        assert [len(p) for p in s3.parts] == [10_000, 10_000, 5_000]
+        assert b"".join(s3.parts) == data
+        assert [p["PartNumber"] for p in s3.completed] == [1, 2, 3]
+        assert result == {"sha256": hashlib.sha256(data).hexdigest(), "bytes": 25_000, "parts": 3}
+
+    def test_failed_stream_aborts_upload(self):
+        def failing():
+            yield b"x" * 100
+            raise RuntimeError("pg_dump exited 1")
+
+        s3 = FakeS3()
+        with pytest.raises(RuntimeError):
+            backup._multipart_upload(s3, "bucket", "key", failing(), part_size=10_000)
+        assert s3.aborted
+        assert s3.completed is None
+
+
+class TestCompression:
+    def test_gzip_round_trip(self, monkeypatch):
+        monkeypatch.setattr(backup.settings, "BACKUP_COMPRESSION", "gzip")
+        suffix, compressor = backup._compressor()
+        dump = b"PGDMP" + os.urandom(50_000) + b"\0" * 200_000
+        compressed = b"".join(compressor.compress(c) for c in _chunks(dump, 7_000))
+        compressed += compressor.flush()
+
+        assert suffix == ".gz"
+        assert gzip.decompress(compressed) == dump
+        assert b"".join(backup._iter_dump(_chunks(compressed, 4_096), f"k.dump{suffix}")) == dump
+
+    def test_legacy_gzip_under_plain_dump_key(self):
+        dump = b"PGDMP" + b"a" * 10_000
+        legacy = gzip.compress(dump)
+        assert b"".join(backup._iter_dump(_chunks(legacy, 1_000), "k.dump")) == dump
+        assert b"".join(backup._iter_dump(_chunks(dump, 1_000), "k.dump")) == dump
+
+
+class TestDRCopy:
+    def test_copies_dump_and_manifest(self, monkeypatch):
+        copies: list[tuple[dict, str, str]] = []
+
+        class FakeClient:
+            def head_object(self, **kwargs):
+                return {"ContentLength": 2 * 1024 * 1024}
+
+            def copy(self, source, bucket, key, **kwargs):
+                copies.append((source, bucket, key))
+
+        monkeypatch.setattr(backup, "_s3_client", lambda region=None: FakeClient())
+        key = "postgres/daily/2026-10-16/scr_2026-10-16T00-00-00.dump.gz"
+        result = backup._copy_to_dr(key, "primary")
+
+        assert result["status"] == "success"
+        assert [(src["Key"], dst) for src, _, dst in copies] == [
+            (key, key),
+            (f"{key}.manifest.json", f"{key}.manifest.json"),
+        ]
@@ -1315,3 +1315,153 @@ class TestTasks:
         doc.name = "Business Plan 2026.pdf"
         result = _classify_document(doc, "")
         assert result == "business_plan"
+
+    def test_download_streams_object_once_while_hashing(self):
+        import hashlib
+
+        from app.modules.dataroom import tasks
+
+        payload = b"a,b\n1,2\n" * 50_000
+        body = MagicMock()
+        body.iter_chunks.return_value = (payload[i : i + 65536] for i in range(0, len(payload), 65536))
+        s3 = MagicMock()
+        s3.get_object.return_value = {"Body": body}
+        doc = MagicMock(file_type="csv", checksum_sha256=hashlib.sha256(payload).hexdigest())
+
+        with (
+            patch.object(tasks, "_s3_client", return_value=s3),
+            tasks._download(doc) as (fh, actual_hash),
+        ):
+            tasks._validate_checksum(doc, actual_hash)
+            text = tasks._extract_text(doc, fh)
+
+        s3.get_object.assert_called_once()
+        assert text == payload.decode()
+
+    def test_validate_checksum_mismatch(self):
+        from app.modules.dataroom.tasks import _validate_checksum
+
+        doc = MagicMock(checksum_sha256="expected")
+        with pytest.raises(ValueError, match="Checksum mismatch"):
+            _validate_checksum(doc, "actual")
+
+    def test_extract_xlsx_text_from_file(self):
+        import io
+
+        import openpyxl
+
+        from app.modules.dataroom.tasks import _extract_xlsx_text
+
+        wb = openpyxl.Workbook()
+        wb.active.title = "P&L"
+        wb.active.append(["Revenue", 1200])
+        buf = io.BytesIO()
+        wb.save(buf)
+        buf.seek(0)
+
+        assert _extract_xlsx_text(buf) == "Sheet: P&L\nRevenue\t1200"
+
+    def test_pdf_pages_keep_numbers_and_offsets(self):
+        import io
+
+        from app.modules.dataroom.tasks import _extract_pdf_pages
+
+        pdf = _make_pdf(["Alpha page", "", "Gamma page"])
+        text, pages = _extract_pdf_pages(io.BytesIO(pdf))
+
+        assert text == "Alpha page\nGamma page"
+        assert pages == [{"page": 1, "offset": 0}, {"page": 3, "offset": 11}]
+
+    def test_pdf_page_ranges_extracted_in_process_pool(self):
+        import io
+
+        from app.services.pdf_extraction import iter_pdf_pages
+
+        pdf = _make_pdf([f"Page {n}" for n in range(1, 8)])
+        pages = list(
+            iter_pdf_pages(io.BytesIO(pdf), workers=2, pages_per_range=2, parallel_min_pages=1)
+        )
+
+        assert [p.page for p in pages] == list(range(1, 8))
+        assert [p.text for p in pages] == [f"Page {n}" for n in range(1, 8)]
+        assert all(p.elapsed_ms >= 0 for p in pages)
+
+    def test_hung_range_worker_is_killed_after_timeout(self, monkeypatch):
+        import os
+        import signal
+
+        from app.core.config import settings
+        from app.services.pdf_extraction import RangeWorkerError, _RangeWorker
+
+        monkeypatch.setattr(settings, "PDF_RANGE_TIMEOUT_SECONDS", 0.5)
+        worker = _RangeWorker()
+        os.kill(worker.proc.pid, signal.SIGSTOP)  # alive but never replies
+        try:
+            with pytest.raises(RangeWorkerError, match="timed out after 0.5s on pages 1-2"):
+                worker.extract("unused.pdf", 0, 2)
+            assert worker.proc.poll() == -signal.SIGKILL
+        finally:
+            worker.close()
+
+    def test_pdf_page_ranges_parallel_inside_daemonic_process(self):
+        """Celery prefork children are daemonic; range workers must still start there."""
+        import multiprocessing
+
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+        pdf = _make_pdf([f"Page {n}" for n in range(1, 8)])
+        proc = ctx.Process(target=_extract_in_daemon, args=(pdf, results), daemon=True)
+        proc.start()
+        daemonic, pages = results.get(timeout=60)
+        proc.join(timeout=10)
+
+        assert daemonic is True
+        assert pages == [(n, f"Page {n}") for n in range(1, 8)]
+
+
+def _extract_in_daemon(pdf: bytes, results) -> None:
+    import io
+    import multiprocessing
+
+    from app.services import pdf_extraction
+
+    def serial_fallback(*args):
+        raise AssertionError("ranges were extracted serially, not by range workers")
+
+    pdf_extraction._extract_pages = serial_fallback
+    try:
+        pages = pdf_extraction.iter_pdf_pages(
+            io.BytesIO(pdf), workers=2, pages_per_range=2, parallel_min_pages=1
+        )
+        results.put((multiprocessing.current_process().daemon, [(p.page, p.text) for p in pages]))
+    except Exception as exc:
+        results.put((multiprocessing.current_process().daemon, repr(exc)))
+
+
+def _make_pdf(page_texts: list[str]) -> bytes:
+    """Minimal valid PDF with one line of Helvetica text per page."""
+    n = len(page_texts)
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode() if text else b""
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
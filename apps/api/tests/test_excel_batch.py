@@ -0,0 +1,114 @@
+"""Tests for the Excel add-in batch evaluation endpoint — no database required."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.database import get_db
+from app.main import app
+from app.modules.excel_api import router as excel_router
+from app.modules.excel_api.auth import verify_api_key
+from app.modules.excel_api.batch import BatchEvaluator, CellRef
+
+ORG_ID = uuid.uuid4()
+
+
+class RecordingEvaluator(BatchEvaluator):
+    """Resolvers echo their inputs so grouping and ordering can be asserted."""
+
+    def __init__(self) -> None:
+        super().__init__(db=None, org_id=ORG_ID)  # type: ignore[arg-type]
+        self.calls: dict[str, list[CellRef]] = {}
+        for fn in list(self._resolvers):
+            self._resolvers[fn] = self._recorder(fn)
+
+    def _recorder(self, fn: str):
+        async def resolve(refs: list[CellRef]) -> list[dict]:
+            self.calls[fn] = refs
+            return [{"value": f"{fn}:{r.metric or r.base}", "label": fn, "as_of": None} for r in refs]
+
+        return resolve
+
+
+class TestBatchEvaluator:
+    async def test_groups_by_function_and_keeps_request_order(self):
+        pid = uuid.uuid4()
+        refs = [
+            CellRef(fn="valuation", project_id=pid, metric="irr"),
+            CellRef(fn="fx", base="EUR", quote="USD"),
+            CellRef(fn="valuation", project_id=pid, metric="npv"),
+            CellRef(fn="valuation", project_id=pid, metric="irr"),  # duplicate
+        ]
+        evaluator = RecordingEvaluator()
+        results, timings = await evaluator.evaluate(refs)
+
+        assert [r["value"] for r in results] == [
+            "valuation:irr",
+            "fx:EUR",
+            "valuation:npv",
+            "valuation:irr",
+        ]
+        assert len(evaluator.calls["valuation"]) == 2  # one group, duplicates resolved once
+        assert set(timings) == {"valuation", "fx"}
+
+    async def test_missing_arguments_error_inline(self):
+        evaluator = RecordingEvaluator()
+        results, _ = await evaluator.evaluate([CellRef(fn="portfolio", metric="nav")])
+        assert results[0]["value"] is None
+        assert "portfolio_id" in results[0]["error"]
+        assert evaluator.calls == {}
+
+
+class TestCellBuilders:
+    def test_valuation_errors_match_get_endpoint(self):
+        from fastapi import HTTPException
+
+        from app.modules.excel_api.cells import valuation_cell
+
+        valuation = SimpleNamespace(
+            valued_at=date(2026, 1, 31), enterprise_value=100.0, equity_value=None, assumptions={}
+        )
+        project = SimpleNamespace(capacity_mw=50)
+        assert valuation_cell(valuation, project, "ev_per_mw")["value"] == 2.0
+        with pytest.raises(HTTPException) as exc:
+            valuation_cell(valuation, project, "irr")
+        assert exc.value.status_code == 404
+
+
+class TestBatchEndpoint:
+    @pytest.fixture
+    async def client(self, monkeypatch):
+        async def fake_evaluate(self, refs):
+            return [{"value": i, "label": r.fn, "as_of": None} for i, r in enumerate(refs)], {"fx": 1.0}
+
+        monkeypatch.setattr(BatchEvaluator, "evaluate", fake_evaluate)
+        app.dependency_overrides[verify_api_key] = lambda: ORG_ID
+        app.dependency_overrides[get_db] = lambda: None
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            yield ac
+        app.dependency_overrides.pop(verify_api_key, None)
+        app.dependency_overrides.pop(get_db, None)
+
+    async def test_etag_round_trip(self, client):
+        body = {"cells": [{"fn": "fx", "base": "EUR", "quote": "USD"}, {"fn": "fx", "base": "EUR", "quote": "GBP"}]}
+        resp = await client.post("/v1/excel/batch", json=body)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert [r["value"] for r in data["results"]] == [0, 1]
+        assert "total" in data["timings_ms"]
+        assert "fx;dur=" in resp.headers["Server-Timing"]
+
+        again = await client.post(
+            "/v1/excel/batch", json=body, headers={"If-None-Match": resp.headers["ETag"]}
+        )
+        assert again.status_code == 304
+        assert again.content == b""
+
+    def test_weak_and_listed_etags_match(self):
+        assert excel_router._etag_matches('W/"abc", "def"', '"abc"')
+        assert not excel_router._etag_matches('"xyz"', '"abc"')
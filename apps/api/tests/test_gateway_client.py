@@ -0,0 +1,140 @@
+"""Unit tests for the pooled AI Gateway client — no gateway or Redis required."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.circuit_breaker import AIGatewayUnavailableError
+from app.services import gateway_client as gc
+from app.services.gateway_client import GatewayClient, LatencyHistogram
+
+
+class FakeBreaker:
+    def __init__(self, allow: bool = True) -> None:
+        self.allow = allow
+        self.successes = 0
+        self.failures = 0
+
+    async def allow_request(self) -> bool:
+        return self.allow
+
+    async def record_success(self) -> None:
+        self.successes += 1
+
+    async def record_failure(self) -> None:
+        self.failures += 1
+
+
+@pytest.fixture
+def breaker(monkeypatch) -> FakeBreaker:
+    fake = FakeBreaker()
+    monkeypatch.setattr(gc, "ai_gateway_cb", fake)
+    return fake
+
+
+def _client(handler) -> GatewayClient:
+    client = GatewayClient("http://gateway.test", "k3y")
+    client._clients[asyncio.get_running_loop()] = httpx.AsyncClient(
+        base_url=client.base_url,
+        headers={"Authorization": "Bearer k3y"},
+        transport=httpx.MockTransport(handler),
+    )
+    return client
+
+
+class TestLatencyHistogram:
+    def test_percentiles_use_bucket_upper_bounds(self):
+        hist = LatencyHistogram()
+        for ms in (3, 40, 40, 40, 700):
+            hist.observe(ms)
+        snap = hist.snapshot()
+        assert snap["count"] == 5
+        assert snap["p50_ms"] == 50.0
+        assert snap["p99_ms"] == 1_000.0
+        assert snap["buckets"]["le_5"] == 1
+
+    def test_empty(self):
+        assert LatencyHistogram().snapshot()["p50_ms"] is None
+
+
+class TestGatewayClient:
+    def test_per_task_timeouts(self):
+        assert GatewayClient.timeout_for("parse_screener_query").read == 10.0
+        assert GatewayClient.timeout_for("chat_with_tools").read == 120.0
+        assert GatewayClient.timeout_for("unlisted").read == gc.DEFAULT_TIMEOUT
+        assert GatewayClient.timeout_for("parse_screener_query", 45.0).read == 45.0
+
+    async def test_post_sends_auth_and_records_success(self, breaker):
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json={"content": "ok"})
+
+        client = _client(handler)
+        resp = await client.post("/v1/completions", json={"task_type": "general"})
+        await client.aclose()
+
+        assert resp.json() == {"content": "ok"}
+        assert str(seen[0].url) == "http://gateway.test/v1/completions"
+        assert seen[0].headers["Authorization"] == "Bearer k3y"
+        assert breaker.successes == 1
+        stats = client.stats()
+        assert stats["requests"] == 1
+        assert stats["latency_ms"]["total"]["count"] == 1
+
+    async def test_server_errors_and_transport_errors_trip_the_breaker(self, breaker):
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                return httpx.Response(503)
+            raise httpx.ConnectError("refused", request=request)
+
+        client = _client(handler)
+        assert (await client.post("/v1/completions", json={})).status_code == 503
+        with pytest.raises(httpx.ConnectError):
+            await client.post("/v1/completions", json={})
+
+        assert breaker.failures == 2
+        assert client.stats()["errors"] == 2
+
+    async def test_open_circuit_rejects_without_sending(self, breaker):
+        breaker.allow = False
+        sent: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request.url.path)
+            return httpx.Response(200)
+
+        client = _client(handler)
+        with pytest.raises(AIGatewayUnavailableError):
+            await client.post("/v1/completions", json={})
+        # Health probes bypass the breaker
+        assert (await client.get("/health", breaker=False)).status_code == 200
+
+        assert sent == ["/health"]
+        assert client.stats()["breaker_rejections"] == 1
+
+    async def test_stream_records_outcome(self, breaker):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=b'data: {"token": "hi"}\n\ndata: {"done": true}\n')
+
+        client = _client(handler)
+        async with client.stream("/v1/completions/stream", json={"task_type": "chat_with_tools"}) as resp:
+            lines = [line async for line in resp.aiter_lines() if line]
+        assert len(lines) == 2
+        assert breaker.successes == 1
+
+    async def test_malformed_success_body_falls_back(self, breaker):
+        from app.services.analysis_cache import AsyncGatewayClient
+
+        client = _client(lambda request: httpx.Response(200, content=b"<html>proxy error</html>"))
+        result = await AsyncGatewayClient(client).complete("classify_document", {"document_text": "x"})
+        await client.aclose()
+        assert result["model_used"] == "unavailable"
@@ -0,0 +1,113 @@
+"""Unit tests for market data ingestion helpers — no DB required."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.modules.market_data.service import (
+    SUMMARY_SERIES,
+    _normalise_observations,
+    _upsert_points,
+    auto_interval,
+    get_series_buckets,
+    get_summary,
+)
+
+
+class TestNormaliseObservations:
+    def test_drops_missing_and_non_numeric_values(self):
+        points = _normalise_observations(
+            [
+                {"date": "2026-01-01", "value": "1.5"},
+                {"date": "2026-01-02", "value": None},
+                {"date": "2026-01-03", "value": "n/a"},
+            ]
+        )
+        assert points == {date(2026, 1, 1): Decimal("1.5")}
+
+    def test_duplicate_dates_keep_last_value(self):
+        """Hourly feeds collapse onto one daily row — the last observation wins."""
+        points = _normalise_observations(
+            [
+                {"date": date(2026, 1, 1), "value": 10},
+                {"date": "2026-01-01", "value": 12.1234567},
+            ]
+        )
+        assert points == {date(2026, 1, 1): Decimal("12.123457")}
+
+
+class TestBulkUpsert:
+    async def test_batches_rows_into_multi_row_statements(self):
+        db = AsyncMock()
+        observations = [
+            {"date": date(2026, 1, 1) + timedelta(days=i), "value": i} for i in range(25)
+        ]
+        written = await _upsert_points(
+            db, "entsoe", "DE_DA", "DE day-ahead", "eur_mwh", observations, batch_size=10
+        )
+        assert written == 25
+        assert db.execute.await_count == 3
+        db.commit.assert_awaited_once()
+        stmt = db.execute.await_args_list[0].args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT ON CONSTRAINT uq_external_data_point" in sql
+        assert "excluded.value" in sql
+
+    async def test_empty_observations_skip_database(self):
+        db = AsyncMock()
+        assert await _upsert_points(db, "fred", "DGS10", "10Y", "percent", []) == 0
+        db.execute.assert_not_awaited()
+        db.commit.assert_not_awaited()
+
+
+class TestSummaryAndBuckets:
+    async def test_summary_uses_single_query_and_keeps_display_order(self):
+        def row(sid: str, day: int, value: float):
+            return SimpleNamespace(
+                source="fred",
+                series_id=sid,
+                series_name=sid,
+                data_date=date(2026, 1, day),
+                value=Decimal(str(value)),
+                unit="percent",
+            )
+
+        result = MagicMock()
+        result.all.return_value = [row("UNRATE", 2, 4.0), row("DGS10", 2, 4.4), row("DGS10", 1, 4.0)]
+        db = AsyncMock()
+        db.execute.return_value = result
+
+        summaries = await get_summary(db)
+
+        db.execute.assert_awaited_once()
+        assert [s.series_id for s in summaries] == [
+            sid for _, sid in SUMMARY_SERIES if sid in {"DGS10", "UNRATE"}
+        ]
+        assert summaries[0].change_pct == 10.0
+        assert summaries[1].change_pct is None
+
+    async def test_buckets_aggregate_in_sql(self):
+        result = MagicMock()
+        result.all.return_value = []
+        db = AsyncMock()
+        db.execute.return_value = result
+
+        await get_series_buckets(db, "fred", "DGS10", days=5 * 365, interval="auto")
+
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "date_trunc" in sql
+        assert "array_agg" in sql
+        assert "GROUP BY" in sql
+
+    def test_auto_interval_bounds_payload(self):
+        assert auto_interval(90) == "day"
+        assert auto_interval(5 * 365) == "week"
+        assert auto_interval(20 * 365) == "month"
+
+    async def test_unknown_interval_rejected(self):
+        with pytest.raises(ValueError):
+            await get_series_buckets(AsyncMock(), "fred", "DGS10", interval="hour")
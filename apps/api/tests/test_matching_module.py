@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import uuid
+from datetime import UTC, datetime
 from decimal import Decimal
+from types import SimpleNamespace
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import get_current_user
@@ -17,12 +20,21 @@ from app.models.enums import (
     MatchInitiator,
     MatchStatus,
     OrgType,
+    ProjectStage,
     ProjectStatus,
     ProjectType,
+    RiskTolerance,
     UserRole,
 )
+from app.models.investors import InvestorMandate
 from app.models.matching import MatchResult
 from app.models.projects import Project
+from app.modules.matching.algorithm import (
+    MatchingAlgorithm,
+    adjacent_sectors,
+    region_countries,
+)
+from app.modules.matching.service import _mandate_candidate_filter
 from app.schemas.auth import CurrentUser
 
 pytestmark = pytest.mark.anyio
@@ -281,6 +293,50 @@ class TestInvestorRecommendations:
         assert "total" in data
         assert isinstance(data["items"], list)
 
+    async def test_prefilter_skips_out_of_mandate_projects_unless_matched(
+        self,
+        mx_inv_client: AsyncClient,
+        db: AsyncSession,
+        mx_inv_user: User,
+        mx_project: Project,
+    ) -> None:
+        """A project outside every mandate is only listed if already matched or unfiltered."""
+        db.add(
+            InvestorMandate(
+                org_id=MX_INV_ORG_ID,
+                name="Nordic Wind Mandate",
+                sectors=["wind"],
+                geographies=["NO"],
+                ticket_size_min=Decimal("100000"),
+                ticket_size_max=Decimal("200000"),
+                risk_tolerance=RiskTolerance.MODERATE,
+            )
+        )
+        await db.flush()
+        url = "/v1/matching/investor/recommendations"
+
+        async def listed(**params) -> bool:
+            resp = await mx_inv_client.get(url, params=params)
+            assert resp.status_code == 200, resp.text
+            return str(MX_PROJECT_ID) in [i["project_id"] for i in resp.json()["items"]]
+
+        assert not await listed()
+        assert await listed(prefilter="false")
+
+        db.add(
+            MatchResult(
+                investor_org_id=MX_INV_ORG_ID,
+                ally_org_id=MX_ORG_ID,
+                project_id=MX_PROJECT_ID,
+                overall_score=35,
+                score_breakdown={},
+                status=MatchStatus.INTERESTED,
+                initiated_by=MatchInitiator.INVESTOR,
+            )
+        )
+        await db.flush()
+        assert await listed()
+
 
 class TestAllyRecommendations:
     """Tests for GET /v1/matching/ally/recommendations/{project_id}."""
@@ -375,3 +431,251 @@ class TestMatchLifecycle:
         assert data["content"] == "Very interested in this project opportunity!"
         assert "id" in data
         assert str(data["match_id"]) == str(match.id)
+
+
+# ── Batch scoring (pure, no DB) ───────────────────────────────────────────────
+
+
+def _mandate(**overrides):
+    fields = {
+        "id": uuid.uuid4(),
+        "sectors": ["solar"],
+        "geographies": ["DE"],
+        "stages": ["operational"],
+        "ticket_size_min": Decimal("1000000"),
+        "ticket_size_max": Decimal("5000000"),
+        "risk_tolerance": RiskTolerance.MODERATE,
+        "esg_requirements": None,
+        "exclusions": None,
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def _candidate(project_type: ProjectType, country: str, amount: str, score: int | None):
+    project = SimpleNamespace(
+        id=uuid.uuid4(),
+        project_type=project_type,
+        geography_country=country,
+        total_investment_required=Decimal(amount),
+        stage=ProjectStage.OPERATIONAL,
+    )
+    ss = SimpleNamespace(overall_score=score) if score is not None else None
+    return project, ss
+
+
+class TestScoreMatrix:
+    """MatchingAlgorithm.score_matrix must agree with per-pair calculate_alignment."""
+
+    def _fixtures(self):
+        mandates = [
+            _mandate(),
+            _mandate(sectors=["wind"], geographies=["FR"]),
+            _mandate(sectors=[], geographies=[], ticket_size_min=Decimal("0")),
+        ]
+        candidates = [
+            _candidate(ProjectType.SOLAR, "DE", "2000000", 80),
+            _candidate(ProjectType.WIND, "FR", "9000000", None),
+            _candidate(ProjectType.HYDRO, "PL", "100", 30),
+            _candidate(ProjectType.SOLAR, "DE", "2000000", 80),
+            _candidate(ProjectType.REAL_ESTATE, "US", "50000000", 55),
+        ]
+        return mandates, candidates
+
+    def test_best_mandate_matches_pairwise_scoring(self):
+        algo = MatchingAlgorithm()
+        mandates, candidates = self._fixtures()
+        rows = algo.score_matrix(mandates, candidates)
+        assert len(rows) == len(candidates)
+        for project, ss, alignment, mandate in rows:
+            expected = max(
+                (algo.calculate_alignment(m, project, ss) for m in mandates),
+                key=lambda a: a.overall,
+            )
+            assert alignment.to_dict() == expected.to_dict()
+            assert algo.calculate_alignment(mandate, project, ss).overall == alignment.overall
+
+    def test_top_k_and_min_score(self):
+        algo = MatchingAlgorithm()
+        mandates, candidates = self._fixtures()
+        full = algo.score_matrix(mandates, candidates)
+        top = algo.score_matrix(mandates, candidates, top_k=2)
+        assert [r[2].overall for r in top] == [r[2].overall for r in full[:2]]
+        threshold = full[2][2].overall
+        filtered = algo.score_matrix(mandates, candidates, min_score=threshold)
+        assert all(r[2].overall >= threshold for r in filtered)
+
+    def test_no_mandates_returns_empty(self):
+        _, candidates = self._fixtures()
+        assert MatchingAlgorithm().score_matrix([], candidates) == []
+
+
+class TestCandidatePrefilter:
+    def test_region_countries_follow_algorithm_regions(self):
+        allowed = region_countries(["DE"])
+        assert {"DE", "FR", "PL"} <= allowed
+        assert "US" not in allowed
+
+    def test_adjacent_sectors_include_neighbours(self):
+        assert adjacent_sectors(["solar"]) == {"solar", "wind", "geothermal", "hydro"}
+
+    def test_filter_compiles_to_single_predicate(self):
+        clause = _mandate_candidate_filter([_mandate(), _mandate(sectors=[], geographies=[])])
+        sql = str(clause.compile(dialect=postgresql.dialect()))
+        assert "project_type IN" in sql
+        assert "geography_country IN" in sql
+        assert "BETWEEN" in sql
+
+
+class TestIncrementalRefresh:
+    def test_upsert_uses_single_on_conflict_statement(self):
+        from unittest.mock import MagicMock
+
+        from app.modules.matching.tasks import _upsert_matches
+
+        session = MagicMock()
+        session.execute.return_value.rowcount = 2
+        rows = [
+            {
+                "investor_org_id": uuid.uuid4(),
+                "ally_org_id": uuid.uuid4(),
+                "project_id": uuid.uuid4(),
+                "mandate_id": uuid.uuid4(),
+                "overall_score": 70,
+                "score_breakdown": {},
+                "status": MatchStatus.SUGGESTED,
+                "initiated_by": MatchInitiator.SYSTEM,
+            }
+            for _ in range(2)
+        ]
+        assert _upsert_matches(session, rows) == 2
+        assert session.execute.call_count == 1
+        sql = str(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (project_id, investor_org_id) WHERE is_deleted = false" in sql
+        assert "status" not in sql.split("DO UPDATE SET")[1]
+
+    def test_missing_watermark_forces_full_run(self):
+        from unittest.mock import patch
+
+        from app.modules.matching import tasks
+
+        with patch.object(tasks, "_redis", side_effect=ConnectionError("down")):
+            assert tasks._read_watermark() is None
+
+    def test_incremental_run_rescores_only_changed_pairs(self, monkeypatch):
+        from app.modules.matching import tasks
+
+        ally = uuid.uuid4()
+        updated, rescored, untouched = (_batch_project(ally) for _ in range(3))
+        steady, changed = uuid.uuid4(), uuid.uuid4()
+        session = _FakeBatchSession(
+            projects=[updated, rescored, untouched],
+            mandates=[_mandate(org_id=steady), _mandate(org_id=changed)],
+            changed_orgs=[changed],
+            updated_project_ids=[updated.id],
+            rescored_project_ids=[rescored.id],
+        )
+        scored = _patch_batch_run(monkeypatch, session)
+
+        stats = tasks.batch_calculate_matches.run()
+
+        assert stats["mode"] == "incremental"
+        # Changed mandates rescore every project; the rest only see changed projects
+        assert scored == {
+            changed: {updated.id, rescored.id, untouched.id},
+            steady: {updated.id, rescored.id},
+        }
+        assert (stats["scanned"], stats["rescored"], stats["skipped"]) == (6, 5, 1)
+
+    def test_incremental_run_without_changes_skips_everything(self, monkeypatch):
+        from app.modules.matching import tasks
+
+        ally = uuid.uuid4()
+        session = _FakeBatchSession(
+            projects=[_batch_project(ally), _batch_project(ally)],
+            mandates=[_mandate(org_id=uuid.uuid4())],
+        )
+        scored = _patch_batch_run(monkeypatch, session)
+
+        stats = tasks.batch_calculate_matches.run()
+
+        assert scored == {}
+        assert (stats["scanned"], stats["rescored"], stats["skipped"]) == (2, 0, 2)
+
+
+def _batch_project(org_id: uuid.UUID):
+    project, _ = _candidate(ProjectType.SOLAR, "DE", "2000000", None)
+    project.org_id = org_id
+    return project
+
+
+class _Rows(list):
+    def all(self) -> list:
+        return list(self)
+
+
+class _Result:
+    def __init__(self, rows=(), scalar=None) -> None:
+        self._rows = _Rows(rows)
+        self._scalar = scalar
+
+    def scalars(self) -> _Rows:
+        return self._rows
+
+    def scalar_one(self):
+        return self._scalar
+
+
+class _FakeBatchSession:
+    """Answers batch_calculate_matches' queries from in-memory projects and mandates."""
+
+    def __init__(
+        self,
+        projects: list,
+        mandates: list,
+        changed_orgs: list | None = None,
+        updated_project_ids: list | None = None,
+        rescored_project_ids: list | None = None,
+    ) -> None:
+        self.projects = projects
+        self.mandates = mandates
+        self.changed_orgs = changed_orgs or []
+        self.updated_project_ids = updated_project_ids or []
+        self.rescored_project_ids = rescored_project_ids or []
+
+    def execute(self, stmt) -> _Result:
+        sql = str(stmt)
+        if sql.startswith("SELECT now()"):
+            return _Result(scalar=datetime(2026, 10, 16, tzinfo=UTC))
+        if "count(*)" in sql:
+            return _Result(scalar=len(self.projects))
+        if "FROM investor_mandates" in sql:
+            return _Result(self.changed_orgs if "updated_at >" in sql else self.mandates)
+        if "FROM signal_scores" in sql:
+            return _Result(self.rescored_project_ids if "created_at >" in sql else [])
+        if sql.startswith("SELECT projects.id"):
+            return _Result(self.updated_project_ids)
+        if "POSTCOMPILE" in sql:  # published projects restricted to the changed ids
+            wanted = set(self.updated_project_ids) | set(self.rescored_project_ids)
+            return _Result([p for p in self.projects if p.id in wanted])
+        return _Result(self.projects)
+
+
+def _patch_batch_run(monkeypatch, session: _FakeBatchSession) -> dict:
+    """Run the batch task against ``session``; returns investor org -> rescored project ids."""
+    from contextlib import nullcontext
+
+    from app.modules.matching import tasks
+
+    scored: dict[uuid.UUID, set[uuid.UUID]] = {}
+
+    def score_matrix(self, mandates, candidates, min_score=0):
+        scored.setdefault(mandates[0].org_id, set()).update(p.id for p, _ in candidates)
+        return []
+
+    monkeypatch.setattr("app.core.celery_db.get_celery_db_session", lambda: nullcontext(session))
+    monkeypatch.setattr(tasks, "_read_watermark", lambda: datetime(2026, 10, 15, tzinfo=UTC))
+    monkeypatch.setattr(tasks, "_write_watermark", lambda value: None)
+    monkeypatch.setattr(tasks, "_upsert_matches", lambda session, rows: len(rows))
+    monkeypatch.setattr(MatchingAlgorithm, "score_matrix", score_matrix)
+    return scored
@@ -100,7 +100,7 @@ def _patch_ai_gateway(briefing_content: dict | None = None):
     mock_http.__aexit__ = AsyncMock(return_value=None)
     mock_http.post = AsyncMock(return_value=mock_resp)
 
-    return patch("httpx.AsyncClient", return_value=mock_http)
+    return patch("app.modules.meeting_prep.service.gateway_client", return_value=mock_http)
 
 
 # ── Service-level tests ───────────────────────────────────────────────────────
@@ -136,7 +136,7 @@ async def test_generate_briefing_uses_fallback_when_ai_fails(
     """generate_briefing uses the fallback briefing when the AI gateway raises an exception."""
     proj = await _make_project(db, SAMPLE_ORG_ID)
 
-    with patch("httpx.AsyncClient") as mock_cls:
+    with patch("app.modules.meeting_prep.service.gateway_client") as mock_cls:
         mock_http = AsyncMock()
         mock_http.__aenter__ = AsyncMock(return_value=mock_http)
         mock_http.__aexit__ = AsyncMock(return_value=None)
@@ -243,11 +243,9 @@ class TestMetricSnapshotService:
         self, db: AsyncSession, sample_user: User
     ):
         """Single entity has no peers below it → rank 0.0."""
-        snap = _make_snapshot(value=80.0)
-        db.add(snap)
-        await db.flush()
-
         svc = MetricSnapshotService(db)
+        await svc.record_snapshot(MM_ORG_ID, "project", MM_ENTITY_ID, "signal_score", 80.0)
+
         rank = await svc.get_percentile_rank("project", MM_ENTITY_ID, "signal_score")
         # 0 entities below it out of 1 total → 0.0%
         assert rank == pytest.approx(0.0)
@@ -275,6 +273,33 @@ class TestMetricSnapshotService:
         )
         assert snap2.previous_value == pytest.approx(10.0)
 
+    async def test_record_snapshot_skips_unchanged_value(
+        self, db: AsyncSession, sample_user: User
+    ):
+        """Re-recording the latest value and metadata writes no new snapshot."""
+        svc = MetricSnapshotService(db)
+        first = await svc.record_snapshot(MM_ORG_ID, "portfolio", MM_ENTITY_ID, "risk_score", 42.0)
+        again = await svc.record_snapshot(MM_ORG_ID, "portfolio", MM_ENTITY_ID, "risk_score", 42.0)
+        assert first is not None
+        assert again is None
+
+        trend = await svc.get_trend("portfolio", MM_ENTITY_ID, "risk_score")
+        assert [s.value for s in trend] == [42.0]
+
+    async def test_get_percentile_rank_uses_latest_not_max(
+        self, db: AsyncSession, sample_user: User
+    ):
+        """An entity whose score fell ranks on its current value, not its peak."""
+        svc = MetricSnapshotService(db)
+        await svc.record_snapshot(MM_ORG_ID, "project", MM_ENTITY_ID, "moic", 3.0)
+        await svc.record_snapshot(MM_ORG_ID, "project", MM_ENTITY_ID, "moic", 1.0)
+        await svc.record_snapshot(MM_ORG_ID, "project", MM_ENTITY_ID_2, "moic", 2.0)
+
+        fallen = await svc.get_percentile_rank("project", MM_ENTITY_ID, "moic")
+        steady = await svc.get_percentile_rank("project", MM_ENTITY_ID_2, "moic")
+        assert fallen == pytest.approx(0.0)
+        assert steady == pytest.approx(50.0)
+
 
 # ── TestMetricTrendEndpoint ───────────────────────────────────────────────────
 
@@ -380,31 +405,9 @@ class TestMetricRankEndpoint:
         low_entity = uuid.UUID("00000000-0000-0000-00bb-000000000020")
         high_entity = uuid.UUID("00000000-0000-0000-00bb-000000000021")
 
-        db.add(
-            MetricSnapshot(
-                id=uuid.uuid4(),
-                org_id=MM_ORG_ID,
-                entity_type="project",
-                entity_id=low_entity,
-                metric_name="irr",
-                value=5.0,
-                previous_value=None,
-                metadata_={},
-            )
-        )
-        db.add(
-            MetricSnapshot(
-                id=uuid.uuid4(),
-                org_id=MM_ORG_ID,
-                entity_type="project",
-                entity_id=high_entity,
-                metric_name="irr",
-                value=15.0,
-                previous_value=None,
-                metadata_={},
-            )
-        )
-        await db.flush()
+        svc = MetricSnapshotService(db)
+        await svc.record_snapshot(MM_ORG_ID, "project", low_entity, "irr", 5.0)
+        await svc.record_snapshot(MM_ORG_ID, "project", high_entity, "irr", 15.0)
 
         # high_entity is above low_entity → percentile > 0
         resp = await metrics_client.get(f"/v1/metrics/rank/project/{high_entity}/irr")
@@ -552,6 +555,18 @@ class TestBenchmarkComputeEndpoint:
             r"\d{4}-\d{2}", result["period"]
         ), f"Expected YYYY-MM format, got: {result['period']}"
 
+    async def test_compute_benchmarks_dry_run_reports_timings(
+        self, db: AsyncSession, sample_user: User
+    ):
+        """dry_run=True aggregates and times the run but writes no rows."""
+        from app.modules.metrics.benchmark_service import BenchmarkService
+
+        svc = BenchmarkService(db)
+        result = await svc.compute_benchmarks(dry_run=True)
+        assert result["dry_run"] is True
+        assert result["rows_written"] == 0
+        assert set(result["timings_ms"]) == {"aggregate", "upsert", "total"}
+
     async def test_compute_endpoint_requires_permission(
         self, metrics_client: AsyncClient, sample_user: User
     ):
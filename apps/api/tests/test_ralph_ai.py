@@ -90,3 +90,134 @@ def test_context_trimming_keeps_last_message() -> None:
     trimmed = manager._truncate_messages(messages, budget=20)
     assert len(trimmed) > 0
     assert trimmed[-1]["content"] == "latest question"
+
+
+# ── Tool execution ──────────────────────────────────────────────────────────
+
+
+class _FakeSession:
+    def __init__(self, opened: list) -> None:
+        self.opened = opened
+        self.committed = False
+
+    async def __aenter__(self):
+        self.opened.append(self)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def commit(self) -> None:
+        self.committed = True
+
+    async def rollback(self) -> None:
+        return None
+
+
+def _tool_call(name: str, args: dict, call_id: str = "c1") -> dict:
+    import json
+
+    return {"id": call_id, "function": {"name": name, "arguments": json.dumps(args)}}
+
+
+def test_tool_memo_ttl_and_errors() -> None:
+    import uuid
+    from unittest.mock import patch
+
+    from app.modules.ralph_ai.tools import ToolResultMemo
+
+    memo = ToolResultMemo(ttls={"get_signal_score": 60.0})
+    conv = uuid.uuid4()
+    memo.put(conv, "get_signal_score", {"project_id": "p"}, {"overall_score": 80}, 12.0)
+    memo.put(conv, "get_signal_score", {"project_id": "q"}, {"error": "not found"}, 5.0)
+    memo.put(conv, "run_valuation", {"project_id": "p"}, {"value": 1}, 5.0)
+
+    assert memo.get(conv, "get_signal_score", {"project_id": "p"}) == ({"overall_score": 80}, 12.0)
+    assert memo.get(conv, "get_signal_score", {"project_id": "q"}) is None
+    assert memo.get(conv, "run_valuation", {"project_id": "p"}) is None
+    assert memo.get(uuid.uuid4(), "get_signal_score", {"project_id": "p"}) is None
+    with patch("app.modules.ralph_ai.tools.time.monotonic", return_value=10**9):
+        assert memo.get(conv, "get_signal_score", {"project_id": "p"}) is None
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_run_concurrently_on_separate_sessions(monkeypatch) -> None:
+    import asyncio
+    import uuid
+
+    from app.modules.ralph_ai.agent import RalphAgent, ToolTiming
+    from app.modules.ralph_ai.tools import RalphTools
+
+    opened: list[_FakeSession] = []
+    used: list = []
+
+    async def fake_tool(self, project_id: str) -> dict:
+        used.append(self.db)
+        await asyncio.sleep(0.05)
+        return {"project_id": project_id}
+
+    monkeypatch.setattr(RalphTools, "_tool_get_project_details", fake_tool)
+    monkeypatch.setattr(RalphTools, "_tool_get_signal_score", fake_tool)
+
+    agent = RalphAgent(session_factory=lambda: _FakeSession(opened))
+    tools = RalphTools(db=None, org_id=uuid.uuid4(), session_factory=agent.session_factory)
+    conv = uuid.uuid4()
+    calls = [
+        _tool_call("get_project_details", {"project_id": "a"}, "c1"),
+        _tool_call("get_signal_score", {"project_id": "b"}, "c2"),
+        _tool_call("get_project_details", {"project_id": "c"}, "c3"),
+    ]
+
+    timing = ToolTiming()
+    results = await agent._run_tool_calls(tools, conv, calls, timing)
+    assert [r["project_id"] for r in results] == ["a", "b", "c"]
+    assert len(opened) == 3 and len(set(map(id, used))) == 3
+    assert all(s.committed for s in opened)
+    assert timing.wall_ms < timing.tool_ms  # overlapped
+
+    # Same calls on the next turn are served from the per-conversation memo
+    again = ToolTiming()
+    assert await agent._run_tool_calls(tools, conv, calls, again) == results
+    assert again.memo_hits == 3 and len(opened) == 3
+    assert again.saved_ms >= 150
+
+
+@pytest.mark.asyncio
+async def test_tool_concurrency_cap_is_per_turn(monkeypatch) -> None:
+    import asyncio
+    import uuid
+
+    from app.core.config import settings
+    from app.modules.ralph_ai.agent import RalphAgent, ToolTiming
+    from app.modules.ralph_ai.tools import RalphTools
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_tool(self, project_id: str) -> dict:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return {"project_id": project_id}
+
+    monkeypatch.setattr(RalphTools, "_tool_get_project_details", fake_tool)
+    monkeypatch.setattr(settings, "RALPH_TOOL_CONCURRENCY", 1)
+
+    agent = RalphAgent(session_factory=lambda: _FakeSession([]))
+    calls = [
+        _tool_call("get_project_details", {"project_id": "a"}, "c1"),
+        _tool_call("get_project_details", {"project_id": "b"}, "c2"),
+    ]
+
+    async def turn() -> list:
+        tools = RalphTools(db=None, org_id=uuid.uuid4(), session_factory=agent.session_factory)
+        return await agent._run_tool_calls(tools, uuid.uuid4(), calls, ToolTiming())
+
+    await turn()
+    assert peak == 1  # capped within a turn
+
+    peak = 0
+    await asyncio.gather(turn(), turn())
+    assert peak == 2  # but concurrent conversations do not queue behind each other
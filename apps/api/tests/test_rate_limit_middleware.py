@@ -0,0 +1,167 @@
+"""Unit tests for the GCRA RateLimitMiddleware — no Redis required.
+
+TestGcraMiddleware stubs the script call and covers the middleware's decisions
+around it; TestGcraScript runs the Lua script itself under lupa against an
+in-memory keyspace. See tests/load/bench_rate_limiter.py for the Redis-backed
+comparison against the legacy sliding window.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middleware.security import _DEFAULT_TIER, _GCRA_LUA, _TIER_ARGS, RateLimitMiddleware
+
+
+def _make_app(script: AsyncMock) -> tuple[TestClient, RateLimitMiddleware]:
+    async def handler(request: Request) -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/v1/projects", handler), Route("/v1/ralph/chat", handler)])
+    limiter = RateLimitMiddleware(app, redis_url="redis://unused")
+    limiter._script = script
+    return TestClient(limiter), limiter
+
+
+def _bearer(org_id: str) -> dict[str, str]:
+    claims = base64.urlsafe_b64encode(json.dumps({"org_id": org_id}).encode()).decode().rstrip("=")
+    return {"Authorization": f"Bearer header.{claims}.sig"}
+
+
+class TestGcraMiddleware:
+    def test_single_round_trip_for_ip_and_org(self):
+        script = AsyncMock(return_value=[1, 299, 0, 1, 59, 0, 60])
+        client, _ = _make_app(script)
+        resp = client.get("/v1/ralph/chat", headers=_bearer("org-1"))
+
+        assert resp.status_code == 200
+        script.assert_awaited_once()
+        call = script.await_args.kwargs
+        assert call["keys"] == ["rl:ip:testclient:ralph", "rl:org:org-1:ralph", "org:tier:org-1"]
+        assert call["args"][:6] == [60, 60_000, 60_000, 1, 1, _DEFAULT_TIER]
+        assert call["args"][6:] == _TIER_ARGS
+        assert resp.headers["x-ratelimit-remaining"] == "299"
+        assert resp.headers["x-ratelimit-org-limit"] == "60"
+        assert resp.headers["x-ratelimit-org-remaining"] == "59"
+
+    def test_rejected_client_is_blocked_locally_until_retry(self):
+        script = AsyncMock(return_value=[0, 0, 4_500, 1, 0, 0, 0])
+        client, limiter = _make_app(script)
+
+        first = client.get("/v1/projects")
+        second = client.get("/v1/projects")
+
+        assert first.status_code == second.status_code == 429
+        assert first.headers["retry-after"] == "5"
+        assert json.loads(second.content)["reason"] == "ip_limit_exceeded"
+        script.assert_awaited_once()  # second rejection never reached Redis
+
+        limiter._blocked["rl:ip:testclient:projects"] = (0.0, "ip_limit_exceeded", 300)
+        script.return_value = [1, 10, 0, 1, 0, 0, 0]
+        assert client.get("/v1/projects").status_code == 200
+
+    def test_org_limit_rejection(self):
+        script = AsyncMock(return_value=[1, 250, 0, 0, 0, 1_200, 300])
+        client, limiter = _make_app(script)
+        resp = client.get("/v1/projects", headers=_bearer("org-1"))
+
+        assert resp.status_code == 429
+        assert json.loads(resp.content)["reason"] == "org_limit_exceeded"
+        assert resp.headers["x-ratelimit-org-limit"] == "300"
+        assert "rl:org:org-1:projects" in limiter._blocked
+
+    def test_fails_open_when_redis_unavailable(self):
+        script = AsyncMock(side_effect=ConnectionError("redis down"))
+        client, _ = _make_app(script)
+        assert client.get("/v1/projects").status_code == 200
+
+    def test_anonymous_request_skips_org_check(self):
+        script = AsyncMock(return_value=[1, 299, 0, 1, 0, 0, 0])
+        client, _ = _make_app(script)
+        resp = client.get("/v1/projects")
+        assert script.await_args.kwargs["args"][3] == 0
+        assert "x-ratelimit-org-limit" not in resp.headers
+
+
+class LuaRedis:
+    """Evaluates ``_GCRA_LUA`` the way Redis EVAL would, on a dict with PX expiry."""
+
+    def __init__(self) -> None:
+        lupa = pytest.importorskip("lupa")
+        self.lua = lupa.LuaRuntime()
+        self.script = self.lua.eval(f"function() {_GCRA_LUA} end")
+        self.now_ms = 1_767_225_600_000
+        self.store: dict[str, tuple[str, int]] = {}  # key -> (value, expires at ms)
+        self.lua.globals().redis = self.lua.table_from({"call": self._call})
+
+    def _call(self, command: str, *args):
+        if command == "TIME":
+            return self.lua.table(str(self.now_ms // 1000), str(self.now_ms % 1000 * 1000))
+        if command == "GET":
+            entry = self.store.get(args[0])
+            if entry is None or entry[1] <= self.now_ms:
+                self.store.pop(args[0], None)
+                return False  # Redis nil reply
+            return entry[0]
+        if command == "SET":
+            key, value, px, ttl = args
+            assert px == "PX"
+            self.store[key] = (value, self.now_ms + int(ttl))
+            return "OK"
+        raise AssertionError(command)
+
+    def run(self, ip_limit: int, window_ms: int, org_tier: tuple[int, int] | None = None):
+        """One request; ``org_tier`` is (general_limit, ai_limit) for a tiered org."""
+        g = self.lua.globals()
+        g.KEYS = self.lua.table("ip", "org", "org:tier")
+        args = [ip_limit, window_ms, window_ms, 1 if org_tier else 0, 0, "free"]
+        if org_tier:
+            args += ["free", *org_tier]
+        g.ARGV = self.lua.table(*map(str, args))
+        return [int(v) for v in self.script().values()]
+
+
+class TestGcraScript:
+    def test_burst_then_deny_with_retry_after(self):
+        redis = LuaRedis()
+        results = [redis.run(3, 3_000) for _ in range(4)]
+
+        assert [r[:3] for r in results[:3]] == [[1, 2, 0], [1, 1, 0], [1, 0, 0]]
+        assert results[3][:3] == [0, 0, 1_000]  # one emission interval until the next slot
+        # The denied request did not advance the stored arrival time
+        assert float(redis.store["ip"][0]) == redis.now_ms + 3_000
+
+        redis.now_ms += 1_000
+        assert redis.run(3, 3_000)[:3] == [1, 0, 0]
+        assert redis.run(3, 3_000)[0] == 0
+
+    def test_key_expires_once_the_window_has_drained(self):
+        redis = LuaRedis()
+        redis.run(3, 3_000)
+        redis.run(3, 3_000)
+
+        assert redis.store["ip"][1] == redis.now_ms + 2_000  # PX = TAT - now
+        redis.now_ms += 2_000
+        assert redis._call("GET", "ip") is False
+        assert [redis.run(3, 3_000)[1] for _ in range(3)] == [2, 1, 0]  # full burst again
+
+    def test_org_denial_leaves_ip_budget_untouched(self):
+        redis = LuaRedis()
+        assert redis.run(10, 60_000, org_tier=(2, 1))[3:] == [1, 1, 0, 2]
+        assert redis.run(10, 60_000, org_tier=(2, 1))[3:] == [1, 0, 0, 2]
+        ip_tat = redis.store["ip"][0]
+
+        denied = redis.run(10, 60_000, org_tier=(2, 1))
+
+        assert denied[0] == 1 and denied[3] == 0
+        assert denied[5] == 30_000
+        assert redis.store["ip"][0] == ip_tat
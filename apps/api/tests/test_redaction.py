@@ -129,7 +129,7 @@ async def test_analyze_document_transitions_to_review_on_success(
     mock_resp.json.return_value = {"content": json.dumps(entities)}
     mock_resp.raise_for_status = MagicMock()
 
-    with patch("httpx.AsyncClient") as mock_cls:
+    with patch("app.modules.redaction.service.gateway_client") as mock_cls:
         mock_http = AsyncMock()
         mock_http.__aenter__ = AsyncMock(return_value=mock_http)
         mock_http.__aexit__ = AsyncMock(return_value=None)
@@ -157,7 +157,7 @@ async def test_analyze_document_transitions_to_failed_on_gateway_error(
     job = await _make_job(db, SAMPLE_ORG_ID)
     svc = RedactionService(db)
 
-    with patch("httpx.AsyncClient") as mock_cls:
+    with patch("app.modules.redaction.service.gateway_client") as mock_cls:
         mock_http = AsyncMock()
         mock_http.__aenter__ = AsyncMock(return_value=mock_http)
         mock_http.__aexit__ = AsyncMock(return_value=None)
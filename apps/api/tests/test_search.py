@@ -213,6 +213,205 @@ async def test_search_org_scoping_passed_to_query():
     assert org_filter["term"]["org_id"] == str(SAMPLE_ORG_ID)
 
 
+# ── Streaming reindex ─────────────────────────────────────────────────────────
+
+
+class _FakeStream:
+    def __init__(self, rows: list, fail_after: int | None = None) -> None:
+        self.rows = rows
+        self.fail_after = fail_after
+
+    async def partitions(self):
+        for i in range(0, len(self.rows), 2):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ConnectionError("cursor lost")
+            yield self.rows[i : i + 2]
+
+
+class _FakeReindexDB:
+    """Serves rows per entity type for count + server-side-cursor queries."""
+
+    def __init__(self, rows: dict[str, list], fail_after: int | None = None) -> None:
+        self.rows = rows
+        self.fail_after = fail_after
+        self.streamed: list = []
+
+    def _entity(self, stmt) -> str:
+        sql = str(stmt)
+        for name in ("documents", "listings", "projects"):
+            if f"FROM {name}" in sql:
+                return name
+        raise AssertionError(sql)
+
+    async def execute(self, stmt):
+        result = MagicMock()
+        result.scalar_one.return_value = len(self.rows[self._entity(stmt)])
+        return result
+
+    async def stream(self, stmt):
+        self.streamed.append(stmt)
+        return _FakeStream(self.rows[self._entity(stmt)], self.fail_after)
+
+
+def _project_row(is_deleted: bool = False):
+    project = MagicMock(
+        id=uuid.uuid4(),
+        org_id=SAMPLE_ORG_ID,
+        description="",
+        project_type=None,
+        status=None,
+        stage=None,
+        total_investment_required=None,
+        updated_at=None,
+        is_deleted=is_deleted,
+    )
+    project.name = "Solar"
+    row = MagicMock(Project=project)
+    row.__getitem__ = lambda self, i: project
+    return row
+
+
+def _reindex_es(concrete_index_exists: bool = True) -> AsyncMock:
+    client = AsyncMock()
+    client.bulk = AsyncMock(
+        side_effect=lambda body: {
+            "items": [
+                {op: {"_id": meta["_id"]}}
+                for action in body
+                for op, meta in action.items()
+                if op in ("index", "delete")
+            ]
+        }
+    )
+    client.indices.exists_alias = AsyncMock(return_value=False)
+    client.indices.exists = AsyncMock(return_value=concrete_index_exists)
+    client.search = AsyncMock(
+        return_value={"aggregations": {"watermark": {"value": 1_767_225_600_000}}}
+    )
+    return client
+
+
+async def test_full_reindex_streams_bounded_chunks_and_swaps_alias(monkeypatch):
+    """Full mode builds a versioned index in bounded _bulk chunks, then swaps the alias."""
+    from app.modules.search import reindexer
+
+    monkeypatch.setattr(reindexer, "BULK_MAX_DOCS", 2)
+    db = _FakeReindexDB({"projects": [_project_row() for _ in range(5)], "listings": [], "documents": []})
+    client = _reindex_es()
+
+    progress, errors = await reindexer.run_reindex(db, client, "full")
+
+    assert errors == []
+    assert progress.entities["projects"].indexed == 5
+    assert progress.entities["projects"].total == 5
+    assert progress.status == "completed"
+    assert client.bulk.await_count == 3  # 2 + 2 + 1
+    new_index = client.indices.create.await_args_list[0].kwargs["index"]
+    assert new_index.startswith("scr_projects_")
+    swap = client.indices.update_aliases.await_args_list[0].kwargs["body"]["actions"]
+    assert {"add": {"index": new_index, "alias": "scr_projects"}} in swap
+    assert {"remove_index": {"index": "scr_projects"}} in swap
+
+
+async def test_full_reindex_swaps_when_rows_change_after_count():
+    """Rows deleted between the COUNT and the stream are not treated as a failure."""
+    from app.modules.search import reindexer
+
+    db = _FakeReindexDB({"projects": [_project_row() for _ in range(5)], "listings": [], "documents": []})
+    client = _reindex_es()
+    counted = db.execute
+
+    async def execute_then_delete(stmt):
+        result = await counted(stmt)
+        db.rows["projects"] = db.rows["projects"][:3]
+        return result
+
+    db.execute = execute_then_delete
+
+    progress, errors = await reindexer.run_reindex(db, client, "full")
+
+    assert errors == []
+    assert progress.entities["projects"].total == 5
+    assert progress.entities["projects"].indexed == 3
+    swapped = [
+        c.kwargs["body"]["actions"][0]["add"]["alias"]
+        for c in client.indices.update_aliases.await_args_list
+    ]
+    assert "scr_projects" in swapped
+    client.indices.delete.assert_not_awaited()
+
+
+async def test_incremental_reindex_uses_watermark_and_deletes_stale(monkeypatch):
+    """Incremental mode only re-sends rows past the watermark; soft-deleted rows are removed."""
+    from app.modules.search import reindexer
+
+    rows = [_project_row(), _project_row(is_deleted=True)]
+    db = _FakeReindexDB({"projects": rows, "listings": [], "documents": []})
+    client = _reindex_es()
+
+    progress, errors = await reindexer.run_reindex(db, client, "incremental")
+
+    assert errors == []
+    assert progress.entities["projects"].indexed == 1
+    assert progress.entities["projects"].deleted == 1
+    client.indices.create.assert_not_awaited()
+    client.indices.update_aliases.assert_not_awaited()
+    assert "updated_at >=" in str(db.streamed[0])
+
+
+async def test_failed_full_reindex_keeps_live_alias(monkeypatch):
+    """A stream failure drops the half-built index and never swaps the alias."""
+    from app.modules.search import reindexer
+
+    db = _FakeReindexDB(
+        {"projects": [_project_row() for _ in range(4)], "listings": [], "documents": []},
+        fail_after=2,
+    )
+    client = _reindex_es()
+
+    _, errors = await reindexer.run_reindex(db, client, "full")
+
+    assert any("cursor lost" in e for e in errors)
+    swapped = [
+        c.kwargs["body"]["actions"][0]["add"]["alias"]
+        for c in client.indices.update_aliases.await_args_list
+    ]
+    assert "scr_projects" not in swapped
+    dropped = client.indices.delete.await_args_list[0].kwargs["index"]
+    assert dropped.startswith("scr_projects_")
+
+
+async def test_full_reindex_with_bulk_errors_keeps_live_alias(monkeypatch):
+    """Rejected _bulk requests (e.g. 429) drop the new index instead of swapping onto it."""
+    from app.modules.search import reindexer
+
+    monkeypatch.setattr(reindexer, "BULK_MAX_DOCS", 2)
+    db = _FakeReindexDB({"projects": [_project_row() for _ in range(4)], "listings": [], "documents": []})
+    client = _reindex_es()
+    responses = iter([None, ConnectionError("429 Too Many Requests")])
+
+    async def flaky_bulk(body):
+        exc = next(responses)
+        if exc:
+            raise exc
+        return {"items": [{"index": {"_id": a["index"]["_id"]}} for a in body if "index" in a]}
+
+    client.bulk = AsyncMock(side_effect=flaky_bulk)
+
+    progress, errors = await reindexer.run_reindex(db, client, "full")
+
+    assert progress.entities["projects"].indexed == 2
+    assert progress.entities["projects"].errors == 2
+    assert any("incomplete index" in e for e in errors)
+    swapped = [
+        c.kwargs["body"]["actions"][0]["add"]["alias"]
+        for c in client.indices.update_aliases.await_args_list
+    ]
+    assert "scr_projects" not in swapped
+    dropped = client.indices.delete.await_args_list[0].kwargs["index"]
+    assert dropped.startswith("scr_projects_")
+
+
 # ── HTTP endpoint tests ───────────────────────────────────────────────────────
 
 
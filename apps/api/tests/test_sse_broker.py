@@ -0,0 +1,170 @@
+"""Unit tests for the SSE notifications broker — no Redis required.
+
+FakeRedis models the per-user backlog stream and loops published messages
+straight back into the manager, standing in for the pub/sub subscription.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from app.modules.notifications import sse
+from app.modules.notifications.sse import SSEManager
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+        self.ops: list = []
+
+    async def __aenter__(self) -> FakePipeline:
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    def expire(self, key, ttl):
+        self.ops.append(("expire", key, ttl))
+
+    def publish(self, channel, message):
+        self.ops.append(("publish", channel, message))
+
+    async def execute(self):
+        for op in self.ops:
+            if op[0] == "publish":
+                self.redis.published.append(op[2])
+                for manager in self.redis.subscribers:
+                    manager._handle_message(op[2])
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+        self.published: list[str] = []
+        self.subscribers: list[SSEManager] = []
+        self.fail = False
+        self._seq = 0
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self._seq += 1
+        event_id = f"1700000000000-{self._seq}"
+        entries = self.streams.setdefault(key, [])
+        entries.append((event_id, fields))
+        del entries[:-maxlen]
+        return event_id
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def xrange(self, key, min="-", max="+"):
+        after = sse._stream_id(min.lstrip("("))
+        return [(i, f) for i, f in self.streams.get(key, []) if sse._stream_id(i) > after]
+
+
+@pytest.fixture
+def redis(monkeypatch) -> FakeRedis:
+    fake = FakeRedis()
+
+    async def get_redis():
+        return fake
+
+    monkeypatch.setattr(sse, "get_redis", get_redis)
+    monkeypatch.setattr(SSEManager, "_ensure_background_tasks", lambda self: None)
+    return fake
+
+
+def _manager(redis: FakeRedis, **kwargs) -> SSEManager:
+    manager = SSEManager(**kwargs)
+    redis.subscribers.append(manager)
+    return manager
+
+
+async def _take(conn: sse.SSEConnection, n: int) -> list[str]:
+    chunks = []
+    async for chunk in conn.events():
+        chunks.append(chunk)
+        if len(chunks) == n:
+            break
+    return chunks
+
+
+def _payload(chunk: str) -> dict:
+    return json.loads(chunk.split("data: ", 1)[1])
+
+
+class TestSSEManager:
+    async def test_push_reaches_connections_on_every_process(self, redis):
+        worker_a, worker_b = _manager(redis), _manager(redis)
+        user = uuid.uuid4()
+        conn_a = await worker_a.connect(user)
+        conn_b = await worker_b.connect(user)
+
+        await worker_a.push(user, {"type": "notification", "data": {"title": "hi"}})
+
+        for conn in (conn_a, conn_b):
+            (chunk,) = await _take(conn, 1)
+            assert chunk.startswith("id: 1700000000000-1\n")
+            assert _payload(chunk)["data"]["title"] == "hi"
+        assert len(redis.published) == 1
+
+    async def test_other_users_are_not_delivered(self, redis):
+        manager = _manager(redis)
+        conn = await manager.connect(uuid.uuid4())
+        await manager.push(uuid.uuid4(), {"type": "notification"})
+        assert conn.queue.empty()
+
+    async def test_slow_consumer_is_evicted(self, redis):
+        manager = _manager(redis, max_queue=2)
+        user = uuid.uuid4()
+        slow = await manager.connect(user)
+
+        for i in range(3):
+            await manager.push(user, {"n": i})
+
+        assert slow.evicted
+        assert await _take(slow, 10) == []  # stream ends; client resumes via Last-Event-ID
+        assert manager.stats()["evicted"] == 1
+
+    async def test_resume_replays_backlog_without_duplicates(self, redis):
+        manager = _manager(redis)
+        user = uuid.uuid4()
+        for i in range(3):
+            await manager.push(user, {"n": i})
+
+        conn = await manager.connect(user, last_event_id="1700000000000-1")
+        assert [event_id for event_id, _ in conn.backlog] == ["1700000000000-2", "1700000000000-3"]
+        # Published while the backlog was being read: delivered live as well, seen once
+        conn.offer("1700000000000-3", {"n": 2})
+        await manager.push(user, {"n": 3})
+
+        chunks = await asyncio.wait_for(_take(conn, 3), 1.0)
+        assert [_payload(c)["n"] for c in chunks] == [1, 2, 3]
+
+    async def test_falls_back_to_local_delivery_when_redis_down(self, redis):
+        redis.fail = True
+        manager = _manager(redis)
+        user = uuid.uuid4()
+        conn = await manager.connect(user)
+
+        await manager.push(user, {"type": "notification"})
+
+        (chunk,) = await _take(conn, 1)
+        assert not chunk.startswith("id:")
+        assert manager.stats()["local_fallbacks"] == 1
+
+    async def test_shared_heartbeat_ticks_every_connection(self, redis):
+        manager = _manager(redis, heartbeat_seconds=0.01)
+        conns = [await manager.connect(uuid.uuid4()) for _ in range(3)]
+        ticker = asyncio.create_task(manager._heartbeat())
+        try:
+            for conn in conns:
+                (chunk,) = await asyncio.wait_for(_take(conn, 1), 1.0)
+                assert _payload(chunk) == {"type": "heartbeat"}
+        finally:
+            ticker.cancel()
@@ -0,0 +1,120 @@
+"""Unit tests for the vectorised Monte Carlo stress engine — no DB required."""
+
+import numpy as np
+import pytest
+
+from app.modules.stress_test.engine import (
+    PREDEFINED_SCENARIOS,
+    ProjectArrays,
+    apply_stress,
+    run_monte_carlo,
+)
+
+PROJECTS = [
+    {
+        "id": "p1",
+        "name": "Solar Park",
+        "current_value": 1_000_000,
+        "project_type": "solar",
+        "stage": "operational",
+        "currency": "EUR",
+        "leverage_ratio": 0.6,
+    },
+    {
+        "id": "p2",
+        "name": "Wind Farm",
+        "current_value": 2_500_000,
+        "project_type": "Wind",
+        "stage": "construction",
+        "currency": "usd",
+        "leverage_ratio": 0.4,
+    },
+    {
+        "id": "p3",
+        "name": "Data Centre",
+        "current_value": 500_000,
+        "project_type": "infrastructure",
+        "stage": "development",
+        "currency": "USD",
+        "leverage_ratio": 0.2,
+    },
+    {
+        "id": "p4",
+        "name": "Written Off",
+        "current_value": 0,
+        "project_type": "solar",
+        "stage": "operational",
+        "currency": "EUR",
+    },
+]
+
+ALL_SHOCKS = {
+    "rate_delta_bps": 150,
+    "energy_delta_pct": -20,
+    "delay_months": 6,
+    "fx_delta_pct": -15,
+    "target_currency": "USD",
+}
+
+
+class TestProjectArrays:
+    def test_masks_are_case_insensitive(self):
+        arrays = ProjectArrays.from_projects(PROJECTS)
+        assert arrays.energy_mask.tolist() == [True, True, False, True]
+        assert arrays.construction_mask.tolist() == [False, True, True, False]
+        assert arrays.currency.tolist() == ["EUR", "USD", "USD", "EUR"]
+
+    def test_missing_leverage_defaults(self):
+        arrays = ProjectArrays.from_projects(PROJECTS)
+        assert arrays.leverage[3] == pytest.approx(0.5)
+        assert len(arrays) == 4
+
+
+class TestRunMonteCarlo:
+    def test_seed_reproducible(self):
+        a = run_monte_carlo(PROJECTS, ALL_SHOCKS, simulations=2_000, seed=42)
+        b = run_monte_carlo(PROJECTS, ALL_SHOCKS, simulations=2_000, seed=42)
+        assert a == b
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 333, 2_000])
+    def test_chunking_does_not_change_results(self, chunk_size: int):
+        full = run_monte_carlo(PROJECTS, ALL_SHOCKS, simulations=2_000, seed=7)
+        chunked = run_monte_carlo(
+            PROJECTS, ALL_SHOCKS, simulations=2_000, seed=7, chunk_size=chunk_size
+        )
+        assert chunked == full
+
+    def test_histogram_covers_all_simulations(self):
+        result = run_monte_carlo(PROJECTS, ALL_SHOCKS, simulations=5_000, seed=1)
+        assert sum(result["histogram"]) == 5_000
+        assert len(result["histogram_edges"]) == 51
+
+    def test_base_nav_and_statistic_ordering(self):
+        result = run_monte_carlo(PROJECTS, ALL_SHOCKS, simulations=5_000, seed=3)
+        assert result["base_nav"] == pytest.approx(4_000_000)
+        assert result["p5_nav"] <= result["median_nav"] <= result["p95_nav"]
+        assert 0.0 <= result["probability_of_loss"] <= 1.0
+
+    def test_zero_value_project_stays_zero(self):
+        result = run_monte_carlo(PROJECTS, ALL_SHOCKS, simulations=1_000, seed=5)
+        written_off = next(s for s in result["project_sensitivities"] if s["project_id"] == "p4")
+        assert written_off["stressed_value"] == 0.0
+        assert written_off["change_pct"] == 0.0
+
+    def test_unaffected_project_is_unchanged(self):
+        """An FX-only shock must not move EUR assets."""
+        params = {"fx_delta_pct": -15, "target_currency": "USD"}
+        result = run_monte_carlo(PROJECTS, params, simulations=1_000, seed=5)
+        solar = next(s for s in result["project_sensitivities"] if s["project_id"] == "p1")
+        assert solar["stressed_value"] == pytest.approx(1_000_000)
+
+    @pytest.mark.parametrize("key", sorted(PREDEFINED_SCENARIOS))
+    def test_matches_scalar_reference_distribution(self, key: str):
+        """Vectorised medians agree with the per-project scalar apply_stress path."""
+        params = PREDEFINED_SCENARIOS[key]["params"]
+        result = run_monte_carlo(PROJECTS, params, simulations=20_000, seed=11)
+        rng = np.random.default_rng(11)
+        for sens in result["project_sensitivities"]:
+            project = next(p for p in PROJECTS if p["id"] == sens["project_id"])
+            reference = np.median([apply_stress(project, params, rng) for _ in range(20_000)])
+            assert sens["stressed_value"] == pytest.approx(reference, rel=0.01, abs=1.0)
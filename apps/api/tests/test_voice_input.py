@@ -144,26 +144,26 @@ class TestTranscribeAudio:
 class TestExtractProjectData:
     def test_returns_validated_data(self):
         mock_cls, _ = _make_http_mock({"validated_data": {"project_name": "Solar Farm"}})
-        with patch("app.modules.voice_input.service.httpx.AsyncClient", mock_cls):
+        with patch("app.modules.voice_input.service.gateway_client", mock_cls):
             result = asyncio.run(voice_service.extract_project_data("transcript text"))
         assert result == {"project_name": "Solar Farm"}
 
     def test_missing_validated_data_returns_empty_dict(self):
         mock_cls, _ = _make_http_mock({})
-        with patch("app.modules.voice_input.service.httpx.AsyncClient", mock_cls):
+        with patch("app.modules.voice_input.service.gateway_client", mock_cls):
             result = asyncio.run(voice_service.extract_project_data("transcript"))
         assert result == {}
 
     def test_task_type_sent_in_request(self):
         mock_cls, mock_client = _make_http_mock({"validated_data": {}})
-        with patch("app.modules.voice_input.service.httpx.AsyncClient", mock_cls):
+        with patch("app.modules.voice_input.service.gateway_client", mock_cls):
             asyncio.run(voice_service.extract_project_data("test"))
         body = mock_client.post.call_args.kwargs.get("json", {})
         assert body.get("task_type") == "extract_project_from_voice"
 
     def test_transcript_passed_in_context(self):
         mock_cls, mock_client = _make_http_mock({"validated_data": {}})
-        with patch("app.modules.voice_input.service.httpx.AsyncClient", mock_cls):
+        with patch("app.modules.voice_input.service.gateway_client", mock_cls):
             asyncio.run(voice_service.extract_project_data("my transcript"))
         body = mock_client.post.call_args.kwargs.get("json", {})
         assert body["context"]["transcript"] == "my transcript"
@@ -0,0 +1,118 @@
+"""Unit tests for the watchlist / saved-search percolator index — no database required."""
+
+from __future__ import annotations
+
+import uuid
+from types import SimpleNamespace
+
+from app.modules.watchlists.percolator import (
+    PercolatorIndex,
+    ProjectFacts,
+    ScoreChange,
+    compile_saved_search,
+    compile_watchlist,
+    score_alert,
+)
+
+OWN_ORG = uuid.uuid4()
+OTHER_ORG = uuid.uuid4()
+
+
+def _watchlist(watch_type: str = "new_projects", **criteria) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        org_id=OWN_ORG,
+        name=f"{watch_type} watch",
+        watch_type=watch_type,
+        criteria=criteria,
+        alert_channels=["in_app"],
+    )
+
+
+def _project(**overrides) -> ProjectFacts:
+    values = {
+        "id": uuid.uuid4(),
+        "org_id": OTHER_ORG,
+        "name": "Sunfield",
+        "project_type": "solar",
+        "stage": "development",
+        "geography": "Spain",
+        "capacity_mw": 50.0,
+        "ticket_size": 20_000_000.0,
+        "signal_score": 70,
+        "is_new": True,
+    }
+    return ProjectFacts(**{**values, **overrides})
+
+
+def _index(*rows) -> PercolatorIndex:
+    return PercolatorIndex([compile_watchlist(r) for r in rows])
+
+
+class TestPercolatorIndex:
+    def test_project_type_and_capacity_band(self):
+        any_solar = _watchlist(project_type="solar")
+        big_solar = _watchlist(project_type="solar", min_capacity_mw=100)
+        wind = _watchlist(project_type="wind")
+        anything = _watchlist()
+        index = _index(any_solar, big_solar, wind, anything)
+
+        hits = {s.id for s in index.match_project(_project(capacity_mw=50.0))}
+        assert hits == {any_solar.id, anything.id}
+
+        hits = {s.id for s in index.match_project(_project(capacity_mw=150.0))}
+        assert hits == {any_solar.id, big_solar.id, anything.id}
+
+    def test_unknown_capacity_only_matches_unbounded(self):
+        index = _index(_watchlist(min_capacity_mw=10), unbounded := _watchlist())
+        assert [s.id for s in index.match_project(_project(capacity_mw=None))] == [unbounded.id]
+
+    def test_own_org_and_existing_projects_do_not_alert(self):
+        index = _index(_watchlist())
+        assert index.match_project(_project(org_id=OWN_ORG)) == []
+        assert index.match_project(_project(is_new=False)) == []
+
+    def test_screener_filters_apply(self):
+        index = _index(
+            spain := _watchlist(geographies=["spain"], stages=["development"], min_ticket_size=10),
+            _watchlist(geographies=["kenya"]),
+            _watchlist(max_signal_score=50),
+        )
+        assert [s.id for s in index.match_project(_project())] == [spain.id]
+
+    def test_score_threshold_band(self):
+        low = _watchlist("score_changes", min_signal_score=40)
+        high = _watchlist("score_changes", min_signal_score=80)
+        index = _index(low, high)
+
+        change = ScoreChange(_project(is_new=False), score=65, previous=72)
+        hits = index.match_score(change)
+        assert [s.id for s in hits] == [low.id]
+        assert score_alert(hits[0], change)["alert_type"] == "score_declined"
+
+    def test_specific_project_matches_updates_and_scores(self):
+        project = _project(is_new=False, org_id=OWN_ORG)
+        watch = _watchlist("specific_project", project_id=str(project.id))
+        index = _index(watch, _watchlist("score_changes"))
+
+        assert [s.id for s in index.match_project(project)] == [watch.id]
+        assert [s.id for s in index.match_score(ScoreChange(project, 60, None))] == [watch.id]
+
+    def test_saved_search_matches_own_org_projects(self):
+        search = SimpleNamespace(
+            id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            org_id=OWN_ORG,
+            name="Solar in Spain",
+            filters={"project_types": ["sol"], "geographies": ["spa"], "min_signal_score": 60},
+        )
+        index = PercolatorIndex([compile_saved_search(search)])
+
+        assert [s.id for s in index.match_project(_project(org_id=OWN_ORG))] == [search.id]
+        assert index.match_project(_project(org_id=OTHER_ORG)) == []
+        assert index.match_project(_project(org_id=OWN_ORG, signal_score=40)) == []
+
+    def test_unsupported_watch_types_are_skipped(self):
+        assert compile_watchlist(_watchlist("market_events")) is None
+        assert compile_watchlist(_watchlist("specific_project", project_id="not-a-uuid")) is None
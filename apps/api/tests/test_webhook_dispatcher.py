@@ -0,0 +1,188 @@
+"""Unit tests for the async webhook dispatcher — no database or network required."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import httpx
+
+from app.modules.webhooks.dispatcher import (
+    _APPLY_FAILURE_DELTA,
+    _AUTO_DISABLE,
+    WebhookDispatcher,
+    delivery_outcome,
+)
+from app.modules.webhooks.service import RETRY_DELAYS_SECONDS
+
+ClaimRow = namedtuple("ClaimRow", "id subscription_id event_type payload attempts")
+SubRow = namedtuple("SubRow", "id url secret is_active")
+
+
+class FakeResult:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+
+    def all(self) -> list:
+        return self.rows
+
+
+class FakeDB:
+    """Serves one claim (deliveries, then subscriptions) and records bulk updates."""
+
+    def __init__(self, claims: list[ClaimRow], subs: list[SubRow]) -> None:
+        self.reads = [claims, subs]
+        self.updates: dict[str, list[dict]] = {}
+        self.executed: list[tuple] = []
+        self.commits = 0
+
+    def session(self) -> FakeSession:
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, db: FakeDB) -> None:
+        self.db = db
+
+    async def __aenter__(self) -> FakeSession:
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def execute(self, stmt, params=None):
+        if params is not None:
+            self.db.updates[stmt.table.name] = params
+            self.db.executed.append((stmt, params))
+            return None
+        return FakeResult(self.db.reads.pop(0) if self.db.reads else [])
+
+    async def commit(self) -> None:
+        self.db.commits += 1
+
+
+def _sub(url: str = "https://hooks.example.com/a") -> SubRow:
+    return SubRow(uuid.uuid4(), url, "s3cret", True)
+
+
+def _claim(sub: SubRow, attempts: int = 1) -> ClaimRow:
+    return ClaimRow(uuid.uuid4(), sub.id, "deal.updated", {"event": "deal.updated"}, attempts)
+
+
+def _dispatcher(db: FakeDB, handler, **kwargs) -> WebhookDispatcher:
+    dispatcher = WebhookDispatcher(db.session, **kwargs)
+    transport = httpx.MockTransport(handler)
+    dispatcher._client_for = lambda url: dispatcher._clients.setdefault(  # type: ignore[method-assign]
+        httpx.URL(url).host, httpx.AsyncClient(transport=transport)
+    )
+    return dispatcher
+
+
+class TestDeliveryOutcome:
+    def test_success(self):
+        now = datetime(2026, 1, 1)
+        outcome = delivery_outcome(1, 204, "", None, now)
+        assert outcome["status"] == "delivered"
+        assert outcome["delivered_at"] == now
+
+    def test_retry_schedule_then_failed(self):
+        now = datetime(2026, 1, 1)
+        first = delivery_outcome(1, 500, "oops", None, now)
+        assert first["status"] == "retrying"
+        assert first["next_retry_at"] == now + timedelta(seconds=RETRY_DELAYS_SECONDS[0])
+        assert first["error_message"] == "HTTP 500"
+
+        last = delivery_outcome(len(RETRY_DELAYS_SECONDS) + 1, None, None, "timeout", now)
+        assert last["status"] == "failed"
+        assert last["next_retry_at"] is None
+
+
+class TestWebhookDispatcher:
+    async def test_batch_is_sent_and_committed_together(self):
+        ok, broken = _sub(), _sub("https://broken.example.com/b")
+        claims = [_claim(ok), _claim(ok), _claim(broken)]
+        db = FakeDB(claims, [ok, broken])
+        seen: list[httpx.Request] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(500 if request.url.host == "broken.example.com" else 200)
+
+        dispatcher = _dispatcher(db, handler)
+        assert await dispatcher.dispatch_once() == 3
+        await dispatcher.aclose()
+
+        assert len(seen) == 3
+        assert seen[0].headers["X-SCR-Signature"].startswith("sha256=")
+        statuses = {u["id"]: u["status"] for u in db.updates["webhook_deliveries"]}
+        assert statuses == {claims[0].id: "delivered", claims[1].id: "delivered", claims[2].id: "retrying"}
+        sub_writes = [(stmt, params) for stmt, params in db.executed if stmt.table.name == "webhook_subscriptions"]
+        assert sub_writes == [
+            (_AUTO_DISABLE, [{"sub_id": broken.id, "delta": 1}]),
+            (_APPLY_FAILURE_DELTA, [{"sub_id": ok.id, "delta": -2}, {"sub_id": broken.id, "delta": 1}]),
+        ]
+        assert db.commits == 2  # claim + one write-back
+
+    def test_subscription_writes_are_relative_and_only_disable(self):
+        disable = _AUTO_DISABLE.compile()
+        assert "failure_count + :delta >= :param_1" in str(disable)
+        assert set(disable.params) >= {"is_active", "disabled_reason"}
+        assert disable.params["is_active"] is False
+        bump = str(_APPLY_FAILURE_DELTA.compile())
+        assert "greatest(:greatest_1, webhook_subscriptions.failure_count + :delta)" in bump
+        assert "is_active" not in bump
+
+    async def test_per_subscriber_concurrency_cap(self):
+        sub = _sub()
+        db = FakeDB([_claim(sub) for _ in range(10)], [sub])
+        in_flight = peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        dispatcher = _dispatcher(db, handler, per_subscriber=2, concurrency=50)
+        await dispatcher.dispatch_once()
+        await dispatcher.aclose()
+        assert peak == 2
+
+    async def test_missing_subscription_fails_delivery(self):
+        orphan = _claim(_sub())
+        db = FakeDB([orphan], [])
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError("nothing should be sent")
+
+        dispatcher = _dispatcher(db, handler)
+        await dispatcher.dispatch_once()
+        (update,) = db.updates["webhook_deliveries"]
+        assert update["status"] == "failed"
+        assert update["error_message"] == "Subscription not found"
+
+    async def test_disabled_subscription_fails_delivery(self):
+        disabled = _sub()._replace(is_active=False)
+        claim = _claim(disabled)
+        db = FakeDB([claim], [disabled])
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError("nothing should be sent")
+
+        dispatcher = _dispatcher(db, handler)
+        await dispatcher.dispatch_once()
+        (update,) = db.updates["webhook_deliveries"]
+        assert update["id"] == claim.id
+        assert update["status"] == "failed"
+        assert update["error_message"] == "Subscription disabled"
+        assert "webhook_subscriptions" not in db.updates
+
+    async def test_empty_claim_writes_nothing(self):
+        db = FakeDB([], [])
+        dispatcher = _dispatcher(db, lambda request: httpx.Response(200))
+        assert await dispatcher.dispatch_once() == 0
+        assert db.updates == {}
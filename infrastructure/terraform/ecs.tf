@@ -942,6 +942,30 @@ resource "aws_ecs_task_definition" "worker_webhooks" {
         awslogs-stream-prefix = "worker-webhooks"
       }
     }
+    }, {
+    # Long-lived dispatcher: claims due deliveries in batches (SKIP LOCKED),
+    # so it is safe to run one per task alongside the Celery worker.
+    name      = "webhook-dispatcher"
+    image     = "${aws_ecr_repository.services["scr-api"].repository_url}:${var.environment}-latest"
+    essential = true
+
+    command = ["python", "-m", "app.modules.webhooks.dispatcher"]
+
+    environment = [
+      { name = "APP_ENV", value = var.environment },
+      { name = "APP_DEBUG", value = "false" },
+    ]
+
+    secrets = local.celery_secrets
+
+    logConfiguration = {
+      logDriver = "awslogs"
+      options = {
+        awslogs-group         = aws_cloudwatch_log_group.worker_webhooks.name
+        awslogs-region        = var.aws_region
+        awslogs-stream-prefix = "webhook-dispatcher"
+      }
+    }
   }])
 }
 
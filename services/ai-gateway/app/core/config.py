@@ -47,6 +47,25 @@ class Settings(BaseSettings):
     PINECONE_API_KEY: str = ""
     PINECONE_ENVIRONMENT: str = "us-east-1"
     PINECONE_INDEX_NAME: str = "scr-platform"
+    # Local (memory) backend: IVF approximate index kicks in at this namespace size
+    VECTOR_STORE_IVF_MIN_VECTORS: int = 20_000
+    VECTOR_STORE_IVF_NLIST: int = 0     # 0 = sqrt(namespace size)
+    VECTOR_STORE_IVF_NPROBE: int = 8    # lists probed per query — recall/latency knob
+    VECTOR_STORE_SNAPSHOT_DIR: str = ""  # restore on startup / snapshot on shutdown when set
+
+    # RAG ingestion batching
+    RAG_EMBED_BATCH_SIZE: int = 64      # texts per provider embedding call
+    RAG_EMBED_CONCURRENCY: int = 4      # embedding calls in flight per document
+    RAG_UPSERT_BATCH_SIZE: int = 100    # vectors per vector-store upsert
+
+    # Embedding cache — keyed by (model, sha256(text)); local LRU in front of Redis
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_LOCAL_SIZE: int = 10_000         # vectors held in-process
+    EMBEDDING_CACHE_TTL_SECONDS: int = 30 * 86400    # Redis tier expiry
+
+    # Completion cache — deterministic task types only (see services/completion_cache.py)
+    COMPLETION_CACHE_ENABLED: bool = True
+    COMPLETION_CACHE_MAX_TEMPERATURE: float = 0.2   # requests above this are always live
 
     # External data feeds
     FRED_API_KEY: str = ""
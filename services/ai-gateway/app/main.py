@@ -40,11 +40,26 @@ if _sentry_dsn:
 async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
     logger.info("Starting AI Gateway", env=settings.APP_ENV, port=settings.PORT)
     # Warm up vector store singleton
+    from app.services.vector_store import InMemoryVectorStore, NumpyVectorStore
     from app.services.vector_store import vector_store as vs
-    vs()
-    logger.info("Vector store initialized", backend=settings.VECTOR_STORE_BACKEND)
+    store = vs()
+    logger.info(
+        "Vector store initialized",
+        backend=settings.VECTOR_STORE_BACKEND,
+        store=type(store).__name__,
+    )
+    if isinstance(store, InMemoryVectorStore):
+        logger.warning(
+            "vector_store_python_fallback",
+            reason="numpy not installed; using the pure-Python store (no IVF index, no snapshots)",
+        )
     yield
     logger.info("Shutting down AI Gateway")
+    if settings.VECTOR_STORE_SNAPSHOT_DIR and isinstance(store, NumpyVectorStore):
+        try:
+            store.snapshot(settings.VECTOR_STORE_SNAPSHOT_DIR)
+        except Exception as e:
+            logger.error("vector_store_snapshot_failed", error=str(e))
 
 
 app = FastAPI(
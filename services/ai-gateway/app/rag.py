@@ -17,6 +17,7 @@ from __future__ import annotations
 
 import json
 import re
+import time
 from collections import defaultdict
 from typing import Any
 from uuid import UUID
@@ -41,6 +42,12 @@ CHUNK_CONFIGS: dict[str, dict[str, int]] = {
     "default":                  {"chunk_size": 1000, "overlap": 200, "min_chunk": 100},
 }
 
+# ── Ingestion batching ────────────────────────────────────────────────────────
+
+# Embedding batch size/concurrency and the vector upsert batch size come from
+# the RAG_EMBED_* / RAG_UPSERT_BATCH_SIZE settings, shared with services/rag.py.
+ES_BULK_CHUNK = 500        # documents per Elasticsearch _bulk request
+
 _SECTION_PATTERN = re.compile(
     r"(?:^#{1,4}\s+.+$|"           # Markdown headers
     r"^\d+[\.\)]\s+[A-Z].+$|"       # Numbered sections
@@ -49,6 +56,10 @@ _SECTION_PATTERN = re.compile(
 )
 
 
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
 class Chunk:
     """A text chunk with metadata."""
 
@@ -96,22 +107,37 @@ class RAGPipeline:
 
         metadata must contain: org_id, project_id, portfolio_id, document_type, filename
         """
+        from app.core.config import settings
+        from app.services.rag import embed_in_batches
+
         org_id = metadata["org_id"]
         doc_type = metadata.get("document_type", "default")
         config = CHUNK_CONFIGS.get(doc_type, CHUNK_CONFIGS["default"])
 
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
         chunks = self._semantic_chunk(text, config)
+        timings["chunk"] = _elapsed_ms(started)
         if not chunks:
-            return {"chunks_created": 0}
+            return {"chunks_created": 0, "timings_ms": timings}
 
+        started = time.perf_counter()
         await self._summarize_chunks(chunks, doc_type)
+        timings["summarize"] = _elapsed_ms(started)
 
         texts_to_embed = [
             f"{c.summary}\n---\n{c.text}" if c.summary else c.text for c in chunks
         ]
-        embeddings = await self.embedder.embed_batch(texts_to_embed)
+        started = time.perf_counter()
+        embeddings = await embed_in_batches(
+            self.embedder.embed_batch,
+            texts_to_embed,
+            settings.RAG_EMBED_BATCH_SIZE,
+            settings.RAG_EMBED_CONCURRENCY,
+        )
         for chunk, emb in zip(chunks, embeddings, strict=False):
             chunk.embedding = emb
+        timings["embed"] = _elapsed_ms(started)
 
         vectors_to_upsert = [
             {
@@ -133,15 +159,23 @@ class RAGPipeline:
             }
             for chunk in chunks
         ]
-        await self.vectors.upsert(vectors=vectors_to_upsert, namespace=str(org_id))
+        started = time.perf_counter()
+        upsert_size = max(1, settings.RAG_UPSERT_BATCH_SIZE)
+        for i in range(0, len(vectors_to_upsert), upsert_size):
+            await self.vectors.upsert(
+                vectors=vectors_to_upsert[i : i + upsert_size], namespace=str(org_id)
+            )
+        timings["vector_upsert"] = _elapsed_ms(started)
 
         es_index = f"scr_rag_{org_id}"
+        started = time.perf_counter()
         await self._ensure_es_index(es_index)
-        for chunk in chunks:
-            await self.es.index(
-                index=es_index,
-                id=f"{document_id}_{chunk.index}",
-                document={
+        es_failed = 0
+        for i in range(0, len(chunks), ES_BULK_CHUNK):
+            operations: list[dict[str, Any]] = []
+            for chunk in chunks[i : i + ES_BULK_CHUNK]:
+                operations.append({"index": {"_index": es_index, "_id": f"{document_id}_{chunk.index}"}})
+                operations.append({
                     "document_id": str(document_id),
                     "project_id": str(metadata.get("project_id", "")),
                     "doc_type": doc_type,
@@ -151,11 +185,30 @@ class RAGPipeline:
                     "summary": chunk.summary,
                     "page": chunk.page_number,
                     "chunk_index": chunk.index,
-                },
-            )
-
-        logger.info("rag.ingested", document_id=str(document_id), chunks=len(chunks))
-        return {"chunks_created": len(chunks), "doc_type": doc_type}
+                })
+            resp = await self.es.bulk(operations=operations)
+            if resp.get("errors"):
+                failed = [
+                    item["index"] for item in resp.get("items", [])
+                    if item.get("index", {}).get("error")
+                ]
+                es_failed += len(failed)
+                logger.warning(
+                    "rag.es_bulk_errors",
+                    document_id=str(document_id),
+                    failed=len(failed),
+                    first_error=failed[0]["error"] if failed else None,
+                )
+        timings["es_index"] = _elapsed_ms(started)
+
+        logger.info(
+            "rag.ingested",
+            document_id=str(document_id),
+            chunks=len(chunks),
+            es_failed=es_failed,
+            timings_ms=timings,
+        )
+        return {"chunks_created": len(chunks), "doc_type": doc_type, "timings_ms": timings}
 
     async def remove_document(self, document_id: UUID, org_id: UUID) -> None:
         """Remove all chunks for a document (on delete or re-upload)."""
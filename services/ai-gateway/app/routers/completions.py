@@ -1,18 +1,30 @@
 """AI Completions router — full MODEL_ROUTING for all task types."""
 import json
+import time
 from collections.abc import AsyncGenerator
 from typing import Any
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
 from app.services.auth import verify_gateway_key
+from app.services.completion_cache import (
+    BYPASS_HEADER,
+    bypass_requested,
+    completion_cache,
+    is_cacheable,
+)
+from app.services.completion_cache import cache_key as completion_cache_key
 from app.services.llm_router import route_completion, route_completion_stream
 from app.services.rate_limiter import RateLimiter
-from app.services.token_tracker import estimate_cost
+from app.services.token_tracker import (
+    completion_cache_report,
+    estimate_cost,
+    record_completion,
+)
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -382,6 +394,7 @@ async def create_completion(
     request: CompletionRequest,
     response: Response,
     _api_key: str = Depends(verify_gateway_key),
+    x_cache_bypass: str | None = Header(default=None, alias=BYPASS_HEADER),
 ) -> CompletionResponse:
     model = _resolve_model(request.task_type, request.model)
     max_tokens = request.max_tokens or TOKEN_LIMITS.get(request.task_type, 4096)
@@ -414,6 +427,27 @@ async def create_completion(
         estimated_tokens=estimated_tokens,
     )
 
+    started = time.perf_counter()
+    cache_key: str | None = None
+    if is_cacheable(request.task_type, request.temperature):
+        cache_key = completion_cache_key(
+            org_id=request.org_id,
+            model=model,
+            messages=messages,
+            task_type=request.task_type,
+            temperature=request.temperature,
+            max_tokens=max_tokens,
+            tools=request.tools,
+            tool_choice=request.tool_choice,
+        )
+        if bypass_requested(x_cache_bypass):
+            response.headers["X-Cache"] = "BYPASS"
+        else:
+            cached = await completion_cache().get(cache_key)
+            if cached is not None:
+                return _cached_response(request, response, model, cached, started)
+            response.headers["X-Cache"] = "MISS"
+
     try:
         result = await route_completion(
             model=model,
@@ -432,6 +466,16 @@ async def create_completion(
             detail=f"LLM provider error: {e}",
         ) from e
 
+    if cache_key is not None:
+        await completion_cache().set(cache_key, request.task_type, result)
+        record_completion(
+            request.task_type,
+            result.get("model_used", model),
+            result.get("usage", {}),
+            (time.perf_counter() - started) * 1000,
+            cached=False,
+        )
+
     usage: dict[str, Any] = result.get("usage", {})
     cost = estimate_cost(
         model=result.get("model_used", model),
@@ -470,6 +514,71 @@ async def create_completion(
     )
 
 
+def _cached_response(
+    request: CompletionRequest,
+    response: Response,
+    model: str,
+    cached: dict[str, Any],
+    started: float,
+) -> CompletionResponse:
+    """Serve a cache hit: no provider tokens are spent, so cost, ``usage`` and
+    X-Tokens-Used are all zero (the tokens the hit saved are in ``usage.saved_tokens``)."""
+    model_used = cached.get("model_used", model)
+    cached_usage: dict[str, Any] = cached.get("usage", {})
+    latency_ms = (time.perf_counter() - started) * 1000
+    record_completion(request.task_type, model_used, cached_usage, latency_ms, cached=True)
+    usage: dict[str, Any] = {
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "saved_tokens": cached_usage.get("total_tokens", 0),
+    }
+
+    response.headers["X-Cache"] = "HIT"
+    response.headers["X-Tokens-Used"] = "0"
+    if request.org_id:
+        response.headers["X-Org-Id"] = request.org_id
+
+    logger.info(
+        "completion_cache_hit",
+        model=model_used,
+        task_type=request.task_type,
+        org_id=request.org_id,
+        latency_ms=round(latency_ms, 1),
+        saved_tokens=usage["saved_tokens"],
+    )
+
+    return CompletionResponse(
+        content=cached["content"],
+        model_used=model_used,
+        usage=usage,
+        estimated_cost_usd=0.0,
+        tool_calls=cached.get("tool_calls"),
+        stop_reason=cached.get("stop_reason", "end_turn"),
+        validated_data=cached.get("validated_data"),
+        confidence=cached.get("confidence"),
+        confidence_level=cached.get("confidence_level"),
+        validation_repairs=cached.get("validation_repairs", []),
+        validation_warnings=cached.get("validation_warnings", []),
+    )
+
+
+@router.get("/completions/cache/stats")
+async def completion_cache_stats(
+    _api_key: str = Depends(verify_gateway_key),
+) -> dict[str, Any]:
+    """Per-task cache hit rate, cached-vs-live latency and token savings (this process)."""
+    return completion_cache_report()
+
+
+@router.get("/completions/batch/stats")
+async def micro_batch_stats(
+    _api_key: str = Depends(verify_gateway_key),
+) -> dict[str, Any]:
+    """Cross-request batch fill ratio and added queueing latency (this process)."""
+    return get_micro_batcher().stats()
+
+
 @router.post("/completions/stream")
 async def stream_completion(
     request: StreamCompletionRequest,
@@ -589,6 +698,19 @@ class _CompletionResult:
         self.validated_data = validated_data
 
 
+_micro_batcher: Any | None = None
+
+
+def get_micro_batcher() -> Any:
+    """Process-wide MicroBatcher so single requests from different callers coalesce."""
+    global _micro_batcher
+    if _micro_batcher is None:
+        from app.task_batcher import MicroBatcher, TaskBatcher
+
+        _micro_batcher = MicroBatcher(TaskBatcher(llm_client=_LLMClientAdapter()))
+    return _micro_batcher
+
+
 @router.post("/completions/batch", response_model=BatchCompletionResponse)
 async def batch_completions(
     request: BatchCompletionRequest,
@@ -598,7 +720,9 @@ async def batch_completions(
 
     Batchable task types: classify_document, extract_kpis, summarize_document,
     explain_match, insurance_risk_impact, risk_monitoring_analysis.
-    Non-batchable tasks are processed individually.
+    Non-batchable tasks are processed individually. Single-context requests for
+    batchable tasks are queued briefly and combined with concurrent requests
+    from other callers in the same org.
     """
     from app.task_batcher import BATCHABLE_TASKS, TaskBatcher
 
@@ -616,6 +740,18 @@ async def batch_completions(
         except Exception:
             pass
 
+    if (
+        request.task_type in BATCHABLE_TASKS
+        and len(request.contexts) == 1
+        and request.max_batch_size is None
+    ):
+        result = await get_micro_batcher().submit(
+            request.task_type, request.contexts[0], org_id=request.org_id
+        )
+        return BatchCompletionResponse(
+            results=[result], task_type=request.task_type, total=1, batched=True
+        )
+
     llm_adapter = _LLMClientAdapter()
     batcher = TaskBatcher(llm_client=llm_adapter)
 
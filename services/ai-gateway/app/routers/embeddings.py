@@ -8,6 +8,7 @@ from pydantic import BaseModel
 
 from app.core.config import settings
 from app.services.auth import verify_gateway_key
+from app.services.embedding_cache import embedding_cache
 from app.services.token_tracker import estimate_cost
 
 logger = structlog.get_logger()
@@ -25,6 +26,7 @@ class EmbedResponse(BaseModel):
     model_used: str
     usage: dict[str, int]
     estimated_cost_usd: float
+    cache_hits: int = 0
 
 
 @router.post("/embed", response_model=EmbedResponse)
@@ -37,22 +39,40 @@ async def create_embedding(
 
     logger.info("embed_request", model=model, texts=len(texts), org_id=request.org_id)
 
-    try:
+    async def _provider(misses: list[str]) -> tuple[list[list[float]], int]:
         response = await litellm.aembedding(
             model=model,
-            input=texts,
+            input=misses,
             api_key=settings.OPENAI_API_KEY,
         )
+        return [item["embedding"] for item in response.data], response.usage.prompt_tokens
+
+    try:
+        embeddings, prompt_tokens, cache_hits = await embedding_cache().embed(model, texts, _provider)
     except Exception as e:
         logger.error("embedding_failed", model=model, error=str(e))
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Embedding error: {e}") from e
 
-    embeddings = [item["embedding"] for item in response.data]
+    # Usage reflects tokens actually sent to the provider — cache hits are free
     usage: dict[str, Any] = {
-        "prompt_tokens": response.usage.prompt_tokens,
+        "prompt_tokens": prompt_tokens,
         "completion_tokens": 0,
-        "total_tokens": response.usage.total_tokens,
+        "total_tokens": prompt_tokens,
     }
     cost = estimate_cost(model=model, input_tokens=usage["prompt_tokens"], output_tokens=0)
 
-    return EmbedResponse(embeddings=embeddings, model_used=model, usage=usage, estimated_cost_usd=cost)
+    return EmbedResponse(
+        embeddings=embeddings,
+        model_used=model,
+        usage=usage,
+        estimated_cost_usd=cost,
+        cache_hits=cache_hits,
+    )
+
+
+@router.get("/embed/cache/stats")
+async def embedding_cache_stats(
+    _api_key: str = Depends(verify_gateway_key),
+) -> dict[str, Any]:
+    """Hit rate and provider tokens saved by the embedding cache (this process)."""
+    return embedding_cache().stats()
@@ -7,23 +7,30 @@ from pydantic import BaseModel, Field
 
 from app.services.auth import verify_gateway_key
 from app.services.rag import get_rag
-from app.services.vector_store import get_vector_store
+from app.services.vector_store import vector_store
 
 logger = structlog.get_logger()
 router = APIRouter()
 
 
+class PageOffset(BaseModel):
+    page: int = Field(..., ge=1)
+    offset: int = Field(..., ge=0)  # character offset where the page starts in ``text``
+
+
 class IngestRequest(BaseModel):
     document_id: str
     text: str
     org_id: str
     metadata: dict[str, Any] | None = None
     index_type: str = "document_chunks"
+    pages: list[PageOffset] | None = None
 
 
 class IngestResponse(BaseModel):
     document_id: str
     chunks_stored: int
+    timings_ms: dict[str, float] = {}
 
 
 class SearchRequest(BaseModel):
@@ -75,14 +82,15 @@ async def ingest_document(
     """Chunk, embed, and store a document in the vector store."""
     rag = get_rag()
     try:
-        chunks = await rag.ingest_document(
+        result = await rag.ingest_document(
             document_id=request.document_id,
             text=request.text,
             org_id=request.org_id,
             metadata=request.metadata,
             index_type=request.index_type,
+            pages=[(p.page, p.offset) for p in request.pages] if request.pages else None,
         )
-        return IngestResponse(document_id=request.document_id, chunks_stored=chunks)
+        return IngestResponse(document_id=request.document_id, **result)
     except Exception as e:
         logger.error("ingest_failed", document_id=request.document_id, error=str(e))
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
@@ -151,7 +159,7 @@ async def rag_complete(
 async def delete_namespace(org_id: str, _api_key: str = Depends(verify_gateway_key)):
     """Delete all RAG vectors for an organization (used on org deletion)."""
     try:
-        vs = get_vector_store()
+        vs = vector_store()
         await vs.delete_namespace(org_id)
         return {"deleted": True, "org_id": org_id}
     except Exception as e:
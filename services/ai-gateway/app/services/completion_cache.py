@@ -0,0 +1,127 @@
+"""Exact-match response cache for deterministic completion task types.
+
+Low-temperature structured tasks (classification, KPI extraction, quality
+scoring) are re-requested with identical prompts by different API modules.
+Responses are cached in Redis keyed on the normalised request payload and
+scoped per org, so one tenant's prompt never serves another's answer.
+"""
+import hashlib
+import json
+from typing import Any
+
+import redis.asyncio as aioredis
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# Cacheable task types → TTL in seconds. Anything not listed is always live.
+CACHEABLE_TASK_TTLS: dict[str, int] = {
+    "classify_document": 7 * 86400,
+    "classify_sfdr": 7 * 86400,
+    "check_taxonomy": 7 * 86400,
+    "extract_kpis": 86400,
+    "extract_clauses": 86400,
+    "extract_esg": 86400,
+    "detect_redactable": 86400,
+    "score_quality": 86400,
+    "summarize_document": 86400,
+    "parse_screener_query": 3600,
+    "parse_nl_query": 3600,
+}
+
+BYPASS_HEADER = "X-Cache-Bypass"
+_TRUTHY = {"1", "true", "yes", "on"}
+
+
+def bypass_requested(header_value: str | None) -> bool:
+    """Only an explicit truthy ``X-Cache-Bypass`` value skips the lookup ("0"/"false" do not)."""
+    return (header_value or "").strip().lower() in _TRUTHY
+
+
+def is_cacheable(task_type: str, temperature: float) -> bool:
+    return (
+        settings.COMPLETION_CACHE_ENABLED
+        and task_type in CACHEABLE_TASK_TTLS
+        and temperature <= settings.COMPLETION_CACHE_MAX_TEMPERATURE
+    )
+
+
+def _normalise_messages(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    normalised = []
+    for m in messages:
+        msg = {k: v for k, v in m.items() if v is not None}
+        if isinstance(msg.get("content"), str):
+            msg["content"] = msg["content"].strip()
+        normalised.append(msg)
+    return normalised
+
+
+def cache_key(
+    *,
+    org_id: str,
+    model: str,
+    messages: list[dict[str, Any]],
+    task_type: str,
+    temperature: float,
+    max_tokens: int,
+    tools: list[dict[str, Any]] | None = None,
+    tool_choice: str | dict[str, Any] | None = None,
+) -> str:
+    payload = {
+        "model": model,
+        "messages": _normalise_messages(messages),
+        "task_type": task_type,
+        "temperature": round(temperature, 2),
+        "max_tokens": max_tokens,
+        "tools": tools or None,
+        "tool_choice": tool_choice,
+    }
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()
+    ).hexdigest()
+    return f"completion:{org_id or '_'}:{task_type}:{digest}"
+
+
+class CompletionCache:
+    """Redis-backed completion cache. All Redis errors fail open (cache miss)."""
+
+    def __init__(self) -> None:
+        self._redis: Any | None = None
+
+    def _get_redis(self) -> Any:
+        if self._redis is None:
+            self._redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        return self._redis
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        try:
+            raw = await self._get_redis().get(key)
+        except Exception as e:
+            logger.warning("completion_cache_error", op="get", error=str(e))
+            return None
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, task_type: str, result: dict[str, Any]) -> None:
+        # Failed validations and empty answers are not worth replaying
+        if not result.get("content") and not result.get("tool_calls"):
+            return
+        if result.get("confidence_level") == "failed":
+            return
+        try:
+            await self._get_redis().set(
+                key, json.dumps(result, default=str), ex=CACHEABLE_TASK_TTLS[task_type]
+            )
+        except Exception as e:
+            logger.warning("completion_cache_error", op="set", error=str(e))
+
+
+_completion_cache: CompletionCache | None = None
+
+
+def completion_cache() -> CompletionCache:
+    global _completion_cache
+    if _completion_cache is None:
+        _completion_cache = CompletionCache()
+    return _completion_cache
@@ -0,0 +1,187 @@
+"""Content-addressed embedding cache: local LRU in front of Redis.
+
+Entries are keyed by (model, sha256(text)), so identical boilerplate — legal
+templates, disclaimers, standard DD questionnaire text — is embedded once per
+model no matter which document or query it arrives in. Vectors are stored in
+Redis as packed float32 to keep the shared tier compact.
+"""
+import hashlib
+from array import array
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import redis.asyncio as aioredis
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# Provider call for cache misses: texts -> (vectors, prompt_tokens)
+EmbedFn = Callable[[list[str]], Awaitable[tuple[list[list[float]], int]]]
+
+
+def cache_key(model: str, text: str) -> str:
+    return f"emb:{model}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+
+def _pack(vector: list[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(raw: bytes) -> list[float]:
+    values = array("f")
+    values.frombytes(raw)
+    return values.tolist()
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough tokenizer-free estimate (~4 chars/token) used for saved-token metrics."""
+    return max(1, len(text) // 4)
+
+
+class EmbeddingCache:
+    """Two-tier (in-process LRU → Redis) embedding cache with batch lookup."""
+
+    def __init__(
+        self,
+        *,
+        local_size: int = 10_000,
+        ttl_seconds: int = 30 * 86400,
+        redis_url: str | None = None,
+    ) -> None:
+        self._local: OrderedDict[str, list[float]] = OrderedDict()
+        self._local_size = local_size
+        self._ttl = ttl_seconds
+        self._redis_url = redis_url
+        self._redis: Any | None = None
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self.provider_tokens = 0
+
+    def _get_redis(self) -> Any | None:
+        if self._redis is None and self._redis_url:
+            self._redis = aioredis.from_url(self._redis_url, decode_responses=False)
+        return self._redis
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        self._local[key] = vector
+        self._local.move_to_end(key)
+        while len(self._local) > self._local_size:
+            self._local.popitem(last=False)
+
+    async def get_many(self, model: str, texts: list[str]) -> list[list[float] | None]:
+        """Look up a batch; returns vectors in input order with None for misses."""
+        keys = [cache_key(model, t) for t in texts]
+        found: list[list[float] | None] = [None] * len(texts)
+        remote: list[int] = []
+        for i, key in enumerate(keys):
+            vector = self._local.get(key)
+            if vector is not None:
+                self._local.move_to_end(key)
+                found[i] = vector
+                self.local_hits += 1
+            else:
+                remote.append(i)
+
+        redis = self._get_redis()
+        if remote and redis is not None:
+            try:
+                raws = await redis.mget([keys[i] for i in remote])
+            except Exception as e:
+                logger.warning("embedding_cache_redis_error", error=str(e))
+                raws = [None] * len(remote)
+            for i, raw in zip(remote, raws, strict=True):
+                if raw:
+                    vector = _unpack(raw)
+                    self._remember(keys[i], vector)
+                    found[i] = vector
+                    self.redis_hits += 1
+        return found
+
+    async def put_many(self, model: str, texts: list[str], vectors: list[list[float]]) -> None:
+        keys = [cache_key(model, t) for t in texts]
+        for key, vector in zip(keys, vectors, strict=True):
+            self._remember(key, vector)
+        redis = self._get_redis()
+        if redis is None or not keys:
+            return
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for key, vector in zip(keys, vectors, strict=True):
+                pipe.set(key, _pack(vector), ex=self._ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("embedding_cache_redis_error", error=str(e))
+
+    async def embed(
+        self,
+        model: str,
+        texts: list[str],
+        embed_fn: EmbedFn,
+        *,
+        fallback: Callable[[list[str]], list[list[float]]] | None = None,
+    ) -> tuple[list[list[float]], int, int]:
+        """Resolve a batch through the cache, sending only distinct misses to ``embed_fn``.
+
+        Returns ``(vectors in input order, provider prompt tokens spent, cache hits)``.
+        Nothing is cached for a failed provider call. The error propagates unless
+        ``fallback`` is given, in which case only the misses get fallback vectors
+        (uncached) and cache hits are still served.
+        """
+        found = await self.get_many(model, texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, found, strict=True) if v is None))
+        hits = 0
+        for text, vector in zip(texts, found, strict=True):
+            if vector is not None:
+                hits += 1
+                self.saved_tokens += _estimate_tokens(text)
+
+        tokens = 0
+        if missing:
+            self.misses += len(missing)
+            try:
+                vectors, tokens = await embed_fn(missing)
+            except Exception as e:
+                if fallback is None:
+                    raise
+                logger.warning("embedding_provider_failed", texts=len(missing), error=str(e))
+                vectors = fallback(missing)
+            else:
+                self.provider_tokens += tokens
+                await self.put_many(model, missing, vectors)
+            fresh = dict(zip(missing, vectors, strict=True))
+            found = [v if v is not None else fresh[t] for t, v in zip(texts, found, strict=True)]
+
+        return found, tokens, hits  # type: ignore[return-value]
+
+    def stats(self) -> dict[str, Any]:
+        hits = self.local_hits + self.redis_hits
+        lookups = hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "saved_tokens": self.saved_tokens,
+            "provider_tokens": self.provider_tokens,
+            "local_entries": len(self._local),
+        }
+
+
+_embedding_cache: EmbeddingCache | None = None
+
+
+def embedding_cache() -> EmbeddingCache:
+    global _embedding_cache
+    if _embedding_cache is None:
+        enabled = settings.EMBEDDING_CACHE_ENABLED
+        _embedding_cache = EmbeddingCache(
+            local_size=settings.EMBEDDING_CACHE_LOCAL_SIZE if enabled else 0,
+            ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+            redis_url=settings.REDIS_URL if enabled else None,
+        )
+    return _embedding_cache
@@ -1,6 +1,10 @@
 """RAG pipeline — chunk, embed, store, retrieve, augment, complete."""
 from __future__ import annotations
 
+import asyncio
+import bisect
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import structlog
@@ -29,27 +33,103 @@ def _chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OV
     return chunks
 
 
+def _chunk_pages(
+    text: str,
+    pages: list[tuple[int, int]],
+    chunk_size: int = CHUNK_SIZE,
+    overlap: int = CHUNK_OVERLAP,
+) -> list[tuple[int, int]]:
+    """(first page, last page) of each chunk ``_chunk_text`` produces.
+
+    ``pages`` holds ``(page number, character offset where the page starts)``.
+    """
+    markers = sorted(pages, key=lambda p: p[1])
+    page_numbers: list[int] = []
+    word_starts: list[int] = []
+    words_before = 0
+    prev_offset = 0
+    for page, offset in markers:
+        words_before += len(text[prev_offset:offset].split())
+        page_numbers.append(page)
+        word_starts.append(words_before)
+        prev_offset = offset
+
+    def page_of(word: int) -> int:
+        return page_numbers[max(0, bisect.bisect_right(word_starts, word) - 1)]
+
+    n_words = len(text.split())
+    spans: list[tuple[int, int]] = []
+    start = 0
+    while start < n_words:
+        end = min(start + chunk_size, n_words)
+        spans.append((page_of(start), page_of(end - 1)))
+        if end == n_words:
+            break
+        start += chunk_size - overlap
+    return spans
+
+
+def _stub_embedding(text: str) -> list[float]:
+    """Deterministic stub vector for dev — real production needs embeddings."""
+    import hashlib
+    import random
+
+    seed = int(hashlib.md5(text.encode()).hexdigest(), 16) % 2**31
+    rng = random.Random(seed)
+    return [rng.gauss(0, 1) for _ in range(1536)]  # text-embedding-3-large dim
+
+
+async def _provider_embed(model: str, texts: list[str]) -> tuple[list[list[float]], int]:
+    import litellm
+
+    from app.core.config import settings
+
+    response = await litellm.aembedding(model=model, input=texts, api_key=settings.OPENAI_API_KEY)
+    return [item["embedding"] for item in response.data], response.usage.prompt_tokens
+
+
+async def _embed_texts(texts: list[str]) -> list[list[float]]:
+    """Embed a batch of texts; cached texts skip the provider, misses share one call."""
+    from app.core.config import settings
+    from app.services.embedding_cache import embedding_cache
+
+    model = settings.AI_EMBEDDING_MODEL
+    # Stub vectors stand in only for texts the provider failed on; cache hits are kept
+    vectors, _, _ = await embedding_cache().embed(
+        model,
+        texts,
+        lambda misses: _provider_embed(model, misses),
+        fallback=lambda misses: [_stub_embedding(t) for t in misses],
+    )
+    return vectors
+
+
 async def _embed_text(text: str) -> list[float]:
     """Generate embeddings via litellm."""
-    try:
-        import litellm
+    return (await _embed_texts([text]))[0]
 
-        from app.core.config import settings
 
-        response = await litellm.aembedding(
-            model=settings.AI_EMBEDDING_MODEL,
-            input=[text],
-            api_key=settings.OPENAI_API_KEY,
-        )
-        return response.data[0]["embedding"]
-    except Exception as e:
-        logger.warning("embedding_failed", error=str(e))
-        # Return a stub vector for dev — real production needs embeddings
-        import hashlib
-        seed = int(hashlib.md5(text.encode()).hexdigest(), 16) % 2**31
-        import random
-        rng = random.Random(seed)
-        return [rng.gauss(0, 1) for _ in range(1536)]  # text-embedding-3-large dim
+async def embed_in_batches(
+    embed: Callable[[list[str]], Awaitable[list[list[float]]]],
+    texts: list[str],
+    batch_size: int,
+    concurrency: int,
+) -> list[list[float]]:
+    """Embed texts with ``embed`` in provider-sized batches, at most ``concurrency`` in flight.
+
+    Output order matches input order. Shared by both ingestion pipelines.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _run(batch: list[str]) -> list[list[float]]:
+        async with semaphore:
+            return await embed(batch)
+
+    size = max(1, batch_size)
+    results = await asyncio.gather(
+        *(_run(texts[i : i + size]) for i in range(0, len(texts), size))
+    )
+    return [vector for batch in results for vector in batch]
 
 
 class RAGPipeline:
@@ -69,36 +149,67 @@ class RAGPipeline:
         org_id: str,
         metadata: dict[str, Any] | None = None,
         index_type: str = "document_chunks",
-    ) -> int:
-        """Chunk text, embed each chunk, store in vector DB. Returns chunk count."""
+        pages: list[tuple[int, int]] | None = None,
+    ) -> dict[str, Any]:
+        """Chunk text, embed chunks in batches, store in vector DB.
+
+        ``pages`` — ``(page number, start offset)`` pairs for paginated sources
+        (PDFs); each chunk's metadata then carries ``page`` and ``page_end``.
+
+        Returns ``{"chunks_stored": int, "timings_ms": {chunk, embed, index}}``.
+        """
+        from app.core.config import settings
+
         namespace = self._org_namespace(org_id, index_type)
-        chunks = _chunk_text(text)
         meta_base = metadata or {}
+        timings: dict[str, float] = {}
 
+        started = time.perf_counter()
+        chunks = _chunk_text(text)
+        spans = _chunk_pages(text, pages) if pages else []
+        timings["chunk"] = round((time.perf_counter() - started) * 1000, 1)
+
+        started = time.perf_counter()
+        vectors = await embed_in_batches(
+            _embed_texts, chunks, settings.RAG_EMBED_BATCH_SIZE, settings.RAG_EMBED_CONCURRENCY
+        )
+        timings["embed"] = round((time.perf_counter() - started) * 1000, 1)
+
+        items = [
+            (
+                f"{document_id}_chunk_{i}",
+                vector,
+                {
+                    **meta_base,
+                    "document_id": document_id,
+                    "chunk_index": i,
+                    "chunk_total": len(chunks),
+                    "text": chunk[:500],  # Store first 500 chars for display
+                    "org_id": org_id,
+                    **({"page": spans[i][0], "page_end": spans[i][1]} if spans else {}),
+                },
+            )
+            for i, (chunk, vector) in enumerate(zip(chunks, vectors, strict=True))
+        ]
+
+        started = time.perf_counter()
         ingested = 0
-        for i, chunk in enumerate(chunks):
-            chunk_id = f"{document_id}_chunk_{i}"
+        size = max(1, settings.RAG_UPSERT_BATCH_SIZE)
+        for offset in range(0, len(items), size):
+            batch = items[offset : offset + size]
             try:
-                vector = await _embed_text(chunk)
-                self._vs.upsert(
-                    namespace=namespace,
-                    doc_id=chunk_id,
-                    vector=vector,
-                    metadata={
-                        **meta_base,
-                        "document_id": document_id,
-                        "chunk_index": i,
-                        "chunk_total": len(chunks),
-                        "text": chunk[:500],  # Store first 500 chars for display
-                        "org_id": org_id,
-                    },
-                )
-                ingested += 1
+                self._vs.upsert_many(namespace, batch)
+                ingested += len(batch)
             except Exception as e:
-                logger.error("chunk_ingest_failed", chunk_id=chunk_id, error=str(e))
+                logger.error(
+                    "chunk_batch_ingest_failed", document_id=document_id, offset=offset, error=str(e)
+                )
+        timings["index"] = round((time.perf_counter() - started) * 1000, 1)
 
-        logger.info("document_ingested", document_id=document_id, chunks=ingested, org_id=org_id)
-        return ingested
+        logger.info(
+            "document_ingested", document_id=document_id, chunks=ingested, org_id=org_id, timings_ms=timings
+        )
+        return {"chunks_stored": ingested, "timings_ms": timings}
 
     async def query(
         self,
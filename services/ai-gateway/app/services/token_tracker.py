@@ -22,3 +22,59 @@ def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
     input_cost = (input_tokens / 1_000_000) * pricing["input"]
     output_cost = (output_tokens / 1_000_000) * pricing["output"]
     return round(input_cost + output_cost, 6)
+
+
+# ── Completion cache accounting ──────────────────────────────────────────────
+# Per-task counters (this process) for cached vs live completions, so the
+# latency and provider spend avoided by the completion cache are visible.
+
+_cache_stats: dict[str, dict[str, float]] = {}
+
+
+def record_completion(
+    task_type: str,
+    model: str,
+    usage: dict[str, int],
+    latency_ms: float,
+    *,
+    cached: bool,
+) -> None:
+    """Record a served completion; cache hits count their tokens as saved."""
+    stats = _cache_stats.setdefault(
+        task_type,
+        {
+            "hits": 0,
+            "misses": 0,
+            "cached_latency_ms": 0.0,
+            "live_latency_ms": 0.0,
+            "saved_tokens": 0,
+            "saved_cost_usd": 0.0,
+        },
+    )
+    input_tokens = usage.get("prompt_tokens", 0)
+    output_tokens = usage.get("completion_tokens", 0)
+    if cached:
+        stats["hits"] += 1
+        stats["cached_latency_ms"] += latency_ms
+        stats["saved_tokens"] += input_tokens + output_tokens
+        stats["saved_cost_usd"] += estimate_cost(model, input_tokens, output_tokens)
+    else:
+        stats["misses"] += 1
+        stats["live_latency_ms"] += latency_ms
+
+
+def completion_cache_report() -> dict[str, dict[str, float]]:
+    """Hit rate, mean cached/live latency and token savings per task type."""
+    report: dict[str, dict[str, float]] = {}
+    for task_type, s in _cache_stats.items():
+        total = s["hits"] + s["misses"]
+        report[task_type] = {
+            "hits": s["hits"],
+            "misses": s["misses"],
+            "hit_rate": round(s["hits"] / total, 4) if total else 0.0,
+            "avg_cached_latency_ms": round(s["cached_latency_ms"] / s["hits"], 1) if s["hits"] else 0.0,
+            "avg_live_latency_ms": round(s["live_latency_ms"] / s["misses"], 1) if s["misses"] else 0.0,
+            "saved_tokens": s["saved_tokens"],
+            "saved_cost_usd": round(s["saved_cost_usd"], 6),
+        }
+    return report
@@ -1,6 +1,12 @@
-"""Vector store interface — Pinecone or in-memory fallback for dev."""
+"""Vector store interface — Pinecone, NumPy-backed local store, or pure-Python fallback."""
 from __future__ import annotations
 
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
 from typing import Any
 
 import structlog
@@ -30,6 +36,10 @@ class InMemoryVectorStore:
         key = self._namespace_key(namespace, doc_id)
         self._store[key] = {"id": doc_id, "vector": vector, "metadata": metadata, "namespace": namespace}
 
+    def upsert_many(self, namespace: str, items: list[tuple[str, list[float], dict[str, Any]]]) -> None:
+        for doc_id, vector, metadata in items:
+            self.upsert(namespace, doc_id, vector, metadata)
+
     def query(
         self, namespace: str, query_vector: list[float], top_k: int = 5, filters: dict | None = None
     ) -> list[VectorMatch]:
@@ -65,6 +75,381 @@ class InMemoryVectorStore:
         logger.info("namespace_deleted", namespace=namespace, vectors_removed=len(keys_to_remove))
 
 
+class _NamespaceMatrix:
+    """Contiguous float32 matrix of pre-normalised vectors for one namespace.
+
+    Rows are appended into a capacity-doubling buffer; deletes swap the last
+    row into the hole so the live region ``matrix[:size]`` stays contiguous.
+    Metadata keys used in filters get a dictionary-encoded int32 column kept
+    in step with the rows, so a filter is an array comparison, not a scan of
+    every row's metadata dict.
+    """
+
+    def __init__(self, dim: int) -> None:
+        import numpy as np
+
+        self.dim = dim
+        self.size = 0
+        self.matrix = np.empty((16, dim), dtype=np.float32)
+        self.ids: list[str] = []
+        self.metadata: list[dict[str, Any]] = []
+        self.rows: dict[str, int] = {}
+        # IVF index: centroid per list and list assignment per row (None until built)
+        self.centroids: Any = None
+        self.assign = np.empty(16, dtype=np.int32)
+        self.indexed_size = 0
+        # Filter columns: metadata key -> per-row value codes, and value -> code
+        self.columns: dict[str, Any] = {}
+        self.vocab: dict[str, dict[Any, int]] = {}
+
+    def _ensure_writable(self) -> None:
+        # Restored snapshots are memory-mapped read-only until the first write
+        import numpy as np
+
+        if not self.matrix.flags.writeable:
+            self.matrix = np.array(self.matrix)
+
+    def _grow(self) -> None:
+        import numpy as np
+
+        capacity = max(16, self.matrix.shape[0] * 2)
+        matrix = np.empty((capacity, self.dim), dtype=np.float32)
+        matrix[: self.size] = self.matrix[: self.size]
+        assign = np.empty(capacity, dtype=np.int32)
+        assign[: self.size] = self.assign[: self.size]
+        self.matrix, self.assign = matrix, assign
+        for key, codes in self.columns.items():
+            grown = np.empty(capacity, dtype=np.int32)
+            grown[: self.size] = codes[: self.size]
+            self.columns[key] = grown
+
+    def put(self, doc_id: str, unit_vector: Any, metadata: dict[str, Any]) -> None:
+        self._ensure_writable()
+        row = self.rows.get(doc_id)
+        if row is None:
+            if self.size == self.matrix.shape[0]:
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.rows[doc_id] = row
+            self.ids.append(doc_id)
+            self.metadata.append(metadata)
+        else:
+            self.metadata[row] = metadata
+        for key, codes in self.columns.items():
+            codes[row] = self._code(key, metadata.get(key))
+        self.matrix[row] = unit_vector
+        if self.centroids is not None:
+            self.assign[row] = int((self.centroids @ unit_vector).argmax())
+
+    def remove(self, doc_id: str) -> bool:
+        row = self.rows.pop(doc_id, None)
+        if row is None:
+            return False
+        self._ensure_writable()
+        last = self.size - 1
+        if row != last:
+            moved = self.ids[last]
+            self.matrix[row] = self.matrix[last]
+            self.assign[row] = self.assign[last]
+            self.ids[row] = moved
+            self.metadata[row] = self.metadata[last]
+            for codes in self.columns.values():
+                codes[row] = codes[last]
+            self.rows[moved] = row
+        self.ids.pop()
+        self.metadata.pop()
+        self.size = last
+        return True
+
+    def _code(self, key: str, value: Any) -> int:
+        vocab = self.vocab[key]
+        return vocab.setdefault(_hashable(value), len(vocab))
+
+    def _column(self, key: str) -> Any:
+        """Value codes of ``key`` for every row; built on first use, then maintained."""
+        import numpy as np
+
+        codes = self.columns.get(key)
+        if codes is None:
+            self.vocab[key] = {}
+            codes = np.empty(self.matrix.shape[0], dtype=np.int32)
+            for row in range(self.size):
+                codes[row] = self._code(key, self.metadata[row].get(key))
+            self.columns[key] = codes
+        return codes
+
+    def filter_rows(self, filters: dict[str, Any], rows: Any) -> Any:
+        """The subset of ``rows`` (all rows when None) whose metadata equals every filter."""
+        import numpy as np
+
+        mask = np.ones(self.size, dtype=bool)
+        for key, value in filters.items():
+            codes = self._column(key)
+            code = self.vocab[key].get(_hashable(value))
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            mask &= codes[: self.size] == code
+        return np.flatnonzero(mask) if rows is None else rows[mask[rows]]
+
+    def build_ivf(self, nlist: int, iterations: int = 8, seed: int = 0) -> None:
+        """Spherical k-means over the live rows; assigns every row to a list."""
+        import numpy as np
+
+        live = self.matrix[: self.size]
+        nlist = max(1, min(nlist, self.size))
+        rng = np.random.default_rng(seed)
+        centroids = live[rng.choice(self.size, size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = (live @ centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, live)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty lists keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+        self.centroids = centroids.astype(np.float32)
+        self.assign[: self.size] = (live @ self.centroids.T).argmax(axis=1)
+        self.indexed_size = self.size
+
+
+class NumpyVectorStore:
+    """NumPy-backed local store for dev and air-gapped deployments.
+
+    Each namespace holds one contiguous float32 matrix of unit vectors, so a
+    query is a single matrix-vector product plus an ``argpartition`` top-k.
+    Namespaces with at least ``ivf_min_vectors`` rows are served from an
+    IVF index that probes the ``nprobe`` closest lists (higher = better recall,
+    slower); smaller namespaces are always searched exactly.
+    """
+
+    def __init__(
+        self,
+        *,
+        ivf_min_vectors: int | None = None,
+        nlist: int | None = None,
+        nprobe: int | None = None,
+    ) -> None:
+        self._namespaces: dict[str, _NamespaceMatrix] = {}
+        self._ivf_min_vectors = (
+            settings.VECTOR_STORE_IVF_MIN_VECTORS if ivf_min_vectors is None else ivf_min_vectors
+        )
+        self._nlist = settings.VECTOR_STORE_IVF_NLIST if nlist is None else nlist
+        self._nprobe = settings.VECTOR_STORE_IVF_NPROBE if nprobe is None else nprobe
+
+    @staticmethod
+    def _normalise(vector: Any) -> Any:
+        import numpy as np
+
+        arr = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(arr))
+        return arr / norm if norm > 0 else arr
+
+    def upsert(self, namespace: str, doc_id: str, vector: list[float], metadata: dict[str, Any]) -> None:
+        unit = self._normalise(vector)
+        ns = self._namespaces.get(namespace)
+        if ns is None:
+            ns = self._namespaces[namespace] = _NamespaceMatrix(unit.shape[0])
+        if unit.shape[0] != ns.dim:
+            raise ValueError(f"Vector dim {unit.shape[0]} does not match namespace dim {ns.dim}")
+        ns.put(doc_id, unit, metadata)
+
+    def upsert_many(self, namespace: str, items: list[tuple[str, list[float], dict[str, Any]]]) -> None:
+        """Upsert a batch of (doc_id, vector, metadata), normalising the batch in one pass."""
+        import numpy as np
+
+        if not items:
+            return
+        batch = np.asarray([vector for _, vector, _ in items], dtype=np.float32)
+        norms = np.linalg.norm(batch, axis=1, keepdims=True)
+        batch = np.divide(batch, norms, out=batch, where=norms > 0)
+        ns = self._namespaces.get(namespace)
+        if ns is None:
+            ns = self._namespaces[namespace] = _NamespaceMatrix(batch.shape[1])
+        if batch.shape[1] != ns.dim:
+            raise ValueError(f"Vector dim {batch.shape[1]} does not match namespace dim {ns.dim}")
+        for (doc_id, _, metadata), unit in zip(items, batch, strict=True):
+            ns.put(doc_id, unit, metadata)
+
+    def _ivf_candidates(self, ns: _NamespaceMatrix, q: Any, nprobe: int) -> Any:
+        """Row indices in the ``nprobe`` lists nearest to ``q`` (None = exact search)."""
+        import numpy as np
+
+        if ns.size < self._ivf_min_vectors:
+            return None
+        # (Re)build when first needed or once the namespace has doubled since the last build
+        if ns.centroids is None or ns.size > 2 * ns.indexed_size:
+            nlist = self._nlist or int(np.sqrt(ns.size))
+            ns.build_ivf(nlist)
+            logger.info("vector_store_ivf_built", vectors=ns.size, nlist=len(ns.centroids))
+        nprobe = max(1, min(nprobe, len(ns.centroids)))
+        probe = np.argpartition(-(ns.centroids @ q), nprobe - 1)[:nprobe]
+        return np.flatnonzero(np.isin(ns.assign[: ns.size], probe))
+
+    def query(
+        self,
+        namespace: str,
+        query_vector: list[float],
+        top_k: int = 5,
+        filters: dict | None = None,
+        *,
+        nprobe: int | None = None,
+    ) -> list[VectorMatch]:
+        """Return top_k matches by cosine similarity within namespace.
+
+        ``nprobe`` overrides the configured IVF probe count for this query.
+        """
+        import numpy as np
+
+        ns = self._namespaces.get(namespace)
+        if ns is None or ns.size == 0 or top_k <= 0:
+            return []
+        q = self._normalise(query_vector)
+        if q.shape[0] != ns.dim:
+            raise ValueError(f"Query dim {q.shape[0]} does not match namespace dim {ns.dim}")
+
+        rows = self._ivf_candidates(ns, q, nprobe or self._nprobe)
+        if filters:
+            rows = ns.filter_rows(filters, rows)
+        if rows is not None and rows.size == 0:
+            return []
+
+        scores = ns.matrix[: ns.size] @ q if rows is None else ns.matrix[rows] @ q
+        k = min(top_k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        hits = top if rows is None else rows[top]
+        return [
+            VectorMatch(id=ns.ids[r], score=float(scores[t]), metadata=ns.metadata[r])
+            for r, t in zip(hits, top, strict=True)
+        ]
+
+    def delete(self, namespace: str, doc_id: str) -> None:
+        ns = self._namespaces.get(namespace)
+        if ns is not None:
+            ns.remove(doc_id)
+
+    async def delete_namespace(self, namespace: str) -> None:
+        """Delete all vectors in a namespace."""
+        ns = self._namespaces.pop(namespace, None)
+        logger.info(
+            "namespace_deleted", namespace=namespace, vectors_removed=ns.size if ns else 0
+        )
+
+    # ── Snapshot / restore ────────────────────────────────────────────────────
+    #
+    # Layout: each snapshot is a self-contained ``snapshot-<ns>`` directory and
+    # ``CURRENT`` names the live one. A snapshot is written and fsynced under a
+    # temporary name, renamed into place, and only then does ``CURRENT`` move
+    # (tmp file + atomic rename). Restored matrices are memory-mapped from the
+    # live snapshot, so it is never written to or removed while mapped.
+
+    def snapshot(self, directory: str | os.PathLike[str]) -> int:
+        """Write every namespace to a new snapshot under ``directory`` and make it current.
+
+        Returns the number of vectors written. A crash at any point leaves the
+        previous snapshot current and readable.
+        """
+        import numpy as np
+
+        root = Path(directory)
+        root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".tmp-snapshot-", dir=root))
+        manifest: list[dict[str, Any]] = []
+        total = 0
+        for i, (name, ns) in enumerate(self._namespaces.items()):
+            stem = f"ns_{i:05d}"
+            with open(staging / f"{stem}.npy", "wb") as fh:
+                np.save(fh, np.ascontiguousarray(ns.matrix[: ns.size]))
+                fh.flush()
+                os.fsync(fh.fileno())
+            _write_durably(staging / f"{stem}.json", json.dumps({"ids": ns.ids, "metadata": ns.metadata}))
+            manifest.append({"namespace": name, "file": stem, "dim": ns.dim, "size": ns.size})
+            total += ns.size
+        _write_durably(staging / "manifest.json", json.dumps(manifest))
+        _fsync_dir(staging)
+
+        current = root / f"snapshot-{time.time_ns()}"
+        staging.rename(current)
+        _fsync_dir(root)
+        _write_durably(root / "CURRENT.tmp", current.name)
+        (root / "CURRENT.tmp").replace(root / "CURRENT")
+        _fsync_dir(root)
+
+        # Move mapped matrices onto the new snapshot before the old one is removed
+        for entry in manifest:
+            ns = self._namespaces[entry["namespace"]]
+            if isinstance(ns.matrix, np.memmap):
+                ns.matrix = np.load(current / f"{entry['file']}.npy", mmap_mode="r")
+        self._prune_snapshots(root, keep=current.name)
+        logger.info("vector_store_snapshot_written", path=str(current), vectors=total)
+        return total
+
+    @staticmethod
+    def _prune_snapshots(root: Path, keep: str) -> None:
+        """Remove superseded snapshots, abandoned staging dirs and the legacy flat layout."""
+        for child in root.iterdir():
+            if child.is_dir() and child.name != keep and child.name.startswith(
+                ("snapshot-", ".tmp-snapshot-")
+            ):
+                shutil.rmtree(child, ignore_errors=True)
+            elif child.is_file() and (child.name.startswith("ns_") or child.name == "manifest.json"):
+                child.unlink(missing_ok=True)
+
+    def restore(self, directory: str | os.PathLike[str]) -> int:
+        """Load the current snapshot written by :meth:`snapshot`; matrices are memory-mapped.
+
+        Returns the number of vectors restored (0 when no snapshot exists).
+        Snapshots in the older flat layout (``manifest.json`` directly in
+        ``directory``) are still read.
+        """
+        import numpy as np
+
+        root = Path(directory)
+        pointer = root / "CURRENT"
+        snap = root / pointer.read_text().strip() if pointer.exists() else root
+        manifest_path = snap / "manifest.json"
+        if not manifest_path.exists():
+            return 0
+        total = 0
+        for entry in json.loads(manifest_path.read_text()):
+            sidecar = json.loads((snap / f"{entry['file']}.json").read_text())
+            ns = _NamespaceMatrix(entry["dim"])
+            ns.matrix = np.load(snap / f"{entry['file']}.npy", mmap_mode="r")
+            ns.size = entry["size"]
+            ns.ids = sidecar["ids"]
+            ns.metadata = sidecar["metadata"]
+            ns.rows = {doc_id: row for row, doc_id in enumerate(ns.ids)}
+            ns.assign = np.zeros(max(ns.size, 16), dtype=np.int32)
+            self._namespaces[entry["namespace"]] = ns
+            total += ns.size
+        logger.info("vector_store_snapshot_restored", path=str(snap), vectors=total)
+        return total
+
+
+def _hashable(value: Any) -> Any:
+    """Filter-column key for a metadata value; unhashable values compare by JSON."""
+    try:
+        hash(value)
+    except TypeError:
+        return ("json", json.dumps(value, sort_keys=True, default=str))
+    return value
+
+
+def _write_durably(path: Path, text: str) -> None:
+    with open(path, "w") as fh:
+        fh.write(text)
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
 class PineconeVectorStore:
     """Pinecone-backed vector store for production."""
 
@@ -81,6 +466,12 @@ class PineconeVectorStore:
     def upsert(self, namespace: str, doc_id: str, vector: list[float], metadata: dict[str, Any]) -> None:
         self._index.upsert(vectors=[{"id": doc_id, "values": vector, "metadata": metadata}], namespace=namespace)
 
+    def upsert_many(self, namespace: str, items: list[tuple[str, list[float], dict[str, Any]]]) -> None:
+        self._index.upsert(
+            vectors=[{"id": doc_id, "values": vector, "metadata": metadata} for doc_id, vector, metadata in items],
+            namespace=namespace,
+        )
+
     def query(
         self, namespace: str, query_vector: list[float], top_k: int = 5, filters: dict | None = None
     ) -> list[VectorMatch]:
@@ -102,21 +493,38 @@ class PineconeVectorStore:
         logger.info("pinecone_namespace_deleted", namespace=namespace)
 
 
-def get_vector_store() -> InMemoryVectorStore | PineconeVectorStore:
-    """Factory: returns Pinecone in production, in-memory in dev."""
+VectorStore = InMemoryVectorStore | NumpyVectorStore | PineconeVectorStore
+
+
+def get_vector_store() -> VectorStore:
+    """Factory: returns Pinecone in production, NumPy-backed in-memory store in dev.
+
+    Falls back to the pure-Python store when NumPy is not installed.
+    """
     if settings.VECTOR_STORE_BACKEND == "pinecone" and settings.PINECONE_API_KEY:
         try:
             return PineconeVectorStore()
         except Exception:
             logger.warning("pinecone_unavailable_using_memory")
-    return InMemoryVectorStore()
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        logger.warning("numpy_unavailable_using_python_store")
+        return InMemoryVectorStore()
+    store = NumpyVectorStore()
+    if settings.VECTOR_STORE_SNAPSHOT_DIR:
+        try:
+            store.restore(settings.VECTOR_STORE_SNAPSHOT_DIR)
+        except Exception as e:
+            logger.warning("vector_store_restore_failed", error=str(e))
+    return store
 
 
 # Singleton
-_vector_store: InMemoryVectorStore | PineconeVectorStore | None = None
+_vector_store: VectorStore | None = None
 
 
-def vector_store() -> InMemoryVectorStore | PineconeVectorStore:
+def vector_store() -> VectorStore:
     global _vector_store
     if _vector_store is None:
         _vector_store = get_vector_store()
@@ -9,6 +9,12 @@ Usage:
         {"filename": "report.pdf", "document_preview": "..."},
         {"filename": "contract.pdf", "document_preview": "..."},
     ])
+
+Single requests arriving concurrently from different callers are coalesced by
+MicroBatcher, which holds each batchable task type open per org for a short
+window:
+
+    result = await micro_batcher.submit("classify_document", {"filename": ...}, org_id=org)
 """
 
 from __future__ import annotations
@@ -16,6 +22,8 @@ from __future__ import annotations
 import asyncio
 import json
 import re
+import time
+from dataclasses import dataclass, field
 from typing import Any
 
 import structlog
@@ -33,6 +41,7 @@ BATCHABLE_TASKS: frozenset[str] = frozenset({
 })
 
 MAX_BATCH_SIZE = 8  # Quality degrades beyond this
+BATCH_WINDOW_MS = 30  # How long MicroBatcher waits for same-type requests to coalesce
 
 
 class _CompletionResult:
@@ -267,3 +276,132 @@ class TaskBatcher:
                 results.append({"error": str(exc)})
 
         return results
+
+
+# ── Cross-request micro-batching ─────────────────────────────────────────────
+
+
+@dataclass
+class _Pending:
+    context: dict[str, Any]
+    future: asyncio.Future[dict[str, Any]]
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher:
+    """Coalesces single batchable requests from concurrent callers into one LLM call.
+
+    Requests of the same task type and org are queued until either ``window_ms``
+    elapses since the first one arrived or ``max_batch_size`` are waiting, then flushed
+    through ``TaskBatcher._process_batch`` and fanned back to each caller. A
+    failed batch falls back to individual calls; a batch that parses but has
+    unusable entries retries only those items. Orgs never share a batch, so
+    one tenant's documents never appear in another tenant's prompt.
+    """
+
+    def __init__(
+        self,
+        batcher: TaskBatcher,
+        *,
+        window_ms: float = BATCH_WINDOW_MS,
+        max_batch_size: int = MAX_BATCH_SIZE,
+    ) -> None:
+        self.batcher = batcher
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        # Keyed by (task_type, org_id)
+        self._pending: dict[tuple[str, str], list[_Pending]] = {}
+        self._timers: dict[tuple[str, str], asyncio.Task[None]] = {}
+        self._inflight: set[asyncio.Task[None]] = set()
+        # Metrics
+        self.batches = 0
+        self.items = 0
+        self.fallback_items = 0
+        self._queue_ms_total = 0.0
+        self.max_queue_ms = 0.0
+
+    async def submit(
+        self, task_type: str, context: dict[str, Any], org_id: str = ""
+    ) -> dict[str, Any]:
+        """Queue one task and wait for its result; only batched with the same org's tasks."""
+        if task_type not in BATCHABLE_TASKS:
+            return (await self.batcher._process_individually(task_type, [context]))[0]
+
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        key = (task_type, org_id)
+        queue = self._pending.setdefault(key, [])
+        queue.append(_Pending(context, future))
+
+        if len(queue) >= self.max_batch_size:
+            self._flush_now(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.create_task(self._flush_after_window(key))
+        return await future
+
+    async def _flush_after_window(self, key: tuple[str, str]) -> None:
+        await asyncio.sleep(self.window)
+        self._timers.pop(key, None)
+        self._flush_now(key)
+
+    def _flush_now(self, key: tuple[str, str]) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        items = self._pending.pop(key, [])
+        if not items:
+            return
+        task = asyncio.create_task(self._run(key[0], items))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run(self, task_type: str, items: list[_Pending]) -> None:
+        started = time.perf_counter()
+        queue_ms = [(started - item.enqueued_at) * 1000 for item in items]
+        self.batches += 1
+        self.items += len(items)
+        self._queue_ms_total += sum(queue_ms)
+        self.max_queue_ms = max(self.max_queue_ms, *queue_ms)
+
+        contexts = [item.context for item in items]
+        try:
+            if len(items) == 1:
+                results = await self.batcher._process_individually(task_type, contexts)
+            else:
+                results = await self.batcher._process_batch(task_type, contexts, self.batches)
+                retry = [i for i, r in enumerate(results) if not isinstance(r, dict) or "error" in r]
+                if retry:
+                    self.fallback_items += len(retry)
+                    redo = await self.batcher._process_individually(
+                        task_type, [contexts[i] for i in retry]
+                    )
+                    for i, result in zip(retry, redo, strict=True):
+                        results[i] = result
+        except Exception as exc:
+            logger.warning(
+                "micro_batch_failed_falling_back", task_type=task_type, size=len(items), error=str(exc)
+            )
+            self.fallback_items += len(items)
+            results = await self.batcher._process_individually(task_type, contexts)
+
+        for item, result in zip(items, results, strict=True):
+            if not item.future.done():
+                item.future.set_result(result)
+
+        logger.info(
+            "micro_batch_flushed",
+            task_type=task_type,
+            size=len(items),
+            fill_ratio=round(len(items) / self.max_batch_size, 2),
+            max_queue_ms=round(max(queue_ms), 1),
+            llm_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_fill_ratio": round(self.items / (self.batches * self.max_batch_size), 3) if self.batches else 0.0,
+            "avg_queue_ms": round(self._queue_ms_total / self.items, 1) if self.items else 0.0,
+            "max_queue_ms": round(self.max_queue_ms, 1),
+            "fallback_items": self.fallback_items,
+        }
@@ -1,8 +1,15 @@
 """Tests for the TaskBatcher."""
-
-
-
-from app.task_batcher import BATCHABLE_TASKS, MAX_BATCH_SIZE, TaskBatcher
+import asyncio
+import json
+import re
+
+from app.task_batcher import (
+    BATCHABLE_TASKS,
+    MAX_BATCH_SIZE,
+    MicroBatcher,
+    TaskBatcher,
+    _CompletionResult,
+)
 
 # ── Eligibility tests ─────────────────────────────────────────────────────────
 
@@ -107,3 +114,86 @@ class TestBatchSplitting:
             batcher.batch_complete("score_quality", contexts)
         )
         assert len(called_individually) == 2
+
+
+# ── Cross-request micro-batching ──────────────────────────────────────────────
+
+
+class _FakeLLM:
+    """Answers batched prompts with one JSON object per TASK, echoing the context id."""
+
+    def __init__(self, broken_ids: set[int] | None = None, fail: bool = False) -> None:
+        self.calls: list[str] = []
+        self.broken_ids = broken_ids or set()
+        self.fail = fail
+
+    async def complete(self, model, messages, temperature=0.1, max_tokens=4096, task_type=None):
+        prompt = messages[-1]["content"]
+        self.calls.append(prompt)
+        if self.fail and "TASK" in prompt:
+            raise RuntimeError("provider error")
+        ids = [int(m) for m in re.findall(r'"id": (\d+)', prompt)]
+        if "TASK" not in prompt:
+            return _CompletionResult(json.dumps({"id": ids[0]}))
+        items = [{"error": "truncated"} if i in self.broken_ids else {"id": i} for i in ids]
+        return _CompletionResult(json.dumps(items))
+
+
+class TestMicroBatcher:
+    async def test_concurrent_requests_share_one_call(self):
+        llm = _FakeLLM()
+        micro = MicroBatcher(TaskBatcher(llm), window_ms=20, max_batch_size=8)
+        results = await asyncio.gather(
+            *(micro.submit("classify_document", {"id": i}) for i in range(5))
+        )
+        assert results == [{"id": i} for i in range(5)]
+        assert len(llm.calls) == 1
+        stats = micro.stats()
+        assert stats["batches"] == 1
+        assert stats["avg_fill_ratio"] == 5 / 8
+        assert stats["max_queue_ms"] >= 15
+
+    async def test_full_batch_flushes_without_waiting(self):
+        llm = _FakeLLM()
+        micro = MicroBatcher(TaskBatcher(llm), window_ms=10_000, max_batch_size=3)
+        results = await asyncio.wait_for(
+            asyncio.gather(*(micro.submit("extract_kpis", {"id": i}) for i in range(3))),
+            timeout=1,
+        )
+        assert [r["id"] for r in results] == [0, 1, 2]
+        assert len(llm.calls) == 1
+
+    async def test_unusable_items_retried_individually(self):
+        llm = _FakeLLM(broken_ids={1})
+        micro = MicroBatcher(TaskBatcher(llm), window_ms=10)
+        results = await asyncio.gather(
+            *(micro.submit("classify_document", {"id": i}) for i in range(3))
+        )
+        assert results == [{"id": 0}, {"id": 1}, {"id": 2}]
+        assert len(llm.calls) == 2  # one batch + one retry for item 1
+        assert micro.stats()["fallback_items"] == 1
+
+    async def test_failed_batch_falls_back_per_item(self):
+        micro = MicroBatcher(TaskBatcher(_FakeLLM(fail=True)), window_ms=10)
+        results = await asyncio.gather(
+            *(micro.submit("classify_document", {"id": i}) for i in range(2))
+        )
+        assert results == [{"id": 0}, {"id": 1}]
+        assert micro.stats()["fallback_items"] == 2
+
+    async def test_non_batchable_task_bypasses_queue(self):
+        llm = _FakeLLM()
+        micro = MicroBatcher(TaskBatcher(llm), window_ms=10_000)
+        assert await micro.submit("score_quality", {"id": 7}) == {"id": 7}
+        assert micro.stats()["batches"] == 0
+
+    async def test_orgs_never_share_a_batch(self):
+        llm = _FakeLLM()
+        micro = MicroBatcher(TaskBatcher(llm), window_ms=20, max_batch_size=8)
+        results = await asyncio.gather(
+            *(micro.submit("classify_document", {"id": i}, org_id=f"org-{i % 2}") for i in range(6))
+        )
+        assert results == [{"id": i} for i in range(6)]
+        assert len(llm.calls) == 2
+        batches = sorted(sorted(int(m) for m in re.findall(r'"id": (\d+)', c)) for c in llm.calls)
+        assert batches == [[0, 2, 4], [1, 3, 5]]
@@ -0,0 +1,138 @@
+"""Tests for the deterministic-task completion cache."""
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.main import app
+from app.routers import completions
+from app.services import completion_cache as cc
+from app.services import token_tracker
+from app.services.completion_cache import cache_key, is_cacheable
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttls[key] = ex
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    cache = cc.CompletionCache()
+    cache._redis = redis
+    monkeypatch.setattr(cc, "_completion_cache", cache)
+    monkeypatch.setattr(token_tracker, "_cache_stats", {})
+    return redis
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    calls = []
+
+    async def fake_route_completion(**kwargs):
+        calls.append(kwargs)
+        return {
+            "content": '{"classification": "financial_statement"}',
+            "model_used": kwargs["model"],
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 50, "total_tokens": 1050},
+            "stop_reason": "end_turn",
+        }
+
+    monkeypatch.setattr(completions, "route_completion", fake_route_completion)
+    return calls
+
+
+async def _post(body, headers=None):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post(
+            "/v1/completions",
+            json=body,
+            headers={"Authorization": f"Bearer {settings.AI_GATEWAY_API_KEY}", **(headers or {})},
+        )
+
+
+def _body(**overrides):
+    return {"prompt": "Classify this document.", "task_type": "classify_document", "temperature": 0.0, **overrides}
+
+
+class TestCacheKey:
+    def _key(self, **overrides):
+        kwargs = {
+            "org_id": "org-1",
+            "model": "m",
+            "messages": [{"role": "user", "content": "hi"}],
+            "task_type": "classify_document",
+            "temperature": 0.0,
+            "max_tokens": 512,
+        }
+        return cache_key(**{**kwargs, **overrides})
+
+    def test_whitespace_and_none_fields_normalised(self):
+        assert self._key() == self._key(messages=[{"role": "user", "content": " hi\n", "name": None}])
+
+    def test_org_scoped(self):
+        assert self._key() != self._key(org_id="org-2")
+        assert self._key().startswith("completion:org-1:classify_document:")
+
+    def test_payload_sensitive(self):
+        assert self._key() != self._key(temperature=0.1)
+        assert self._key() != self._key(tools=[{"name": "t"}])
+
+    def test_only_deterministic_tasks_cached(self):
+        assert is_cacheable("classify_document", 0.0)
+        assert not is_cacheable("classify_document", 0.7)
+        assert not is_cacheable("generate_memo", 0.0)
+
+
+class TestCompletionEndpoint:
+    async def test_second_identical_request_is_served_from_cache(self, fake_redis, provider):
+        first = await _post(_body(org_id="org-1"))
+        second = await _post(_body(org_id="org-1"))
+
+        assert len(provider) == 1
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.headers["X-Tokens-Used"] == "0"
+        assert second.json()["usage"]["total_tokens"] == 0
+        assert second.json()["usage"]["saved_tokens"] == 1050
+        assert second.json()["content"] == first.json()["content"]
+        assert second.json()["estimated_cost_usd"] == 0.0
+        assert list(fake_redis.ttls.values()) == [cc.CACHEABLE_TASK_TTLS["classify_document"]]
+
+        report = token_tracker.completion_cache_report()["classify_document"]
+        assert report["hits"] == 1
+        assert report["misses"] == 1
+        assert report["saved_tokens"] == 1050
+
+    async def test_other_org_does_not_share_entries(self, fake_redis, provider):
+        await _post(_body(org_id="org-1"))
+        await _post(_body(org_id="org-2"))
+        assert len(provider) == 2
+
+    async def test_bypass_header_skips_lookup_but_refreshes(self, fake_redis, provider):
+        await _post(_body())
+        bypass = await _post(_body(), headers={"X-Cache-Bypass": "1"})
+        assert bypass.headers["X-Cache"] == "BYPASS"
+        assert len(provider) == 2
+
+    async def test_falsy_bypass_header_still_uses_cache(self, fake_redis, provider):
+        await _post(_body())
+        for value in ("0", "false", ""):
+            resp = await _post(_body(), headers={"X-Cache-Bypass": value})
+            assert resp.headers["X-Cache"] == "HIT"
+        assert len(provider) == 1
+
+    async def test_high_temperature_is_always_live(self, fake_redis, provider):
+        await _post(_body(temperature=0.9))
+        resp = await _post(_body(temperature=0.9))
+        assert "X-Cache" not in resp.headers
+        assert len(provider) == 2
+        assert fake_redis.data == {}
@@ -0,0 +1,125 @@
+"""Tests for the content-addressed embedding cache."""
+import pytest
+
+from app.services.embedding_cache import EmbeddingCache, cache_key
+
+
+class FakeRedis:
+    """Minimal async Redis: MGET plus a non-transactional SET pipeline."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.mget_calls = 0
+
+    async def mget(self, keys):
+        self.mget_calls += 1
+        return [self.data.get(k) for k in keys]
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class _Pipe:
+            def __init__(self):
+                self.ops = []
+
+            def set(self, key, value, ex=None):
+                self.ops.append((key, value))
+
+            async def execute(self):
+                redis.data.update(self.ops)
+
+        return _Pipe()
+
+
+class Provider:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    async def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts], sum(len(t) for t in texts)
+
+
+def _cache(redis=None, local_size=100) -> EmbeddingCache:
+    cache = EmbeddingCache(local_size=local_size)
+    cache._redis = redis
+    return cache
+
+
+class TestEmbeddingCache:
+    def test_key_is_model_scoped(self):
+        assert cache_key("a", "text") != cache_key("b", "text")
+        assert cache_key("a", "text") == cache_key("a", "text")
+
+    async def test_mixed_batch_sends_only_misses(self):
+        cache, provider = _cache(), Provider()
+        await cache.embed("m", ["alpha", "beta"], provider)
+        vectors, tokens, hits = await cache.embed("m", ["beta", "gamma", "alpha", "gamma"], provider)
+
+        assert provider.calls == [["alpha", "beta"], ["gamma"]]
+        assert vectors == [[4.0, 1.0], [5.0, 1.0], [5.0, 1.0], [5.0, 1.0]]
+        assert tokens == 5
+        assert hits == 2
+        stats = cache.stats()
+        assert stats["local_hits"] == 2
+        assert stats["misses"] == 3
+        assert stats["hit_rate"] == pytest.approx(0.4)
+        assert stats["saved_tokens"] > 0
+
+    async def test_redis_tier_shared_across_processes(self):
+        redis, provider = FakeRedis(), Provider()
+        await _cache(redis).embed("m", ["disclaimer"], provider)
+
+        other = _cache(redis)
+        vectors, tokens, hits = await other.embed("m", ["disclaimer"], provider)
+        assert len(provider.calls) == 1
+        assert vectors == [[10.0, 1.0]]
+        assert (tokens, hits) == (0, 1)
+        assert other.stats()["redis_hits"] == 1
+
+        # Promoted to the local tier — no second Redis round trip
+        await other.embed("m", ["disclaimer"], provider)
+        assert redis.mget_calls == 2
+        assert other.stats()["local_hits"] == 1
+
+    async def test_local_tier_evicts_least_recently_used(self):
+        cache, provider = _cache(local_size=2), Provider()
+        await cache.embed("m", ["a", "b"], provider)
+        await cache.embed("m", ["a"], provider)  # refresh "a"
+        await cache.embed("m", ["c"], provider)  # evicts "b"
+        await cache.embed("m", ["a", "b"], provider)
+        assert provider.calls[-1] == ["b"]
+
+    async def test_provider_failure_caches_nothing(self):
+        cache = _cache()
+
+        async def failing(texts):
+            raise RuntimeError("provider down")
+
+        with pytest.raises(RuntimeError):
+            await cache.embed("m", ["x"], failing)
+        assert await cache.get_many("m", ["x"]) == [None]
+
+    async def test_fallback_replaces_only_provider_misses(self):
+        cache, provider = _cache(), Provider()
+        await cache.embed("m", ["cached"], provider)
+
+        async def failing(texts):
+            raise RuntimeError("provider down")
+
+        vectors, tokens, hits = await cache.embed(
+            "m", ["cached", "new"], failing, fallback=lambda texts: [[0.0, 0.0] for _ in texts]
+        )
+        assert vectors == [[6.0, 1.0], [0.0, 0.0]]
+        assert (tokens, hits) == (0, 1)
+        assert await cache.get_many("m", ["new"]) == [None]  # fallback vectors are not cached
+
+    async def test_redis_errors_fail_open(self):
+        class BrokenRedis(FakeRedis):
+            async def mget(self, keys):
+                raise ConnectionError("down")
+
+        cache, provider = _cache(BrokenRedis()), Provider()
+        vectors, _, hits = await cache.embed("m", ["x"], provider)
+        assert vectors == [[1.0, 1.0]]
+        assert hits == 0
@@ -1,4 +1,8 @@
 """Tests for the production RAG pipeline."""
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from app.core.config import settings
 from app.rag import CHUNK_CONFIGS, RAGPipeline
 
 
@@ -99,3 +103,68 @@ class TestChunkConfigs:
         assert len(chunks) >= 1
         for chunk in chunks:
             assert len(chunk.strip()) > 0
+
+
+class TestBatchedIngestion:
+    """Ingestion embeds in bounded batches and indexes ES through _bulk."""
+
+    def _pipeline(self):
+        embedder = MagicMock()
+        embedder.embed_batch = AsyncMock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+        es = MagicMock()
+        es.bulk = AsyncMock(return_value={"errors": False, "items": []})
+        es.index = AsyncMock()
+        vectors = MagicMock()
+        vectors.upsert = AsyncMock()
+        pipeline = RAGPipeline(vectors, es, MagicMock(), embedder)
+        pipeline._summarize_chunks = AsyncMock()
+        pipeline._ensure_es_index = AsyncMock()
+        return pipeline
+
+    async def test_embeds_and_indexes_in_batches(self, monkeypatch):
+        monkeypatch.setattr(settings, "RAG_EMBED_BATCH_SIZE", 3)
+        monkeypatch.setattr(settings, "RAG_UPSERT_BATCH_SIZE", 4)
+        pipeline = self._pipeline()
+        text = "\n\n".join(f"Paragraph {i} " + "word " * (40 + i) for i in range(10))
+
+        result = await pipeline.ingest_document(
+            uuid4(), text, {"org_id": uuid4(), "document_type": "default"}
+        )
+
+        n = result["chunks_created"]
+        assert n > 3
+        assert pipeline.embedder.embed_batch.await_count == -(-n // 3)
+        assert pipeline.vectors.upsert.await_count == -(-n // 4)
+        pipeline.es.bulk.assert_awaited_once()
+        pipeline.es.index.assert_not_awaited()
+        assert set(result["timings_ms"]) == {"chunk", "summarize", "embed", "vector_upsert", "es_index"}
+
+        # Embeddings stay aligned with their chunks despite concurrent batches
+        upserted = [v for call in pipeline.vectors.upsert.await_args_list for v in call.kwargs["vectors"]]
+        assert [v["metadata"]["chunk_index"] for v in upserted] == list(range(n))
+        ops = pipeline.es.bulk.await_args.kwargs["operations"]
+        assert len(ops) == 2 * n
+
+    async def test_empty_text_skips_indexing(self):
+        pipeline = self._pipeline()
+        result = await pipeline.ingest_document(uuid4(), "", {"org_id": uuid4()})
+        assert result["chunks_created"] == 0
+        pipeline.es.bulk.assert_not_awaited()
+
+
+class TestChunkPages:
+    """Ingest page offsets map onto the chunks the service pipeline produces."""
+
+    def test_chunks_carry_first_and_last_page(self):
+        from app.services.rag import _chunk_pages, _chunk_text
+
+        page_one = " ".join(f"a{i}" for i in range(6))
+        page_two = " ".join(f"b{i}" for i in range(6))
+        text = f"{page_one}\n{page_two}"
+        pages = [(1, 0), (2, len(page_one) + 1)]
+
+        chunks = _chunk_text(text, chunk_size=4, overlap=1)
+        spans = _chunk_pages(text, pages, chunk_size=4, overlap=1)
+
+        assert len(spans) == len(chunks)
+        assert spans == [(1, 1), (1, 2), (2, 2), (2, 2)]
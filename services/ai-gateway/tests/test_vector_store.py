@@ -0,0 +1,184 @@
+"""Tests for the NumPy-backed local vector store."""
+import numpy as np
+import pytest
+
+from app.services.vector_store import InMemoryVectorStore, NumpyVectorStore
+
+
+def _random_vectors(n: int, dim: int = 32, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+class TestExactSearch:
+    def test_matches_pure_python_store(self):
+        vectors = _random_vectors(200)
+        fast, slow = NumpyVectorStore(), InMemoryVectorStore()
+        for i, v in enumerate(vectors):
+            meta = {"document_id": f"d{i % 7}"}
+            fast.upsert("ns", f"c{i}", v.tolist(), meta)
+            slow.upsert("ns", f"c{i}", v.tolist(), meta)
+
+        query = _random_vectors(1, seed=1)[0].tolist()
+        for filters in (None, {"document_id": "d3"}):
+            got = fast.query("ns", query, top_k=10, filters=filters)
+            want = slow.query("ns", query, top_k=10, filters=filters)
+            assert [m.id for m in got] == [m.id for m in want]
+            assert [m.score for m in got] == pytest.approx([m.score for m in want], abs=1e-5)
+
+    def test_namespaces_are_isolated(self):
+        store = NumpyVectorStore()
+        store.upsert("a", "x", [1.0, 0.0], {})
+        store.upsert("b", "y", [1.0, 0.0], {})
+        assert [m.id for m in store.query("a", [1.0, 0.0])] == ["x"]
+        assert store.query("missing", [1.0, 0.0]) == []
+
+    def test_upsert_replaces_and_delete_keeps_rows_contiguous(self):
+        store = NumpyVectorStore()
+        store.upsert("ns", "a", [1.0, 0.0], {"v": 1})
+        store.upsert("ns", "b", [0.0, 1.0], {"v": 2})
+        store.upsert("ns", "c", [0.7, 0.7], {"v": 3})
+        store.upsert("ns", "a", [0.0, -1.0], {"v": 4})
+        store.delete("ns", "b")
+
+        matches = store.query("ns", [0.0, -1.0], top_k=5)
+        assert [m.id for m in matches] == ["a", "c"]
+        assert matches[0].metadata == {"v": 4}
+        assert matches[0].score == pytest.approx(1.0)
+
+    def test_dimension_mismatch_rejected(self):
+        store = NumpyVectorStore()
+        store.upsert("ns", "a", [1.0, 0.0], {})
+        with pytest.raises(ValueError):
+            store.upsert("ns", "b", [1.0, 0.0, 0.0], {})
+
+    async def test_delete_namespace(self):
+        store = NumpyVectorStore()
+        store.upsert("ns", "a", [1.0, 0.0], {})
+        await store.delete_namespace("ns")
+        assert store.query("ns", [1.0, 0.0]) == []
+
+
+class TestFilters:
+    def test_filter_columns_track_upserts_and_deletes(self):
+        fast, slow = NumpyVectorStore(), InMemoryVectorStore()
+        vectors = _random_vectors(120)
+
+        def upsert(i: int, meta: dict) -> None:
+            fast.upsert("ns", f"c{i}", vectors[i].tolist(), meta)
+            slow.upsert("ns", f"c{i}", vectors[i].tolist(), meta)
+
+        for i in range(60):
+            upsert(i, {"org_id": f"o{i % 3}", "document_id": f"d{i % 5}"})
+        query = _random_vectors(1, seed=5)[0].tolist()
+        fast.query("ns", query, filters={"org_id": "o1"})  # builds the org_id column
+
+        for i in range(60, 120):  # grows the matrix past the built column
+            upsert(i, {"org_id": f"o{i % 3}", "tags": ["a", "b"]})
+        for i in range(0, 60, 4):
+            upsert(i, {"org_id": "o9"})  # rewritten metadata
+        for i in range(1, 120, 7):
+            fast.delete("ns", f"c{i}")
+            slow.delete("ns", f"c{i}")
+
+        for filters in (
+            {"org_id": "o1"},
+            {"org_id": "o9"},
+            {"org_id": "o2", "document_id": "d2"},
+            {"document_id": None},
+            {"tags": ["a", "b"]},
+            {"org_id": "unknown"},
+        ):
+            got = fast.query("ns", query, top_k=200, filters=filters)
+            want = slow.query("ns", query, top_k=200, filters=filters)
+            assert [m.id for m in got] == [m.id for m in want], filters
+
+    def test_filters_apply_within_ivf_candidates(self):
+        store = NumpyVectorStore(ivf_min_vectors=100, nlist=8)
+        for i, v in enumerate(_random_vectors(300)):
+            store.upsert("ns", str(i), v.tolist(), {"org_id": f"o{i % 4}"})
+        query = _random_vectors(1, seed=6)[0].tolist()
+
+        matches = store.query("ns", query, top_k=300, filters={"org_id": "o2"}, nprobe=8)
+        assert sorted(int(m.id) for m in matches) == list(range(2, 300, 4))
+
+
+class TestIVFIndex:
+    def test_full_probe_equals_exact_search(self):
+        vectors = _random_vectors(500)
+        exact = NumpyVectorStore(ivf_min_vectors=10**9)
+        ivf = NumpyVectorStore(ivf_min_vectors=100, nlist=16)
+        for i, v in enumerate(vectors):
+            exact.upsert("ns", str(i), v.tolist(), {})
+            ivf.upsert("ns", str(i), v.tolist(), {})
+
+        query = _random_vectors(1, seed=2)[0].tolist()
+        want = [m.id for m in exact.query("ns", query, top_k=10)]
+        assert [m.id for m in ivf.query("ns", query, top_k=10, nprobe=16)] == want
+
+    def test_recall_improves_with_nprobe(self):
+        vectors = _random_vectors(2000, dim=16, seed=3)
+        exact = NumpyVectorStore(ivf_min_vectors=10**9)
+        ivf = NumpyVectorStore(ivf_min_vectors=100, nlist=32)
+        for i, v in enumerate(vectors):
+            exact.upsert("ns", str(i), v.tolist(), {})
+            ivf.upsert("ns", str(i), v.tolist(), {})
+
+        def recall(nprobe: int) -> float:
+            hits = 0
+            for q in _random_vectors(20, dim=16, seed=4):
+                want = {m.id for m in exact.query("ns", q.tolist(), top_k=10)}
+                got = {m.id for m in ivf.query("ns", q.tolist(), top_k=10, nprobe=nprobe)}
+                hits += len(want & got)
+            return hits / 200
+
+        assert recall(1) <= recall(8) <= recall(32) == 1.0
+
+    def test_vectors_added_after_build_are_searchable(self):
+        store = NumpyVectorStore(ivf_min_vectors=50, nlist=4)
+        for i, v in enumerate(_random_vectors(100)):
+            store.upsert("ns", str(i), v.tolist(), {})
+        store.query("ns", _random_vectors(1)[0].tolist())  # builds the index
+        target = _random_vectors(1, seed=9)[0].tolist()
+        store.upsert("ns", "new", target, {})
+        assert store.query("ns", target, top_k=1, nprobe=4)[0].id == "new"
+
+
+class TestSnapshot:
+    def test_roundtrip_is_memory_mapped_and_writable(self, tmp_path):
+        store = NumpyVectorStore()
+        vectors = _random_vectors(50)
+        for i, v in enumerate(vectors):
+            store.upsert(f"org_{i % 2}", str(i), v.tolist(), {"i": i})
+        assert store.snapshot(tmp_path) == 50
+
+        restored = NumpyVectorStore()
+        assert restored.restore(tmp_path) == 50
+        query = vectors[3].tolist()
+        assert [m.id for m in restored.query("org_1", query, top_k=3)] == [
+            m.id for m in store.query("org_1", query, top_k=3)
+        ]
+
+        restored.upsert("org_1", "extra", [1.0] * 32, {})
+        restored.delete("org_1", "3")
+        assert "3" not in {m.id for m in restored.query("org_1", query, top_k=50)}
+
+    def test_restore_without_snapshot_is_noop(self, tmp_path):
+        assert NumpyVectorStore().restore(tmp_path) == 0
+
+    def test_restore_snapshot_restore_keeps_vectors(self, tmp_path):
+        """Snapshotting a store whose matrices are mapped from the current snapshot."""
+        store = NumpyVectorStore()
+        vectors = _random_vectors(40)
+        for i, v in enumerate(vectors):
+            store.upsert("ns", str(i), v.tolist(), {"i": i})
+        store.snapshot(tmp_path)
+
+        restored = NumpyVectorStore()
+        restored.restore(tmp_path)
+        assert restored.snapshot(tmp_path) == 40  # shutdown snapshot of an untouched restore
+        assert [m.id for m in restored.query("ns", vectors[7].tolist(), top_k=1)] == ["7"]
+
+        again = NumpyVectorStore()
+        assert again.restore(tmp_path) == 40
+        assert [m.id for m in again.query("ns", vectors[7].tolist(), top_k=1)] == ["7"]
+        assert len([p for p in tmp_path.iterdir() if p.is_dir()]) == 1